@@ -0,0 +1,683 @@
+# Arquivo: app/agregados.py
+"""
+Visões materializadas do histórico de partidas.
+
+Como os ratings (app/ratings.py), o histórico é lido em blocos a partir do
+deslocamento (em bytes) já processado: cada bloco de linhas novas é agregado
+com pandas em uma única passada vetorizada e somado aos totais guardados em
+data/agregados. salvar_resultados_em_lote() sincroniza as visões logo após
+gravar (fora da trava do histórico), então a interface só consulta
+dicionários já prontos. Cada partição
+por competição (data/historico/<competicao>.csv) tem as suas próprias visões
+em data/agregados/<competicao>.
+
+Visões:
+    clubes: por clube, vitórias/empates/derrotas, gols, artilheiros e a
+        sequência dos últimos resultados.
+    confrontos: por par de clubes (sem ordem), o retrospecto do confronto
+        direto e os últimos jogos entre eles.
+    janelas: por clube, os gols dos últimos jogos (buffer circular de
+        JANELA_GOLS) e pontos/gols acumulados por mês ('AAAA-MM').
+    artilharia: os N maiores artilheiros (TOP_ARTILHEIROS), atualizados só
+        com os jogadores que marcaram no bloco (os contadores só crescem).
+    índices por data: registros binários ordenados por data, um por partida
+        (data, linha do histórico, clubes e placar, em indice_datas.bin) e um
+        por gol (data, jogador e clube, em indice_gols.bin), para consultas
+        entre datas e "mais recentes primeiro" sem ordenar o histórico.
+        Registros gravados em ordem só são anexados ao arquivo; um registro
+        com data anterior ao último indexado força uma mesclagem.
+"""
+import datetime
+import heapq
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from app.armazenamento import escrever_atomico, gravar_json_atomico, tamanho_estavel, trava_arquivo
+from app.competicoes import arquivo_historico_competicao
+from app.ratings import ler_assinatura, HISTORICO_ARQUIVO, TAMANHO_BLOCO
+
+AGREGADOS_DIR = os.path.join("data", "agregados")
+AGREGADOS_ARQUIVO = os.path.join(AGREGADOS_DIR, "agregados.json")
+INDICE_ARQUIVO = os.path.join(AGREGADOS_DIR, "indice_datas.bin")
+INDICE_GOLS_ARQUIVO = os.path.join(AGREGADOS_DIR, "indice_gols.bin")
+
+# Resultados guardados na sequência recente de cada clube
+TAMANHO_FORMA = 10
+
+# Jogos guardados no retrospecto de cada confronto direto
+ULTIMOS_CONFRONTOS = 5
+
+# Jogos na janela móvel de gols por partida
+JANELA_GOLS = 10
+
+PONTOS = {'V': 3, 'E': 1, 'D': 0}
+
+# Artilheiros mantidos na lista dos maiores (consultas sem filtro até esse limite são diretas)
+TOP_ARTILHEIROS = 50
+
+# Um registro por partida, ordenado por data (segundos desde 1970; 0 se inválida)
+DTYPE_INDICE = np.dtype([
+    ('data', '<i8'),
+    ('linha', '<u4'),
+    ('casa', '<u2'),
+    ('fora', '<u2'),
+    ('gols_casa', 'u1'),
+    ('gols_fora', 'u1'),
+])
+
+# Um registro por gol, ordenado por data
+DTYPE_GOL = np.dtype([
+    ('data', '<i8'),
+    ('jogador', '<u4'),
+    ('clube', '<u2'),
+])
+
+SEPARADOR_PAR = "|"
+
+RESULTADOS = np.array(['D', 'E', 'V'])  # Indexado por sinal do saldo + 1
+
+def ler_blocos_historico(arquivo, posicao=0, colunas=None, limite=None):
+    """
+    Lê o histórico a partir de um deslocamento, em blocos de linhas completas,
+    até o byte limite (None: até o fim do arquivo).
+
+    Yields:
+        tuple: (DataFrame do bloco, bytes consumidos, colunas do cabeçalho).
+    """
+    with open(arquivo, 'rb') as f:
+        f.seek(posicao)
+        resto = b''
+
+        while True:
+            bloco = f.read(TAMANHO_BLOCO if limite is None else max(0, min(TAMANHO_BLOCO, limite - f.tell())))
+            if not bloco:
+                break
+
+            # Só processa linhas completas; o resto fica para o próximo bloco
+            bloco = resto + bloco
+            fim = bloco.rfind(b'\n') + 1
+            bloco, resto = bloco[:fim], bloco[fim:]
+            if not bloco:
+                continue
+
+            consumidos = len(bloco)
+            if colunas is None:
+                cabecalho, bloco = bloco.split(b'\n', 1)
+                colunas = cabecalho.decode('utf-8', errors='replace').strip().split(',')
+
+            df = pd.read_csv(io.BytesIO(bloco), header=None, names=colunas, dtype=str,
+                             keep_default_na=False, encoding_errors='replace') if bloco.strip() else None
+            yield df, consumidos, colunas
+
+def normalizar_partidas(df, inicio=0):
+    """
+    Partidas válidas do bloco, com gols inteiros, a ordem original em 'ordem'
+    e a posição da linha no histórico (a partir de inicio) em 'linha'.
+    """
+    partidas = pd.DataFrame({
+        'data': df['data'],
+        'time_casa': df['time_casa'],
+        'time_visitante': df['time_visitante'],
+        'gols_casa': pd.to_numeric(df['gols_casa'], errors='coerce'),
+        'gols_visitante': pd.to_numeric(df['gols_visitante'], errors='coerce'),
+        'marcadores_gols': df['marcadores_gols'] if 'marcadores_gols' in df.columns else '',
+        'linha': inicio + np.arange(len(df)),
+    })
+    partidas = partidas.dropna(subset=['gols_casa', 'gols_visitante'])
+    partidas['gols_casa'] = partidas['gols_casa'].astype(int)
+    partidas['gols_visitante'] = partidas['gols_visitante'].astype(int)
+    partidas['ordem'] = np.arange(len(partidas))
+    return partidas
+
+def resultados_por_clube(partidas):
+    """Uma linha por clube e partida (mandante e visitante), na ordem do histórico"""
+    casa = pd.DataFrame({
+        'time': partidas['time_casa'].to_numpy(),
+        'adversario': partidas['time_visitante'].to_numpy(),
+        'gols_pro': partidas['gols_casa'].to_numpy(),
+        'gols_contra': partidas['gols_visitante'].to_numpy(),
+        'mes': partidas['data'].str[:7].to_numpy(),
+        'ordem': partidas['ordem'].to_numpy(),
+    })
+    fora = pd.DataFrame({
+        'time': partidas['time_visitante'].to_numpy(),
+        'adversario': partidas['time_casa'].to_numpy(),
+        'gols_pro': partidas['gols_visitante'].to_numpy(),
+        'gols_contra': partidas['gols_casa'].to_numpy(),
+        'mes': partidas['data'].str[:7].to_numpy(),
+        'ordem': partidas['ordem'].to_numpy(),
+    })
+    longo = pd.concat([casa, fora], ignore_index=True).sort_values('ordem', kind='stable')
+    longo['resultado'] = RESULTADOS[np.sign(longo['gols_pro'] - longo['gols_contra']).to_numpy() + 1]
+    return longo
+
+def marcadores_por_partida(partidas):
+    """Um gol por linha ('ordem' da partida, time e jogador) a partir da coluna marcadores_gols"""
+    marcadores = pd.Series(partidas['marcadores_gols'].astype(str).to_numpy(), index=partidas['ordem'].to_numpy())
+    marcadores = marcadores.str.split(';').explode()
+    marcadores = marcadores[marcadores.str.count(':') >= 2]
+    if marcadores.empty:
+        return pd.DataFrame({'ordem': pd.Series(dtype=int), 'time': pd.Series(dtype=str), 'jogador': pd.Series(dtype=str)})
+    partes = marcadores.str.rsplit(':', n=2, expand=True)
+    return pd.DataFrame({'ordem': partes.index.to_numpy(), 'time': partes[2].to_numpy(), 'jogador': partes[0].to_numpy()})
+
+def segundos_das_datas(datas):
+    """Datas do histórico ('AAAA-MM-DD HH:MM:SS') em segundos; 0 para datas inválidas"""
+    convertidas = pd.to_datetime(pd.Series(datas, dtype=str).str[:19], format="%Y-%m-%d %H:%M:%S", errors='coerce')
+    segundos = convertidas.to_numpy(dtype='datetime64[s]')
+    return np.where(np.isnat(segundos), 0, segundos.astype(np.int64))
+
+def para_segundos(momento, fim_do_dia=False):
+    """
+    Converte data/datetime/texto em segundos, como no índice. Com fim_do_dia,
+    uma data sem horário vale até 23:59:59 (limite superior inclusivo).
+    """
+    instante = pd.Timestamp(momento)
+    if fim_do_dia and instante == instante.normalize() and not isinstance(momento, (datetime.datetime, pd.Timestamp)):
+        instante += pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+    return int(instante.value // 10**9)
+
+def mesclar_indice(indice, novos):
+    """Junta registros novos ao índice mantendo a ordem por data (estável para empates)"""
+    if not len(indice):
+        return novos[np.argsort(novos['data'], kind='stable')]
+    juntos = np.concatenate([indice, novos])
+    return juntos[np.argsort(juntos['data'], kind='stable')]
+
+class IndicePorData:
+    """
+    Registros binários (dtype com campo 'data') mantidos em ordem de data.
+
+    Os registros novos ficam pendentes até gravar(): se nenhum é anterior ao
+    último já indexado, são só anexados ao arquivo; senão o índice é mesclado
+    e reescrito. Sem arquivo, o índice fica só em memória.
+    """
+
+    def __init__(self, dtype, arquivo=None):
+        self.dtype = dtype
+        self.arquivo = arquivo
+        self.total = 0
+        self.ultima_data = 0
+        self._novos = []
+        self._registros = None
+
+    def adicionar(self, registros):
+        if len(registros):
+            self._novos.append(registros)
+            self._registros = None
+
+    def registros(self):
+        """Todos os registros (gravados e pendentes), ordenados por data"""
+        if self._registros is None:
+            registros = np.empty(0, dtype=self.dtype)
+            if self.arquivo and self.total:
+                registros = np.fromfile(self.arquivo, dtype=self.dtype, count=self.total)
+            if self._novos:
+                registros = mesclar_indice(registros, np.concatenate(self._novos))
+            self._registros = registros
+        return self._registros
+
+    def pendentes(self):
+        return sum(len(novos) for novos in self._novos)
+
+    def gravar(self):
+        if not self._novos or not self.arquivo:
+            return
+        novos = np.concatenate(self._novos)
+        em_ordem = novos['data'].min() >= self.ultima_data and np.all(np.diff(novos['data']) >= 0)
+
+        os.makedirs(os.path.dirname(self.arquivo), exist_ok=True)
+        if em_ordem:
+            with open(self.arquivo, 'ab') as f:
+                f.write(novos.tobytes())
+        else:
+            escrever_atomico(self.arquivo, self.registros().tobytes())
+
+        self.total += len(novos)
+        self.ultima_data = max(self.ultima_data, int(novos['data'].max()))
+        self._novos = []
+
+    def valido(self):
+        """O arquivo tem exatamente os registros contabilizados no estado salvo"""
+        if not self.arquivo or not self.total:
+            return True
+        return os.path.isfile(self.arquivo) and os.path.getsize(self.arquivo) == self.total * self.dtype.itemsize
+
+    def entre(self, inicio=None, fim=None):
+        """Registros com data entre inicio e fim (inclusivos; fim sem horário vale o dia todo)"""
+        registros = self.registros()
+        datas = registros['data']
+        de = np.searchsorted(datas, para_segundos(inicio), side='left') if inicio is not None else 0
+        ate = np.searchsorted(datas, para_segundos(fim, fim_do_dia=True), side='right') if fim is not None else len(datas)
+        return registros[de:ate]
+
+    def para_dict(self):
+        return {'total': self.total, 'ultima_data': self.ultima_data}
+
+    def carregar_dict(self, dados):
+        self.total = dados.get('total', 0)
+        self.ultima_data = dados.get('ultima_data', 0)
+
+def chave_confronto(nome1, nome2):
+    """Chave do par de clubes, a mesma nas duas ordens"""
+    return SEPARADOR_PAR.join(sorted((nome1, nome2)))
+
+def novo_confronto():
+    # Campos "1" e "2" se referem aos clubes na ordem da chave
+    return {'jogos': 0, 'vitorias1': 0, 'empates': 0, 'vitorias2': 0, 'gols1': 0, 'gols2': 0, 'ultimos': []}
+
+def novo_clube():
+    return {'jogos': 0, 'vitorias': 0, 'empates': 0, 'derrotas': 0,
+            'gols_pro': 0, 'gols_contra': 0, 'artilheiros': {}, 'forma': [],
+            'ultimos_gols': [], 'meses': {}}
+
+class AgregadosHistorico:
+    """Visões do histórico mantidas incrementalmente (ver o docstring do módulo)"""
+
+    def __init__(self, diretorio=None):
+        self.partidas_processadas = 0
+        self.bytes_processados = 0
+        self.colunas = None
+        self.assinatura = ''
+        self.clubes = {}
+        self.confrontos = {}
+        self.linhas_lidas = 0
+        self.ids_clubes = {}
+        self.ids_artilheiros = {}
+        self.top_artilheiros = []
+        # Sem diretório, os índices ficam só em memória (ver de_historico)
+        arquivo = lambda nome: os.path.join(diretorio, nome) if diretorio else None
+        self.partidas_por_data = IndicePorData(DTYPE_INDICE, arquivo(os.path.basename(INDICE_ARQUIVO)))
+        self.gols_por_data = IndicePorData(DTYPE_GOL, arquivo(os.path.basename(INDICE_GOLS_ARQUIVO)))
+        self._nomes_artilheiros = None
+
+    def processar(self, df):
+        """Soma um bloco de partidas (DataFrame no formato do histórico) às visões"""
+        partidas = normalizar_partidas(df, self.linhas_lidas)
+        self.linhas_lidas += len(df)
+        if partidas.empty:
+            return 0
+
+        longo = resultados_por_clube(partidas)
+        longo['vitorias'] = longo['resultado'] == 'V'
+        longo['empates'] = longo['resultado'] == 'E'
+        longo['derrotas'] = longo['resultado'] == 'D'
+        grupos = longo.groupby('time', sort=False)
+        totais = grupos[['vitorias', 'empates', 'derrotas', 'gols_pro', 'gols_contra']].sum()
+        totais['jogos'] = grupos.size()
+        forma = grupos.tail(TAMANHO_FORMA).groupby('time', sort=False)['resultado'].agg(list)
+        recentes = grupos.tail(JANELA_GOLS)
+        janela_gols = pd.Series(recentes[['gols_pro', 'gols_contra']].to_numpy().tolist(),
+                                index=recentes['time'].to_numpy()).groupby(level=0, sort=False).agg(list)
+
+        # Acumuladores por mês: [jogos, pontos, gols pró, gols contra]
+        longo['pontos'] = longo['resultado'].map(PONTOS)
+        meses = longo.groupby(['time', 'mes'], sort=False).agg(
+            jogos=('pontos', 'size'), pontos=('pontos', 'sum'),
+            gols_pro=('gols_pro', 'sum'), gols_contra=('gols_contra', 'sum'))
+
+        for nome, linha in zip(totais.index, totais.itertuples(index=False)):
+            clube = self.clubes.setdefault(nome, novo_clube())
+            for campo in ('jogos', 'vitorias', 'empates', 'derrotas', 'gols_pro', 'gols_contra'):
+                clube[campo] += int(getattr(linha, campo))
+            clube['forma'] = (clube['forma'] + forma[nome])[-TAMANHO_FORMA:]
+            clube['ultimos_gols'] = (clube['ultimos_gols'] + janela_gols[nome])[-JANELA_GOLS:]
+
+        for (nome, mes), linha in zip(meses.index, meses.itertuples(index=False)):
+            acumulado = self.clubes[nome]['meses'].setdefault(mes, [0, 0, 0, 0])
+            for i, valor in enumerate(linha):
+                acumulado[i] += int(valor)
+
+        gols = marcadores_por_partida(partidas)
+        for (nome, jogador), quantidade in gols.groupby(['time', 'jogador'], sort=False).size().items():
+            artilheiros = self.clubes.setdefault(nome, novo_clube())['artilheiros']
+            artilheiros[jogador] = artilheiros.get(jogador, 0) + int(quantidade)
+        self.atualizar_top_artilheiros(zip(gols['time'], gols['jogador']))
+
+        self.processar_confrontos(partidas)
+        self.indexar(partidas, gols)
+        self.partidas_processadas += len(partidas)
+        return len(partidas)
+
+    def processar_confrontos(self, partidas):
+        """Soma as partidas do bloco ao retrospecto de cada par de clubes"""
+        casa = partidas['time_casa'].to_numpy()
+        fora = partidas['time_visitante'].to_numpy()
+        em_ordem = casa <= fora
+        gols1 = np.where(em_ordem, partidas['gols_casa'], partidas['gols_visitante'])
+        gols2 = np.where(em_ordem, partidas['gols_visitante'], partidas['gols_casa'])
+        primeiro = pd.Series(np.where(em_ordem, casa, fora), dtype=str)
+        segundo = pd.Series(np.where(em_ordem, fora, casa), dtype=str)
+        pares = pd.DataFrame({
+            'chave': (primeiro + SEPARADOR_PAR + segundo).to_numpy(),
+            'gols1': gols1,
+            'gols2': gols2,
+            'vitorias1': gols1 > gols2,
+            'empates': gols1 == gols2,
+            'vitorias2': gols1 < gols2,
+        })
+        grupos = pares.groupby('chave', sort=False)
+        totais = grupos[['vitorias1', 'empates', 'vitorias2', 'gols1', 'gols2']].sum()
+        totais['jogos'] = grupos.size()
+
+        ultimos = partidas[['data', 'time_casa', 'gols_casa', 'gols_visitante', 'time_visitante']].assign(chave=pares['chave'].to_numpy())
+        ultimos = ultimos.groupby('chave', sort=False).tail(ULTIMOS_CONFRONTOS)
+        jogos_recentes = {}
+        for linha in ultimos.itertuples(index=False):
+            jogos_recentes.setdefault(linha.chave, []).append(
+                [linha.data, linha.time_casa, int(linha.gols_casa), int(linha.gols_visitante), linha.time_visitante])
+
+        for chave, linha in zip(totais.index, totais.itertuples(index=False)):
+            confronto = self.confrontos.setdefault(chave, novo_confronto())
+            for campo in ('jogos', 'vitorias1', 'empates', 'vitorias2', 'gols1', 'gols2'):
+                confronto[campo] += int(getattr(linha, campo))
+            confronto['ultimos'] = (confronto['ultimos'] + jogos_recentes[chave])[-ULTIMOS_CONFRONTOS:]
+
+    def atualizar_top_artilheiros(self, marcaram):
+        """
+        Recalcula os maiores artilheiros só entre os atuais e os que marcaram
+        no bloco: como os contadores só crescem, ninguém mais pode entrar.
+        """
+        candidatos = {(time, jogador) for _, time, jogador in self.top_artilheiros}
+        candidatos.update(marcaram)
+        gols = lambda par: self.clubes[par[0]]['artilheiros'][par[1]]
+        maiores = heapq.nsmallest(TOP_ARTILHEIROS, candidatos, key=lambda par: (-gols(par), par[1], par[0]))
+        self.top_artilheiros = [[gols(par), par[0], par[1]] for par in maiores]
+
+    def indexar(self, partidas, gols):
+        """Registros dos índices por data para as partidas e gols do bloco (gravados em gravar_indices)"""
+        nomes = pd.concat([partidas['time_casa'], partidas['time_visitante'], gols['time']]).unique()
+        for nome in nomes:
+            self.ids_clubes.setdefault(nome, len(self.ids_clubes) + 1)
+
+        segundos = segundos_das_datas(partidas['data'])
+        registros = np.empty(len(partidas), dtype=DTYPE_INDICE)
+        registros['data'] = segundos
+        registros['linha'] = partidas['linha'].to_numpy()
+        registros['casa'] = partidas['time_casa'].map(self.ids_clubes).to_numpy()
+        registros['fora'] = partidas['time_visitante'].map(self.ids_clubes).to_numpy()
+        registros['gols_casa'] = np.clip(partidas['gols_casa'].to_numpy(), 0, 255)
+        registros['gols_fora'] = np.clip(partidas['gols_visitante'].to_numpy(), 0, 255)
+        self.partidas_por_data.adicionar(registros)
+
+        chaves = (gols['time'] + SEPARADOR_PAR + gols['jogador']).to_numpy()
+        for chave in pd.unique(chaves):
+            if chave not in self.ids_artilheiros:
+                self.ids_artilheiros[chave] = len(self.ids_artilheiros)
+                self._nomes_artilheiros = None
+        registros_gols = np.empty(len(gols), dtype=DTYPE_GOL)
+        registros_gols['data'] = segundos[gols['ordem'].to_numpy(dtype=np.int64)]
+        registros_gols['jogador'] = pd.Series(chaves).map(self.ids_artilheiros).to_numpy()
+        registros_gols['clube'] = gols['time'].map(self.ids_clubes).to_numpy()
+        self.gols_por_data.adicionar(registros_gols)
+
+    def indice(self):
+        """Registros de todas as partidas processadas, ordenados por data"""
+        return self.partidas_por_data.registros()
+
+    def gravar_indices(self):
+        self.partidas_por_data.gravar()
+        self.gols_por_data.gravar()
+
+    def indices_validos(self):
+        """Os índices em disco conferem com o estado (partidas e gols contabilizados)"""
+        return (self.partidas_por_data.total + self.partidas_por_data.pendentes() == self.partidas_processadas
+                and self.partidas_por_data.valido() and self.gols_por_data.valido())
+
+    def _registros_entre(self, inicio=None, fim=None, nome=None):
+        registros = self.partidas_por_data.entre(inicio, fim)
+        if nome is not None:
+            clube_id = self.ids_clubes.get(nome)
+            if clube_id is None:
+                return registros[:0]
+            registros = registros[(registros['casa'] == clube_id) | (registros['fora'] == clube_id)]
+        return registros
+
+    def linhas_recentes(self, nome=None, limite=None, inicio=None, fim=None):
+        """
+        Posições (linhas) no histórico carregado das partidas mais recentes
+        primeiro, opcionalmente só as de um clube e/ou entre duas datas.
+        """
+        linhas = self._registros_entre(inicio, fim, nome)['linha'][::-1]
+        return linhas[:limite] if limite is not None else linhas
+
+    def periodo(self, nome=None, inicio=None, fim=None):
+        """
+        Totais das partidas entre inicio e fim (inclusivos; None = sem limite).
+
+        Returns:
+            dict: jogos e gols; com nome, também vitorias, empates, derrotas,
+            gols_pro, gols_contra e pontos do clube.
+        """
+        registros = self._registros_entre(inicio, fim, nome)
+        gols_casa = registros['gols_casa'].astype(np.int64)
+        gols_fora = registros['gols_fora'].astype(np.int64)
+        totais = {'jogos': len(registros), 'gols': int(gols_casa.sum() + gols_fora.sum())}
+        if nome is None:
+            return totais
+
+        em_casa = registros['casa'] == self.ids_clubes.get(nome)
+        gols_pro = np.where(em_casa, gols_casa, gols_fora)
+        gols_contra = np.where(em_casa, gols_fora, gols_casa)
+        totais.update({
+            'vitorias': int((gols_pro > gols_contra).sum()),
+            'empates': int((gols_pro == gols_contra).sum()),
+            'derrotas': int((gols_pro < gols_contra).sum()),
+            'gols_pro': int(gols_pro.sum()),
+            'gols_contra': int(gols_contra.sum()),
+        })
+        totais['pontos'] = 3 * totais['vitorias'] + totais['empates']
+        return totais
+
+    def forma_recente(self, nome):
+        """
+        Métricas móveis do clube, lidas dos buffers já mantidos (sem percorrer o histórico).
+
+        Returns:
+            dict ou None: pontos_por_jogo_5/_10 (últimos 5/10 resultados),
+            gols_pro_por_jogo/gols_contra_por_jogo (últimos JANELA_GOLS jogos)
+            e pontos_por_mes ({'AAAA-MM': pontos por jogo}).
+        """
+        clube = self.clubes.get(nome)
+        if clube is None:
+            return None
+        forma = clube['forma']
+        ultimos_gols = clube.get('ultimos_gols', [])
+        meses = clube.get('meses', {})
+
+        def pontos_por_jogo(resultados):
+            return sum(PONTOS[r] for r in resultados) / len(resultados) if resultados else 0.0
+
+        return {
+            'pontos_por_jogo_5': pontos_por_jogo(forma[-5:]),
+            'pontos_por_jogo_10': pontos_por_jogo(forma[-10:]),
+            'gols_pro_por_jogo': sum(g[0] for g in ultimos_gols) / len(ultimos_gols) if ultimos_gols else 0.0,
+            'gols_contra_por_jogo': sum(g[1] for g in ultimos_gols) / len(ultimos_gols) if ultimos_gols else 0.0,
+            'pontos_por_mes': {mes: m[1] / m[0] for mes, m in sorted(meses.items()) if m[0]},
+        }
+
+    def _contagem_gols(self, nome=None, inicio=None, fim=None):
+        """Gols por id de artilheiro entre as datas (np.bincount sobre o índice de gols)"""
+        registros = self.gols_por_data.entre(inicio, fim)
+        if nome is not None:
+            registros = registros[registros['clube'] == self.ids_clubes.get(nome, -1)]
+        return np.bincount(registros['jogador'], minlength=len(self.ids_artilheiros))
+
+    def artilharia(self, limite=15, nome=None, inicio=None, fim=None):
+        """
+        Maiores artilheiros, opcionalmente de um clube e/ou entre duas datas.
+
+        Sem filtros, até TOP_ARTILHEIROS vêm direto da lista mantida a cada
+        bloco; por clube, um heap sobre os contadores do clube; por período,
+        uma contagem sobre a fatia do índice de gols e seleção parcial.
+
+        Returns:
+            list: Tuplas (jogador, time, gols), do maior para o menor.
+        """
+        if inicio is None and fim is None:
+            if nome is None and limite is not None and limite <= TOP_ARTILHEIROS:
+                return [(jogador, time, gols) for gols, time, jogador in self.top_artilheiros[:limite]]
+            nomes = [nome] if nome is not None else list(self.clubes)
+            fonte = ((jogador, time, gols) for time in nomes if time in self.clubes
+                     for jogador, gols in self.clubes[time]['artilheiros'].items())
+        else:
+            contagem = self._contagem_gols(nome, inicio, fim)
+            ids = np.flatnonzero(contagem)
+            if limite is not None and len(ids) > limite:
+                # Todos os empatados com o último da lista entram como candidatos
+                corte = np.partition(contagem[ids], len(ids) - limite)[len(ids) - limite]
+                ids = ids[contagem[ids] >= corte]
+            if self._nomes_artilheiros is None:
+                self._nomes_artilheiros = list(self.ids_artilheiros)
+            fonte = []
+            for artilheiro_id in ids:
+                time, jogador = self._nomes_artilheiros[artilheiro_id].split(SEPARADOR_PAR, 1)
+                fonte.append((jogador, time, int(contagem[artilheiro_id])))
+
+        chave = lambda item: (-item[2], item[0], item[1])
+        return heapq.nsmallest(limite, fonte, key=chave) if limite is not None else sorted(fonte, key=chave)
+
+    def total_artilheiros(self, nome=None, inicio=None, fim=None):
+        """Quantos jogadores marcaram (com os mesmos filtros de artilharia())"""
+        if inicio is None and fim is None:
+            nomes = [nome] if nome is not None else list(self.clubes)
+            return sum(len(self.clubes[time]['artilheiros']) for time in nomes if time in self.clubes)
+        return int(np.count_nonzero(self._contagem_gols(nome, inicio, fim)))
+
+    def processar_historico(self, arquivo=HISTORICO_ARQUIVO, limite=None):
+        """Processa as linhas do histórico ainda não lidas (até o byte limite). Retorna o número de partidas novas."""
+        if not os.path.isfile(arquivo):
+            return 0
+
+        novas = 0
+        for df, consumidos, colunas in ler_blocos_historico(arquivo, self.bytes_processados, self.colunas, limite):
+            self.colunas = colunas
+            if df is not None:
+                novas += self.processar(df)
+            self.bytes_processados += consumidos
+
+        self.assinatura = ler_assinatura(arquivo, self.bytes_processados)
+        return novas
+
+    @classmethod
+    def de_historico(cls, historico):
+        """Visões de um DataFrame de histórico já carregado (sem estado em disco)"""
+        agregados = cls()
+        if historico is not None and not historico.empty:
+            agregados.processar(historico)
+        return agregados
+
+    def clube(self, nome):
+        """Estatísticas de um clube (dict de novo_clube()) ou None se ainda não jogou"""
+        return self.clubes.get(nome)
+
+    def confronto(self, nome, adversario):
+        """
+        Retrospecto de nome contra adversario, ou None se nunca se enfrentaram.
+
+        Returns:
+            dict: jogos, vitorias, empates, derrotas, gols_pro, gols_contra e
+            ultimos (listas [data, mandante, gols_mandante, gols_visitante,
+            visitante], do mais antigo ao mais recente).
+        """
+        confronto = self.confrontos.get(chave_confronto(nome, adversario))
+        if confronto is None:
+            return None
+        lado, outro = ('1', '2') if nome <= adversario else ('2', '1')
+        return {
+            'jogos': confronto['jogos'],
+            'vitorias': confronto['vitorias' + lado],
+            'empates': confronto['empates'],
+            'derrotas': confronto['vitorias' + outro],
+            'gols_pro': confronto['gols' + lado],
+            'gols_contra': confronto['gols' + outro],
+            'ultimos': confronto['ultimos'],
+        }
+
+    def para_dict(self):
+        return {
+            'partidas_processadas': self.partidas_processadas,
+            'bytes_processados': self.bytes_processados,
+            'colunas': self.colunas,
+            'assinatura': self.assinatura,
+            'clubes': self.clubes,
+            'confrontos': self.confrontos,
+            'linhas_lidas': self.linhas_lidas,
+            'ids_clubes': self.ids_clubes,
+            'ids_artilheiros': self.ids_artilheiros,
+            'top_artilheiros': self.top_artilheiros,
+            'indice_partidas': self.partidas_por_data.para_dict(),
+            'indice_gols': self.gols_por_data.para_dict(),
+        }
+
+    @classmethod
+    def de_dict(cls, dados, diretorio=None):
+        agregados = cls(diretorio)
+        agregados.partidas_processadas = dados.get('partidas_processadas', 0)
+        agregados.bytes_processados = dados.get('bytes_processados', 0)
+        agregados.colunas = dados.get('colunas')
+        agregados.assinatura = dados.get('assinatura', '')
+        agregados.clubes = dados.get('clubes', {})
+        agregados.confrontos = dados.get('confrontos', {})
+        agregados.linhas_lidas = dados.get('linhas_lidas', 0)
+        agregados.ids_clubes = dados.get('ids_clubes', {})
+        agregados.ids_artilheiros = dados.get('ids_artilheiros', {})
+        agregados.top_artilheiros = dados.get('top_artilheiros', [])
+        agregados.partidas_por_data.carregar_dict(dados.get('indice_partidas', {}))
+        agregados.gols_por_data.carregar_dict(dados.get('indice_gols', {}))
+        return agregados
+
+def salvar_agregados(agregados, arquivo=AGREGADOS_ARQUIVO):
+    # Os índices vão primeiro: um estado salvo nunca conta registros que não estão nos arquivos
+    agregados.gravar_indices()
+    gravar_json_atomico(arquivo, agregados.para_dict())
+
+def sincronizar_agregados(arquivo_historico=HISTORICO_ARQUIVO, arquivo_agregados=AGREGADOS_ARQUIVO):
+    """
+    Carrega as visões salvas e processa apenas as partidas novas do histórico.
+
+    Se o histórico foi recriado ou editado, ou os índices por data não conferem
+    com o estado salvo, as visões são reconstruídas do zero (a mesma rotina,
+    começando do byte zero).
+
+    Returns:
+        AgregadosHistorico: Visões atualizadas e já gravadas em disco.
+    """
+    # Como nos ratings, a trava é a das visões: uma sessão por vez as atualiza,
+    # e a do histórico fica só com quem grava partidas
+    with trava_arquivo(arquivo_agregados):
+        diretorio = os.path.dirname(arquivo_agregados)
+        agregados = None
+        if os.path.isfile(arquivo_agregados):
+            try:
+                with open(arquivo_agregados, 'r', encoding='utf-8') as f:
+                    agregados = AgregadosHistorico.de_dict(json.load(f), diretorio)
+            except (json.JSONDecodeError, OSError):
+                agregados = None
+
+        tamanho_historico = tamanho_estavel(arquivo_historico)
+        assinatura_historico = ler_assinatura(arquivo_historico, tamanho_historico)
+        if (agregados is None or agregados.bytes_processados > tamanho_historico
+                or agregados.assinatura != ler_assinatura(arquivo_historico, agregados.bytes_processados)
+                or not agregados.indices_validos()):
+            agregados = AgregadosHistorico(diretorio)
+            for indice in (agregados.partidas_por_data, agregados.gols_por_data):
+                if os.path.isfile(indice.arquivo):
+                    os.remove(indice.arquivo)
+
+        if agregados.bytes_processados < tamanho_historico:
+            agregados.processar_historico(arquivo_historico, tamanho_historico)
+            # Histórico reescrito durante a leitura: a próxima sincronização reconstrói
+            if ler_assinatura(arquivo_historico, tamanho_historico) == assinatura_historico:
+                salvar_agregados(agregados, arquivo_agregados)
+
+        return agregados
+
+def sincronizar_agregados_competicao(competicao):
+    """Visões de uma única competição, a partir da sua partição do histórico (ver app/competicoes.py)"""
+    return sincronizar_agregados(arquivo_historico_competicao(competicao),
+                                 os.path.join(AGREGADOS_DIR, competicao, os.path.basename(AGREGADOS_ARQUIVO)))
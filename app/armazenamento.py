@@ -0,0 +1,184 @@
+# Arquivo: app/armazenamento.py
+"""
+Escrita segura dos arquivos de dados com várias sessões ao mesmo tempo.
+
+Várias sessões do Streamlit (threads do mesmo servidor) e a linha de comando
+(outros processos) gravam nos mesmos arquivos. Três peças resolvem isso:
+
+    trava_arquivo(): trava exclusiva por arquivo, entre threads (RLock) e
+        entre processos (flock/msvcrt em '<arquivo>.lock'), reentrante na
+        mesma thread. Em arquivos só de acréscimos ela cobre só a escrita:
+        quem lê pega o tamanho com tamanho_estavel() e lê até ali sem trava.
+    escrever_atomico(): reescritas vão para um temporário único na mesma
+        pasta e entram no lugar com os.replace(); leitores nunca veem um
+        arquivo pela metade.
+    GrupoCommit: gravações que chegam enquanto outra está em curso esperam
+        e são gravadas juntas pela próxima (uma trava e uma escrita por
+        lote, em vez de uma por chamada).
+
+Só usa a biblioteca padrão (a linha de comando importa este módulo).
+"""
+import contextlib
+import json
+import os
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_travas = {}
+_travas_guarda = threading.Lock()
+_local = threading.local()
+
+def _travar(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return
+    while True:
+        try:
+            # LK_LOCK tenta por ~10 s e desiste com OSError; continua esperando
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
+
+def _destravar(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+@contextlib.contextmanager
+def trava_arquivo(caminho):
+    """
+    Trava exclusiva de um arquivo de dados (o arquivo em si não é aberto).
+
+    Entre threads, um RLock por caminho; entre processos, uma trava do sistema
+    em '<caminho>.lock', pega só pela chamada mais externa de cada thread.
+    """
+    chave = os.path.abspath(caminho)
+    with _travas_guarda:
+        trava = _travas.setdefault(chave, threading.RLock())
+
+    with trava:
+        profundidades = _local.__dict__.setdefault('profundidades', {})
+        if profundidades.get(chave):
+            profundidades[chave] += 1
+            try:
+                yield
+            finally:
+                profundidades[chave] -= 1
+            return
+
+        os.makedirs(os.path.dirname(chave), exist_ok=True)
+        fd = os.open(chave + '.lock', os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            _travar(fd)
+            profundidades[chave] = 1
+            try:
+                yield
+            finally:
+                del profundidades[chave]
+                _destravar(fd)
+        finally:
+            os.close(fd)
+
+def tamanho_estavel(caminho):
+    """
+    Tamanho de um arquivo só de acréscimos, lido sob a trava dele (0 se não
+    existe). Até esse ponto só há escritas completas, que não mudam mais:
+    dá para ler esses bytes depois, sem segurar a trava.
+    """
+    with trava_arquivo(caminho):
+        return os.path.getsize(caminho) if os.path.isfile(caminho) else 0
+
+def escrever_atomico(caminho, conteudo, encoding='utf-8'):
+    """Substitui o arquivo inteiro de uma vez (temporário único + fsync + os.replace)"""
+    if isinstance(conteudo, str):
+        conteudo = conteudo.encode(encoding)
+    pasta = os.path.dirname(caminho) or '.'
+    os.makedirs(pasta, exist_ok=True)
+    fd, temporario = tempfile.mkstemp(dir=pasta, prefix=os.path.basename(caminho) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(conteudo)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, caminho)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temporario)
+        raise
+
+def gravar_json_atomico(caminho, dados, **opcoes):
+    """json.dump com escrita atômica (ensure_ascii=False, como o resto do projeto)"""
+    opcoes.setdefault('ensure_ascii', False)
+    escrever_atomico(caminho, json.dumps(dados, **opcoes))
+
+def anexar_bytes(caminho, conteudo):
+    """Acrescenta ao fim do arquivo em uma única escrita, com fsync"""
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    with open(caminho, 'ab') as f:
+        f.write(conteudo)
+        f.flush()
+        os.fsync(f.fileno())
+
+class GrupoCommit:
+    """
+    Junta gravações concorrentes do mesmo processo em lotes.
+
+    enviar(item) entra na fila. Se nenhuma gravação está em curso, quem
+    chamou vira o líder: grava com gravar_lote(itens) tudo o que está na fila
+    e entrega a cada chamador o seu resultado. Quem chega durante a gravação
+    espera e entra no lote seguinte. gravar_lote recebe a lista de itens e
+    devolve uma lista de resultados na mesma ordem; se levantar uma exceção,
+    ela é repassada a todos os chamadores do lote. Se a gravação for
+    interrompida, a fila é liberada do mesmo jeito: ninguém fica esperando.
+    """
+
+    def __init__(self, gravar_lote):
+        self.gravar_lote = gravar_lote
+        self._condicao = threading.Condition()
+        self._fila = []
+        self._gravando = False
+        self.lotes = 0
+        self.itens = 0
+
+    def enviar(self, item):
+        pedido = {'item': item, 'pronto': False, 'resultado': None, 'erro': None}
+        with self._condicao:
+            self._fila.append(pedido)
+            while not pedido['pronto'] and self._gravando:
+                self._condicao.wait()
+            if not pedido['pronto']:
+                self._gravando = True
+                lote, self._fila = self._fila, []
+
+        if not pedido['pronto']:
+            resultados, erro = [None] * len(lote), None
+            try:
+                resultados = self.gravar_lote([p['item'] for p in lote])
+            except BaseException as e:
+                # Mesmo interrompido (KeyboardInterrupt, SystemExit) o líder libera a fila no
+                # finally; os outros chamadores do lote recebem um erro comum
+                erro = e if isinstance(e, Exception) else RuntimeError(f"Gravação interrompida: {e!r}")
+                raise
+            finally:
+                with self._condicao:
+                    for p, resultado in zip(lote, resultados):
+                        p['resultado'], p['erro'], p['pronto'] = resultado, erro, True
+                    self.lotes += 1
+                    self.itens += len(lote)
+                    self._gravando = False
+                    self._condicao.notify_all()
+
+        if pedido['erro'] is not None:
+            raise pedido['erro']
+        return pedido['resultado']
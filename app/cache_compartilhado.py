@@ -0,0 +1,180 @@
+# Arquivo: app/cache_compartilhado.py
+"""
+Dados carregados compartilhados por todas as sessões do servidor.
+
+st.cache_data guarda cada resultado uma vez, mas entrega a cada sessão uma
+cópia (pickle) a cada execução da página e, quando o arquivo muda, recarrega
+tudo. Aqui cada conjunto de dados (clubes, histórico, ratings, visões do
+histórico, torneios) e cada tabela derivada (classificação, artilharia) fica
+uma única vez na memória do processo, com uma versão:
+
+    versão = (gravações notificadas neste processo, tamanho e data dos arquivos)
+
+Quem grava chama notificar_alteracao(): as outras sessões veem a versão nova
+na próxima execução da página, mesmo em sistemas de arquivos com data de
+modificação pouco precisa. A parte dos arquivos pega gravações de outros
+processos (linha de comando). Com a versão nova, o histórico só lê as
+partidas acrescentadas (utils.io.atualizar_historico()), e ratings e visões
+leem o estado que quem gravou já sincronizou.
+
+Os valores são compartilhados entre sessões: quem os recebe não pode
+alterá-los. O número de entradas é limitado (as menos usadas saem primeiro).
+Só usa a biblioteca padrão; os módulos de dados são importados sob demanda.
+"""
+import os
+import threading
+from collections import Counter, OrderedDict
+
+# Conjuntos de dados: clubes, históricos e visões (completos e por competição), torneios
+MAX_ENTRADAS = 16
+# Tabelas derivadas: uma por combinação de filtros, então ficam em um cache à parte
+# para não tirarem os conjuntos de dados da memória
+MAX_TABELAS = 64
+
+def assinatura_arquivos(*caminhos):
+    """Tamanho e data de modificação dos arquivos (None para os que não existem)"""
+    assinatura = []
+    for caminho in caminhos:
+        try:
+            estado = os.stat(caminho)
+            assinatura.append((estado.st_size, estado.st_mtime_ns))
+        except OSError:
+            assinatura.append(None)
+    return tuple(assinatura)
+
+class CacheCompartilhado:
+    """
+    Cache LRU do processo, com versões.
+
+    obter(chave, versao, carregar, atualizar) devolve o valor guardado se a
+    versão for a mesma. Se mudou, atualizar(valor_anterior) produz o novo a
+    partir do anterior (só os deltas) ou, sem ele, carregar() refaz do zero.
+    Só uma sessão por vez (re)constrói cada chave; as outras esperam e usam
+    o resultado.
+    """
+
+    def __init__(self, max_entradas=MAX_ENTRADAS):
+        self.max_entradas = max_entradas
+        self._entradas = OrderedDict()  # chave -> (versao, valor)
+        self._travas_chave = {}
+        self._trava = threading.Lock()
+        self._gravacoes = Counter()
+        self.acertos = 0
+        self.cargas = 0
+        self.atualizacoes = 0
+
+    def notificar(self, *nomes):
+        """Registra gravações nos conjuntos de dados (a versão deles muda)"""
+        with self._trava:
+            self._gravacoes.update(nomes)
+
+    def versao(self, nome, *arquivos):
+        return self._gravacoes[nome], assinatura_arquivos(*arquivos)
+
+    def obter(self, chave, versao, carregar, atualizar=None):
+        with self._trava:
+            trava_chave = self._travas_chave.setdefault(chave, threading.Lock())
+
+        with trava_chave:
+            with self._trava:
+                entrada = self._entradas.get(chave)
+                if entrada is not None:
+                    self._entradas.move_to_end(chave)
+                    if entrada[0] == versao:
+                        self.acertos += 1
+                        return entrada[1]
+
+            if entrada is not None and atualizar is not None:
+                valor = atualizar(entrada[1])
+                self.atualizacoes += 1
+            else:
+                valor = carregar()
+                self.cargas += 1
+
+            with self._trava:
+                self._entradas[chave] = (versao, valor)
+                self._entradas.move_to_end(chave)
+                while len(self._entradas) > self.max_entradas:
+                    antiga, _ = self._entradas.popitem(last=False)
+                    self._travas_chave.pop(antiga, None)
+        return valor
+
+    def limpar(self):
+        with self._trava:
+            self._entradas.clear()
+            self._travas_chave.clear()
+
+    def estatisticas(self):
+        return {
+            'entradas': len(self._entradas),
+            'acertos': self.acertos,
+            'cargas': self.cargas,
+            'atualizacoes': self.atualizacoes,
+        }
+
+# Um de cada por processo do servidor, compartilhados por todas as sessões
+cache = CacheCompartilhado()
+tabelas = CacheCompartilhado(MAX_TABELAS)
+
+def notificar_alteracao(*nomes):
+    """Chamada por quem grava: 'historico', 'torneios' ou 'clubes'"""
+    cache.notificar(*nomes)
+
+def versao_historico(competicao=None):
+    """Versão do histórico completo ou da partição de uma competição"""
+    from app.competicoes import arquivo_historico_competicao
+    from app.ratings import HISTORICO_ARQUIVO
+    arquivo = arquivo_historico_competicao(competicao) if competicao else HISTORICO_ARQUIVO
+    return cache.versao('historico', arquivo)
+
+def versao_torneios():
+    from app.historico_torneios import ARQUIVO_HISTORICO_TORNEIOS, ARQUIVO_RESUMO_TORNEIOS
+    return cache.versao('torneios', ARQUIVO_HISTORICO_TORNEIOS, ARQUIVO_RESUMO_TORNEIOS)
+
+def clubes_compartilhados():
+    """Clubes com jogadores; recarregados apenas quando os CSVs ou os logos mudam"""
+    from utils.io import CLUBES_ARQUIVO, JOGADORES_ARQUIVO, LOGOS_DIR, carregar_clubes, carregar_jogadores
+
+    def carregar():
+        clubes = carregar_clubes()
+        carregar_jogadores(clubes=clubes)
+        return clubes
+
+    return cache.obter('clubes', cache.versao('clubes', CLUBES_ARQUIVO, JOGADORES_ARQUIVO, LOGOS_DIR), carregar)
+
+def historico_compartilhado(competicao=None):
+    """Histórico (completo ou de uma competição); só as partidas novas são lidas a cada gravação"""
+    from utils.io import atualizar_historico, carregar_historico
+    return cache.obter(('historico', competicao), versao_historico(competicao),
+                       lambda: carregar_historico(competicao),
+                       lambda anterior: atualizar_historico(anterior, competicao))
+
+def ratings_compartilhados():
+    from app.ratings import sincronizar_ratings
+    return cache.obter('ratings', versao_historico(), sincronizar_ratings)
+
+def agregados_compartilhados(competicao=None):
+    """Visões do histórico completo ou de uma competição (ver app/agregados.py)"""
+    from app.agregados import sincronizar_agregados, sincronizar_agregados_competicao
+    if competicao:
+        return cache.obter(('agregados', competicao), versao_historico(competicao),
+                           lambda: sincronizar_agregados_competicao(competicao))
+    return cache.obter(('agregados', None), versao_historico(), sincronizar_agregados)
+
+def tabela_do_historico(nome, historico, competicao, calcular, *parametros):
+    """
+    Tabela derivada do histórico (classificação, artilharia...), calculada uma
+    vez por parâmetros e pelo ponto até onde o histórico recebido foi lido, e
+    compartilhada entre sessões.
+    """
+    versao = (historico.attrs.get('bytes_lidos'), len(historico))
+    return tabelas.obter((nome, competicao) + parametros, versao, calcular)
+
+def resumo_torneios_compartilhado():
+    """Resumo dos torneios (Hall da Fama); None se não houver histórico"""
+    from app.historico_torneios import carregar_resumo_torneios
+    return cache.obter('resumo_torneios', versao_torneios(), carregar_resumo_torneios)
+
+def historico_torneios_compartilhado():
+    from app.historico_torneios import carregar_historico_torneios
+    return cache.obter('historico_torneios', versao_torneios(), carregar_historico_torneios)
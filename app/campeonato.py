@@ -0,0 +1,186 @@
+# Arquivo: app/campeonato.py
+"""
+Campeonato por pontos corridos (ex.: Brasileirão) simulado sem interface.
+"""
+import random
+import pandas as pd
+
+from app.competicoes import gerar_torneio_id, temporada_atual
+from app.escalacao import escalar
+from app.motor import simular_partida_escalacao, simular_partida_rapida
+
+def gerar_rodadas_pontos_corridos(times, ida_e_volta=True):
+    """
+    Gera a tabela de jogos de todos contra todos pelo método do círculo.
+
+    Um time fica fixo e os demais giram uma posição a cada rodada. Com número
+    ímpar de times, um participante "folga" é adicionado e seus jogos são
+    descartados. No returno os mandos de campo são invertidos.
+
+    Args:
+        times (list): Lista de clubes participantes.
+        ida_e_volta (bool): Se True, gera turno e returno (2·N·(N−1)/2 jogos).
+
+    Returns:
+        list: Lista de rodadas, cada uma com uma lista de tuplas (mandante, visitante).
+    """
+    participantes = list(times)
+    if len(participantes) % 2:
+        participantes.append(None)  # Folga
+
+    n = len(participantes)
+    fixo, rotativos = participantes[0], participantes[1:]
+    rodadas = []
+
+    for rodada in range(n - 1):
+        ordem = [fixo] + rotativos
+        jogos = []
+        for i in range(n // 2):
+            casa, fora = ordem[i], ordem[n - 1 - i]
+            # Alterna os mandos para equilibrar jogos em casa e fora
+            if (i == 0 and rodada % 2 == 1) or (i > 0 and i % 2 == 1):
+                casa, fora = fora, casa
+            if casa is not None and fora is not None:
+                jogos.append((casa, fora))
+        rodadas.append(jogos)
+        rotativos = rotativos[-1:] + rotativos[:-1]
+
+    if ida_e_volta:
+        rodadas += [[(fora, casa) for casa, fora in rodada] for rodada in rodadas]
+
+    return rodadas
+
+def criar_linha_tabela(time_nome):
+    """Cria a linha inicial de um time na tabela de classificação"""
+    return {
+        'time': time_nome,
+        'jogos': 0,
+        'vitorias': 0,
+        'empates': 0,
+        'derrotas': 0,
+        'gols_pro': 0,
+        'gols_contra': 0,
+        'saldo_gols': 0,
+        'pontos': 0
+    }
+
+def registrar_resultado_tabela(tabela, time_casa, time_visitante, gols_casa, gols_visitante):
+    """Atualiza incrementalmente a tabela (dict por nome) com um resultado"""
+    casa = tabela[time_casa]
+    fora = tabela[time_visitante]
+
+    casa['jogos'] += 1
+    fora['jogos'] += 1
+    casa['gols_pro'] += gols_casa
+    casa['gols_contra'] += gols_visitante
+    fora['gols_pro'] += gols_visitante
+    fora['gols_contra'] += gols_casa
+    casa['saldo_gols'] = casa['gols_pro'] - casa['gols_contra']
+    fora['saldo_gols'] = fora['gols_pro'] - fora['gols_contra']
+
+    if gols_casa > gols_visitante:
+        casa['vitorias'] += 1
+        fora['derrotas'] += 1
+        casa['pontos'] += 3
+    elif gols_visitante > gols_casa:
+        fora['vitorias'] += 1
+        casa['derrotas'] += 1
+        fora['pontos'] += 3
+    else:
+        casa['empates'] += 1
+        fora['empates'] += 1
+        casa['pontos'] += 1
+        fora['pontos'] += 1
+
+def ordenar_tabela(tabela):
+    """
+    Converte a tabela (dict por nome) em DataFrame ordenado, no mesmo formato
+    de gerar_tabela_classificacao().
+    """
+    df_tabela = pd.DataFrame(list(tabela.values()))
+    df_tabela = df_tabela.sort_values(
+        by=['pontos', 'saldo_gols', 'gols_pro', 'vitorias'],
+        ascending=[False, False, False, False]
+    )
+    df_tabela = df_tabela.reset_index(drop=True)
+    df_tabela.index = df_tabela.index + 1
+    df_tabela.index.name = "Pos"
+    return df_tabela
+
+class CampeonatoPontosCorridos:
+    def __init__(self, nome, times, ida_e_volta=True, seed=None, temporada=None, motor="forca"):
+        self.nome = nome
+        self.id = gerar_torneio_id(nome)  # torneio_id das partidas no histórico
+        self.temporada = temporada or temporada_atual()
+        self.times = times
+        self.ida_e_volta = ida_e_volta
+        self.rng = random.Random(seed)
+        self.rodadas = gerar_rodadas_pontos_corridos(times, ida_e_volta)
+        self.rodada_atual = 0
+        self.tabela = {time['nome']: criar_linha_tabela(time['nome']) for time in times}
+        self.partidas = []  # Tuplas (clube1, clube2, gols1, gols2, marcadores_gols)
+        # Motor "escalacao": os titulares de cada time são escolhidos uma vez para a temporada
+        self.escalacoes = {time['nome']: escalar(time) for time in times} if motor == "escalacao" else None
+        self.resultados_rodadas = []
+
+    @property
+    def total_rodadas(self):
+        return len(self.rodadas)
+
+    @property
+    def total_jogos(self):
+        return sum(len(rodada) for rodada in self.rodadas)
+
+    @property
+    def concluido(self):
+        return self.rodada_atual >= self.total_rodadas
+
+    def simular_rodada(self):
+        """Simula a próxima rodada e atualiza a tabela incrementalmente"""
+        if self.concluido:
+            return []
+
+        resultados = []
+        for casa, fora in self.rodadas[self.rodada_atual]:
+            if self.escalacoes is not None:
+                gols_casa, gols_fora, marcadores = simular_partida_escalacao(
+                    self.escalacoes[casa['nome']], self.escalacoes[fora['nome']], rng=self.rng)
+            else:
+                gols_casa, gols_fora, marcadores = simular_partida_rapida(casa, fora, self.rng)
+            registrar_resultado_tabela(self.tabela, casa['nome'], fora['nome'], gols_casa, gols_fora)
+            partida = (casa, fora, gols_casa, gols_fora, marcadores)
+            self.partidas.append(partida)
+            resultados.append(partida)
+
+        self.resultados_rodadas.append(resultados)
+        self.rodada_atual += 1
+        return resultados
+
+    def simular_ate_rodada(self, rodada):
+        """Simula até a rodada informada (contagem a partir de 1)"""
+        while self.rodada_atual < min(rodada, self.total_rodadas):
+            self.simular_rodada()
+
+    def simular_temporada(self):
+        """Simula todas as rodadas restantes"""
+        self.simular_ate_rodada(self.total_rodadas)
+        return self.gerar_tabela()
+
+    def jogos_restantes(self):
+        """Retorna os jogos ainda não disputados como tuplas (mandante, visitante)"""
+        return [jogo for rodada in self.rodadas[self.rodada_atual:] for jogo in rodada]
+
+    def gerar_tabela(self):
+        """Retorna a classificação atual como DataFrame"""
+        return ordenar_tabela(self.tabela)
+
+    @property
+    def campeao(self):
+        if not self.concluido:
+            return None
+        return self.gerar_tabela().iloc[0]['time']
+
+    def salvar(self):
+        """Persiste todas as partidas disputadas no histórico (competição 'liga') em um único lote"""
+        from utils.io import salvar_resultados_em_lote
+        return salvar_resultados_em_lote(self.partidas, 'liga', self.temporada, self.id)
@@ -95,45 +95,38 @@ def gerar_tabela_classificacao(historico):
     
     return df_tabela
 
-def gerar_tabela_artilharia(historico):
+def gerar_tabela_artilharia(historico, limite=None, agregados=None, time=None, inicio=None, fim=None):
     """
     Gera a tabela de artilharia do campeonato.
     
     Args:
         historico (DataFrame): DataFrame com o histórico de partidas.
+        limite (int, opcional): Quantos artilheiros incluir (padrão: todos).
+        agregados (AgregadosHistorico, opcional): Contadores já mantidos a cada
+            partida salva; sem eles, são calculados de historico.
+        time (str, opcional): Só os artilheiros deste time.
+        inicio, fim (date/str, opcional): Só os gols marcados entre as datas.
         
     Returns:
         DataFrame or None: DataFrame com a tabela de artilharia ou None se não houver dados.
     """
-    if historico is None or historico.empty or 'marcadores_gols' not in historico.columns:
-        return None
+    if agregados is None:
+        if historico is None or historico.empty or 'marcadores_gols' not in historico.columns:
+            return None
+        from app.agregados import AgregadosHistorico
+        agregados = AgregadosHistorico.de_historico(historico)
     
     try:
-        # Extrair todos os marcadores de gols
-        artilheiros_campeonato = {}
-        
-        for _, partida in historico.iterrows():
-            if isinstance(partida['marcadores_gols'], str) and partida['marcadores_gols']:
-                marcadores_lista = partida['marcadores_gols'].split(';')
-                for marcador_info in marcadores_lista:
-                    if marcador_info:
-                        partes = marcador_info.split(':')
-                        if len(partes) >= 3:
-                            jogador, _, time = partes
-                            chave_jogador = f"{jogador} ({time})"
-                            if chave_jogador in artilheiros_campeonato:
-                                artilheiros_campeonato[chave_jogador] += 1
-                            else:
-                                artilheiros_campeonato[chave_jogador] = 1
-        
-        if not artilheiros_campeonato:
+        # Só os maiores artilheiros são selecionados (heap), sem ordenar todos
+        artilheiros = agregados.artilharia(limite, nome=time, inicio=inicio, fim=fim)
+        if not artilheiros:
             return None
-            
-        # Ordenar artilheiros por número de gols (decrescente)
-        artilheiros_ordenados = sorted(artilheiros_campeonato.items(), key=lambda x: x[1], reverse=True)
         
         # Criar DataFrame para mostrar os artilheiros
-        artilheiros_df = pd.DataFrame(artilheiros_ordenados, columns=['Jogador', 'Gols'])
+        artilheiros_df = pd.DataFrame(
+            [(f"{jogador} ({time_jogador})", gols) for jogador, time_jogador, gols in artilheiros],
+            columns=['Jogador', 'Gols']
+        )
         
         # Adicionar ranking
         artilheiros_df.index = artilheiros_df.index + 1
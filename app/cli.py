@@ -0,0 +1,614 @@
+# Arquivo: app/cli.py
+"""
+Simulador em lote pela linha de comando, sem Streamlit.
+
+Uso (a partir da raiz do projeto):
+
+    python -m app.cli simulate --casa Flamengo --visitante Palmeiras -n 1000 --saida jogos.csv
+    python -m app.cli tournament --times 16 --repeticoes 500 --workers 4 --saida campeoes.csv
+    python -m app.cli season --times 20 --temporadas 100 --seed 7 --saida tabelas.csv
+    python -m app.cli season --temporadas 100 --motor escalacao
+    python -m app.cli odds --saida odds.csv
+    python -m app.cli startup --orcamento-ms 1200
+    python -m app.cli stress --processos 4 --escritores 8 --partidas 50
+
+Todos os comandos aceitam --seed (resultados reproduzíveis), --workers
+(processos em paralelo) e --saida (arquivo .csv ou .json; sem ele o resumo é
+impresso). --salvar-historico grava as partidas simuladas no histórico
+(data/historico_partidas.csv e a partição da competição: amistoso para
+simulate, copa para tournament, liga para season), em uma única escrita por
+execução; cada torneio ou temporada simulado recebe o seu torneio_id.
+
+simulate e season aceitam --motor escalacao: as forças vêm dos titulares de
+cada clube (app/escalacao.py), escolhidos uma vez por lote, e autores dos
+gols são sorteados entre eles.
+
+stress grava ao mesmo tempo, de vários processos e threads, em um histórico
+descartável (pasta temporária) e confere que nenhuma partida ou torneio se
+perdeu ou foi gravado pela metade (ver app/armazenamento.py).
+
+Nenhum módulo importado aqui depende do Streamlit, então o comando inicia
+rápido e pode rodar em máquinas sem interface (cron, servidores).
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from app.campeonato import CampeonatoPontosCorridos
+from app.mata_mata import TorneioMataMata, simular_chaveamento_vetorizado
+from app.escalacao import escalar
+from app.modelo import como_clube
+from app.motor import MOTORES, simular_partida_escalacao, simular_partida_rapida
+
+# Execuções de cada comando são divididas em lotes, um por tarefa do pool
+LOTES_POR_WORKER = 4
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Orçamento da primeira renderização: import app.main e main() com todas as abas
+# (st.tabs executa o corpo de cada aba), sem contar a importação do Streamlit
+ORCAMENTO_RENDERIZACAO_MS = 1200
+MODULOS_EXIBIDOS = 8  # Módulos mais caros importados por main() no relatório
+
+# Módulos que app.main só importa dentro de main(), quando a parte da página que os usa é montada
+MODULOS_ADIADOS = (
+    'pandas', 'PIL', 'utils.io', 'app.ratings', 'app.probabilidades', 'app.simulacao',
+    'app.estatisticas', 'app.classificacao', 'app.torneios',
+)
+
+def carregar_clubes_cli(usar_rating=False, verboso=False):
+    """Clubes com jogadores, sem logos; o relatório de carga só aparece com --verboso"""
+    from utils.io import carregar_clubes, carregar_jogadores
+
+    saida = contextlib.nullcontext() if verboso else contextlib.redirect_stdout(io.StringIO())
+    with saida:
+        clubes = carregar_clubes(carregar_logos=False)
+        carregar_jogadores(clubes=clubes)
+
+    if usar_rating:
+        from app.ratings import sincronizar_ratings, clubes_com_forca_rating
+        clubes = clubes_com_forca_rating(clubes, sincronizar_ratings())
+
+    return clubes
+
+def buscar_clube(clubes, nome):
+    """Clube pelo nome (sem diferenciar maiúsculas)"""
+    for clube in clubes.values():
+        if clube['nome'].lower() == nome.lower():
+            return clube
+    raise SystemExit(f"❌ Clube não encontrado: {nome}")
+
+def selecionar_times(clubes, quantidade, selecao, rng):
+    """Os mais fortes ou um sorteio, como na página de torneios"""
+    if quantidade > len(clubes):
+        raise SystemExit(f"❌ Há apenas {len(clubes)} clubes cadastrados (pedido: {quantidade})")
+    if selecao == "sorteio":
+        return rng.sample(list(clubes.values()), quantidade)
+    return sorted(clubes.values(), key=lambda x: x['forca_geral'], reverse=True)[:quantidade]
+
+def dividir_em_lotes(total, workers):
+    """Tamanhos de lote que somam total, o bastante para ocupar os workers"""
+    num_lotes = max(1, min(total, (workers or 1) * LOTES_POR_WORKER))
+    base, resto = divmod(total, num_lotes)
+    return [base + (i < resto) for i in range(num_lotes)]
+
+def executar_lotes(funcao, tarefas, workers):
+    """Executa funcao(*tarefa) para cada tarefa, em paralelo quando workers > 1"""
+    if workers and workers > 1 and len(tarefas) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(funcao, *zip(*tarefas)))
+    return [funcao(*tarefa) for tarefa in tarefas]
+
+def gravar_saida(df, caminho):
+    """Grava o DataFrame em CSV ou JSON conforme a extensão, ou imprime se não houver caminho"""
+    if not caminho:
+        print(df.to_string(index=False))
+        return
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    if caminho.lower().endswith(".json"):
+        df.to_json(caminho, orient="records", force_ascii=False, indent=2)
+    else:
+        df.to_csv(caminho, index=False, encoding="utf-8")
+    print(f"💾 {len(df)} linhas gravadas em {caminho}")
+
+def salvar_no_historico(partidas, clubes, competicao, torneio_ids=None):
+    """Grava partidas (nomes, gols e marcadores) no histórico com uma única escrita"""
+    from utils.io import salvar_resultados_em_lote
+
+    por_nome = {clube['nome']: clube for clube in clubes.values()}
+    lote = [(por_nome[casa], por_nome[fora], gols_casa, gols_fora, marcadores)
+            for casa, fora, gols_casa, gols_fora, marcadores in partidas]
+    if salvar_resultados_em_lote(lote, competicao, torneio_id=torneio_ids):
+        print(f"💾 {len(lote)} partidas gravadas no histórico ({competicao})")
+
+def linhas_partidas(partidas):
+    """Partidas no mesmo formato de colunas do histórico"""
+    return pd.DataFrame([{
+        'time_casa': casa,
+        'time_visitante': fora,
+        'gols_casa': gols_casa,
+        'gols_visitante': gols_fora,
+        'vencedor': casa if gols_casa > gols_fora else (fora if gols_fora > gols_casa else 'Empate'),
+        'marcadores_gols': ';'.join(f"{jogador}:{minuto}:{time_nome}" for jogador, minuto, time_nome in marcadores),
+    } for casa, fora, gols_casa, gols_fora, marcadores in partidas],
+        columns=['time_casa', 'time_visitante', 'gols_casa', 'gols_visitante', 'vencedor', 'marcadores_gols'])
+
+# Lotes executados nos workers (funções de módulo para poderem ir a outro processo)
+
+def lote_partidas(casa, fora, times, quantidade, seed, motor="forca"):
+    """Partidas avulsas; sem casa/fora definidos, cada jogo sorteia dois times"""
+    rng = random.Random(seed)
+    if motor == "escalacao":
+        # Titulares escolhidos uma vez por lote, não a cada jogo
+        escalacoes = {time['nome']: escalar(time) for time in times}
+        escalacoes.update({time['nome']: escalar(time) for time in (casa, fora) if time is not None})
+    partidas = []
+    for _ in range(quantidade):
+        clube1, clube2 = (casa, fora) if casa is not None else rng.sample(times, 2)
+        if motor == "escalacao":
+            gols1, gols2, marcadores = simular_partida_escalacao(
+                escalacoes[clube1['nome']], escalacoes[clube2['nome']], rng=rng)
+        else:
+            gols1, gols2, marcadores = simular_partida_rapida(clube1, clube2, rng)
+        partidas.append((clube1['nome'], clube2['nome'], gols1, gols2, marcadores))
+    return partidas
+
+def lote_torneios(times, formato, sortear, quantidade, seed):
+    """Torneios mata-mata completos: lista de (campeão, vice, partidas, torneio_id)"""
+    rng = random.Random(seed)
+    resultados = []
+    for _ in range(quantidade):
+        torneio = TorneioMataMata("CLI", times, formato, rng)
+        chaves = torneio.sortear_chaves(times) if sortear else torneio.montar_chaves(times)
+        try:
+            partidas = torneio.simular_chaveamento(chaves)
+        except ValueError as e:
+            # Nada é gravado: o histórico só recebe as partidas depois de todos os lotes
+            raise SystemExit(f"❌ {e}; nenhuma partida foi salva no histórico")
+        resultados.append((torneio.campeao['nome'], torneio.vice['nome'], [
+            (clube1['nome'], clube2['nome'], gols1, gols2, marcadores)
+            for clube1, clube2, gols1, gols2, marcadores in partidas
+        ], torneio.id))
+    return resultados
+
+def lote_temporadas(times, ida_e_volta, quantidade, seed, motor="forca"):
+    """Temporadas de pontos corridos completas: lista de (tabela, partidas, torneio_id)"""
+    rng = random.Random(seed)
+    resultados = []
+    for _ in range(quantidade):
+        campeonato = CampeonatoPontosCorridos("CLI", times, ida_e_volta, rng.getrandbits(32), motor=motor)
+        tabela = campeonato.simular_temporada()
+        resultados.append((tabela, [
+            (casa['nome'], fora['nome'], gols_casa, gols_fora, marcadores)
+            for casa, fora, gols_casa, gols_fora, marcadores in campeonato.partidas
+        ], campeonato.id))
+    return resultados
+
+# Comandos
+
+def comando_simulate(args, clubes, rng):
+    casa = como_clube(buscar_clube(clubes, args.casa)) if args.casa else None
+    fora = como_clube(buscar_clube(clubes, args.visitante)) if args.visitante else None
+    if (casa is None) != (fora is None):
+        raise SystemExit("❌ Informe --casa e --visitante juntos (ou nenhum, para confrontos sorteados)")
+    times = [como_clube(clube) for clube in clubes.values()]
+
+    tarefas = [(casa, fora, times, quantidade, rng.getrandbits(32), args.motor)
+               for quantidade in dividir_em_lotes(args.n, args.workers)]
+    partidas = [partida for lote in executar_lotes(lote_partidas, tarefas, args.workers) for partida in lote]
+
+    df = linhas_partidas(partidas)
+    if casa is not None:
+        resumo = df['vencedor'].value_counts(normalize=True).mul(100).round(1)
+        print(f"📊 {args.n} jogos: " + ", ".join(f"{nome} {pct}%" for nome, pct in resumo.items()))
+        print(f"⚽ Média de gols: {df['gols_casa'].mean():.2f} x {df['gols_visitante'].mean():.2f}")
+    return df, partidas, None
+
+def comando_tournament(args, clubes, rng):
+    times = [como_clube(clube) for clube in selecionar_times(clubes, args.times, args.selecao, rng)]
+    valido, erro = TorneioMataMata("CLI", times, args.formato).validar_numero_times()
+    if not valido:
+        raise SystemExit(f"❌ {erro}")
+
+    if not args.salvar_historico:
+        # Só as contagens interessam: todas as repetições de cada fase em um único lote NumPy
+        chances = simular_chaveamento_vetorizado(times, args.formato, args.repeticoes, not args.sem_sorteio,
+                                                 rng.getrandbits(32))
+        titulos = Counter({nome: round(prob_titulo * args.repeticoes) for nome, _, prob_titulo in chances})
+        finais = Counter({nome: round(prob_final * args.repeticoes) for nome, prob_final, _ in chances})
+        resultados = []
+    else:
+        tarefas = [(times, args.formato, not args.sem_sorteio, quantidade, rng.getrandbits(32))
+                   for quantidade in dividir_em_lotes(args.repeticoes, args.workers)]
+        resultados = [r for lote in executar_lotes(lote_torneios, tarefas, args.workers) for r in lote]
+        titulos = Counter(campeao for campeao, _, _, _ in resultados)
+        finais = Counter(time_nome for campeao, vice, _, _ in resultados for time_nome in (campeao, vice))
+
+    df = pd.DataFrame([{
+        'time': time_clube['nome'],
+        'titulos': titulos[time_clube['nome']],
+        'finais': finais[time_clube['nome']],
+        'prob_titulo': round(100 * titulos[time_clube['nome']] / args.repeticoes, 2),
+        'prob_final': round(100 * finais[time_clube['nome']] / args.repeticoes, 2),
+    } for time_clube in times]).sort_values(['titulos', 'finais'], ascending=False)
+
+    partidas = [partida for _, _, lista, _ in resultados for partida in lista]
+    torneio_ids = [torneio_id for _, _, lista, torneio_id in resultados for _ in lista]
+    return df, partidas, torneio_ids
+
+def comando_season(args, clubes, rng):
+    times = [como_clube(clube) for clube in selecionar_times(clubes, args.times, args.selecao, rng)]
+
+    tarefas = [(times, not args.turno_unico, quantidade, rng.getrandbits(32), args.motor)
+               for quantidade in dividir_em_lotes(args.temporadas, args.workers)]
+    resultados = [r for lote in executar_lotes(lote_temporadas, tarefas, args.workers) for r in lote]
+
+    tabelas = []
+    for temporada, (tabela, _, _) in enumerate(resultados, start=1):
+        tabela = tabela.reset_index(drop=True)
+        tabela.insert(0, 'posicao', range(1, len(tabela) + 1))
+        tabela.insert(0, 'temporada', temporada)
+        tabelas.append(tabela)
+    df = pd.concat(tabelas, ignore_index=True)
+
+    if args.temporadas > 1:
+        campeoes = df[df['posicao'] == 1]['time'].value_counts()
+        print("🏆 Títulos: " + ", ".join(f"{nome} {quantidade}" for nome, quantidade in campeoes.items()))
+
+    partidas = [partida for _, lista, _ in resultados for partida in lista]
+    torneio_ids = [torneio_id for _, lista, torneio_id in resultados for _ in lista]
+    return df, partidas, torneio_ids
+
+def comando_odds(args, clubes, rng):
+    from app.matriz_confrontos import carregar_matriz_confrontos
+    from app.probabilidades import placares_mais_provaveis, resumir_distribuicao
+
+    if args.casa and args.visitante:
+        pares = [(buscar_clube(clubes, args.casa), buscar_clube(clubes, args.visitante))]
+    else:
+        todos = list(clubes.values())
+        pares = [(casa, fora) for casa in todos for fora in todos if casa is not fora]
+
+    matriz = carregar_matriz_confrontos(clubes)
+    linhas = []
+    for casa, fora in pares:
+        resumo = resumir_distribuicao(matriz.distribuicao(casa, fora))
+        (gols_casa, gols_fora), prob_placar = placares_mais_provaveis(casa['forca_geral'], fora['forca_geral'], 1)[0]
+        linhas.append({
+            'time_casa': casa['nome'],
+            'time_visitante': fora['nome'],
+            'vitoria_casa': round(100 * resumo['vitoria_casa'], 2),
+            'empate': round(100 * resumo['empate'], 2),
+            'vitoria_visitante': round(100 * resumo['vitoria_visitante'], 2),
+            'gols_casa': round(resumo['gols_casa'], 3),
+            'gols_visitante': round(resumo['gols_visitante'], 3),
+            'placar_mais_provavel': f"{gols_casa}x{gols_fora}",
+            'prob_placar': round(100 * prob_placar, 2),
+        })
+    return pd.DataFrame(linhas), [], None
+
+def medir_importacao(*argumentos):
+    """
+    Executa o Python com -X importtime em um interpretador novo (argumentos:
+    ["-c", código] ou ["-m", módulo]).
+
+    Returns:
+        tuple: (stdout do processo, dict módulo -> (tempo acumulado em ms,
+        se foi importado por outro módulo)).
+    """
+    processo = subprocess.run([sys.executable, "-X", "importtime", *argumentos],
+                              cwd=RAIZ_PROJETO, capture_output=True, text=True)
+    if processo.returncode != 0:
+        raise SystemExit(f"❌ Falha ao importar:\n{processo.stderr.strip().splitlines()[-1]}")
+
+    tempos = {}
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:"):
+            continue
+        _, acumulado, nome = linha[len("import time:"):].split("|")
+        if not acumulado.strip().isdigit():  # Cabeçalho
+            continue
+        tempos[nome.strip()] = (int(acumulado) / 1000, nome.startswith("  "))
+    return processo.stdout, tempos
+
+def medir_renderizacao():
+    """
+    Primeira renderização da página em um interpretador novo (ver
+    app/medicao_inicio.py).
+
+    Returns:
+        tuple: (tempos de import app.main e até o fim de main(), em ms; tempos
+        de importação como em medir_importacao()).
+    """
+    saida, tempos = medir_importacao("-m", "app.medicao_inicio")
+    return json.loads(saida.strip().splitlines()[-1]), tempos
+
+def comando_startup(args):
+    """
+    Verifica o tempo até a primeira renderização (import app.main e main()
+    com todas as abas) e que os módulos pesados continuam fora de import app.main.
+    """
+    importacoes = [medir_importacao("-c", "import app.main")[1] for _ in range(args.repeticoes)]
+    total_importacao = min(tempos['app.main'][0] for tempos in importacoes)
+    adiantados = [modulo for modulo in MODULOS_ADIADOS if modulo in importacoes[0]]
+
+    renderizacoes = [medir_renderizacao() for _ in range(args.repeticoes)]
+    medicao, tempos = min(renderizacoes, key=lambda r: r[0]['renderizacao_ms'])
+    total = medicao['renderizacao_ms']
+    print(f"⏱️ primeira renderização: {total:.0f} ms (orçamento: {args.orcamento_ms:.0f} ms, "
+          f"melhor de {args.repeticoes})")
+    print(f"   import app.main (com o Streamlit): {total_importacao:.0f} ms")
+
+    # Módulos que main() importa, do mais caro para o mais barato (-X importtime; a partir de 1 ms)
+    carregados = sorted(((tempo, modulo) for modulo, (tempo, aninhado) in tempos.items()
+                         if not aninhado and tempo >= 1 and modulo not in importacoes[0]), reverse=True)
+    for tempo, modulo in carregados[:MODULOS_EXIBIDOS]:
+        print(f"   main()  {modulo:<24} {tempo:7.1f} ms")
+
+    ok = True
+    if adiantados:
+        print("❌ Importados junto com app.main (deveriam ser adiados): " + ", ".join(adiantados))
+        ok = False
+    if total > args.orcamento_ms:
+        print(f"❌ Primeira renderização acima do orçamento em {total - args.orcamento_ms:.0f} ms")
+        ok = False
+    if ok:
+        print("✅ Dentro do orçamento")
+    return 0 if ok else 1
+
+def escritor_estresse(processo, escritor, partidas, torneios, seed):
+    """Uma thread de escrita: salva partidas (uma por chamada) e registra torneios"""
+    from app.competicoes import COMPETICOES, gerar_torneio_id
+    from app.historico_torneios import registrar_torneio
+    from utils.io import salvar_resultados_em_lote
+
+    rng = random.Random(f"{seed}-{processo}-{escritor}")
+    casa = f"P{processo}T{escritor}"
+    falhas = 0
+    # Cada partida tem um par de clubes único, para conferir que aparece uma única vez
+    for i in range(partidas):
+        fora = f"N{processo}-{escritor}-{i}"
+        gols_casa, gols_fora = rng.randint(0, 4), rng.randint(0, 4)
+        marcadores = ([(f"Jogador {escritor}", 10 + g, casa) for g in range(gols_casa)]
+                      + [(f"Jogador {i}", 50 + g, fora) for g in range(gols_fora)])
+        partida = ({'nome': casa}, {'nome': fora}, gols_casa, gols_fora, marcadores)
+        if not salvar_resultados_em_lote([partida], rng.choice(list(COMPETICOES)), torneio_id=f"estresse-{processo}"):
+            falhas += 1
+    for i in range(torneios):
+        registrar_torneio({
+            'id': gerar_torneio_id(f"estresse {processo} {escritor} {i}"),
+            'nome': f"Estresse {processo}-{escritor}-{i}",
+            'data': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'formato': "jogo_unico",
+            'campeao': casa,
+            'vice': f"N{processo}-{escritor}-0",
+            'num_times': 2,
+            'times_participantes': [casa, f"N{processo}-{escritor}-0"],
+        })
+    return falhas
+
+def processo_estresse(diretorio, processo, escritores, partidas, torneios, seed):
+    """Um processo de escrita com várias threads. Retorna (falhas, lotes e itens gravados)."""
+    from app.historico_torneios import grupo_torneios
+    from utils.io import grupo_historico
+
+    os.chdir(diretorio)
+    resultados = [0] * escritores
+
+    def executar(escritor):
+        resultados[escritor] = escritor_estresse(processo, escritor, partidas, torneios, seed)
+
+    threads = [threading.Thread(target=executar, args=(escritor,)) for escritor in range(escritores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return (sum(resultados), grupo_historico.lotes, grupo_historico.itens,
+            grupo_torneios.lotes, grupo_torneios.itens)
+
+def conferir_estresse(esperadas, torneios_esperados):
+    """Confere os arquivos gravados no teste de estresse. Retorna a lista de problemas."""
+    import csv
+
+    from app.competicoes import COMPETICOES, arquivo_historico_competicao
+    from app.historico_torneios import carregar_historico_torneios, carregar_resumo_torneios
+    from utils.io import COLUNAS_HISTORICO, HISTORICO_ARQUIVO
+
+    problemas = []
+    with open(HISTORICO_ARQUIVO, 'r', encoding='utf-8', newline='') as f:
+        linhas = list(csv.reader(f))
+    if linhas[0] != COLUNAS_HISTORICO:
+        problemas.append(f"cabeçalho inesperado: {linhas[0]}")
+    partidas = linhas[1:]
+    if len(partidas) != esperadas:
+        problemas.append(f"histórico com {len(partidas)} partidas, esperadas {esperadas}")
+    incompletas = sum(len(linha) != len(COLUNAS_HISTORICO) for linha in partidas)
+    if incompletas:
+        problemas.append(f"{incompletas} linhas com número de colunas errado")
+    repetidas = len(partidas) - len({(linha[1], linha[2]) for linha in partidas})
+    if repetidas:
+        problemas.append(f"{repetidas} partidas repetidas")
+
+    na_particao = 0
+    for competicao in COMPETICOES:
+        arquivo = arquivo_historico_competicao(competicao)
+        if not os.path.isfile(arquivo):
+            continue
+        with open(arquivo, 'r', encoding='utf-8', newline='') as f:
+            linhas_competicao = list(csv.reader(f))[1:]
+        na_particao += len(linhas_competicao)
+        if any(linha[7] != competicao for linha in linhas_competicao):
+            problemas.append(f"partição {competicao} com partidas de outra competição")
+    if na_particao != len(partidas):
+        problemas.append(f"partições somam {na_particao} partidas, histórico tem {len(partidas)}")
+
+    # Ratings e visões incrementais precisam ter lido exatamente o arquivo final
+    tamanho = os.path.getsize(HISTORICO_ARQUIVO)
+    for nome, estado in (("ratings", os.path.join("data", "ratings", "ratings.json")),
+                         ("agregados", os.path.join("data", "agregados", "agregados.json"))):
+        with open(estado, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        if dados['partidas_processadas'] != len(partidas) or dados['bytes_processados'] != tamanho:
+            problemas.append(f"{nome}: {dados['partidas_processadas']} partidas e {dados['bytes_processados']} "
+                             f"bytes processados, histórico tem {len(partidas)} e {tamanho}")
+
+    historico_torneios = carregar_historico_torneios()
+    if len(historico_torneios) != torneios_esperados:
+        problemas.append(f"{len(historico_torneios)} torneios no histórico, esperados {torneios_esperados}")
+    if len({torneio['id'] for torneio in historico_torneios}) != len(historico_torneios):
+        problemas.append("torneios com id repetido")
+    if torneios_esperados and carregar_resumo_torneios()['total_torneios'] != len(historico_torneios):
+        problemas.append("resumo dos torneios fora de sincronia com o histórico")
+    return problemas
+
+def comando_stress(args):
+    """Várias sessões gravando ao mesmo tempo em um histórico descartável"""
+    diretorio = tempfile.mkdtemp(prefix="manager_estresse_")
+    diretorio_original = os.getcwd()
+    seed = args.seed if args.seed is not None else random.randrange(1 << 30)
+    esperadas = args.processos * args.escritores * args.partidas
+    torneios_esperados = args.processos * args.escritores * args.torneios
+    print(f"🔨 {args.processos} processos x {args.escritores} threads: {esperadas} partidas "
+          f"e {torneios_esperados} torneios em {diretorio}")
+
+    inicio = time.perf_counter()
+    try:
+        os.chdir(diretorio)
+        tarefas = [(diretorio, processo, args.escritores, args.partidas, args.torneios, seed)
+                   for processo in range(args.processos)]
+        resultados = executar_lotes(processo_estresse, tarefas, args.processos)
+        duracao = time.perf_counter() - inicio
+
+        falhas = sum(r[0] for r in resultados)
+        lotes, itens = sum(r[1] for r in resultados), sum(r[2] for r in resultados)
+        lotes_torneios, itens_torneios = sum(r[3] for r in resultados), sum(r[4] for r in resultados)
+        print(f"⏱️ {esperadas / duracao:.0f} partidas/s em {duracao:.1f}s")
+        print(f"   histórico: {itens} gravações em {lotes} lotes ({itens / max(lotes, 1):.1f} por lote)")
+        if torneios_esperados:
+            print(f"   torneios:  {itens_torneios} gravações em {lotes_torneios} lotes "
+                  f"({itens_torneios / max(lotes_torneios, 1):.1f} por lote)")
+
+        problemas = conferir_estresse(esperadas, torneios_esperados)
+        if falhas:
+            problemas.insert(0, f"{falhas} gravações falharam")
+    finally:
+        os.chdir(diretorio_original)
+        if not args.manter:
+            shutil.rmtree(diretorio, ignore_errors=True)
+
+    for problema in problemas:
+        print(f"❌ {problema}")
+    if not problemas:
+        print("✅ Nenhuma partida ou torneio perdido, repetido ou gravado pela metade")
+    return 0 if not problemas else 1
+
+COMANDOS = {
+    'simulate': comando_simulate,
+    'tournament': comando_tournament,
+    'season': comando_season,
+    'odds': comando_odds,
+}
+
+# Competição em que cada comando grava as partidas (ver app/competicoes.py)
+COMPETICAO_COMANDO = {
+    'simulate': 'amistoso',
+    'tournament': 'copa',
+    'season': 'liga',
+}
+
+def criar_parser():
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Simulações em lote sem interface")
+    comum = argparse.ArgumentParser(add_help=False)
+    comum.add_argument("--seed", type=int, help="Semente para resultados reproduzíveis")
+    comum.add_argument("--workers", type=int, default=1, help="Processos em paralelo (padrão: 1)")
+    comum.add_argument("--saida", help="Arquivo de resultados (.csv ou .json); sem ele, imprime o resumo")
+    comum.add_argument("--salvar-historico", action="store_true",
+                       help="Grava as partidas simuladas no histórico e na partição da competição")
+    comum.add_argument("--usar-rating", action="store_true", help="Usa o rating Elo como força dos clubes")
+    comum.add_argument("--verboso", action="store_true", help="Mostra o relatório de carga dos dados")
+
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    simulate = subparsers.add_parser("simulate", parents=[comum], help="Partidas avulsas")
+    simulate.add_argument("--casa", help="Mandante (sem --casa/--visitante, os confrontos são sorteados)")
+    simulate.add_argument("--visitante", help="Visitante")
+    simulate.add_argument("-n", type=int, default=1, help="Número de partidas (padrão: 1)")
+    simulate.add_argument("--motor", choices=MOTORES, default="forca",
+                          help="forca: força geral do clube; escalacao: habilidade dos titulares")
+
+    tournament = subparsers.add_parser("tournament", parents=[comum], help="Torneios mata-mata completos")
+    tournament.add_argument("--times", type=int, default=16, help="Participantes (potência de 2)")
+    tournament.add_argument("--formato", choices=["ida_volta", "jogo_unico"], default="ida_volta")
+    tournament.add_argument("--selecao", choices=["melhores", "sorteio"], default="melhores")
+    tournament.add_argument("--repeticoes", type=int, default=1, help="Número de torneios simulados")
+    tournament.add_argument("--sem-sorteio", action="store_true",
+                            help="Mantém o chaveamento pela ordem de força em vez de sortear as chaves")
+
+    season = subparsers.add_parser("season", parents=[comum], help="Temporadas de pontos corridos")
+    season.add_argument("--times", type=int, default=20, help="Participantes")
+    season.add_argument("--selecao", choices=["melhores", "sorteio"], default="melhores")
+    season.add_argument("--temporadas", type=int, default=1, help="Número de temporadas simuladas")
+    season.add_argument("--turno-unico", action="store_true", help="Apenas turno (sem returno)")
+    season.add_argument("--motor", choices=MOTORES, default="forca",
+                        help="forca: força geral do clube; escalacao: habilidade dos titulares")
+
+    odds = subparsers.add_parser("odds", parents=[comum], help="Probabilidades exatas dos confrontos")
+    odds.add_argument("--casa", help="Mandante (sem --casa/--visitante, calcula todos os confrontos)")
+    odds.add_argument("--visitante", help="Visitante")
+
+    startup = subparsers.add_parser("startup", help="Verifica o tempo até a primeira renderização da interface")
+    startup.add_argument("--orcamento-ms", type=float, default=ORCAMENTO_RENDERIZACAO_MS,
+                         help=f"Tempo máximo da primeira renderização (padrão: {ORCAMENTO_RENDERIZACAO_MS} ms)")
+    startup.add_argument("--repeticoes", type=int, default=3, help="Medições (vale a melhor)")
+
+    stress = subparsers.add_parser("stress", help="Gravações simultâneas em um histórico descartável")
+    stress.add_argument("--processos", type=int, default=4, help="Processos escrevendo (padrão: 4)")
+    stress.add_argument("--escritores", type=int, default=8, help="Threads por processo (padrão: 8)")
+    stress.add_argument("--partidas", type=int, default=10, help="Partidas salvas por thread (padrão: 10)")
+    stress.add_argument("--torneios", type=int, default=2, help="Torneios registrados por thread (padrão: 2)")
+    stress.add_argument("--seed", type=int, help="Semente dos placares")
+    stress.add_argument("--manter", action="store_true", help="Não apaga a pasta temporária no fim")
+
+    return parser
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    if args.comando == "startup":
+        return comando_startup(args)
+    if args.comando == "stress":
+        return comando_stress(args)
+
+    inicio = time.perf_counter()
+    rng = random.Random(args.seed)
+
+    clubes = carregar_clubes_cli(args.usar_rating, args.verboso)
+    if not clubes:
+        print("❌ Nenhum clube carregado. Verifique os arquivos em data/.", file=sys.stderr)
+        return 1
+
+    df, partidas, torneio_ids = COMANDOS[args.comando](args, clubes, rng)
+    gravar_saida(df, args.saida)
+
+    if args.salvar_historico and partidas:
+        salvar_no_historico(partidas, clubes, COMPETICAO_COMANDO[args.comando], torneio_ids)
+
+    print(f"⏱️ Concluído em {time.perf_counter() - inicio:.1f}s", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+# Arquivo: app/competicoes.py
+"""
+Competição, temporada e torneio de cada partida do histórico.
+
+Toda partida salva leva as colunas competicao (amistoso, liga ou copa),
+temporada e torneio_id, e é gravada também na partição da sua competição
+(data/historico/<competicao>.csv). Tabelas, artilharia e estatísticas de uma
+competição leem só a sua partição. O histórico completo
+(data/historico_partidas.csv) continua recebendo todas as partidas, porque os
+ratings e as visões gerais precisam de uma sequência única.
+
+Partidas gravadas antes dessas colunas ficam com a competição vazia: só
+aparecem no histórico completo.
+"""
+import datetime
+import os
+import re
+import unicodedata
+
+COMPETICOES = {
+    'amistoso': "🤝 Amistosos",
+    'liga': "📅 Pontos corridos",
+    'copa': "🏆 Copas (mata-mata)",
+}
+COMPETICAO_PADRAO = 'amistoso'
+
+# Colunas acrescentadas ao histórico, depois das originais
+COLUNAS_COMPETICAO = ['competicao', 'temporada', 'torneio_id']
+
+HISTORICO_COMPETICOES_DIR = os.path.join("data", "historico")
+
+def arquivo_historico_competicao(competicao, diretorio=HISTORICO_COMPETICOES_DIR):
+    """Caminho da partição do histórico de uma competição"""
+    if competicao not in COMPETICOES:
+        raise ValueError(f"Competição desconhecida: {competicao!r} (use {', '.join(COMPETICOES)})")
+    return os.path.join(diretorio, f"{competicao}.csv")
+
+def competicoes_disponiveis(diretorio=HISTORICO_COMPETICOES_DIR):
+    """Competições que já têm partidas gravadas, na ordem de COMPETICOES"""
+    return [competicao for competicao in COMPETICOES
+            if os.path.isfile(arquivo_historico_competicao(competicao, diretorio))]
+
+def temporada_atual():
+    return str(datetime.date.today().year)
+
+def gerar_torneio_id(nome):
+    """
+    Identificador único de um torneio ou temporada, legível no CSV
+    (ex.: "brasileirao-2024-20250526130003-9f2c"). Não usa o módulo random,
+    para não alterar a sequência de simulações com semente.
+    """
+    texto = unicodedata.normalize('NFKD', str(nome)).encode('ascii', 'ignore').decode('ascii')
+    slug = re.sub(r'[^a-z0-9]+', '-', texto.lower()).strip('-') or "torneio"
+    return f"{slug}-{datetime.datetime.now():%Y%m%d%H%M%S}-{os.urandom(2).hex()}"
@@ -0,0 +1,178 @@
+# Arquivo: app/copa.py
+"""
+Competição com fase de grupos e mata-mata (estilo Champions League / Copa do Mundo).
+
+Os grupos são campeonatos de pontos corridos independentes e podem ser
+simulados em paralelo. Os classificados formam um chaveamento semeado pela
+classificação dos grupos, disputado com as regras de TorneioMataMata.
+"""
+import random
+import string
+from concurrent.futures import ProcessPoolExecutor
+
+from app.campeonato import CampeonatoPontosCorridos
+from app.competicoes import gerar_torneio_id
+from app.mata_mata import TorneioMataMata
+from app.modelo import como_clube
+
+def sortear_grupos_por_potes(times, num_grupos, rng=None):
+    """
+    Sorteia os grupos usando potes por força.
+
+    Os times são ordenados por forca_geral e divididos em potes de
+    num_grupos times; cada grupo recebe exatamente um time de cada pote.
+
+    Returns:
+        dict: Letra do grupo -> lista de clubes.
+    """
+    if rng is None:
+        rng = random
+
+    ordenados = sorted(times, key=lambda x: x['forca_geral'], reverse=True)
+    letras = string.ascii_uppercase[:num_grupos]
+    grupos = {letra: [] for letra in letras}
+
+    for inicio in range(0, len(ordenados), num_grupos):
+        pote = ordenados[inicio:inicio + num_grupos]
+        rng.shuffle(pote)
+        for letra, time in zip(letras, pote):
+            grupos[letra].append(time)
+
+    return grupos
+
+def simular_grupo(nome_grupo, times, ida_e_volta=True, seed=None):
+    """
+    Simula um grupo completo. Função de módulo para poder rodar em outro processo.
+
+    Returns:
+        tuple: (nome_grupo, tabela, partidas), com a tabela no formato de
+        gerar_tabela_classificacao() e as partidas como tuplas
+        (nome_casa, nome_visitante, gols_casa, gols_visitante, marcadores_gols).
+    """
+    campeonato = CampeonatoPontosCorridos(f"Grupo {nome_grupo}", times, ida_e_volta, seed)
+    tabela = campeonato.simular_temporada()
+    partidas = [(casa['nome'], fora['nome'], gols_casa, gols_fora, marcadores)
+                for casa, fora, gols_casa, gols_fora, marcadores in campeonato.partidas]
+    return nome_grupo, tabela, partidas
+
+class CompeticaoGruposMataMata:
+    def __init__(self, nome, times, num_grupos=8, formato="ida_volta",
+                 grupos_ida_e_volta=True, classificados_por_grupo=2, seed=None):
+        self.nome = nome
+        self.id = gerar_torneio_id(nome)  # torneio_id das partidas no histórico
+        self.times = times
+        self.num_grupos = num_grupos
+        self.formato = formato  # Formato do mata-mata: "ida_volta" ou "jogo_unico"
+        self.grupos_ida_e_volta = grupos_ida_e_volta
+        self.classificados_por_grupo = classificados_por_grupo
+        self.rng = random.Random(seed)
+        self.grupos = {}
+        self.tabelas = {}
+        self.classificados = []
+        self.mata_mata = None
+        self.partidas = []  # Tuplas (clube1, clube2, gols1, gols2, marcadores_gols)
+        self.campeao = None
+        self.vice = None
+
+    def validar(self):
+        """Valida a divisão em grupos e o tamanho do mata-mata"""
+        if self.num_grupos < 1 or len(self.times) % self.num_grupos != 0:
+            return False, f"{len(self.times)} times não podem ser divididos em {self.num_grupos} grupos iguais"
+
+        if self.classificados_por_grupo not in (1, 2):
+            return False, "Classificam-se 1 ou 2 times por grupo"
+
+        if len(self.times) // self.num_grupos <= self.classificados_por_grupo:
+            return False, "Cada grupo precisa ter mais times do que classificados"
+
+        num_classificados = self.num_grupos * self.classificados_por_grupo
+        if num_classificados < 2 or num_classificados & (num_classificados - 1):
+            return False, f"O mata-mata precisa de uma potência de 2 times (recebeu {num_classificados})"
+
+        return True, "OK"
+
+    def sortear_grupos(self):
+        self.grupos = sortear_grupos_por_potes(self.times, self.num_grupos, self.rng)
+        return self.grupos
+
+    def simular_fase_de_grupos(self, workers=None):
+        """
+        Simula todos os grupos, em paralelo quando workers > 1.
+
+        Cada grupo recebe uma semente própria sorteada do gerador da competição,
+        então o resultado não depende da ordem de execução dos processos.
+        """
+        if not self.grupos:
+            self.sortear_grupos()
+
+        clubes_por_nome = {time['nome']: time for time in self.times}
+        tarefas = [
+            (letra, [como_clube(time) for time in times], self.grupos_ida_e_volta, self.rng.getrandbits(32))
+            for letra, times in self.grupos.items()
+        ]
+
+        if workers and workers > 1 and len(tarefas) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tarefas))) as executor:
+                resultados = list(executor.map(simular_grupo, *zip(*tarefas)))
+        else:
+            resultados = [simular_grupo(*tarefa) for tarefa in tarefas]
+
+        for letra, tabela, partidas in resultados:
+            self.tabelas[letra] = tabela
+            for casa, fora, gols_casa, gols_fora, marcadores in partidas:
+                self.partidas.append((clubes_por_nome[casa], clubes_por_nome[fora], gols_casa, gols_fora, marcadores))
+
+        return self.tabelas
+
+    def semear_mata_mata(self):
+        """
+        Monta o chaveamento a partir da classificação dos grupos.
+
+        O 1º de um grupo enfrenta o 2º do grupo vizinho (A1 x B2, B1 x A2, ...),
+        e os líderes dos grupos vizinhos ficam em lados opostos da chave.
+        No formato ida e volta o líder decide em casa (joga como time2).
+        """
+        clubes_por_nome = {time['nome']: time for time in self.times}
+        letras = list(self.tabelas)
+        colocados = {
+            letra: [clubes_por_nome[nome] for nome in self.tabelas[letra]['time'].iloc[:self.classificados_por_grupo]]
+            for letra in letras
+        }
+
+        if self.classificados_por_grupo == 1 or len(letras) == 1:
+            # Só líderes (ou um único grupo): chaveamento na ordem dos grupos
+            ordem = [time for letra in letras for time in colocados[letra]]
+            if len(letras) == 1:
+                ordem.reverse()
+        else:
+            ordem = []
+            for i in range(0, len(letras), 2):
+                grupo_a = colocados[letras[i]]
+                grupo_b = colocados[letras[i + 1]]
+                ordem.extend([grupo_b[1], grupo_a[0], grupo_a[1], grupo_b[0]])
+
+        # Intercala as metades para separar os líderes de grupos vizinhos
+        pares = [ordem[i:i + 2] for i in range(0, len(ordem), 2)]
+        if len(pares) > 2:
+            pares = pares[0::2] + pares[1::2]
+        self.classificados = [time for par in pares for time in par]
+
+        self.mata_mata = TorneioMataMata(self.nome, self.classificados, self.formato, self.rng)
+        self.mata_mata.id = self.id
+        return self.mata_mata.montar_chaves(self.classificados)
+
+    def simular_mata_mata(self):
+        chaves = self.semear_mata_mata()
+        self.partidas.extend(self.mata_mata.simular_chaveamento(chaves))
+        self.campeao = self.mata_mata.campeao
+        self.vice = self.mata_mata.vice
+        return self.campeao
+
+    def simular(self, workers=None):
+        """Simula a competição completa e retorna o campeão"""
+        valido, erro = self.validar()
+        if not valido:
+            raise ValueError(erro)
+
+        self.simular_fase_de_grupos(workers)
+        return self.simular_mata_mata()
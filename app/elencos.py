@@ -0,0 +1,204 @@
+# Arquivo: app/elencos.py
+"""
+Elencos de todos os clubes em colunas NumPy.
+
+Em vez de um objeto por jogador, ElencosColunares guarda arrays paralelos
+(clube, código da posição, habilidade, id e índice do nome) ordenados por
+clube, e o intervalo [inicio[k], inicio[k + 1]) das linhas de cada clube.
+Os nomes distintos ficam em um único bloco de bytes UTF-8. São 22 bytes por
+jogador mais o nome (100 mil jogadores de várias ligas ocupam cerca de 5 MB,
+contra mais de 20 MB em objetos; ver utils.io.carregar_elencos()).
+
+Agregados por clube (média de habilidade, jogadores por posição) saem de
+uma operação vetorizada sobre todos os clubes de uma vez, e motores em lote
+podem trabalhar direto com as linhas (faixa(), linhas_de_campo()).
+jogadores() monta os objetos Jogador de um clube para o código que usa
+app/modelo.py.
+"""
+import numpy as np
+import pandas as pd
+
+from app.modelo import Jogador, eh_goleiro
+
+COLUNAS_ELENCO = ['id', 'nome', 'clube_id', 'posicao', 'habilidade']
+SEM_ID = -1  # Jogador cadastrado sem id
+
+def empacotar_nomes(nomes):
+    """Bloco UTF-8 com os nomes em sequência e o deslocamento de cada um (mais o fim)"""
+    codificados = [nome.encode('utf-8') for nome in nomes]
+    inicio = np.zeros(len(codificados) + 1, dtype=np.int64)
+    np.cumsum([len(nome) for nome in codificados], out=inicio[1:])
+    return b''.join(codificados), inicio
+
+class ElencosColunares:
+    """Jogadores de todos os clubes em arrays paralelos ordenados por clube"""
+
+    def __init__(self, clube_id, posicao, habilidade, jogador_id, nome_indice, nomes_bytes, nomes_inicio, posicoes):
+        # A ordenação estável mantém a ordem do cadastro dentro de cada clube
+        ordem = np.argsort(clube_id, kind='stable')
+        self.clube_id = np.asarray(clube_id, dtype=np.int32)[ordem]
+        self.posicao = np.asarray(posicao, dtype=np.int8)[ordem]
+        self.habilidade = np.asarray(habilidade, dtype=np.float64)[ordem]
+        self.jogador_id = np.asarray(jogador_id, dtype=np.int32)[ordem]
+        self.nome_indice = np.asarray(nome_indice, dtype=np.int32)[ordem]
+        self.nomes_bytes = nomes_bytes
+        self.nomes_inicio = nomes_inicio
+        self.posicoes = tuple(posicoes)  # Código da posição -> texto ('ATA', 'MEI', ...)
+        self.descartados = 0
+
+        self.clubes, inicio = np.unique(self.clube_id, return_index=True)
+        self.inicio = np.append(inicio, len(self.clube_id)).astype(np.int64)
+        self._indice_clube = {int(cid): k for k, cid in enumerate(self.clubes)}
+        codigos_goleiro = [codigo for codigo, posicao in enumerate(self.posicoes) if eh_goleiro(posicao)]
+        self.goleiro = np.isin(self.posicao, codigos_goleiro)
+
+    @classmethod
+    def de_colunas(cls, clube_id, posicao, habilidade, jogador_id, nome):
+        """A partir de colunas já limpas; posição e nome como arrays de texto"""
+        posicoes, codigos_posicao = np.unique(np.asarray(posicao, dtype=object), return_inverse=True)
+        nomes, nome_indice = np.unique(np.asarray(nome, dtype=object), return_inverse=True)
+        nomes_bytes, nomes_inicio = empacotar_nomes(nomes)
+        return cls(clube_id, codigos_posicao, habilidade, jogador_id, nome_indice,
+                   nomes_bytes, nomes_inicio, posicoes.tolist())
+
+    @classmethod
+    def de_dataframe(cls, df):
+        """
+        Elencos a partir de um DataFrame no formato do cadastro de jogadores
+        (COLUNAS_ELENCO; 'id' é opcional). Linhas sem clube ou habilidade
+        numéricos ficam de fora e são contadas em descartados.
+        """
+        clube_id = pd.to_numeric(df['clube_id'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        habilidade = pd.to_numeric(df['habilidade'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        validos = ~(np.isnan(clube_id) | np.isnan(habilidade))
+
+        if 'id' in df.columns:
+            jogador_id = pd.to_numeric(df['id'], errors='coerce').fillna(SEM_ID).to_numpy(dtype=np.int64)
+        else:
+            jogador_id = np.full(len(df), SEM_ID, dtype=np.int64)
+
+        elencos = cls.de_colunas(
+            clube_id[validos].astype(np.int64),
+            df['posicao'].astype(str).str.strip().to_numpy(dtype=object)[validos],
+            habilidade[validos],
+            jogador_id[validos],
+            df['nome'].astype(str).str.strip().to_numpy(dtype=object)[validos]
+        )
+        elencos.descartados = int((~validos).sum())
+        return elencos
+
+    @classmethod
+    def juntar(cls, partes):
+        """Um conjunto único a partir de vários (ex.: um por liga); ids de clube não se repetem entre as partes"""
+        posicoes = list(dict.fromkeys(posicao for parte in partes for posicao in parte.posicoes))
+        codigo = {posicao: k for k, posicao in enumerate(posicoes)}
+
+        posicao, nome_indice, inicios = [], [], [np.zeros(1, dtype=np.int64)]
+        nomes_antes, bytes_antes = 0, 0
+        for parte in partes:
+            traducao = np.array([codigo[p] for p in parte.posicoes] or [0], dtype=np.int8)
+            posicao.append(traducao[parte.posicao])
+            nome_indice.append(parte.nome_indice.astype(np.int64) + nomes_antes)
+            inicios.append(parte.nomes_inicio[1:] + bytes_antes)
+            nomes_antes += len(parte.nomes_inicio) - 1
+            bytes_antes += len(parte.nomes_bytes)
+
+        def concatenar(arrays, dtype):
+            return np.concatenate(arrays) if arrays else np.empty(0, dtype=dtype)
+
+        elencos = cls(
+            concatenar([parte.clube_id for parte in partes], np.int32),
+            concatenar(posicao, np.int8),
+            concatenar([parte.habilidade for parte in partes], np.float64),
+            concatenar([parte.jogador_id for parte in partes], np.int32),
+            concatenar(nome_indice, np.int64),
+            b''.join(parte.nomes_bytes for parte in partes),
+            np.concatenate(inicios),
+            posicoes
+        )
+        elencos.descartados = sum(parte.descartados for parte in partes)
+        return elencos
+
+    def __len__(self):
+        return len(self.clube_id)
+
+    @property
+    def nbytes(self):
+        """Memória ocupada pelos arrays e pelo bloco de nomes"""
+        arrays = (self.clube_id, self.posicao, self.habilidade, self.jogador_id, self.nome_indice,
+                  self.nomes_inicio, self.clubes, self.inicio, self.goleiro)
+        return sum(a.nbytes for a in arrays) + len(self.nomes_bytes)
+
+    # Linhas de um clube
+
+    def faixa(self, clube_id):
+        """slice com as linhas do clube (vazio se o clube não tem jogadores)"""
+        k = self._indice_clube.get(int(clube_id))
+        if k is None:
+            return slice(0, 0)
+        return slice(int(self.inicio[k]), int(self.inicio[k + 1]))
+
+    def habilidades(self, clube_id):
+        return self.habilidade[self.faixa(clube_id)]
+
+    def linhas_de_campo(self, clube_id):
+        """Linhas dos jogadores do clube que não são goleiros"""
+        faixa = self.faixa(clube_id)
+        return np.flatnonzero(~self.goleiro[faixa]) + faixa.start
+
+    def nome(self, linha):
+        k = self.nome_indice[linha]
+        return self.nomes_bytes[self.nomes_inicio[k]:self.nomes_inicio[k + 1]].decode('utf-8')
+
+    def jogadores(self, clube_id):
+        """Objetos Jogador do clube, na ordem do cadastro"""
+        faixa = self.faixa(clube_id)
+        return [
+            Jogador(self.nome(linha), self.posicoes[codigo], habilidade, None if jid == SEM_ID else jid)
+            for linha, codigo, habilidade, jid in zip(
+                range(faixa.start, faixa.stop),
+                self.posicao[faixa].tolist(),
+                self.habilidade[faixa].tolist(),
+                self.jogador_id[faixa].tolist()
+            )
+        ]
+
+    def montar_clubes(self, clubes):
+        """
+        Coloca em cada Clube do dict o elenco correspondente.
+
+        Returns:
+            dict: id do clube -> número de jogadores sem clube cadastrado.
+        """
+        for clube_id, clube in clubes.items():
+            clube.definir_elenco(self.jogadores(clube_id))
+        return {int(cid): int(n) for cid, n in zip(self.clubes, self.jogadores_por_clube())
+                if int(cid) not in clubes}
+
+    # Agregados de todos os clubes (alinhados com self.clubes)
+
+    def jogadores_por_clube(self):
+        return np.diff(self.inicio)
+
+    def media_habilidade(self):
+        if not len(self):
+            return np.empty(0)
+        return np.add.reduceat(self.habilidade, self.inicio[:-1]) / self.jogadores_por_clube()
+
+    def contagem_posicoes(self):
+        """Matriz (clubes x posições) com quantos jogadores cada clube tem em cada posição"""
+        num_posicoes = max(len(self.posicoes), 1)
+        clube = np.repeat(np.arange(len(self.clubes)), self.jogadores_por_clube())
+        contagem = np.bincount(clube * num_posicoes + self.posicao, minlength=len(self.clubes) * num_posicoes)
+        return contagem.reshape(len(self.clubes), num_posicoes)[:, :len(self.posicoes)]
+
+    def tabela(self):
+        """Resumo por clube: jogadores, média de habilidade e jogadores por posição"""
+        tabela = pd.DataFrame({
+            'jogadores': self.jogadores_por_clube(),
+            'media_habilidade': self.media_habilidade().round(1)
+        }, index=pd.Index(self.clubes, name='clube_id'))
+        contagem = self.contagem_posicoes()
+        for codigo, posicao in enumerate(self.posicoes):
+            tabela[posicao] = contagem[:, codigo]
+        return tabela
@@ -0,0 +1,117 @@
+# Arquivo: app/escalacao.py
+"""
+Escalação titular de um clube e as forças que saem dela.
+
+escalar() escolhe o goleiro e os dez jogadores de linha pela posição do
+cadastro (formação 4-3-3 por padrão), os mais habilidosos de cada setor, e
+calcula uma única vez as forças usadas pelo motor de escalação
+(app/motor.py, simular_partida_escalacao()):
+
+    forca          média dos onze titulares (posse de bola)
+    ataque         atacantes e meias (chance de finalizar e de marcar)
+    defesa         defensores e meias (o quanto a defesa impede finalizações)
+    forca_goleiro  habilidade do goleiro (o quanto ele evita gols)
+
+Ataque, defesa e goleiro pesam em relação à força média do próprio time: um
+ataque acima do resto do time finaliza e converte mais; uma defesa ou um
+goleiro acima do resto do time seguram mais.
+
+Vagas que o elenco não preenche contam com a força geral do clube. Assim um
+clube sem jogadores cadastrados (ou só com parte do time) joga como no motor
+por força geral, e os jogadores cadastrados puxam a força para cima ou para
+baixo conforme a habilidade.
+"""
+from app.modelo import como_clube, eh_goleiro
+
+# Posição do cadastro -> setor do time (posições desconhecidas jogam no meio)
+SETOR_POR_POSICAO = {
+    'ZAG': 'defesa', 'LAT': 'defesa', 'LD': 'defesa', 'LE': 'defesa', 'DEF': 'defesa',
+    'Zagueiro': 'defesa', 'Lateral': 'defesa',
+    'VOL': 'meio', 'MEI': 'meio', 'MC': 'meio', 'Volante': 'meio', 'Meia': 'meio',
+    'ATA': 'ataque', 'CA': 'ataque', 'PD': 'ataque', 'PE': 'ataque', 'Atacante': 'ataque',
+}
+SETORES = ('defesa', 'meio', 'ataque')
+FORMACAO_PADRAO = {'defesa': 4, 'meio': 3, 'ataque': 3}  # Jogadores de linha (mais o goleiro)
+
+# Peso de cada setor nas forças de ataque e defesa
+PESOS_ATAQUE = {'ataque': 0.6, 'meio': 0.4, 'defesa': 0.0}
+PESOS_DEFESA = {'defesa': 0.6, 'meio': 0.4, 'ataque': 0.0}
+# Peso de cada setor no sorteio do autor do gol (multiplica a habilidade)
+PESOS_MARCADOR = {'ataque': 3.0, 'meio': 2.0, 'defesa': 1.0}
+
+def setor_da_posicao(posicao):
+    if eh_goleiro(posicao):
+        return 'goleiro'
+    posicao = str(posicao).strip()
+    return SETOR_POR_POSICAO.get(posicao, SETOR_POR_POSICAO.get(posicao.upper(), 'meio'))
+
+class Escalacao:
+    """Titulares de um clube e as forças calculadas a partir deles"""
+    __slots__ = ('clube', 'goleiro', 'setores', 'forca', 'ataque', 'defesa', 'forca_goleiro',
+                 'titulares', 'marcadores', 'pesos_marcadores')
+
+    def __init__(self, clube, goleiro, setores, formacao=FORMACAO_PADRAO):
+        self.clube = clube
+        self.goleiro = goleiro
+        self.setores = setores  # setor -> titulares do setor
+        self.titulares = ([goleiro] if goleiro else []) + [j for setor in SETORES for j in setores[setor]]
+
+        forca_geral = float(clube.forca_geral)
+        medias = {}
+        for setor in SETORES:
+            vagas = formacao[setor] - len(setores[setor])
+            total = sum(j.habilidade for j in setores[setor]) + vagas * forca_geral
+            medias[setor] = total / formacao[setor] if formacao[setor] else forca_geral
+        vagas_time = 1 + sum(formacao.values()) - len(self.titulares)
+
+        self.forca_goleiro = float(goleiro.habilidade) if goleiro else forca_geral
+        self.forca = (sum(j.habilidade for j in self.titulares) + vagas_time * forca_geral) / (1 + sum(formacao.values()))
+        self.ataque = sum(PESOS_ATAQUE[setor] * medias[setor] for setor in SETORES)
+        self.defesa = sum(PESOS_DEFESA[setor] * medias[setor] for setor in SETORES)
+
+        # Sorteio do autor do gol por pesos acumulados (random.choices com cum_weights)
+        self.marcadores = [j for setor in SETORES for j in setores[setor]]
+        self.pesos_marcadores = []
+        acumulado = 0.0
+        for setor in SETORES:
+            for jogador in setores[setor]:
+                acumulado += PESOS_MARCADOR[setor] * max(float(jogador.habilidade), 1.0)
+                self.pesos_marcadores.append(acumulado)
+
+    def __repr__(self):
+        return (f"Escalacao({self.clube.nome!r}, forca={self.forca:.1f}, ataque={self.ataque:.1f}, "
+                f"defesa={self.defesa:.1f}, goleiro={self.forca_goleiro:.1f})")
+
+def escalar(clube, formacao=FORMACAO_PADRAO):
+    """
+    Escalação titular do clube: o goleiro e, em cada setor, os jogadores mais
+    habilidosos da posição. Sobrando vagas em um setor, entram os melhores
+    jogadores de linha que ficaram de fora; se ainda faltar gente, a vaga
+    fica com a força geral do clube.
+
+    Args:
+        clube (Clube): Clube com elenco (um dict no formato antigo também é aceito).
+        formacao (dict): Jogadores de linha por setor ('defesa', 'meio', 'ataque').
+
+    Returns:
+        Escalacao: Titulares e forças do clube.
+    """
+    clube = como_clube(clube)
+    por_setor = {'goleiro': [], 'defesa': [], 'meio': [], 'ataque': []}
+    # Ordenação estável: entre habilidades iguais vale a ordem do cadastro
+    for jogador in sorted(clube.jogadores, key=lambda j: -j.habilidade):
+        por_setor[setor_da_posicao(jogador.posicao)].append(jogador)
+
+    goleiro = por_setor['goleiro'][0] if por_setor['goleiro'] else None
+    setores = {setor: por_setor[setor][:formacao[setor]] for setor in SETORES}
+    reservas = sorted((j for setor in SETORES for j in por_setor[setor][formacao[setor]:]),
+                      key=lambda j: -j.habilidade)
+    for setor in reversed(SETORES):  # Vagas do ataque primeiro
+        while len(setores[setor]) < formacao[setor] and reservas:
+            setores[setor].append(reservas.pop(0))
+
+    return Escalacao(clube, goleiro, setores, formacao)
+
+def como_escalacao(clube):
+    """Escalação a partir de uma Escalacao (devolvida como está) ou de um clube"""
+    return clube if isinstance(clube, Escalacao) else escalar(clube)
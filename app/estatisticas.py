@@ -2,62 +2,81 @@
 import streamlit as st
 import pandas as pd
 
-def exibir_estatisticas_time(historico, time_nome):
+def exibir_estatisticas_time(historico, time_nome, agregados=None):
     """
     Exibe estatísticas detalhadas de um time com base no histórico.
     
     Args:
-        historico (DataFrame): DataFrame com o histórico de partidas.
+        historico (DataFrame): Histórico completo já carregado (com agregados)
+            ou só as partidas do time (sem agregados).
         time_nome (str): Nome do time para exibir estatísticas.
+        agregados (AgregadosHistorico, opcional): Visões materializadas e
+            índice por data do histórico; sem elas, são calculadas de historico.
     """
     if historico is None or historico.empty:
         st.info(f"Não há partidas registradas para {time_nome}")
         return
     
-    # Contador de vitórias, derrotas e empates
-    vitorias = len(historico[historico['vencedor'] == time_nome])
-    empates = len(historico[historico['vencedor'] == 'Empate'])
-    derrotas = len(historico) - vitorias - empates
-    
-    # Gols marcados e sofridos
-    gols_marcados = 0
-    gols_sofridos = 0
-    
-    for _, partida in historico.iterrows():
-        if partida['time_casa'] == time_nome:
-            gols_marcados += partida['gols_casa']
-            gols_sofridos += partida['gols_visitante']
-        else:
-            gols_marcados += partida['gols_visitante']
-            gols_sofridos += partida['gols_casa']
+    if agregados is None:
+        from app.agregados import AgregadosHistorico
+        agregados = AgregadosHistorico.de_historico(historico)
+    estatisticas = agregados.clube(time_nome)
+    if estatisticas is None:
+        st.info(f"Não há partidas registradas para {time_nome}")
+        return
     
     # Exibir estatísticas
     col1, col2, col3 = st.columns(3)
-    col1.metric("Vitórias", vitorias)
-    col2.metric("Empates", empates)
-    col3.metric("Derrotas", derrotas)
+    col1.metric("Vitórias", estatisticas['vitorias'])
+    col2.metric("Empates", estatisticas['empates'])
+    col3.metric("Derrotas", estatisticas['derrotas'])
     
     col1, col2, col3 = st.columns(3)
-    col1.metric("Jogos", len(historico))
-    col2.metric("Gols marcados", gols_marcados)
-    col3.metric("Gols sofridos", gols_sofridos)
+    col1.metric("Jogos", estatisticas['jogos'])
+    col2.metric("Gols marcados", estatisticas['gols_pro'])
+    col3.metric("Gols sofridos", estatisticas['gols_contra'])
+    
+    if estatisticas['forma']:
+        simbolos = {'V': '✅', 'E': '➖', 'D': '❌'}
+        st.markdown("**Últimos jogos:** " + " ".join(simbolos[r] for r in estatisticas['forma']))
+    
+    # Métricas móveis (buffers e acumuladores mantidos a cada partida salva)
+    forma = agregados.forma_recente(time_nome)
+    st.subheader("📈 Forma recente")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Pontos/jogo (5)", f"{forma['pontos_por_jogo_5']:.2f}")
+    col2.metric("Pontos/jogo (10)", f"{forma['pontos_por_jogo_10']:.2f}")
+    col3.metric("Gols pró/jogo (10)", f"{forma['gols_pro_por_jogo']:.2f}")
+    col4.metric("Gols contra/jogo (10)", f"{forma['gols_contra_por_jogo']:.2f}")
+    
+    if len(forma['pontos_por_mes']) > 1:
+        st.caption("Pontos por jogo em cada mês")
+        st.bar_chart(pd.Series(forma['pontos_por_mes'], name="Pontos/jogo"))
     
-    # Histórico de partidas
+    # Histórico de partidas (mais recente primeiro, pelo índice por data)
     st.subheader("Histórico de partidas")
     
-    # Formatar o histórico para exibição
-    historico_exibicao = historico.copy()
-    historico_exibicao['Placar'] = historico_exibicao.apply(
-        lambda x: f"{x['time_casa']} {x['gols_casa']} x {x['gols_visitante']} {x['time_visitante']}", 
-        axis=1
-    )
+    linhas = agregados.linhas_recentes(time_nome)
+    datas = agregados.indice()['data']
+    if len(datas) and datas[-1] > datas[0]:
+        inicio_padrao = pd.Timestamp(int(datas[0]), unit='s').date()
+        fim_padrao = pd.Timestamp(int(datas[-1]), unit='s').date()
+        periodo = st.date_input("Período:", (inicio_padrao, fim_padrao), min_value=inicio_padrao,
+                                max_value=fim_padrao, key=f"periodo_{time_nome}")
+        if isinstance(periodo, (tuple, list)) and len(periodo) == 2:
+            linhas = agregados.linhas_recentes(time_nome, inicio=periodo[0], fim=periodo[1])
+            no_periodo = agregados.periodo(time_nome, periodo[0], periodo[1])
+            st.caption(f"No período: {no_periodo['jogos']} jogos · {no_periodo['vitorias']}V "
+                       f"{no_periodo['empates']}E {no_periodo['derrotas']}D · "
+                       f"Gols {no_periodo['gols_pro']} x {no_periodo['gols_contra']} · {no_periodo['pontos']} pontos")
     
-    # Ordenar por data (mais recente primeiro)
-    historico_exibicao = historico_exibicao.sort_values('data', ascending=False)
+    historico_exibicao = historico.iloc[linhas[linhas < len(historico)]]
+    placar = (historico_exibicao['time_casa'] + " " + historico_exibicao['gols_casa'].astype(str) + " x "
+              + historico_exibicao['gols_visitante'].astype(str) + " " + historico_exibicao['time_visitante'])
     
     # Exibir a tabela
     st.dataframe(
-        historico_exibicao[['data', 'Placar', 'vencedor']],
+        pd.DataFrame({'data': historico_exibicao['data'], 'Placar': placar, 'vencedor': historico_exibicao['vencedor']}),
         column_config={
             "data": "Data",
             "Placar": "Placar",
@@ -66,35 +85,66 @@ def exibir_estatisticas_time(historico, time_nome):
         hide_index=True
     )
     
-    # Se houver informações sobre os marcadores de gols, exibir os artilheiros do time
-    if 'marcadores_gols' in historico.columns:
-        try:
-            # Extrair todos os marcadores de gols do time
-            artilheiros = {}
-            
-            for _, partida in historico.iterrows():
-                if isinstance(partida['marcadores_gols'], str) and partida['marcadores_gols']:
-                    marcadores_lista = partida['marcadores_gols'].split(';')
-                    for marcador_info in marcadores_lista:
-                        if marcador_info:
-                            partes = marcador_info.split(':')
-                            if len(partes) >= 3:
-                                jogador, _, time_marcador = partes
-                                if time_marcador == time_nome:
-                                    if jogador in artilheiros:
-                                        artilheiros[jogador] += 1
-                                    else:
-                                        artilheiros[jogador] = 1
-            
-            if artilheiros:
-                st.subheader("Artilheiros")
-                # Ordenar artilheiros por número de gols (decrescente)
-                artilheiros_ordenados = sorted(artilheiros.items(), key=lambda x: x[1], reverse=True)
-                
-                # Criar DataFrame para mostrar os artilheiros
-                artilheiros_df = pd.DataFrame(artilheiros_ordenados, columns=['Jogador', 'Gols'])
-                
-                # Mostrar tabela de artilheiros
-                st.dataframe(artilheiros_df, hide_index=True)
-        except Exception as e:
-            st.warning(f"Não foi possível carregar os artilheiros: {e}")
\ No newline at end of file
+    # Artilheiros do time
+    if estatisticas['artilheiros']:
+        st.subheader("Artilheiros")
+        artilheiros_ordenados = sorted(estatisticas['artilheiros'].items(), key=lambda x: x[1], reverse=True)
+        artilheiros_df = pd.DataFrame(artilheiros_ordenados, columns=['Jogador', 'Gols'])
+        st.dataframe(artilheiros_df, hide_index=True)
+
+def exibir_confronto_direto(nome1, nome2, confronto):
+    """
+    Retrospecto do confronto direto antes da partida.
+    
+    Args:
+        confronto (dict): AgregadosHistorico.confronto(nome1, nome2), ou None
+            se os times nunca se enfrentaram.
+    """
+    st.subheader("📜 Confronto Direto")
+    if confronto is None:
+        st.caption(f"{nome1} e {nome2} ainda não se enfrentaram.")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric(f"Vitórias {nome1}", confronto['vitorias'])
+    col2.metric("Empates", confronto['empates'])
+    col3.metric(f"Vitórias {nome2}", confronto['derrotas'])
+    st.caption(f"{confronto['jogos']} jogos · Gols: {nome1} {confronto['gols_pro']} x {confronto['gols_contra']} {nome2}")
+    
+    for data, casa, gols_casa, gols_fora, fora in reversed(confronto['ultimos']):
+        st.markdown(f"- {data[:10]}: {casa} **{gols_casa} x {gols_fora}** {fora}")
+
+def exibir_estatisticas_eventos(clubes, log_eventos=None):
+    """
+    Exibe totais de eventos por clube (finalizações, defesas, cartões...)
+    a partir do log binário de eventos, sem re-simular partidas.
+    
+    Args:
+        clubes (dict): Clubes carregados, com 'id'.
+        log_eventos (LogEventos, opcional): Log a consultar; padrão é data/eventos.
+    """
+    from app.log_eventos import LogEventos
+    
+    totais = (log_eventos or LogEventos()).totais_por_clube()
+    if not totais:
+        st.info("Nenhuma partida com eventos registrados ainda.")
+        return
+    
+    nomes = {clube.get('id'): clube['nome'] for clube in clubes.values()}
+    linhas = []
+    for clube_id, total in totais.items():
+        linhas.append({
+            'Time': nomes.get(clube_id, f"Clube {clube_id}"),
+            'Jogos': total['partidas'],
+            'Gols': total['gols'],
+            'Finalizações': total['finalizacoes'],
+            'No Gol': total['finalizacoes_gol'],
+            'Defesas': total['defesas'],
+            'Faltas': total['faltas'],
+            'Escanteios': total['escanteios'],
+            'Cartões Amarelos': total['cartoes_amarelos'],
+            'Cartões/Jogo': round(total['cartoes_amarelos'] / total['partidas'], 2)
+        })
+    
+    df = pd.DataFrame(linhas).sort_values('Jogos', ascending=False)
+    st.dataframe(df, hide_index=True, use_container_width=True)
@@ -0,0 +1,254 @@
+# Arquivo: app/eventos.py
+"""
+Eventos tipados emitidos pelo motor de partida e os "sinks" que os consomem.
+
+O motor não monta textos: cada lance vira um Evento compacto (tipo inteiro,
+minuto, lado, jogador e placar) entregue a um sink. A interface formata e
+classifica os eventos pelo tipo, um arquivo de log grava registros
+compactos e simulações em lote podem apenas contar, ou não receber nada.
+"""
+from collections import Counter
+
+# Tipos de evento
+INICIO = 0
+INSPIRADO = 1
+LANCE = 2  # Fim de cada lance do relógio (lado = time com a posse)
+GOL = 3
+DEFESA = 4  # lado = time do goleiro que defendeu
+FINALIZACAO_FORA = 5
+FALTA = 6  # lado = time que cometeu a falta
+ESCANTEIO = 7
+CARTAO = 8
+INTERVALO = 9
+MOTIVACAO = 10
+FIM = 11
+
+NOMES_TIPOS = {
+    INICIO: 'inicio', INSPIRADO: 'inspirado', LANCE: 'lance', GOL: 'gol', DEFESA: 'defesa',
+    FINALIZACAO_FORA: 'finalizacao_fora', FALTA: 'falta', ESCANTEIO: 'escanteio', CARTAO: 'cartao',
+    INTERVALO: 'intervalo', MOTIVACAO: 'motivacao', FIM: 'fim'
+}
+TIPOS_POR_NOME = {nome: tipo for tipo, nome in NOMES_TIPOS.items()}
+
+# Eventos que aparecem na narração da partida
+TIPOS_NARRADOS = (GOL, DEFESA, FINALIZACAO_FORA, FALTA, ESCANTEIO, CARTAO, INTERVALO, MOTIVACAO)
+# Eventos de destaque ("melhores momentos")
+TIPOS_DESTAQUE = (GOL, DEFESA, CARTAO)
+
+# Estilo de exibição de cada tipo (nome do componente de alerta do Streamlit)
+ESTILOS_EVENTO = {
+    GOL: 'success',
+    DEFESA: 'info',
+    FINALIZACAO_FORA: 'warning',
+    FALTA: 'warning',
+    ESCANTEIO: 'info',
+    CARTAO: 'warning',
+    INTERVALO: 'info',
+    MOTIVACAO: 'info',
+    INSPIRADO: 'success',
+    INICIO: 'info',
+}
+
+class Evento:
+    __slots__ = ('tipo', 'minuto', 'lado', 'jogador', 'gols1', 'gols2')
+
+    def __init__(self, tipo, minuto, lado=0, jogador=None, gols1=0, gols2=0):
+        self.tipo = tipo
+        self.minuto = minuto
+        self.lado = lado  # 1 = mandante, 2 = visitante, 0 = nenhum
+        self.jogador = jogador
+        self.gols1 = gols1
+        self.gols2 = gols2
+
+    def __repr__(self):
+        return (f"Evento({NOMES_TIPOS.get(self.tipo, self.tipo)}, {self.minuto}', lado={self.lado}, "
+                f"jogador={self.jogador!r}, placar={self.gols1}x{self.gols2})")
+
+def formatar_evento(evento, clube1, clube2):
+    """Texto de narração de um evento (o mesmo usado na tela da partida)"""
+    nome1, nome2 = clube1['nome'], clube2['nome']
+    clube = nome1 if evento.lado == 1 else nome2
+    minuto = evento.minuto
+    tipo = evento.tipo
+
+    if tipo == GOL:
+        if evento.jogador:
+            return f"⚽ {minuto}' - GOL! {evento.jogador} marca para o {clube}!"
+        return f"⚽ {minuto}' - GOL do {clube}!"
+    if tipo == DEFESA:
+        if evento.jogador:
+            return f"🧤 {minuto}' - Grande defesa de {evento.jogador} ({clube})!"
+        return f"🧤 {minuto}' - Defesa do goleiro do {clube}!"
+    if tipo == FINALIZACAO_FORA:
+        return f"😮 {minuto}' - {clube} finaliza para fora!"
+    if tipo == FALTA:
+        return f"⚠️ {minuto}' - Falta cometida por {clube}"
+    if tipo == ESCANTEIO:
+        return f"🚩 {minuto}' - Escanteio para {clube}"
+    if tipo == CARTAO:
+        return f"🟨 {minuto}' - Cartão amarelo para {evento.jogador} ({clube})"
+    if tipo == INTERVALO:
+        return f"⏱️ {minuto}' - Fim do 1º tempo: {nome1} {evento.gols1} x {evento.gols2} {nome2}"
+    if tipo == MOTIVACAO:
+        return f"🗣️ {clube} volta motivado do intervalo!"
+    if tipo == INSPIRADO:
+        return f"🔥 {clube} está em um dia inspirado!"
+    if tipo == INICIO:
+        return "📢 Começa a partida!"
+    if tipo == FIM:
+        return f"🏁 {minuto}' - Fim de jogo: {nome1} {evento.gols1} x {evento.gols2} {nome2}"
+    return f"⏱️ {minuto}'"
+
+def eventos_de_resultado(gols1, gols2, marcadores_gols, nome1, nome2, intervalo_lances=5):
+    """
+    Linha do tempo mínima de uma partida que só tem placar e marcadores
+    (como as do histórico em CSV), para exibição em replay.
+
+    Args:
+        marcadores_gols (list): Tuplas (jogador, minuto, time).
+        intervalo_lances (int): Minutos entre os lances de relógio gerados.
+
+    Returns:
+        list: Eventos INICIO, GOL, LANCE, INTERVALO e FIM em ordem.
+    """
+    gols = []
+    restantes = {1: gols1, 2: gols2}
+    for jogador, minuto, time_nome in marcadores_gols:
+        lado = 1 if time_nome == nome1 else 2 if time_nome == nome2 else 0
+        if lado and restantes[lado] > 0:
+            gols.append((min(max(int(minuto), 1), 90), lado, jogador))
+            restantes[lado] -= 1
+
+    # Gols sem marcador registrado são distribuídos ao longo do jogo
+    for lado, quantidade in restantes.items():
+        for i in range(quantidade):
+            gols.append((round(90 * (i + 1) / (quantidade + 1)), lado, None))
+    gols.sort(key=lambda gol: gol[0])
+
+    eventos = [Evento(INICIO, 0)]
+    placar = [0, 0, 0]
+    proximo_gol = 0
+    for minuto in sorted(set(range(intervalo_lances, 91, intervalo_lances)) | {45, 90}):
+        while proximo_gol < len(gols) and gols[proximo_gol][0] <= minuto:
+            minuto_gol, lado, jogador = gols[proximo_gol]
+            placar[lado] += 1
+            eventos.append(Evento(GOL, minuto_gol, lado, jogador, placar[1], placar[2]))
+            proximo_gol += 1
+        eventos.append(Evento(LANCE, minuto, 0, None, placar[1], placar[2]))
+        if minuto == 45:
+            eventos.append(Evento(INTERVALO, 45, 0, None, placar[1], placar[2]))
+
+    eventos.append(Evento(FIM, 90, 0, None, placar[1], placar[2]))
+    return eventos
+
+class SinkEventos:
+    """
+    Destino dos eventos de uma partida. A classe base descarta tudo.
+
+    Subclasses sobrescrevem registrar(); finalizar() é chamado pelo motor
+    depois do último evento.
+    """
+
+    def registrar(self, evento):
+        pass
+
+    def finalizar(self):
+        pass
+
+class SinkNulo(SinkEventos):
+    """Descarta os eventos (equivale a não passar sink ao motor)"""
+
+class SinkLista(SinkEventos):
+    """Guarda os eventos em uma lista"""
+
+    def __init__(self, tipos=None):
+        self.tipos = set(tipos) if tipos is not None else None
+        self.eventos = []
+
+    def registrar(self, evento):
+        if self.tipos is None or evento.tipo in self.tipos:
+            self.eventos.append(evento)
+
+class SinkContadores(SinkEventos):
+    """Conta eventos por tipo e lado, sem guardar os eventos"""
+
+    def __init__(self):
+        self.contagem = Counter()
+
+    def registrar(self, evento):
+        self.contagem[evento.tipo, evento.lado] += 1
+
+    def total(self, tipo, lado):
+        return self.contagem[tipo, lado]
+
+    def estatisticas(self):
+        """
+        Estatísticas da partida por time.
+
+        Returns:
+            dict: Nome da estatística -> (valor do mandante, valor do visitante).
+        """
+        def par(funcao):
+            return funcao(1, 2), funcao(2, 1)
+
+        posse1, posse2 = self.total(LANCE, 1), self.total(LANCE, 2)
+        total_posse = posse1 + posse2
+        posse_time1 = round(posse1 / total_posse * 100) if total_posse else 50
+
+        return {
+            'posse': (posse_time1, 100 - posse_time1),
+            'gols': par(lambda lado, outro: self.total(GOL, lado)),
+            'finalizacoes': par(lambda lado, outro: self.total(GOL, lado) + self.total(FINALIZACAO_FORA, lado)
+                                + self.total(DEFESA, outro)),
+            'finalizacoes_gol': par(lambda lado, outro: self.total(GOL, lado) + self.total(DEFESA, outro)),
+            'defesas': par(lambda lado, outro: self.total(DEFESA, lado)),
+            'faltas': par(lambda lado, outro: self.total(FALTA, lado)),
+            'escanteios': par(lambda lado, outro: self.total(ESCANTEIO, lado)),
+            'cartoes_amarelos': par(lambda lado, outro: self.total(CARTAO, lado)),
+        }
+
+class SinkArquivo(SinkEventos):
+    """
+    Grava os eventos em um arquivo de texto, um registro compacto por linha:
+    tipo, minuto, lado, jogador, gols1 e gols2 separados por tabulação.
+    """
+
+    def __init__(self, caminho, incluir_lances=False):
+        self.caminho = caminho
+        self.incluir_lances = incluir_lances
+        self.linhas = []
+
+    def registrar(self, evento):
+        if evento.tipo == LANCE and not self.incluir_lances:
+            return
+        self.linhas.append(f"{NOMES_TIPOS[evento.tipo]}\t{evento.minuto}\t{evento.lado}\t"
+                           f"{evento.jogador or ''}\t{evento.gols1}\t{evento.gols2}\n")
+
+    def finalizar(self):
+        if self.linhas:
+            with open(self.caminho, 'a', encoding='utf-8') as f:
+                f.write(''.join(self.linhas))
+            self.linhas = []
+
+def ler_eventos_arquivo(caminho):
+    """Lê os eventos gravados por SinkArquivo"""
+    eventos = []
+    with open(caminho, 'r', encoding='utf-8') as f:
+        for linha in f:
+            tipo, minuto, lado, jogador, gols1, gols2 = linha.rstrip('\n').split('\t')
+            eventos.append(Evento(TIPOS_POR_NOME[tipo], int(minuto), int(lado), jogador or None, int(gols1), int(gols2)))
+    return eventos
+
+class SinkMultiplo(SinkEventos):
+    """Repassa cada evento para vários sinks"""
+
+    def __init__(self, *sinks):
+        self.sinks = [sink for sink in sinks if sink is not None]
+
+    def registrar(self, evento):
+        for sink in self.sinks:
+            sink.registrar(evento)
+
+    def finalizar(self):
+        for sink in self.sinks:
+            sink.finalizar()
@@ -0,0 +1,233 @@
+# Arquivo: app/historico_torneios.py
+"""
+Histórico de torneios (data/torneios/historico_torneios.json) e o seu resumo
+agregado (resumo_torneios.json), sem Streamlit.
+
+O histórico é um único JSON reescrito a cada torneio salvo. Para que duas
+sessões salvando ao mesmo tempo não percam torneios uma da outra, a leitura,
+o acréscimo e a reescrita acontecem com a trava do arquivo, e registros
+simultâneos do mesmo processo são gravados juntos (ver app/armazenamento.py).
+
+O resumo guarda o tamanho e a data de modificação do histórico de quando foi
+gravado; se o histórico mudou por fora (editado, restaurado de um backup), o
+resumo não confere e é reconstruído.
+"""
+import json
+import os
+import shutil
+from datetime import datetime
+
+from app.armazenamento import GrupoCommit, gravar_json_atomico, trava_arquivo
+from app.cache_compartilhado import notificar_alteracao
+
+ARQUIVO_HISTORICO_TORNEIOS = os.path.join("data", "torneios", "historico_torneios.json")
+ARQUIVO_RESUMO_TORNEIOS = os.path.join("data", "torneios", "resumo_torneios.json")
+ULTIMOS_TORNEIOS_RESUMO = 10
+
+def criar_resumo_torneios():
+    """Cria um resumo agregado vazio do histórico de torneios"""
+    return {
+        'total_torneios': 0,
+        'campeoes': {},
+        'vices': {},
+        'participacoes': {},
+        'formatos': {},
+        'tamanhos': {},
+        'ultimos': []
+    }
+
+def atualizar_resumo_torneios(resumo, dados_torneio):
+    """
+    Incorpora um torneio ao resumo agregado sem reprocessar o histórico.
+
+    Args:
+        resumo (dict): Resumo criado por criar_resumo_torneios().
+        dados_torneio (dict): Registro do torneio no formato do histórico.
+
+    Returns:
+        dict: O próprio resumo atualizado.
+    """
+    campeao = dados_torneio.get('campeao')
+    vice = dados_torneio.get('vice')
+
+    resumo['total_torneios'] += 1
+
+    if campeao:
+        resumo['campeoes'][campeao] = resumo['campeoes'].get(campeao, 0) + 1
+    if vice:
+        resumo['vices'][vice] = resumo['vices'].get(vice, 0) + 1
+
+    for time in dados_torneio.get('times_participantes', []):
+        resumo['participacoes'][time] = resumo['participacoes'].get(time, 0) + 1
+
+    # Chaves de JSON precisam ser strings, por isso o número de times vira texto
+    grupos = [
+        (resumo['formatos'], dados_torneio.get('formato', 'N/A')),
+        (resumo['tamanhos'], str(dados_torneio.get('num_times', 0)))
+    ]
+    for estatisticas, chave in grupos:
+        grupo = estatisticas.setdefault(chave, {'count': 0, 'campeoes': {}})
+        grupo['count'] += 1
+        if campeao:
+            grupo['campeoes'][campeao] = grupo['campeoes'].get(campeao, 0) + 1
+
+    # Últimos torneios (mais recente primeiro)
+    resumo['ultimos'].insert(0, {
+        'nome': dados_torneio.get('nome', 'Torneio'),
+        'data': dados_torneio.get('data', 'N/A'),
+        'formato': dados_torneio.get('formato', 'N/A'),
+        'campeao': campeao,
+        'vice': vice,
+        'num_times': dados_torneio.get('num_times', 0),
+        'times_participantes': dados_torneio.get('times_participantes', [])
+    })
+    resumo['ultimos'].sort(key=lambda x: x.get('data') or '', reverse=True)
+    del resumo['ultimos'][ULTIMOS_TORNEIOS_RESUMO:]
+
+    return resumo
+
+def reconstruir_resumo_torneios(historico):
+    """Reconstrói o resumo agregado a partir da lista completa de torneios"""
+    resumo = criar_resumo_torneios()
+    for dados_torneio in historico:
+        atualizar_resumo_torneios(resumo, dados_torneio)
+    return resumo
+
+def assinatura_historico_torneios():
+    """[tamanho, mtime em ns] do arquivo de histórico, ou None se ele não existe"""
+    try:
+        estado = os.stat(ARQUIVO_HISTORICO_TORNEIOS)
+    except FileNotFoundError:
+        return None
+    return [estado.st_size, estado.st_mtime_ns]
+
+def salvar_resumo_torneios(resumo):
+    """
+    Grava o resumo agregado dos torneios em disco, junto com a assinatura do
+    histórico. Deve ser chamada depois de gravar o histórico, com a trava dele.
+    """
+    resumo['historico'] = assinatura_historico_torneios()
+    gravar_json_atomico(ARQUIVO_RESUMO_TORNEIOS, resumo, indent=2)
+
+def ler_resumo_em_dia():
+    """Resumo salvo, se existe, é legível e confere com o histórico atual; senão None"""
+    if not os.path.exists(ARQUIVO_RESUMO_TORNEIOS):
+        return None
+    try:
+        with open(ARQUIVO_RESUMO_TORNEIOS, 'r', encoding='utf-8') as f:
+            resumo = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return None
+    if not isinstance(resumo, dict) or resumo.get('historico') != assinatura_historico_torneios():
+        return None
+    return resumo
+
+def carregar_historico_torneios():
+    """
+    Lista completa de torneios salvos ([] se ainda não há histórico).
+
+    Raises:
+        json.JSONDecodeError: Se o histórico estiver corrompido.
+    """
+    if not os.path.exists(ARQUIVO_HISTORICO_TORNEIOS):
+        return []
+    with open(ARQUIVO_HISTORICO_TORNEIOS, 'r', encoding='utf-8') as f:
+        conteudo = f.read().strip()
+    return json.loads(conteudo) if conteudo else []
+
+def carregar_resumo_torneios():
+    """
+    Carrega o resumo agregado dos torneios.
+
+    Se o resumo ainda não existir, estiver corrompido ou não conferir com o
+    histórico (ver assinatura_historico_torneios()), ele é reconstruído uma
+    única vez a partir do histórico completo e gravado em disco.
+
+    Returns:
+        dict or None: Resumo dos torneios ou None se não houver histórico.
+
+    Raises:
+        json.JSONDecodeError: Se o próprio histórico estiver corrompido.
+    """
+    if not os.path.exists(ARQUIVO_HISTORICO_TORNEIOS):
+        return None
+
+    resumo = ler_resumo_em_dia()
+    if resumo is not None:
+        return resumo
+
+    with trava_arquivo(ARQUIVO_HISTORICO_TORNEIOS):
+        # Outra sessão pode ter reconstruído enquanto esta esperava a trava
+        resumo = ler_resumo_em_dia()
+        if resumo is None:
+            resumo = reconstruir_resumo_torneios(carregar_historico_torneios())
+            salvar_resumo_torneios(resumo)
+    return resumo
+
+def recriar_historico_torneios():
+    """Substitui o histórico por uma lista vazia e zera o resumo"""
+    with trava_arquivo(ARQUIVO_HISTORICO_TORNEIOS):
+        gravar_json_atomico(ARQUIVO_HISTORICO_TORNEIOS, [], indent=2)
+        salvar_resumo_torneios(criar_resumo_torneios())
+    notificar_alteracao('torneios')
+
+def dados_do_torneio(torneio):
+    """Registro de um torneio (mata-mata, pontos corridos ou grupos) no formato do histórico"""
+    dados_torneio = {
+        'id': torneio.id,
+        'nome': torneio.nome,
+        'data': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'formato': torneio.formato,
+        'campeao': torneio.campeao['nome'] if torneio.campeao else None,
+        'vice': torneio.vice['nome'] if torneio.vice else None,
+        'num_times': len(torneio.times),
+        'times_participantes': [time['nome'] for time in torneio.times]
+    }
+    if getattr(torneio, 'num_grupos', None):
+        dados_torneio['num_grupos'] = torneio.num_grupos
+    return dados_torneio
+
+def gravar_lotes_torneios(lotes):
+    """
+    Acrescenta os torneios recebidos ao histórico e ao resumo, com uma leitura
+    e uma reescrita de cada arquivo por lote. Retorna, para cada torneio, o
+    total de torneios no histórico depois da gravação.
+    """
+    with trava_arquivo(ARQUIVO_HISTORICO_TORNEIOS):
+        try:
+            historico = carregar_historico_torneios()
+        except json.JSONDecodeError:
+            # Um histórico ilegível é guardado ao lado em vez de ser sobrescrito
+            copia = f"{ARQUIVO_HISTORICO_TORNEIOS}.corrompido-{datetime.now():%Y%m%d%H%M%S}"
+            shutil.copyfile(ARQUIVO_HISTORICO_TORNEIOS, copia)
+            print(f"⚠️ Histórico de torneios corrompido, cópia em {copia}; criando novo")
+            historico = []
+
+        # Resumo anterior: reaproveita o arquivo se estiver em dia com o histórico
+        resumo = ler_resumo_em_dia()
+        if resumo is None or resumo.get('total_torneios') != len(historico):
+            resumo = reconstruir_resumo_torneios(historico)
+
+        totais = []
+        for dados_torneio in lotes:
+            historico.append(dados_torneio)
+            atualizar_resumo_torneios(resumo, dados_torneio)
+            totais.append(len(historico))
+
+        # O histórico vai antes: um resumo em dia nunca conta torneios que não estão nele
+        gravar_json_atomico(ARQUIVO_HISTORICO_TORNEIOS, historico, indent=2)
+        salvar_resumo_torneios(resumo)
+    notificar_alteracao('torneios')
+    return totais
+
+grupo_torneios = GrupoCommit(gravar_lotes_torneios)
+
+def registrar_torneio(dados_torneio):
+    """
+    Acrescenta um torneio (ver dados_do_torneio()) ao histórico e ao resumo.
+    Seguro com várias sessões e processos gravando ao mesmo tempo.
+
+    Returns:
+        int: Total de torneios no histórico depois da gravação.
+    """
+    return grupo_torneios.enviar(dados_torneio)
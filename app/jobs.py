@@ -0,0 +1,287 @@
+# Arquivo: app/jobs.py
+"""
+Tarefas em segundo plano para simulações longas, fora do script do Streamlit.
+
+Cada tarefa (job) é registrada em uma tabela SQLite (data/jobs/jobs.db) com
+status, progresso e mensagem, e executada em um pool de processos único por
+servidor. O resultado é gravado em disco (data/jobs/<id>.pkl). A interface
+apenas submete, consulta o progresso e carrega resultados, então uma
+simulação de vários minutos continua rodando se a página for recarregada ou
+a sessão cair, e não ocupa a thread do script.
+
+Tarefas que estavam pendentes ou em execução quando o servidor parou são
+marcadas como interrompidas na próxima vez que o pool é criado.
+"""
+import multiprocessing
+import os
+import pickle
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+JOBS_DIR = os.path.join("data", "jobs")
+ARQUIVO_JOBS = os.path.join(JOBS_DIR, "jobs.db")
+MAX_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+INTERVALO_PROGRESSO = 0.5  # Segundos mínimos entre gravações de progresso
+
+PENDENTE = "pendente"
+EXECUTANDO = "executando"
+CONCLUIDO = "concluido"
+ERRO = "erro"
+CANCELADO = "cancelado"
+INTERROMPIDO = "interrompido"
+STATUS_ATIVOS = (PENDENTE, EXECUTANDO)
+
+COLUNAS_JOB = ('id', 'tipo', 'descricao', 'status', 'progresso', 'mensagem', 'erro',
+               'arquivo_resultado', 'criado_em', 'iniciado_em', 'concluido_em')
+
+# Tipo de tarefa -> função(parametros, progresso) que retorna o resultado
+TIPOS_JOB = {}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+class JobCancelado(Exception):
+    """Levantada pelo callback de progresso quando a tarefa foi cancelada"""
+
+def registrar_tipo_job(nome):
+    """Decorador que registra uma função como tipo de tarefa"""
+    def decorador(funcao):
+        TIPOS_JOB[nome] = funcao
+        return funcao
+    return decorador
+
+@contextmanager
+def _conectar(caminho=ARQUIVO_JOBS):
+    """Conexão com a tabela de tarefas (transação confirmada e conexão fechada ao sair)"""
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    conexao = sqlite3.connect(caminho, timeout=30)
+    conexao.execute("PRAGMA journal_mode=WAL")
+    conexao.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            tipo TEXT NOT NULL,
+            descricao TEXT,
+            status TEXT NOT NULL,
+            progresso REAL NOT NULL DEFAULT 0,
+            mensagem TEXT,
+            erro TEXT,
+            arquivo_resultado TEXT,
+            criado_em REAL NOT NULL,
+            iniciado_em REAL,
+            concluido_em REAL
+        )
+    """)
+    try:
+        with conexao:
+            yield conexao
+    finally:
+        conexao.close()
+
+def _atualizar_job(job_id, caminho=ARQUIVO_JOBS, **campos):
+    atribuicoes = ", ".join(f"{coluna} = ?" for coluna in campos)
+    with _conectar(caminho) as conexao:
+        conexao.execute(f"UPDATE jobs SET {atribuicoes} WHERE id = ?", (*campos.values(), job_id))
+
+def _linha_para_job(linha):
+    return dict(zip(COLUNAS_JOB, linha)) if linha else None
+
+def obter_job(job_id, caminho=ARQUIVO_JOBS):
+    """Registro da tarefa como dict (ou None se não existir)"""
+    with _conectar(caminho) as conexao:
+        linha = conexao.execute(f"SELECT {', '.join(COLUNAS_JOB)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return _linha_para_job(linha)
+
+def listar_jobs(limite=20, tipo=None, caminho=ARQUIVO_JOBS):
+    """Tarefas mais recentes primeiro, opcionalmente filtradas por tipo"""
+    consulta = f"SELECT {', '.join(COLUNAS_JOB)} FROM jobs"
+    argumentos = []
+    if tipo is not None:
+        consulta += " WHERE tipo = ?"
+        argumentos.append(tipo)
+    consulta += " ORDER BY criado_em DESC LIMIT ?"
+    argumentos.append(limite)
+    with _conectar(caminho) as conexao:
+        return [_linha_para_job(linha) for linha in conexao.execute(consulta, argumentos).fetchall()]
+
+def _marcar_jobs_interrompidos(caminho=ARQUIVO_JOBS):
+    """Tarefas ativas de um servidor anterior nunca vão terminar: marca como interrompidas"""
+    with _conectar(caminho) as conexao:
+        conexao.execute(
+            "UPDATE jobs SET status = ?, concluido_em = ? WHERE status IN (?, ?)",
+            (INTERROMPIDO, time.time(), *STATUS_ATIVOS)
+        )
+
+def obter_executor():
+    """Pool de processos compartilhado por todas as sessões do servidor"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _marcar_jobs_interrompidos()
+            # "spawn": o servidor do Streamlit tem várias threads, e fork copiaria locks em uso
+            _executor = ProcessPoolExecutor(max_workers=MAX_WORKERS,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+class ProgressoJob:
+    """
+    Callback de progresso entregue à função da tarefa: progresso(fracao, mensagem).
+
+    Grava no banco no máximo a cada INTERVALO_PROGRESSO segundos e levanta
+    JobCancelado se a tarefa foi cancelada pela interface.
+    """
+
+    def __init__(self, job_id, caminho=ARQUIVO_JOBS):
+        self.job_id = job_id
+        self.caminho = caminho
+        self.ultima_gravacao = 0.0
+
+    def __call__(self, fracao, mensagem=None):
+        agora = time.monotonic()
+        if agora - self.ultima_gravacao < INTERVALO_PROGRESSO and fracao < 1:
+            return
+        self.ultima_gravacao = agora
+
+        job = obter_job(self.job_id, self.caminho)
+        if job is None or job['status'] == CANCELADO:
+            raise JobCancelado(self.job_id)
+        _atualizar_job(self.job_id, self.caminho, progresso=float(min(max(fracao, 0.0), 1.0)), mensagem=mensagem)
+
+def _executar_job(job_id, tipo, parametros, caminho=ARQUIVO_JOBS):
+    """Executa a tarefa no processo do pool e registra o resultado"""
+    job = obter_job(job_id, caminho)
+    if job is None or job['status'] != PENDENTE:
+        return
+
+    _atualizar_job(job_id, caminho, status=EXECUTANDO, iniciado_em=time.time())
+    try:
+        resultado = TIPOS_JOB[tipo](parametros, ProgressoJob(job_id, caminho))
+    except JobCancelado:
+        _atualizar_job(job_id, caminho, status=CANCELADO, concluido_em=time.time())
+        return
+    except Exception as e:
+        _atualizar_job(job_id, caminho, status=ERRO, erro=f"{type(e).__name__}: {e}", concluido_em=time.time())
+        return
+
+    arquivo_resultado = os.path.join(os.path.dirname(caminho) or ".", f"{job_id}.pkl")
+    temporario = arquivo_resultado + ".tmp"
+    with open(temporario, 'wb') as f:
+        pickle.dump(resultado, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporario, arquivo_resultado)
+
+    _atualizar_job(job_id, caminho, status=CONCLUIDO, progresso=1.0, arquivo_resultado=arquivo_resultado,
+                   concluido_em=time.time())
+
+def _registrar_falha_pool(job_id, caminho):
+    """Callback do futuro: registra falhas do próprio pool (processo morto, etc.)"""
+    def callback(futuro):
+        erro = futuro.exception()
+        if erro is not None:
+            _atualizar_job(job_id, caminho, status=ERRO, erro=f"{type(erro).__name__}: {erro}",
+                           concluido_em=time.time())
+    return callback
+
+def submeter_job(tipo, parametros, descricao="", caminho=ARQUIVO_JOBS):
+    """
+    Registra e envia uma tarefa para o pool de processos.
+
+    Args:
+        tipo (str): Nome registrado em TIPOS_JOB.
+        parametros (dict): Argumentos da tarefa (precisam ser serializáveis com pickle).
+        descricao (str): Texto exibido na lista de tarefas.
+
+    Returns:
+        str: Id da tarefa.
+    """
+    if tipo not in TIPOS_JOB:
+        raise ValueError(f"Tipo de tarefa desconhecido: {tipo}")
+
+    executor = obter_executor()
+    job_id = uuid.uuid4().hex[:12]
+    with _conectar(caminho) as conexao:
+        conexao.execute(
+            "INSERT INTO jobs (id, tipo, descricao, status, progresso, criado_em) VALUES (?, ?, ?, ?, 0, ?)",
+            (job_id, tipo, descricao, PENDENTE, time.time())
+        )
+
+    futuro = executor.submit(_executar_job, job_id, tipo, parametros, caminho)
+    futuro.add_done_callback(_registrar_falha_pool(job_id, caminho))
+    return job_id
+
+def cancelar_job(job_id, caminho=ARQUIVO_JOBS):
+    """Pede o cancelamento; a tarefa para na próxima atualização de progresso"""
+    with _conectar(caminho) as conexao:
+        conexao.execute(
+            "UPDATE jobs SET status = ?, concluido_em = ? WHERE id = ? AND status IN (?, ?)",
+            (CANCELADO, time.time(), job_id, *STATUS_ATIVOS)
+        )
+
+def carregar_resultado(job_id, caminho=ARQUIVO_JOBS):
+    """Resultado de uma tarefa concluída (ou None)"""
+    job = obter_job(job_id, caminho)
+    if job is None or job['status'] != CONCLUIDO or not job['arquivo_resultado']:
+        return None
+    with open(job['arquivo_resultado'], 'rb') as f:
+        return pickle.load(f)
+
+def remover_job(job_id, caminho=ARQUIVO_JOBS):
+    """Apaga o registro e o arquivo de resultado de uma tarefa que não está ativa"""
+    job = obter_job(job_id, caminho)
+    if job is None or job['status'] in STATUS_ATIVOS:
+        return False
+    if job['arquivo_resultado'] and os.path.isfile(job['arquivo_resultado']):
+        os.remove(job['arquivo_resultado'])
+    with _conectar(caminho) as conexao:
+        conexao.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+    return True
+
+# Tipos de tarefa
+
+@registrar_tipo_job("fase_mata_mata")
+def job_fase_mata_mata(parametros, progresso):
+    """
+    Simula todas as chaves de uma fase de mata-mata.
+
+    Parâmetros: chaves (lista de dicts com time1 e time2), formato e seed.
+    Resultado: {'chaves': chaves preenchidas, 'partidas': tuplas (clube1,
+    clube2, gols1, gols2, marcadores_gols)}.
+    """
+    from app.mata_mata import TorneioMataMata
+
+    torneio = TorneioMataMata("fase", [], parametros['formato'], random.Random(parametros.get('seed')))
+    chaves = parametros['chaves']
+    partidas = []
+    for i, chave in enumerate(chaves):
+        partidas.extend(torneio.simular_chave(chave))
+        progresso((i + 1) / len(chaves), f"{i + 1} de {len(chaves)} chaves")
+    return {'chaves': chaves, 'partidas': partidas}
+
+@registrar_tipo_job("projecao_temporada")
+def job_projecao_temporada(parametros, progresso):
+    """
+    Projeção de Monte Carlo do restante de uma temporada.
+
+    Parâmetros: tabela, jogos_restantes, n_simulacoes, tempo_limite e seed
+    (os mesmos de projetar_temporada_progressiva()).
+    Resultado: {'tabela': DataFrame da projeção, 'n_simulacoes', 'tempo_decorrido', 'vagas_topo'}.
+    """
+    from app.projecao import projetar_temporada_progressiva
+
+    n_simulacoes = parametros['n_simulacoes']
+    projecao = None
+    for projecao in projetar_temporada_progressiva(
+        parametros['tabela'], parametros['jogos_restantes'], n_simulacoes=n_simulacoes,
+        tempo_limite=parametros.get('tempo_limite'), seed=parametros.get('seed')
+    ):
+        progresso(projecao.n_simulacoes / n_simulacoes, f"{projecao.n_simulacoes} temporadas")
+
+    return {
+        'tabela': projecao.tabela(),
+        'n_simulacoes': projecao.n_simulacoes,
+        'tempo_decorrido': projecao.tempo_decorrido,
+        'vagas_topo': projecao.vagas_topo,
+    }
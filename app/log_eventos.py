@@ -0,0 +1,285 @@
+# Arquivo: app/log_eventos.py
+"""
+Log binário dos eventos de cada partida simulada.
+
+Os eventos ficam em um arquivo só de acréscimo com registros de tamanho fixo
+(partida, minuto, tipo, lado, clube e jogador por id), e um segundo arquivo
+guarda o índice das partidas: posição do primeiro evento, quantidade de
+eventos, clubes, placar e data. A leitura usa memory mapping, então replays e
+estatísticas de eventos (finalizações, defesas, cartões...) de várias
+temporadas são feitos varrendo arrays NumPy, sem re-simular partidas.
+
+O índice é gravado depois dos eventos: se a gravação for interrompida, os
+eventos órfãos no fim do arquivo são descartados na próxima escrita. Cada
+gravação pega a trava do índice, então sessões e processos que gravam ao mesmo
+tempo recebem ids de partida distintos.
+"""
+import os
+import time
+
+import numpy as np
+
+from app.armazenamento import trava_arquivo
+from app.eventos import (
+    Evento, SinkEventos, GOL, DEFESA, FINALIZACAO_FORA, FALTA, ESCANTEIO, CARTAO
+)
+
+LOG_DIR = os.path.join("data", "eventos")
+
+# Registro de um evento (13 bytes)
+DTYPE_EVENTO = np.dtype([
+    ('partida', '<u4'),
+    ('minuto', 'u1'),
+    ('tipo', 'u1'),
+    ('lado', 'u1'),  # 1 = mandante, 2 = visitante, 0 = nenhum
+    ('clube', '<u2'),  # Id do clube do lado (0 = nenhum)
+    ('jogador', '<u4'),  # Id do jogador (0 = nenhum)
+])
+
+# Registro do índice de uma partida (30 bytes)
+DTYPE_PARTIDA = np.dtype([
+    ('partida', '<u4'),
+    ('inicio', '<u8'),  # Posição do primeiro evento no arquivo de eventos
+    ('quantidade', '<u4'),
+    ('clube1', '<u2'),
+    ('clube2', '<u2'),
+    ('gols1', 'u1'),
+    ('gols2', 'u1'),
+    ('data', '<i8'),  # Segundos desde a época Unix
+])
+
+# Estatísticas de eventos por clube: nome -> tipo de evento
+TIPOS_ESTATISTICAS = {
+    'gols': GOL,
+    'defesas': DEFESA,
+    'finalizacoes_fora': FINALIZACAO_FORA,
+    'faltas': FALTA,
+    'escanteios': ESCANTEIO,
+    'cartoes_amarelos': CARTAO,
+}
+
+def _ler_array(caminho, dtype):
+    """Mapeia o arquivo em memória como array de registros (somente leitura)"""
+    if not os.path.isfile(caminho):
+        return np.zeros(0, dtype=dtype)
+    quantidade = os.path.getsize(caminho) // dtype.itemsize
+    if quantidade == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(caminho, dtype=dtype, mode='r', shape=(quantidade,))
+
+def _id_clube(clube):
+    return int(clube.get('id', 0) or 0)
+
+def _ids_jogadores(clube):
+    """Nome do jogador -> id, para os jogadores cadastrados com id"""
+    return {j['nome']: int(j['id']) for j in clube.get('jogadores', []) if j.get('id') is not None}
+
+class LogEventos:
+    """
+    Log de eventos em data/eventos (eventos.bin e partidas.bin).
+
+    adicionar_partida() acumula partidas em memória; gravar() faz uma única
+    escrita por arquivo para todas as pendentes.
+    """
+
+    def __init__(self, diretorio=LOG_DIR):
+        self.diretorio = diretorio
+        self.arquivo_eventos = os.path.join(diretorio, "eventos.bin")
+        self.arquivo_partidas = os.path.join(diretorio, "partidas.bin")
+        self.pendentes = []  # Tuplas (clube1, clube2, gols1, gols2, registros, data)
+
+    def adicionar_partida(self, clube1, clube2, gols1, gols2, eventos, data=None):
+        """
+        Acrescenta uma partida à fila de gravação.
+
+        Args:
+            eventos (list): Eventos emitidos pelo motor (app.eventos.Evento).
+            data (float, opcional): Timestamp da partida; padrão é o momento atual.
+        """
+        clubes = (None, clube1, clube2)
+        ids_clubes = (0, _id_clube(clube1), _id_clube(clube2))
+        ids_jogadores = (None, _ids_jogadores(clube1), _ids_jogadores(clube2))
+
+        registros = np.zeros(len(eventos), dtype=DTYPE_EVENTO)
+        registros['minuto'] = [e.minuto for e in eventos]
+        registros['tipo'] = [e.tipo for e in eventos]
+        registros['lado'] = [e.lado for e in eventos]
+        registros['clube'] = [ids_clubes[e.lado] for e in eventos]
+        registros['jogador'] = [
+            ids_jogadores[e.lado].get(e.jogador, 0) if e.jogador and clubes[e.lado] else 0
+            for e in eventos
+        ]
+
+        self.pendentes.append((ids_clubes[1], ids_clubes[2], gols1, gols2, registros,
+                               time.time() if data is None else data))
+
+    def _preparar_arquivos(self):
+        """
+        Retorna (número de partidas, número de eventos) já gravados, descartando
+        registros incompletos ou eventos sem entrada no índice.
+        """
+        os.makedirs(self.diretorio, exist_ok=True)
+
+        tamanho_partidas = os.path.getsize(self.arquivo_partidas) if os.path.isfile(self.arquivo_partidas) else 0
+        num_partidas = tamanho_partidas // DTYPE_PARTIDA.itemsize
+        if tamanho_partidas != num_partidas * DTYPE_PARTIDA.itemsize:
+            with open(self.arquivo_partidas, 'r+b') as f:
+                f.truncate(num_partidas * DTYPE_PARTIDA.itemsize)
+
+        num_eventos = 0
+        if num_partidas:
+            ultima = _ler_array(self.arquivo_partidas, DTYPE_PARTIDA)[-1]
+            num_eventos = int(ultima['inicio']) + int(ultima['quantidade'])
+
+        tamanho_eventos = os.path.getsize(self.arquivo_eventos) if os.path.isfile(self.arquivo_eventos) else 0
+        if tamanho_eventos != num_eventos * DTYPE_EVENTO.itemsize:
+            with open(self.arquivo_eventos, 'r+b') as f:
+                f.truncate(num_eventos * DTYPE_EVENTO.itemsize)
+
+        return num_partidas, num_eventos
+
+    def gravar(self):
+        """Grava as partidas pendentes. Retorna os ids atribuídos a elas."""
+        if not self.pendentes:
+            return []
+
+        with trava_arquivo(self.arquivo_partidas):
+            num_partidas, num_eventos = self._preparar_arquivos()
+
+            indice = np.zeros(len(self.pendentes), dtype=DTYPE_PARTIDA)
+            blocos = []
+            for i, (clube1, clube2, gols1, gols2, registros, data) in enumerate(self.pendentes):
+                partida = num_partidas + i
+                registros['partida'] = partida
+                indice[i] = (partida, num_eventos, len(registros), clube1, clube2, gols1, gols2, int(data))
+                num_eventos += len(registros)
+                blocos.append(registros)
+
+            with open(self.arquivo_eventos, 'ab') as f:
+                f.write(np.concatenate(blocos).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self.arquivo_partidas, 'ab') as f:
+                f.write(indice.tobytes())
+
+        self.pendentes = []
+        return indice['partida'].tolist()
+
+    def partidas(self):
+        """Índice de partidas (array de registros DTYPE_PARTIDA)"""
+        return _ler_array(self.arquivo_partidas, DTYPE_PARTIDA)
+
+    def eventos(self):
+        """Todos os eventos gravados (array de registros DTYPE_EVENTO)"""
+        partidas = self.partidas()
+        if not partidas.shape[0]:
+            return np.zeros(0, dtype=DTYPE_EVENTO)
+        total = int(partidas[-1]['inicio']) + int(partidas[-1]['quantidade'])
+        return _ler_array(self.arquivo_eventos, DTYPE_EVENTO)[:total]
+
+    def eventos_partida(self, partida):
+        """Registros dos eventos de uma partida, na ordem em que ocorreram"""
+        entrada = self.partidas()[partida]
+        inicio = int(entrada['inicio'])
+        return self.eventos()[inicio:inicio + int(entrada['quantidade'])]
+
+    def reconstruir_partida(self, partida, clubes):
+        """
+        Reconstrói os eventos de uma partida como objetos Evento.
+
+        Args:
+            clubes (dict): Clubes carregados (com 'id' nos clubes e jogadores).
+
+        Returns:
+            tuple: (clube1, clube2, eventos), com o placar de cada evento
+            recalculado a partir dos gols. Clubes que não existem mais no
+            cadastro são substituídos por um registro mínimo.
+        """
+        entrada = self.partidas()[partida]
+        por_id = {_id_clube(clube): clube for clube in clubes.values()}
+        clube1 = por_id.get(int(entrada['clube1']), {'nome': f"Clube {int(entrada['clube1'])}", 'jogadores': []})
+        clube2 = por_id.get(int(entrada['clube2']), {'nome': f"Clube {int(entrada['clube2'])}", 'jogadores': []})
+        nomes = {int(j['id']): j['nome'] for c in (clube1, clube2) for j in c.get('jogadores', []) if j.get('id') is not None}
+
+        registros = self.eventos_partida(partida)
+        gols = [0, 0, 0]
+        eventos = []
+        for minuto, tipo, lado, jogador in zip(registros['minuto'].tolist(), registros['tipo'].tolist(),
+                                               registros['lado'].tolist(), registros['jogador'].tolist()):
+            if tipo == GOL:
+                gols[lado] += 1
+            eventos.append(Evento(tipo, minuto, lado, nomes.get(jogador), gols[1], gols[2]))
+
+        return clube1, clube2, eventos
+
+    def totais_por_clube(self, inicio=None, fim=None):
+        """
+        Conta os eventos de cada tipo por clube, varrendo o log inteiro.
+
+        Args:
+            inicio, fim (float, opcional): Intervalo de datas (timestamps) das
+                partidas consideradas, por exemplo uma temporada.
+
+        Returns:
+            dict: Id do clube -> {'partidas': n, 'gols': n, 'finalizacoes': n,
+            'finalizacoes_gol': n, 'defesas': n, ...}.
+        """
+        partidas = self.partidas()
+        eventos = self.eventos()
+        if not partidas.shape[0]:
+            return {}
+
+        selecionadas = np.ones(partidas.shape[0], dtype=bool)
+        if inicio is not None:
+            selecionadas &= partidas['data'] >= inicio
+        if fim is not None:
+            selecionadas &= partidas['data'] <= fim
+        eventos = eventos[selecionadas[eventos['partida']]]
+
+        tamanho = int(max(partidas['clube1'].max(), partidas['clube2'].max())) + 1
+        jogos = (np.bincount(partidas['clube1'][selecionadas], minlength=tamanho)
+                 + np.bincount(partidas['clube2'][selecionadas], minlength=tamanho))
+        contagens = {
+            nome: np.bincount(eventos['clube'][eventos['tipo'] == tipo], minlength=tamanho)
+            for nome, tipo in TIPOS_ESTATISTICAS.items()
+        }
+
+        # Uma defesa é registrada para o clube do goleiro; a finalização é do adversário
+        defesas = eventos[eventos['tipo'] == DEFESA]
+        finalizador = np.where(defesas['lado'] == 1, partidas['clube2'][defesas['partida']],
+                               partidas['clube1'][defesas['partida']])
+        defesas_sofridas = np.bincount(finalizador, minlength=tamanho)
+        contagens['finalizacoes_gol'] = contagens['gols'] + defesas_sofridas
+        contagens['finalizacoes'] = contagens['finalizacoes_gol'] + contagens['finalizacoes_fora']
+
+        return {
+            clube_id: dict({'partidas': int(jogos[clube_id])},
+                           **{nome: int(contagem[clube_id]) for nome, contagem in contagens.items()})
+            for clube_id in np.flatnonzero(jogos).tolist() if clube_id
+        }
+
+class SinkLogBinario(SinkEventos):
+    """
+    Guarda os eventos da partida e os entrega ao LogEventos no fim do jogo.
+
+    Com gravar=False a partida fica pendente no log, para que simulações em
+    lote chamem log.gravar() uma única vez.
+    """
+
+    def __init__(self, log, clube1, clube2, gravar=True):
+        self.log = log
+        self.clube1 = clube1
+        self.clube2 = clube2
+        self.gravar = gravar
+        self.eventos = []
+        self.partida = None
+
+    def registrar(self, evento):
+        self.eventos.append(evento)
+
+    def finalizar(self):
+        ultimo = self.eventos[-1]
+        self.log.adicionar_partida(self.clube1, self.clube2, ultimo.gols1, ultimo.gols2, self.eventos)
+        self.eventos = []
+        if self.gravar:
+            self.partida = self.log.gravar()[-1]
@@ -1,40 +1,53 @@
 # Arquivo: app/main.py
-import streamlit as st
-import pandas as pd
+import os
 import re
+import sys
 
-# Adiciona o diretório raiz ao sys.path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import streamlit as st
 
-# Importar os módulos da aplicação
-import sys
-import os
-current_dir = os.path.dirname(os.path.abspath(__file__))
-sys.path.insert(0, current_dir)
+# Adiciona o diretório raiz ao sys.path (streamlit run app/main.py só adiciona a pasta app/)
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ_PROJETO not in sys.path:
+    sys.path.append(RAIZ_PROJETO)
 
-# Tentar importar com tratamento de erro
-try:
-    from utils.io import carregar_clubes, carregar_jogadores, carregar_historico, filtrar_historico_por_time
-except ModuleNotFoundError as e:
-    st.error(f"Erro ao importar módulo utils: {e}")
-    st.error(f"Diretório atual: {os.getcwd()}")
-    st.error(f"Arquivos disponíveis: {os.listdir('.')}")
-    if os.path.exists('utils'):
-        st.error(f"Arquivos em utils: {os.listdir('utils')}")
-    else:
-        st.error("Pasta utils não encontrada!")
-    st.stop()
-from app.simulacao import simular_partida
-from app.estatisticas import exibir_estatisticas_time
-from app.classificacao import gerar_tabela_classificacao, gerar_tabela_artilharia, exibir_classificacao_com_logos
+# Os módulos da aplicação (e pandas/PIL, que eles usam) são importados dentro de
+# main(), no ponto em que cada parte da página precisa deles: o título aparece
+# antes de as importações pesadas terminarem. Ver `python -m app.cli startup`.
 
-# NOVA IMPORTAÇÃO PARA TORNEIOS
-try:
-    from app.torneios import pagina_torneios, exibir_classificacao_geral_torneios
-    TORNEIOS_DISPONIVEL = True
-except ImportError:
-    TORNEIOS_DISPONIVEL = False
-    st.sidebar.warning("⚠️ Módulo de torneios não encontrado. Crie o arquivo app/torneios.py")
+def avisar_novidades(chave, total, mensagem):
+    """
+    Aviso (toast) quando o total de partidas ou torneios cresceu desde a última
+    execução da página nesta sessão, inclusive por gravações de outras sessões.
+    """
+    anterior = st.session_state.get(chave)
+    st.session_state[chave] = total
+    if anterior is not None and total > anterior:
+        st.toast(mensagem.format(total - anterior))
+
+def selecionar_competicao(historico, agregados, chave):
+    """
+    Seletor de competição de uma aba. Devolve o histórico e as visões da
+    competição escolhida, lidos só da sua partição, ou os gerais recebidos,
+    e a competição (None para todas).
+    """
+    from app.competicoes import COMPETICOES, competicoes_disponiveis
+    disponiveis = competicoes_disponiveis()
+    if not disponiveis:
+        return historico, agregados, None
+    
+    competicao = st.selectbox("🏷️ Competição:", [None] + disponiveis, key=chave,
+                              format_func=lambda c: "🌐 Todas" if c is None else COMPETICOES[c])
+    if competicao is None:
+        return historico, agregados, None
+    
+    from app.cache_compartilhado import agregados_compartilhados, historico_compartilhado
+    historico_competicao = historico_compartilhado(competicao)
+    try:
+        agregados_competicao = agregados_compartilhados(competicao)
+    except Exception as e:
+        agregados_competicao = None
+        st.warning(f"⚠️ Não foi possível atualizar as estatísticas da competição: {e}")
+    return historico_competicao, agregados_competicao, competicao
 
 def main():
     """
@@ -50,10 +63,21 @@ def main():
     
     st.title("⚽ Simulador de Partidas de Futebol")
     
+    # Dados carregados uma vez por processo e compartilhados entre as sessões
+    # (ver app/cache_compartilhado.py); cada gravação muda a versão deles
+    from app.cache_compartilhado import (
+        agregados_compartilhados, clubes_compartilhados, historico_compartilhado, ratings_compartilhados,
+        resumo_torneios_compartilhado, tabela_do_historico
+    )
+    
     # Carregar dados dos clubes e jogadores
     with st.spinner("🔄 Carregando dados..."):
-        clubes = carregar_clubes()
-        carregar_jogadores(clubes=clubes)
+        try:
+            clubes = clubes_compartilhados()
+        except ModuleNotFoundError as e:
+            st.error(f"Erro ao importar módulo utils: {e}")
+            st.error(f"Diretório atual: {os.getcwd()}")
+            st.stop()
     
     # Exibir informações na sidebar
     st.sidebar.title("📊 Informações Gerais")
@@ -66,21 +90,51 @@ def main():
         st.sidebar.error("❌ Erro ao carregar clubes")
     
     # Carregar histórico (compartilhado entre as abas)
-    historico = carregar_historico()
+    historico = historico_compartilhado()
     
     if historico is not None:
         st.sidebar.metric("⚽ Partidas Simuladas", len(historico))
+        avisar_novidades('partidas_vistas', len(historico), "🔄 {} nova(s) partida(s) no histórico")
+    
+    # Ratings Elo (processa apenas as partidas ainda não contabilizadas)
+    from app.ratings import clubes_com_forca_rating
+    try:
+        ratings = ratings_compartilhados()
+    except Exception as e:
+        ratings = None
+        st.sidebar.warning(f"⚠️ Não foi possível calcular os ratings: {e}")
+    
+    # Estatísticas agregadas do histórico (processa apenas as partidas novas)
+    try:
+        agregados = agregados_compartilhados()
+    except Exception as e:
+        agregados = None
+        st.sidebar.warning(f"⚠️ Não foi possível atualizar as estatísticas agregadas: {e}")
+    
+    # Clubes usados nas simulações: força do cadastro ou força equivalente ao rating
+    clubes_simulacao = clubes
+    if ratings is not None and clubes:
+        usar_rating = st.sidebar.checkbox(
+            "📈 Usar rating Elo como força",
+            help="As simulações usam a força equivalente ao rating Elo atual em vez da força do cadastro"
+        )
+        if usar_rating:
+            clubes_simulacao = clubes_com_forca_rating(clubes, ratings)
+    
+    # Módulo de torneios (opcional)
+    try:
+        from app.torneios import pagina_torneios, exibir_classificacao_geral_torneios
+        TORNEIOS_DISPONIVEL = True
+    except ImportError:
+        TORNEIOS_DISPONIVEL = False
+        st.sidebar.warning("⚠️ Módulo de torneios não encontrado. Crie o arquivo app/torneios.py")
     
     # Verificar se há torneios realizados
     try:
-        import json
-        arquivo_torneios = "data/torneios/historico_torneios.json"
-        if os.path.exists(arquivo_torneios):
-            with open(arquivo_torneios, 'r', encoding='utf-8') as f:
-                historico_torneios = json.load(f)
-            st.sidebar.metric("🏆 Torneios Realizados", len(historico_torneios))
-        else:
-            st.sidebar.metric("🏆 Torneios Realizados", 0)
+        resumo_torneios = resumo_torneios_compartilhado() if TORNEIOS_DISPONIVEL else None
+        st.sidebar.metric("🏆 Torneios Realizados", resumo_torneios['total_torneios'] if resumo_torneios else 0)
+        if resumo_torneios:
+            avisar_novidades('torneios_vistos', resumo_torneios['total_torneios'], "🏆 {} novo(s) torneio(s) no Hall da Fama")
     except:
         st.sidebar.metric("🏆 Torneios Realizados", 0)
     
@@ -177,12 +231,37 @@ def main():
         if clube1_id[0] == clube2_id[0]:
             st.warning("⚠️ Selecione dois clubes diferentes para simular a partida.")
         else:
+            from app.probabilidades import probabilidades_partida
+            from app.simulacao import simular_partida
+            
+            # Probabilidades exatas do modelo (sem simulação)
+            probabilidades = probabilidades_partida(clubes_simulacao[clube1_id[0]], clubes_simulacao[clube2_id[0]])
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric(f"🏠 Vitória {clubes[clube1_id[0]]['nome']}", f"{probabilidades['vitoria_casa']:.1%}")
+            with col2:
+                st.metric("🤝 Empate", f"{probabilidades['empate']:.1%}")
+            with col3:
+                st.metric(f"✈️ Vitória {clubes[clube2_id[0]]['nome']}", f"{probabilidades['vitoria_visitante']:.1%}")
+            st.caption(
+                f"Gols esperados: {probabilidades['gols_casa']:.2f} x {probabilidades['gols_visitante']:.2f}"
+            )
+            
+            # Retrospecto entre os dois clubes (consulta ao índice de confrontos)
+            if agregados is not None:
+                from app.estatisticas import exibir_confronto_direto
+                nome1, nome2 = clubes[clube1_id[0]]['nome'], clubes[clube2_id[0]]['nome']
+                exibir_confronto_direto(nome1, nome2, agregados.confronto(nome1, nome2))
+            
             # Centralizar o botão
             col1, col2, col3 = st.columns([1, 1, 1])
             with col2:
+                usar_escalacao = st.checkbox("🧩 Usar escalações", key="usar_escalacao",
+                                             help="Forças de ataque, defesa e goleiro pela habilidade dos titulares")
                 if st.button("⚽ Simular Partida", use_container_width=True, type="primary"):
                     try:
-                        simular_partida(clubes[clube1_id[0]], clubes[clube2_id[0]])
+                        simular_partida(clubes_simulacao[clube1_id[0]], clubes_simulacao[clube2_id[0]],
+                                        motor="escalacao" if usar_escalacao else "forca")
                     except Exception as e:
                         st.error(f"❌ Erro na simulação: {e}")
     
@@ -190,31 +269,38 @@ def main():
     with tab2:
         st.header("📊 Histórico e Estatísticas")
         
-        if historico is None:
+        historico_aba, agregados_aba, _ = selecionar_competicao(historico, agregados, "competicao_historico")
+        
+        if historico_aba is None:
             st.info("📝 Não há partidas registradas ainda. Simule algumas partidas primeiro!")
         else:
+            import pandas as pd
+            from utils.io import filtrar_historico_por_time
+            from app.estatisticas import exibir_estatisticas_time, exibir_estatisticas_eventos
+            from app.simulacao import exibir_replays
+            
             # Estatísticas rápidas no topo
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                st.metric("⚽ Total de Partidas", len(historico))
+                st.metric("⚽ Total de Partidas", len(historico_aba))
             
             with col2:
-                total_gols = historico['gols_casa'].sum() + historico['gols_visitante'].sum()
+                total_gols = historico_aba['gols_casa'].sum() + historico_aba['gols_visitante'].sum()
                 st.metric("🥅 Total de Gols", total_gols)
             
             with col3:
-                media_gols = total_gols / len(historico) if len(historico) > 0 else 0
+                media_gols = total_gols / len(historico_aba) if len(historico_aba) > 0 else 0
                 st.metric("📊 Média de Gols/Jogo", f"{media_gols:.1f}")
             
             with col4:
-                empates = len(historico[historico['gols_casa'] == historico['gols_visitante']])
+                empates = len(historico_aba[historico_aba['gols_casa'] == historico_aba['gols_visitante']])
                 st.metric("🤝 Empates", empates)
             
             st.markdown("---")
             
             # Obter lista de times para filtrar
-            times = pd.concat([historico['time_casa'], historico['time_visitante']]).unique()
+            times = pd.concat([historico_aba['time_casa'], historico_aba['time_visitante']]).unique()
             time_selecionado = st.selectbox("🔍 Selecione um time para ver estatísticas:", 
                                           ["Todos os times"] + sorted(times.tolist()))
             
@@ -231,39 +317,59 @@ def main():
                         )
                         break
                 
-                # Filtrar histórico pelo time selecionado
-                historico_time = filtrar_historico_por_time(historico, time_selecionado)
-                
-                # Exibir estatísticas
-                exibir_estatisticas_time(historico_time, time_selecionado)
+                # Exibir estatísticas (totais e índice por data já materializados em data/agregados)
+                if agregados_aba is not None:
+                    exibir_estatisticas_time(historico_aba, time_selecionado, agregados_aba)
+                else:
+                    exibir_estatisticas_time(filtrar_historico_por_time(historico_aba, time_selecionado), time_selecionado)
+            
+            # Totais por evento lidos do log binário (finalizações, defesas, cartões)
+            with st.expander("🎯 Estatísticas de Eventos por Time"):
+                exibir_estatisticas_eventos(clubes)
+            
+            # Replay de partidas passadas (sem re-simular)
+            with st.expander("🔁 Replay de Partidas"):
+                exibir_replays(clubes, historico_aba)
             
             # Opção para ver todo o histórico
             if st.checkbox("📋 Ver histórico completo de todas as partidas"):
                 st.subheader("📅 Histórico Completo")
-                # Ordenar por data (mais recente primeiro)
-                historico_completo = historico.sort_values('data', ascending=False)
-                
                 # Limitar a exibição para melhor performance
-                limite = st.slider("Número de partidas a exibir:", 5, len(historico), min(50, len(historico)))
+                limite = len(historico_aba)
+                if limite > 5:
+                    limite = st.slider("Número de partidas a exibir:", 5, limite, min(50, limite))
+                
+                # Mais recentes primeiro: posições lidas do índice por data, sem ordenar o histórico
+                if agregados_aba is not None:
+                    linhas = agregados_aba.linhas_recentes(limite=limite)
+                    historico_completo = historico_aba.iloc[linhas[linhas < len(historico_aba)]]
+                else:
+                    historico_completo = historico_aba.sort_values('data', ascending=False).head(limite)
                 
                 st.dataframe(
-                    historico_completo.head(limite),
+                    historico_completo,
                     hide_index=True,
                     use_container_width=True
                 )
                 
-                if limite < len(historico):
-                    st.info(f"Exibindo {limite} de {len(historico)} partidas. Ajuste o slider para ver mais.")
+                if limite < len(historico_aba):
+                    st.info(f"Exibindo {limite} de {len(historico_aba)} partidas. Ajuste o slider para ver mais.")
     
     # ABA 3: CLASSIFICAÇÃO
     with tab3:
         st.header("🏆 Classificação")
         
-        if historico is None:
+        historico_aba, agregados_aba, competicao_aba = selecionar_competicao(historico, agregados, "competicao_classificacao")
+        
+        if historico_aba is None:
             st.info("📝 Não há partidas registradas ainda. Simule algumas partidas primeiro!")
         else:
+            import pandas as pd
+            from app.classificacao import gerar_tabela_classificacao, gerar_tabela_artilharia, exibir_classificacao_com_logos
+            
             # Gerar a tabela de classificação
-            tabela = gerar_tabela_classificacao(historico)
+            tabela = tabela_do_historico('classificacao', historico_aba, competicao_aba,
+                                         lambda: gerar_tabela_classificacao(historico_aba))
             
             # Exibir a tabela de classificação com logos
             if tabela is not None:
@@ -272,11 +378,30 @@ def main():
                 
                 st.markdown("---")
                 
-                # Seção de artilharia do campeonato
-                artilheiros_df = gerar_tabela_artilharia(historico)
-                if artilheiros_df is not None:
-                    st.subheader("🥇 Artilharia do Campeonato")
-                    
+                # Seção de artilharia do campeonato (contadores mantidos a cada partida salva)
+                st.subheader("🥇 Artilharia do Campeonato")
+                filtro_time, filtro_periodo = None, None
+                with st.expander("🔎 Filtrar artilharia"):
+                    times_tabela = sorted(tabela['time'].tolist())
+                    escolha_time = st.selectbox("Time:", ["Todos os times"] + times_tabela, key="artilharia_time")
+                    if escolha_time != "Todos os times":
+                        filtro_time = escolha_time
+                    if st.checkbox("Filtrar por período", key="artilharia_filtrar_periodo"):
+                        datas_historico = historico_aba['data'].str[:10]
+                        inicio_padrao = pd.Timestamp(datas_historico.min()).date()
+                        fim_padrao = pd.Timestamp(datas_historico.max()).date()
+                        filtro_periodo = st.date_input("Período:", (inicio_padrao, fim_padrao), key="artilharia_periodo")
+                inicio, fim = (filtro_periodo if isinstance(filtro_periodo, (tuple, list)) and len(filtro_periodo) == 2
+                               else (None, None))
+                
+                artilheiros_df = tabela_do_historico(
+                    'artilharia', historico_aba, competicao_aba,
+                    lambda: gerar_tabela_artilharia(historico_aba, limite=15, agregados=agregados_aba,
+                                                    time=filtro_time, inicio=inicio, fim=fim),
+                    filtro_time, inicio, fim)
+                if artilheiros_df is None:
+                    st.info("Nenhum gol marcado com esses filtros.")
+                else:
                     # Exibe artilheiros formatados
                     for i, (jogador, gols) in enumerate(zip(artilheiros_df['Jogador'], artilheiros_df['Gols'])):
                         # Extrai o nome do time entre parênteses
@@ -314,17 +439,39 @@ def main():
                         else:
                             # Fallback se não conseguir extrair o time
                             st.markdown(f"**{i+1}º** {jogador} - **{gols}** ⚽")
-                        
-                        # Limite para os top 15 artilheiros
-                        if i >= 14:
-                            st.info(f"Exibindo os primeiros 15 de {len(artilheiros_df)} artilheiros")
-                            break
+                    
+                    total_artilheiros = (agregados_aba.total_artilheiros(filtro_time, inicio, fim)
+                                         if agregados_aba is not None else len(artilheiros_df))
+                    if total_artilheiros > len(artilheiros_df):
+                        st.info(f"Exibindo os primeiros 15 de {total_artilheiros} artilheiros")
+            
+            # Seção de ratings Elo
+            if ratings is not None:
+                st.markdown("---")
+                st.subheader("📈 Ratings Elo")
+                st.caption(f"Calculados a partir de {ratings.partidas_processadas} partidas do histórico")
+                
+                df_ratings = pd.DataFrame(ratings.tabela(), columns=['Time', 'Rating', 'Força Equivalente'])
+                df_ratings['Rating'] = df_ratings['Rating'].round(0).astype(int)
+                df_ratings['Força Equivalente'] = df_ratings['Força Equivalente'].round(1)
+                df_ratings.index = df_ratings.index + 1
+                df_ratings.index.name = "Pos"
+                st.dataframe(df_ratings, use_container_width=True)
+                
+                time_rating = st.selectbox("📉 Evolução do rating:", df_ratings['Time'].tolist(), key="time_rating")
+                evolucao = ratings.historico_rating(time_rating)
+                if evolucao:
+                    df_evolucao = pd.DataFrame(evolucao, columns=['data', 'rating'])
+                    df_evolucao['partida'] = range(1, len(df_evolucao) + 1)
+                    st.line_chart(df_evolucao, x='partida', y='rating')
+                else:
+                    st.info(f"📝 {time_rating} ainda não disputou partidas.")
     
     # ABA 4: TORNEIOS
     if TORNEIOS_DISPONIVEL and tab4 is not None:
         with tab4:
             try:
-                pagina_torneios(clubes)
+                pagina_torneios(clubes_simulacao)
             except Exception as e:
                 st.error(f"❌ Erro ao carregar módulo de torneios: {e}")
                 st.info("📝 Verifique se o arquivo app/torneios.py existe e está correto.")
@@ -0,0 +1,338 @@
+# Arquivo: app/mata_mata.py
+"""
+Regras do torneio mata-mata (chaves, desempates e pênaltis), sem interface.
+
+O confronto (ida e volta ou jogo único) é a unidade de simulação: o jogo de
+volta conhece o placar da ida, o desempate é resolvido na hora e o resultado
+é um ResultadoConfronto compacto. simular_confrontos_vetorizado() e
+simular_chaveamento_vetorizado() fazem o mesmo com NumPy para Monte Carlo de
+chaveamentos inteiros.
+"""
+import random
+
+import numpy as np
+
+from app.competicoes import gerar_torneio_id
+from app.motor import simular_partida_confronto, simular_placares_vetorizado
+from app.penaltis import simular_disputa_penaltis, prob_vitoria_penaltis
+
+def decidir_por_placar(resultado_ida, resultado_volta=None):
+    """
+    Vencedor de um confronto pelo placar, antes dos pênaltis.
+
+    Args:
+        resultado_ida (tuple): (gols do time1, gols do time2) no jogo de ida
+            (ou jogo único), com o time1 como mandante.
+        resultado_volta (tuple, opcional): (gols do time1, gols do time2) no
+            jogo de volta, com o time2 como mandante.
+
+    Returns:
+        tuple: (vencedor, criterio): vencedor é 1, 2 ou 0 (vai para os
+        pênaltis); criterio é 'placar', 'agregado' ou 'gols fora'.
+    """
+    gols1, gols2 = resultado_ida
+    if resultado_volta is None:
+        return (1 if gols1 > gols2 else 2 if gols2 > gols1 else 0), 'placar'
+
+    total1 = gols1 + resultado_volta[0]
+    total2 = gols2 + resultado_volta[1]
+    if total1 != total2:
+        return (1 if total1 > total2 else 2), 'agregado'
+
+    # Gols fora: time1 marcou fora na volta, time2 marcou fora na ida
+    if resultado_volta[0] != gols2:
+        return (1 if resultado_volta[0] > gols2 else 2), 'gols fora'
+    return 0, 'agregado'
+
+def descrever_confronto(resultado_ida, resultado_volta=None, penaltis=None):
+    """Texto do resultado de um confronto, como exibido nas chaves"""
+    if resultado_volta is None:
+        texto = f"{resultado_ida[0]}-{resultado_ida[1]}"
+    else:
+        total1 = resultado_ida[0] + resultado_volta[0]
+        total2 = resultado_ida[1] + resultado_volta[1]
+        texto = f"Agregado: {total1}-{total2}"
+        if penaltis is None and total1 == total2:
+            texto += " (gols fora)"
+
+    if penaltis is not None:
+        texto += f" ({penaltis[0]}-{penaltis[1]} pên.)"
+    return texto
+
+class ResultadoConfronto:
+    """
+    Resultado de um confronto simulado como unidade.
+
+    ida e volta são (gols do time1, gols do time2); volta é None em jogo
+    único. completo é False quando a volta foi interrompida por já estar
+    decidida (o placar da volta fica parcial, o vencedor não muda).
+    """
+    __slots__ = ('vencedor', 'ida', 'volta', 'penaltis', 'marcadores_ida', 'marcadores_volta', 'completo')
+
+    def __init__(self, vencedor, ida, volta=None, penaltis=None, marcadores_ida=(), marcadores_volta=(), completo=True):
+        self.vencedor = vencedor  # 1 = time1, 2 = time2
+        self.ida = ida
+        self.volta = volta
+        self.penaltis = penaltis
+        self.marcadores_ida = marcadores_ida
+        self.marcadores_volta = marcadores_volta
+        self.completo = completo
+
+    @property
+    def detalhes(self):
+        return descrever_confronto(self.ida, self.volta, self.penaltis)
+
+    def partidas(self, time1, time2):
+        """Jogos do confronto como tuplas (mandante, visitante, gols_mandante, gols_visitante, marcadores)"""
+        partidas = [(time1, time2, self.ida[0], self.ida[1], self.marcadores_ida)]
+        if self.volta is not None:
+            partidas.append((time2, time1, self.volta[1], self.volta[0], self.marcadores_volta))
+        return partidas
+
+    def __repr__(self):
+        return f"ResultadoConfronto(vencedor={self.vencedor}, {self.detalhes})"
+
+def simular_confronto(time1, time2, formato="ida_volta", rng=None, parar_quando_decidido=False):
+    """
+    Simula um confronto inteiro (time1 manda a ida) e resolve o desempate.
+
+    No jogo de volta o time2 joga em casa sabendo o placar da ida: o ajuste
+    de ataque e a motivação no intervalo usam o agregado. Com
+    parar_quando_decidido=True a volta é interrompida quando nenhum placar
+    possível muda o classificado (útil em Monte Carlo; os jogos não devem
+    então ser gravados no histórico).
+
+    Returns:
+        ResultadoConfronto
+    """
+    if rng is None:
+        rng = random
+
+    gols1, gols2, marcadores_ida, _ = simular_partida_confronto(time1, time2, rng)
+    ida = (gols1, gols2)
+    volta = None
+    marcadores_volta = []
+    completo = True
+
+    if formato == "ida_volta":
+        gols2_volta, gols1_volta, marcadores_volta, completo = simular_partida_confronto(
+            time2, time1, rng, saldo_inicial=gols2 - gols1, encerrar_se_decidido=parar_quando_decidido
+        )
+        volta = (gols1_volta, gols2_volta)
+
+    vencedor, _ = decidir_por_placar(ida, volta)
+    penaltis = None
+    if not vencedor:
+        penaltis1, penaltis2, _ = simular_disputa_penaltis(time1, time2, rng)
+        penaltis = (penaltis1, penaltis2)
+        vencedor = 1 if penaltis1 > penaltis2 else 2
+
+    return ResultadoConfronto(vencedor, ida, volta, penaltis, marcadores_ida, marcadores_volta, completo)
+
+def simular_confrontos_vetorizado(forcas1, forcas2, prob_penaltis, n_simulacoes, formato="ida_volta", rng=None):
+    """
+    Simula vários confrontos, n_simulacoes vezes cada, de uma vez com NumPy.
+
+    Mesmo modelo de simular_confronto() (volta dependente do agregado, gols
+    fora e pênaltis), sem autores de gols. A disputa de pênaltis é decidida
+    pela sua probabilidade exata (app.penaltis.prob_vitoria_penaltis).
+
+    Args:
+        forcas1, forcas2 (array-like): Forças do time1 (mandante na ida) e do
+            time2, um valor por confronto ou formato (n_simulacoes, confrontos).
+        prob_penaltis (array-like): Chance de o time1 vencer nos pênaltis, no mesmo formato.
+        rng (numpy.random.Generator, opcional): Gerador de números aleatórios.
+
+    Returns:
+        ndarray: Booleanos (n_simulacoes, confrontos), True quando o time1 avança.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    ida1, ida2 = simular_placares_vetorizado(forcas1, forcas2, n_simulacoes, rng)
+    saldo = ida1.astype(np.int32) - ida2
+    desempate = np.zeros(saldo.shape, dtype=np.int32)
+
+    if formato == "ida_volta":
+        volta2, volta1 = simular_placares_vetorizado(forcas2, forcas1, n_simulacoes, rng, saldo_inicial=-saldo)
+        saldo += volta1.astype(np.int32) - volta2
+        desempate = volta1.astype(np.int32) - ida2  # Gols fora
+
+    penaltis = rng.random(saldo.shape) < np.broadcast_to(prob_penaltis, saldo.shape)
+    return np.where(saldo != 0, saldo > 0, np.where(desempate != 0, desempate > 0, penaltis))
+
+def simular_chaveamento_vetorizado(times, formato="ida_volta", n_simulacoes=10000, sortear_chaves=True, seed=None):
+    """
+    Monte Carlo de um mata-mata inteiro, com o confronto como unidade.
+
+    Cada repetição sorteia as chaves uma vez (como TorneioMataMata.sortear_chaves())
+    e os vencedores seguem o chaveamento, como em simular_chaveamento(). Cada
+    fase de todas as repetições é um único lote de confrontos.
+
+    Returns:
+        list: Tuplas (nome, prob_final, prob_titulo), ordenadas pela chance de título.
+    """
+    rng = np.random.default_rng(seed)
+    num_times = len(times)
+    forcas = np.array([time_clube['forca_geral'] for time_clube in times], dtype=float)
+    penaltis = np.array([[prob_vitoria_penaltis(time1, time2) if time1 is not time2 else 0.5
+                          for time2 in times] for time1 in times])
+
+    vivos = np.tile(np.arange(num_times), (n_simulacoes, 1))
+    if sortear_chaves:
+        vivos = np.take_along_axis(vivos, rng.random(vivos.shape).argsort(axis=1), axis=1)
+
+    finalistas = vivos
+    while vivos.shape[1] > 1:
+        if vivos.shape[1] == 2:
+            finalistas = vivos
+        time1, time2 = vivos[:, 0::2], vivos[:, 1::2]
+        avanca_time1 = simular_confrontos_vetorizado(forcas[time1], forcas[time2], penaltis[time1, time2],
+                                                     n_simulacoes, formato, rng)
+        vivos = np.where(avanca_time1, time1, time2)
+
+    prob_titulo = np.bincount(vivos[:, 0], minlength=num_times) / n_simulacoes
+    prob_final = np.bincount(finalistas.reshape(-1), minlength=num_times) / n_simulacoes
+    resultado = [(time_clube['nome'], float(prob_final[i]), float(prob_titulo[i])) for i, time_clube in enumerate(times)]
+    return sorted(resultado, key=lambda x: x[2], reverse=True)
+
+# Nome da fase pelo número de times que a disputam
+NOMES_FASES = {
+    2: "Final",
+    4: "Semifinais",
+    8: "Quartas de Final",
+    16: "Oitavas de Final",
+    32: "Dezesseis-avos de Final",
+    64: "Trinta-e-dois-avos de Final",
+}
+
+def nome_fase(num_times):
+    return NOMES_FASES.get(num_times, f"Fase de {num_times} times")
+
+class TorneioMataMata:
+    def __init__(self, nome, times, formato="ida_volta", rng=None):
+        self.nome = nome
+        self.id = gerar_torneio_id(nome)  # torneio_id das partidas no histórico
+        self.times = times
+        self.formato = formato  # "ida_volta" ou "jogo_unico"
+        self.fase_atual = None
+        self.chaves = {}
+        self.resultados = {}
+        self.campeao = None
+        self.vice = None
+        self.historico = []
+        self.rng = rng if rng is not None else random
+        
+    def validar_numero_times(self):
+        """Valida se o número de times é válido para mata-mata"""
+        num_times = len(self.times)
+        potencias_validas = [2, 4, 8, 16, 32, 64]
+        
+        if num_times not in potencias_validas:
+            return False, f"Número inválido de times ({num_times}). Use: {potencias_validas}"
+        
+        return True, "OK"
+    
+    def gerar_fases(self):
+        """Gera as fases do torneio baseado no número de times (uma por rodada até a final)"""
+        fases = []
+        times_restantes = len(self.times)
+        while times_restantes > 2:
+            fases.append(nome_fase(times_restantes))
+            times_restantes = (times_restantes + 1) // 2
+        fases.append("Final")
+        
+        return fases
+    
+    def sortear_chaves(self, times_participantes):
+        """Sorteia as chaves de uma fase"""
+        times_embaralhados = times_participantes.copy()
+        self.rng.shuffle(times_embaralhados)
+        
+        return self.montar_chaves(times_embaralhados)
+    
+    def montar_chaves(self, times_ordenados):
+        """Monta as chaves pareando os times na ordem recebida (1x2, 3x4, ...)"""
+        chaves = []
+        for i in range(0, len(times_ordenados), 2):
+            chave = {
+                'time1': times_ordenados[i],
+                'time2': times_ordenados[i+1],
+                'resultado_ida': None,
+                'resultado_volta': None,
+                'vencedor': None,
+                'detalhes': {}
+            }
+            chaves.append(chave)
+        
+        return chaves
+    
+    def simular_penaltis(self, time1, time2):
+        """Simula disputa de pênaltis (time1 cobra primeiro) com os elencos dos times"""
+        penaltis1, penaltis2, _ = simular_disputa_penaltis(time1, time2, self.rng)
+        return penaltis1, penaltis2
+    
+    def determinar_vencedor_chave(self, chave):
+        """Determina o vencedor de uma chave já disputada (placares em resultado_ida/resultado_volta)"""
+        time1 = chave['time1']
+        time2 = chave['time2']
+        resultado_volta = chave['resultado_volta'] if self.formato == "ida_volta" else None
+        
+        vencedor, _ = decidir_por_placar(chave['resultado_ida'], resultado_volta)
+        penaltis = None
+        if not vencedor:
+            penaltis = self.simular_penaltis(time1, time2)
+            vencedor = 1 if penaltis[0] > penaltis[1] else 2
+        
+        return (time1 if vencedor == 1 else time2), descrever_confronto(chave['resultado_ida'], resultado_volta, penaltis)
+    
+    def simular_chave(self, chave):
+        """
+        Simula uma chave sem interface gráfica e preenche resultado e vencedor.
+        
+        Returns:
+            list: Partidas disputadas como tuplas (clube1, clube2, gols1, gols2, marcadores_gols).
+        """
+        resultado = simular_confronto(chave['time1'], chave['time2'], self.formato, self.rng)
+        chave['resultado_ida'] = resultado.ida
+        chave['resultado_volta'] = resultado.volta
+        chave['vencedor'] = chave['time1'] if resultado.vencedor == 1 else chave['time2']
+        chave['detalhes'] = resultado.detalhes
+        
+        return resultado.partidas(chave['time1'], chave['time2'])
+    
+    def simular_chaveamento(self, chaves):
+        """
+        Simula sem interface todas as fases a partir das chaves iniciais.
+        
+        Os vencedores de chaves vizinhas se enfrentam na fase seguinte, mantendo
+        o chaveamento montado (sem novo sorteio), até sobrar um só. Cada fase é
+        nomeada pelo número de times que a disputam. Preenche self.chaves,
+        self.resultados, self.campeao e self.vice.
+        
+        Returns:
+            list: Todas as partidas disputadas.
+        """
+        partidas = []
+        
+        while chaves:
+            fase = nome_fase(2 * len(chaves))
+            vencedores = []
+            for chave in chaves:
+                partidas.extend(self.simular_chave(chave))
+                vencedores.append(chave['vencedor'])
+            
+            self.chaves[fase] = chaves
+            self.resultados[fase] = vencedores
+            
+            if len(vencedores) == 1:
+                final = chaves[0]
+                self.campeao = final['vencedor']
+                self.vice = final['time1'] if final['time2'] is self.campeao else final['time2']
+                break
+            
+            chaves = self.montar_chaves(vencedores)
+        
+        if self.campeao is None:
+            raise ValueError(f"Chaveamento de {self.nome} terminou sem campeão")
+        return partidas
@@ -0,0 +1,261 @@
+# Arquivo: app/matriz_confrontos.py
+"""
+Matriz de confrontos: probabilidades exatas de todos os pares de clubes.
+
+Para cada par (mandante, visitante) guarda a distribuição de placar, as
+probabilidades de vitória/empate/derrota, a chance de vencer nos pênaltis e
+as chances de classificação em um mata-mata (jogo único ou ida e volta).
+A matriz é calculada uma vez e gravada em data/cache/; ela é refeita quando
+o cadastro de clubes, o de jogadores, os ratings usados ou as forças dos
+clubes mudam. Análises de torneio passam a
+ser consultas à tabela, sem simular partidas.
+"""
+import hashlib
+import glob
+import os
+
+import numpy as np
+
+from app.probabilidades import distribuicoes_placar, TAMANHO_GRADE
+from app.penaltis import prob_vitoria_penaltis
+
+DATA_DIR = "data"
+CACHE_DIR = os.path.join(DATA_DIR, "cache")
+CLUBES_ARQUIVO = os.path.join(DATA_DIR, "clubes_utf8.csv")
+JOGADORES_ARQUIVO = os.path.join(DATA_DIR, "jogadores_utf8.csv")
+RATINGS_ARQUIVO = os.path.join(DATA_DIR, "ratings", "ratings.json")
+
+VERSAO_MODELO = "2"
+MATRIZES_MANTIDAS = 4
+
+_matrizes_em_memoria = {}
+
+def _bytes_arquivo(caminho):
+    if not os.path.isfile(caminho):
+        return b''
+    with open(caminho, 'rb') as f:
+        return f.read()
+
+def impressao_digital(clubes):
+    """
+    Identificador do conteúdo que determina a matriz.
+
+    Combina o cadastro de clubes e jogadores, os ratings (quando os clubes
+    usam força derivada do rating) e as forças efetivamente usadas.
+    """
+    usa_rating = any('forca_cadastro' in clube for clube in clubes.values())
+    hash_conteudo = hashlib.sha1(VERSAO_MODELO.encode())
+    hash_conteudo.update(_bytes_arquivo(CLUBES_ARQUIVO))
+    hash_conteudo.update(_bytes_arquivo(JOGADORES_ARQUIVO))
+    if usa_rating:
+        hash_conteudo.update(_bytes_arquivo(RATINGS_ARQUIVO))
+    for clube in clubes.values():
+        hash_conteudo.update(f"{clube['nome']}|{float(clube['forca_geral'])!r};".encode('utf-8'))
+    return hash_conteudo.hexdigest()[:16]
+
+def _grades_por_diferenca(distribuicoes, gols_do_time1_na_coluna):
+    """
+    Reorganiza distribuições de placar por (saldo do time1, gols de referência).
+
+    Para o jogo de ida (time1 mandante, linha = gols do time1) devolve
+    P[saldo, gols do time2]; para o de volta (time1 visitante, coluna = gols
+    do time1) devolve P[saldo, gols do time1].
+    """
+    gols = np.arange(TAMANHO_GRADE)
+    linha, coluna = np.meshgrid(gols, gols, indexing='ij')
+    forma = distribuicoes.shape[:-2] + (2 * TAMANHO_GRADE - 1, TAMANHO_GRADE)
+    resultado = np.zeros(forma)
+    if gols_do_time1_na_coluna:
+        resultado[..., coluna - linha + TAMANHO_GRADE - 1, coluna] = distribuicoes
+    else:
+        resultado[..., linha - coluna + TAMANHO_GRADE - 1, coluna] = distribuicoes
+    return resultado
+
+def prob_classificacao_ida_volta(ida, volta, prob_penaltis):
+    """
+    Probabilidade de o time1 avançar em um confronto de ida e volta.
+
+    Args:
+        ida (ndarray): Distribuições do jogo de ida (time1 mandante), formato (..., 25, 25).
+        volta (ndarray): Distribuições do jogo de volta (time2 mandante), mesmo formato.
+        prob_penaltis (ndarray or float): Chance de o time1 vencer nos pênaltis, formato (...).
+
+    Critérios como em TorneioMataMata.determinar_vencedor_chave():
+    agregado, gols fora e pênaltis. Os dois jogos são tratados como
+    independentes; no simulador a volta reage ao agregado da ida
+    (app.mata_mata.simular_confronto), o que muda a chance de classificação
+    em menos de 0,2 ponto percentual.
+    """
+    tamanho_saldo = 2 * TAMANHO_GRADE - 1
+    # ida: P[saldo1, gols do time2 em casa]; volta: P[saldo2, gols do time1 fora]
+    saldo_ida = _grades_por_diferenca(ida, False)
+    saldo_volta = _grades_por_diferenca(volta, True)
+
+    marginal_ida = saldo_ida.sum(axis=-1)
+    marginal_volta = saldo_volta.sum(axis=-1)
+    saldos = np.arange(tamanho_saldo) - (TAMANHO_GRADE - 1)
+    vence_agregado = (saldos[:, None] + saldos[None, :] > 0).astype(float)
+    prob_agregado = np.einsum('...x,xy,...y->...', marginal_ida, vence_agregado, marginal_volta)
+
+    # Agregado empatado: saldo da volta é o oposto do da ida; desempate pelos gols fora
+    gols = np.arange(TAMANHO_GRADE)
+    mais_gols_fora = (gols[None, :] > gols[:, None]).astype(float)
+    volta_espelhada = saldo_volta[..., ::-1, :]
+    prob_gols_fora = np.einsum('...xb,bd,...xd->...', saldo_ida, mais_gols_fora, volta_espelhada)
+    prob_penaltis_total = np.einsum('...xb,...xb->...', saldo_ida, volta_espelhada)
+
+    return prob_agregado + prob_gols_fora + prob_penaltis_total * prob_penaltis
+
+class MatrizConfrontos:
+    """Probabilidades de todos os confrontos entre os clubes carregados"""
+
+    def __init__(self, nomes, forcas, distribuicoes, penaltis):
+        self.nomes = list(nomes)
+        self.indice = {nome: i for i, nome in enumerate(self.nomes)}
+        self.forcas = np.asarray(forcas, dtype=float)
+        self.distribuicoes = distribuicoes  # (N, N, 25, 25): mandante, visitante, gols
+        self.penaltis = penaltis  # (N, N): chance de i vencer nos pênaltis cobrando primeiro
+        self.vitoria = np.tril(distribuicoes, -1).sum(axis=(-2, -1))
+        self.empate = np.trace(distribuicoes, axis1=-2, axis2=-1)
+        self.derrota = 1 - self.vitoria - self.empate
+        gols = np.arange(TAMANHO_GRADE)
+        self.gols_casa = distribuicoes.sum(axis=-1) @ gols
+        self.gols_visitante = distribuicoes.sum(axis=-2) @ gols
+        self._classificacao = {}
+
+    @classmethod
+    def calcular(cls, clubes):
+        """Calcula a matriz para um dict de clubes (como o de carregar_clubes())"""
+        nomes = [clube['nome'] for clube in clubes.values()]
+        forcas = np.array([float(clube['forca_geral']) for clube in clubes.values()])
+        n = len(nomes)
+        distribuicoes = distribuicoes_placar(np.repeat(forcas, n), np.tile(forcas, n))
+        penaltis = np.array([[prob_vitoria_penaltis(clube1, clube2) for clube2 in clubes.values()]
+                             for clube1 in clubes.values()])
+        return cls(nomes, forcas, distribuicoes.reshape(n, n, TAMANHO_GRADE, TAMANHO_GRADE), penaltis)
+
+    def par(self, casa, visitante):
+        """Índices de um confronto a partir de nomes ou de clubes (Clube ou dict)"""
+        if not isinstance(casa, str):
+            casa = casa['nome']
+        if not isinstance(visitante, str):
+            visitante = visitante['nome']
+        return self.indice[casa], self.indice[visitante]
+
+    def probabilidades(self, casa, visitante):
+        """(vitória do mandante, empate, vitória do visitante)"""
+        i, j = self.par(casa, visitante)
+        return float(self.vitoria[i, j]), float(self.empate[i, j]), float(self.derrota[i, j])
+
+    def distribuicao(self, casa, visitante):
+        """Distribuição P(gols_casa, gols_visitante) do confronto"""
+        i, j = self.par(casa, visitante)
+        return self.distribuicoes[i, j]
+
+    def classificacao(self, formato="ida_volta"):
+        """
+        Matriz A[i, j] com a chance de i eliminar j quando i é o time1 da chave
+        (mandante no jogo único ou no jogo de ida).
+        """
+        if formato not in self._classificacao:
+            if formato == "jogo_unico":
+                matriz = self.vitoria + self.penaltis * self.empate
+            else:
+                matriz = prob_classificacao_ida_volta(self.distribuicoes, self.distribuicoes.transpose(1, 0, 2, 3),
+                                                      self.penaltis)
+            self._classificacao[formato] = matriz
+        return self._classificacao[formato]
+
+    def salvar(self, arquivo):
+        os.makedirs(os.path.dirname(arquivo), exist_ok=True)
+        temporario = arquivo + '.tmp.npz'
+        np.savez_compressed(temporario, nomes=np.array(self.nomes), forcas=self.forcas,
+                            distribuicoes=self.distribuicoes, penaltis=self.penaltis)
+        os.replace(temporario, arquivo)
+
+    @classmethod
+    def carregar(cls, arquivo):
+        with np.load(arquivo) as dados:
+            return cls(dados['nomes'].tolist(), dados['forcas'], dados['distribuicoes'], dados['penaltis'])
+
+def _remover_matrizes_antigas(manter):
+    arquivos = sorted(glob.glob(os.path.join(CACHE_DIR, "matriz_confrontos_*.npz")), key=os.path.getmtime, reverse=True)
+    for arquivo in arquivos[manter:]:
+        try:
+            os.remove(arquivo)
+        except OSError:
+            pass
+
+def carregar_matriz_confrontos(clubes):
+    """
+    Retorna a matriz de confrontos dos clubes, do cache quando possível.
+
+    Procura primeiro na memória do processo e depois em data/cache/; se a
+    impressão digital mudou, recalcula e grava. Mantém as matrizes mais
+    recentes em disco (ex.: com e sem força por rating).
+    """
+    chave = impressao_digital(clubes)
+    if chave in _matrizes_em_memoria:
+        return _matrizes_em_memoria[chave]
+
+    arquivo = os.path.join(CACHE_DIR, f"matriz_confrontos_{chave}.npz")
+    matriz = None
+    if os.path.isfile(arquivo):
+        try:
+            matriz = MatrizConfrontos.carregar(arquivo)
+        except (OSError, ValueError, KeyError):
+            matriz = None
+
+    if matriz is None:
+        matriz = MatrizConfrontos.calcular(clubes)
+        try:
+            matriz.salvar(arquivo)
+            _remover_matrizes_antigas(MATRIZES_MANTIDAS)
+        except OSError as e:
+            print(f"⚠️ Não foi possível gravar a matriz de confrontos: {e}")
+
+    _matrizes_em_memoria.clear()
+    _matrizes_em_memoria[chave] = matriz
+    return matriz
+
+def probabilidades_titulo_mata_mata(times, matriz, formato="ida_volta", n_simulacoes=20000,
+                                    sortear_cada_fase=True, seed=None):
+    """
+    Chances de cada time em um mata-mata usando apenas consultas à matriz.
+
+    Cada repetição sorteia as chaves (como em TorneioMataMata.sortear_chaves())
+    e decide cada confronto com a probabilidade de classificação da matriz;
+    todas as repetições são processadas juntas com NumPy.
+
+    Args:
+        times (list): Clubes participantes (potência de 2).
+        matriz (MatrizConfrontos): Matriz com todos os participantes.
+        formato (str): "ida_volta" ou "jogo_unico".
+        sortear_cada_fase (bool): Se True, as chaves são sorteadas de novo a
+            cada fase; se False, os vencedores seguem o chaveamento na ordem de times.
+
+    Returns:
+        list: Tuplas (nome, prob_final, prob_titulo), ordenadas pela chance de título.
+    """
+    rng = np.random.default_rng(seed)
+    classificacao = matriz.classificacao(formato)
+    indices = np.array([matriz.par(time, time)[0] for time in times])
+    num_times = len(indices)
+
+    vivos = np.tile(indices, (n_simulacoes, 1))
+    finalistas = None
+    while vivos.shape[1] > 1:
+        if sortear_cada_fase:
+            vivos = np.take_along_axis(vivos, rng.random(vivos.shape).argsort(axis=1), axis=1)
+        if vivos.shape[1] == 2:
+            finalistas = vivos.copy()
+        time1, time2 = vivos[:, 0::2], vivos[:, 1::2]
+        vence_time1 = rng.random(time1.shape) < classificacao[time1, time2]
+        vivos = np.where(vence_time1, time1, time2)
+
+    total_indices = len(matriz.nomes)
+    prob_titulo = np.bincount(vivos[:, 0], minlength=total_indices) / n_simulacoes
+    prob_final = np.bincount(finalistas.reshape(-1), minlength=total_indices) / n_simulacoes if num_times > 1 else prob_titulo
+
+    resultado = [(matriz.nomes[i], float(prob_final[i]), float(prob_titulo[i])) for i in indices]
+    return sorted(resultado, key=lambda x: x[2], reverse=True)
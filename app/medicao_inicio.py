@@ -0,0 +1,118 @@
+# Arquivo: app/medicao_inicio.py
+"""
+Tempo até a primeira renderização da página, sem servidor nem navegador.
+
+Executa o que o servidor do Streamlit executa na primeira visita (import
+app.main e main(), com todas as abas: st.tabs monta o corpo de cada uma a
+cada execução) trocando o Streamlit por um substituto que aceita qualquer
+comando e devolve o valor padrão de cada widget. Fica de fora só o custo do
+próprio Streamlit, que o servidor já carregou antes da primeira visita.
+
+Usado por `python -m app.cli startup`, que roda este módulo em um
+interpretador novo (python -X importtime -m app.medicao_inicio) e lê a
+linha de resultado em JSON. Só usa a biblioteca padrão, para não carregar
+de antemão nada que app.main adia.
+"""
+import datetime
+import json
+import sys
+import time
+import types
+
+class InterrupcaoScript(Exception):
+    """st.stop() e st.rerun(): encerram a execução, como no servidor"""
+
+class EstadoSessao(dict):
+    """st.session_state: dict com acesso também por atributo"""
+
+    def __getattr__(self, nome):
+        try:
+            return self[nome]
+        except KeyError:
+            raise AttributeError(nome) from None
+
+    def __setattr__(self, nome, valor):
+        self[nome] = valor
+
+    def __delattr__(self, nome):
+        self.pop(nome, None)
+
+class Elemento:
+    """Retorno dos comandos de exibição: aceita qualquer comando e serve de contexto (with)"""
+
+    def __getattr__(self, nome):
+        return comando(nome)
+
+    def __call__(self, *args, **kwargs):
+        return Elemento()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+def opcao_padrao(*args, **kwargs):
+    opcoes = list(kwargs.get('options', args[1] if len(args) > 1 else []))
+    if 'value' in kwargs:
+        return kwargs['value']
+    return opcoes[kwargs.get('index', 0) or 0] if opcoes else None
+
+def quantidade(spec):
+    return spec if isinstance(spec, int) else len(spec)
+
+# Valor devolvido por cada widget sem interação do usuário
+WIDGETS = {
+    'button': lambda *a, **k: False,
+    'form_submit_button': lambda *a, **k: False,
+    'download_button': lambda *a, **k: False,
+    'checkbox': lambda *a, **k: k.get('value', False),
+    'toggle': lambda *a, **k: k.get('value', False),
+    'selectbox': opcao_padrao,
+    'radio': opcao_padrao,
+    'select_slider': opcao_padrao,
+    'multiselect': lambda *a, **k: list(k.get('default') or []),
+    'slider': lambda *a, **k: k.get('value', a[3] if len(a) > 3 else k.get('min_value', a[1] if len(a) > 1 else 0)),
+    'number_input': lambda *a, **k: k.get('value', a[3] if len(a) > 3 else k.get('min_value', a[1] if len(a) > 1 else 0)),
+    'text_input': lambda *a, **k: k.get('value', ''),
+    'text_area': lambda *a, **k: k.get('value', ''),
+    'date_input': lambda *a, **k: k.get('value', datetime.date.today()),
+    'columns': lambda spec, *a, **k: [Elemento() for _ in range(quantidade(spec))],
+    'tabs': lambda rotulos, *a, **k: [Elemento() for _ in rotulos],
+    'cache_data': lambda *a, **k: a[0] if a and callable(a[0]) else (lambda funcao: funcao),
+    'cache_resource': lambda *a, **k: a[0] if a and callable(a[0]) else (lambda funcao: funcao),
+}
+
+def interromper(*args, **kwargs):
+    raise InterrupcaoScript()
+
+def comando(nome):
+    if nome in ('stop', 'rerun'):
+        return interromper
+    return WIDGETS.get(nome, Elemento())
+
+def streamlit_substituto():
+    modulo = types.ModuleType('streamlit')
+    modulo.__getattr__ = comando
+    modulo.session_state = EstadoSessao()
+    modulo.sidebar = Elemento()
+    return modulo
+
+def medir():
+    """Tempos (ms) de import app.main e da primeira execução de main()"""
+    sys.modules['streamlit'] = streamlit_substituto()
+    inicio = time.perf_counter()
+    import app.main
+    importado = time.perf_counter()
+    try:
+        app.main.main()
+    except InterrupcaoScript:
+        pass
+    fim = time.perf_counter()
+    return {'importacao_ms': 1000 * (importado - inicio), 'renderizacao_ms': 1000 * (fim - inicio)}
+
+if __name__ == '__main__':
+    # Mensagens de carga da aplicação vão para o stderr; o stdout fica só com o resultado
+    saida, sys.stdout = sys.stdout, sys.stderr
+    resultado = medir()
+    saida.write(json.dumps(resultado) + '\n')
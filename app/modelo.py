@@ -0,0 +1,144 @@
+# Arquivo: app/modelo.py
+"""
+Modelo compacto de clubes e jogadores.
+
+Clube e Jogador usam __slots__: sem o dicionário de atributos de cada objeto,
+um jogador ocupa uma fração de um dict com as mesmas chaves. O logo de cada
+clube (base64, dezenas de KB) fica uma única vez no registro LOGOS, pelo id do
+clube: o Clube guarda só o id, então cópias (força pelo rating), chaves de
+torneio e objetos enviados a outros processos (pickle, tarefas em segundo
+plano) não carregam o logo junto.
+
+Para o código de interface que lê clube['nome'] ou clube.get('logo_base64'),
+as classes também aceitam acesso como dicionário; os motores de simulação
+usam os atributos diretamente.
+"""
+# id do clube -> logo em base64
+LOGOS = {}
+
+# Posições do cadastro que contam como goleiro; as demais são de linha
+POSICOES_GOLEIRO = ('Goleiro', 'GOL', 'GK')
+
+def eh_goleiro(posicao):
+    return str(posicao).strip() in POSICOES_GOLEIRO
+
+def registrar_logo(clube_id, logo_base64):
+    if logo_base64:
+        LOGOS[clube_id] = logo_base64
+    else:
+        LOGOS.pop(clube_id, None)
+
+class ComoDicionario:
+    """Leitura dos campos como em um dict: obj['campo'], obj.get(), 'campo' in obj, dict(obj)"""
+    __slots__ = ()
+    CAMPOS = ()
+
+    def __getitem__(self, campo):
+        if campo not in self.CAMPOS:
+            raise KeyError(campo)
+        return getattr(self, campo)
+
+    def __setitem__(self, campo, valor):
+        if campo not in self.CAMPOS:
+            raise KeyError(campo)
+        setattr(self, campo, valor)
+
+    def get(self, campo, padrao=None):
+        valor = getattr(self, campo, None) if campo in self.CAMPOS else None
+        return padrao if valor is None else valor
+
+    def __contains__(self, campo):
+        # Campos vazios (None) contam como ausentes, como chaves que o dict não tinha
+        return campo in self.CAMPOS and getattr(self, campo, None) is not None
+
+    def keys(self):
+        return [campo for campo in self.CAMPOS if campo in self]
+
+    def para_dict(self):
+        return {campo: self[campo] for campo in self.keys()}
+
+class Jogador(ComoDicionario):
+    __slots__ = ('id', 'nome', 'posicao', 'habilidade')
+    CAMPOS = __slots__
+
+    def __init__(self, nome, posicao, habilidade, id=None):
+        self.id = id
+        self.nome = nome
+        self.posicao = posicao
+        self.habilidade = habilidade
+
+    def __reduce__(self):
+        return Jogador, (self.nome, self.posicao, self.habilidade, self.id)
+
+    def __repr__(self):
+        return f"Jogador({self.nome!r}, {self.posicao!r}, {self.habilidade})"
+
+class Clube(ComoDicionario):
+    """
+    Clube com elenco. Atacantes e goleiro são separados uma vez (ao montar o
+    elenco) em vez de a cada partida simulada.
+    """
+    __slots__ = ('id', 'nome', 'forca_geral', 'jogadores', 'forca_cadastro', 'atacantes', 'goleiro')
+    CAMPOS = ('id', 'nome', 'forca_geral', 'jogadores', 'forca_cadastro', 'logo_base64')
+
+    def __init__(self, id, nome, forca_geral, jogadores=None, forca_cadastro=None):
+        self.id = id
+        self.nome = nome
+        self.forca_geral = forca_geral
+        self.forca_cadastro = forca_cadastro  # Força do cadastro quando forca_geral vem do rating
+        self.definir_elenco(jogadores or [])
+
+    @property
+    def logo_base64(self):
+        return LOGOS.get(self.id)
+
+    def definir_elenco(self, jogadores):
+        self.jogadores = list(jogadores)
+        self.atacantes = [j for j in self.jogadores if not eh_goleiro(j.posicao)]
+        self.goleiro = next((j for j in self.jogadores if eh_goleiro(j.posicao)), None)
+
+    def adicionar_jogador(self, jogador):
+        self.jogadores.append(jogador)
+        if eh_goleiro(jogador.posicao):
+            self.goleiro = self.goleiro or jogador
+        else:
+            self.atacantes.append(jogador)
+
+    def com_forca(self, forca_geral):
+        """Cópia com outra força (mesmo elenco e logo); a original fica em forca_cadastro"""
+        copia = Clube.__new__(Clube)
+        copia.id, copia.nome, copia.jogadores = self.id, self.nome, self.jogadores
+        copia.atacantes, copia.goleiro = self.atacantes, self.goleiro
+        copia.forca_geral = forca_geral
+        copia.forca_cadastro = self.forca_cadastro if self.forca_cadastro is not None else self.forca_geral
+        return copia
+
+    def __reduce__(self):
+        # Atacantes e goleiro são refeitos do elenco ao desserializar
+        return Clube, (self.id, self.nome, self.forca_geral, self.jogadores, self.forca_cadastro)
+
+    def __eq__(self, outro):
+        if not isinstance(outro, Clube):
+            return NotImplemented
+        return (self.id, self.nome) == (outro.id, outro.nome)
+
+    def __hash__(self):
+        return hash((self.id, self.nome))
+
+    def __repr__(self):
+        return f"Clube({self.id}, {self.nome!r}, {self.forca_geral})"
+
+def como_jogador(dados):
+    if isinstance(dados, Jogador):
+        return dados
+    return Jogador(dados['nome'], dados.get('posicao', ''), dados.get('habilidade', 50), dados.get('id'))
+
+def como_clube(dados):
+    """Clube a partir de um Clube (devolvido como está) ou de um dict no formato antigo"""
+    if isinstance(dados, Clube):
+        return dados
+    clube = Clube(dados.get('id'), dados['nome'], dados.get('forca_geral'),
+                  [como_jogador(j) for j in dados.get('jogadores', [])], dados.get('forca_cadastro'))
+    if dados.get('logo_base64') and clube.id is not None:
+        registrar_logo(clube.id, dados['logo_base64'])
+    return clube
@@ -0,0 +1,479 @@
+# Arquivo: app/motor.py
+"""
+Motor de simulação de partidas sem interface (headless).
+
+Reproduz o mesmo modelo de simular_partida() (força, fator casa, fator do dia,
+ajuste por diferença de gols e motivação no intervalo), mas sem Streamlit,
+animações ou pausas, para ser usado em simulações em lote.
+
+simular_partida_eventos() é o modelo completo, com finalizações, defesas,
+faltas, escanteios e cartões, emitidos como eventos tipados para um sink
+(ver app/eventos.py); a tela da partida é apenas um desses sinks.
+
+simular_partida_escalacao() é o mesmo modelo com as forças dos titulares
+(app/escalacao.py) no lugar da força geral: a média dos onze na posse, o
+ataque contra a defesa na chance de finalizar, o ataque contra o goleiro na
+de marcar, e autores de gols, defesas e cartões sorteados entre os escalados.
+"""
+import random
+
+import numpy as np
+
+from app.modelo import como_clube
+from app.escalacao import como_escalacao
+from app.eventos import (
+    Evento, INICIO, INSPIRADO, LANCE, GOL, DEFESA, FINALIZACAO_FORA, FALTA, ESCANTEIO, CARTAO,
+    INTERVALO, MOTIVACAO, FIM
+)
+
+# Parâmetros do modelo de partida (os mesmos de app/simulacao.py)
+EVENTOS_POR_TEMPO = (8, 12)
+AVANCO_MINUTOS = (3, 8)
+FATOR_CASA = (1.05, 1.15)
+FATOR_DIA = (0.85, 1.15)
+PROB_FINALIZACAO = 0.20
+PROB_FINALIZACAO_NO_GOL = 0.60
+PROB_GOL = 0.40
+PROB_MOTIVACAO_INTERVALO = 0.30
+BONUS_MOTIVACAO = 1.10
+PROB_OUTRO_EVENTO = 0.10
+PROB_CARTAO = 0.30
+LIMITE_DIA_INSPIRADO = 1.10
+OUTROS_EVENTOS = (FALTA, ESCANTEIO, CARTAO)
+
+# Motor de escalação: sensibilidade das chances à razão entre as forças dos setores
+ELASTICIDADE_ESCALACAO = 1.5
+LIMITES_FINALIZACAO = (0.08, 0.40)
+LIMITES_GOL = (0.20, 0.65)
+
+MOTORES = ("forca", "escalacao")
+
+def ajustar_probabilidade_ataque(prob_clube1, diferenca_gols):
+    """
+    Ajusta a probabilidade de ataque do mandante pela diferença de gols
+    (time perdendo ataca mais) e limita ao intervalo [0.3, 0.7].
+    """
+    if diferenca_gols >= 2:
+        prob_clube1 *= 0.8
+    elif diferenca_gols <= -2:
+        prob_clube1 *= 1.2
+    return max(0.3, min(0.7, prob_clube1))
+
+def simular_partida_rapida(clube1, clube2, rng=None, saldo_inicial=0):
+    """
+    Simula uma partida sem interface gráfica.
+
+    Args:
+        clube1 (Clube): Clube mandante (ver app/modelo.py; um dict no formato
+            antigo também é aceito).
+        clube2 (Clube): Clube visitante.
+        rng (random.Random, opcional): Gerador de números aleatórios. Permite
+            reproduzir simulações com uma semente.
+        saldo_inicial (int): Saldo do mandante antes do jogo (agregado de um
+            confronto de ida e volta), somado ao placar no ajuste de ataque.
+
+    Returns:
+        tuple: (gols1, gols2, marcadores_gols), onde marcadores_gols é uma
+        lista de tuplas (jogador, minuto, time) como em simular_partida().
+    """
+    return simular_partida_confronto(clube1, clube2, rng, saldo_inicial)[:3]
+
+def simular_partida_confronto(clube1, clube2, rng=None, saldo_inicial=0, encerrar_se_decidido=False):
+    """
+    Simula uma partida levando em conta o saldo que o mandante já traz.
+
+    O ajuste de ataque e a motivação no intervalo usam o saldo do confronto
+    (saldo_inicial + gols1 - gols2) em vez do placar do jogo: quem está sendo
+    eliminado pressiona. Com saldo_inicial=0 é o mesmo modelo de uma partida
+    avulsa.
+
+    Com encerrar_se_decidido=True a simulação para assim que o saldo do
+    confronto supera o número máximo de lances restantes (cada lance vale no
+    máximo um gol, então ninguém mais vira nem empata): o vencedor do
+    confronto é exato, mas o placar do jogo fica incompleto.
+
+    Returns:
+        tuple: (gols1, gols2, marcadores_gols, completo).
+    """
+    if rng is None:
+        rng = random
+    clube1, clube2 = como_clube(clube1), como_clube(clube2)
+
+    # Atalhos locais (laço executado milhares de vezes em lote)
+    aleatorio = rng.random
+    inteiro = rng.randint
+
+    gols1 = gols2 = 0
+    minutos = 0
+    marcadores_gols = []
+
+    # Separados uma vez ao montar o elenco (Clube.atacantes)
+    atacantes1 = clube1.atacantes
+    atacantes2 = clube2.atacantes
+
+    # Fatores do jogo
+    fator_casa = rng.uniform(*FATOR_CASA)
+    fator_dia_clube1 = rng.uniform(*FATOR_DIA)
+    fator_dia_clube2 = rng.uniform(*FATOR_DIA)
+
+    forca_efetiva_clube1 = clube1.forca_geral * fator_casa * fator_dia_clube1
+    forca_efetiva_clube2 = clube2.forca_geral * fator_dia_clube2
+
+    prob_gol_por_evento = PROB_FINALIZACAO * PROB_FINALIZACAO_NO_GOL * PROB_GOL
+
+    for periodo in range(2):
+        tempo_final = 45 if periodo == 0 else 90
+        prob_base = forca_efetiva_clube1 / (forca_efetiva_clube1 + forca_efetiva_clube2)
+        num_eventos = inteiro(*EVENTOS_POR_TEMPO)
+        # Lances que ainda podem acontecer depois deste tempo
+        eventos_seguintes = EVENTOS_POR_TEMPO[1] if periodo == 0 else 0
+
+        for evento in range(num_eventos):
+            if encerrar_se_decidido and abs(saldo_inicial + gols1 - gols2) > num_eventos - evento + eventos_seguintes:
+                return gols1, gols2, marcadores_gols, False
+
+            if minutos < tempo_final:
+                minutos = min(minutos + inteiro(*AVANCO_MINUTOS), tempo_final)
+
+            prob_clube1 = ajustar_probabilidade_ataque(prob_base, saldo_inicial + gols1 - gols2)
+            time_atacante = 1 if aleatorio() < prob_clube1 else 2
+
+            # Finalização no gol convertida (20% x 60% x 40%)
+            if aleatorio() < prob_gol_por_evento:
+                if time_atacante == 1:
+                    gols1 += 1
+                    if atacantes1:
+                        marcador = rng.choice(atacantes1)
+                        marcadores_gols.append((marcador.nome, minutos, clube1.nome))
+                else:
+                    gols2 += 1
+                    if atacantes2:
+                        marcador = rng.choice(atacantes2)
+                        marcadores_gols.append((marcador.nome, minutos, clube2.nome))
+
+        # Chance de motivação no intervalo
+        if periodo == 0:
+            if saldo_inicial + gols1 < gols2 and aleatorio() < PROB_MOTIVACAO_INTERVALO:
+                forca_efetiva_clube1 *= BONUS_MOTIVACAO
+            elif saldo_inicial + gols1 > gols2 and aleatorio() < PROB_MOTIVACAO_INTERVALO:
+                forca_efetiva_clube2 *= BONUS_MOTIVACAO
+
+    return gols1, gols2, marcadores_gols, True
+
+def simular_partida_eventos(clube1, clube2, sink=None, rng=None, saldo_inicial=0):
+    """
+    Simula uma partida com todos os lances, emitindo eventos tipados.
+
+    Args:
+        clube1 (Clube): Clube mandante.
+        clube2 (Clube): Clube visitante.
+        sink (SinkEventos, opcional): Recebe os eventos. Sem sink nenhum
+            evento é criado.
+        rng (random.Random, opcional): Gerador de números aleatórios.
+        saldo_inicial (int): Saldo do mandante no confronto antes do jogo,
+            como em simular_partida_confronto().
+
+    Returns:
+        tuple: (gols1, gols2, marcadores_gols), como simular_partida_rapida().
+    """
+    if rng is None:
+        rng = random
+
+    clube1, clube2 = como_clube(clube1), como_clube(clube2)
+    emitir = sink.registrar if sink is not None else None
+    aleatorio = rng.random
+
+    clubes = (None, clube1, clube2)
+    atacantes = (None, clube1.atacantes, clube2.atacantes)
+    goleiros = (None, clube1.goleiro, clube2.goleiro)
+
+    gols = [0, 0, 0]  # Índices 1 e 2 = mandante e visitante
+    minutos = 0
+    marcadores_gols = []
+
+    # Fatores do jogo
+    fator_casa = rng.uniform(*FATOR_CASA)
+    fator_dia_clube1 = rng.uniform(*FATOR_DIA)
+    fator_dia_clube2 = rng.uniform(*FATOR_DIA)
+
+    forca_efetiva_clube1 = clube1.forca_geral * fator_casa * fator_dia_clube1
+    forca_efetiva_clube2 = clube2.forca_geral * fator_dia_clube2
+
+    if emitir:
+        if fator_dia_clube1 > LIMITE_DIA_INSPIRADO:
+            emitir(Evento(INSPIRADO, 0, 1))
+        if fator_dia_clube2 > LIMITE_DIA_INSPIRADO:
+            emitir(Evento(INSPIRADO, 0, 2))
+        emitir(Evento(INICIO, 0))
+
+    for periodo in range(2):
+        tempo_final = 45 if periodo == 0 else 90
+
+        for _ in range(rng.randint(*EVENTOS_POR_TEMPO)):
+            if minutos < tempo_final:
+                minutos = min(minutos + rng.randint(*AVANCO_MINUTOS), tempo_final)
+
+            prob_base = forca_efetiva_clube1 / (forca_efetiva_clube1 + forca_efetiva_clube2)
+            prob_clube1 = ajustar_probabilidade_ataque(prob_base, saldo_inicial + gols[1] - gols[2])
+            atacante = 1 if aleatorio() < prob_clube1 else 2
+            defensor = 3 - atacante
+
+            if aleatorio() < PROB_FINALIZACAO:
+                if aleatorio() < PROB_FINALIZACAO_NO_GOL:
+                    if aleatorio() < PROB_GOL:
+                        gols[atacante] += 1
+                        jogador = None
+                        if atacantes[atacante]:
+                            jogador = rng.choice(atacantes[atacante]).nome
+                            marcadores_gols.append((jogador, minutos, clubes[atacante].nome))
+                        if emitir:
+                            emitir(Evento(GOL, minutos, atacante, jogador, gols[1], gols[2]))
+                    elif emitir:
+                        goleiro = goleiros[defensor]
+                        emitir(Evento(DEFESA, minutos, defensor, goleiro.nome if goleiro else None, gols[1], gols[2]))
+                elif emitir:
+                    emitir(Evento(FINALIZACAO_FORA, minutos, atacante, None, gols[1], gols[2]))
+
+            elif aleatorio() < PROB_OUTRO_EVENTO:
+                tipo = rng.choice(OUTROS_EVENTOS)
+                if tipo != CARTAO:
+                    lado = 1 if aleatorio() < prob_clube1 else 2
+                    if emitir:
+                        emitir(Evento(tipo, minutos, lado, None, gols[1], gols[2]))
+                elif aleatorio() < PROB_CARTAO:
+                    lado = 1 if aleatorio() < prob_clube1 else 2
+                    jogadores = clubes[lado].jogadores
+                    jogador = rng.choice(jogadores).nome if jogadores else None
+                    if emitir:
+                        emitir(Evento(CARTAO, minutos, lado, jogador, gols[1], gols[2]))
+
+            if emitir:
+                emitir(Evento(LANCE, minutos, atacante, None, gols[1], gols[2]))
+
+        # Intervalo e chance de motivação
+        if periodo == 0:
+            if emitir:
+                emitir(Evento(INTERVALO, 45, 0, None, gols[1], gols[2]))
+            if saldo_inicial + gols[1] < gols[2] and aleatorio() < PROB_MOTIVACAO_INTERVALO:
+                forca_efetiva_clube1 *= BONUS_MOTIVACAO
+                if emitir:
+                    emitir(Evento(MOTIVACAO, 45, 1, None, gols[1], gols[2]))
+            elif saldo_inicial + gols[1] > gols[2] and aleatorio() < PROB_MOTIVACAO_INTERVALO:
+                forca_efetiva_clube2 *= BONUS_MOTIVACAO
+                if emitir:
+                    emitir(Evento(MOTIVACAO, 45, 2, None, gols[1], gols[2]))
+
+    if sink is not None:
+        sink.registrar(Evento(FIM, 90, 0, None, gols[1], gols[2]))
+        sink.finalizar()
+
+    return gols[1], gols[2], marcadores_gols
+
+def chances_escalacao(ataque, defesa):
+    """
+    Chances de finalizar (por lance) e de marcar (por finalização no gol) do
+    lado que ataca. Cada setor entra relativo à força média do próprio time:
+    a diferença de nível entre os times já está na posse, e times sem
+    jogadores cadastrados (setores = força geral) ficam com as chances do
+    motor por força.
+    """
+    ataque_relativo = ataque.ataque / ataque.forca
+    prob_finalizacao = PROB_FINALIZACAO * (ataque_relativo / (defesa.defesa / defesa.forca)) ** ELASTICIDADE_ESCALACAO
+    prob_gol = PROB_GOL * (ataque_relativo / (defesa.forca_goleiro / defesa.forca)) ** ELASTICIDADE_ESCALACAO
+    return (max(LIMITES_FINALIZACAO[0], min(LIMITES_FINALIZACAO[1], prob_finalizacao)),
+            max(LIMITES_GOL[0], min(LIMITES_GOL[1], prob_gol)))
+
+def simular_partida_escalacao(clube1, clube2, sink=None, rng=None, saldo_inicial=0):
+    """
+    Simula uma partida pelas escalações dos dois clubes.
+
+    Mesmos lances, fatores e eventos de simular_partida_eventos(), mas a posse
+    vem da força média dos titulares e as chances de finalizar e de marcar
+    de cada lado, do ataque dele contra a defesa e o goleiro do adversário
+    (ver chances_escalacao()). As chances são calculadas uma vez por
+    partida; nos lances só há sorteios. Sem jogadores cadastrados, o
+    resultado é o mesmo de simular_partida_eventos() com a mesma semente.
+
+    Args:
+        clube1 (Clube or Escalacao): Mandante. Em lote, passe escalações
+            prontas (app.escalacao.escalar()) para não refazê-las a cada jogo.
+        clube2 (Clube or Escalacao): Visitante.
+        sink, rng, saldo_inicial: Como em simular_partida_eventos().
+
+    Returns:
+        tuple: (gols1, gols2, marcadores_gols), como simular_partida_rapida().
+    """
+    if rng is None:
+        rng = random
+
+    escalacao1, escalacao2 = como_escalacao(clube1), como_escalacao(clube2)
+    emitir = sink.registrar if sink is not None else None
+    aleatorio = rng.random
+    sortear = rng.choices
+
+    nomes = (None, escalacao1.clube.nome, escalacao2.clube.nome)
+    goleiros = (None, escalacao1.goleiro, escalacao2.goleiro)
+    titulares = (None, escalacao1.titulares, escalacao2.titulares)
+    marcadores = (None, escalacao1.marcadores, escalacao2.marcadores)
+    pesos_marcadores = (None, escalacao1.pesos_marcadores, escalacao2.pesos_marcadores)
+    chances = (None, chances_escalacao(escalacao1, escalacao2), chances_escalacao(escalacao2, escalacao1))
+
+    gols = [0, 0, 0]  # Índices 1 e 2 = mandante e visitante
+    minutos = 0
+    marcadores_gols = []
+
+    # Fatores do jogo
+    fator_casa = rng.uniform(*FATOR_CASA)
+    fator_dia_clube1 = rng.uniform(*FATOR_DIA)
+    fator_dia_clube2 = rng.uniform(*FATOR_DIA)
+
+    forca_efetiva_clube1 = escalacao1.forca * fator_casa * fator_dia_clube1
+    forca_efetiva_clube2 = escalacao2.forca * fator_dia_clube2
+
+    if emitir:
+        if fator_dia_clube1 > LIMITE_DIA_INSPIRADO:
+            emitir(Evento(INSPIRADO, 0, 1))
+        if fator_dia_clube2 > LIMITE_DIA_INSPIRADO:
+            emitir(Evento(INSPIRADO, 0, 2))
+        emitir(Evento(INICIO, 0))
+
+    for periodo in range(2):
+        tempo_final = 45 if periodo == 0 else 90
+        prob_base = forca_efetiva_clube1 / (forca_efetiva_clube1 + forca_efetiva_clube2)
+
+        for _ in range(rng.randint(*EVENTOS_POR_TEMPO)):
+            if minutos < tempo_final:
+                minutos = min(minutos + rng.randint(*AVANCO_MINUTOS), tempo_final)
+
+            prob_clube1 = ajustar_probabilidade_ataque(prob_base, saldo_inicial + gols[1] - gols[2])
+            atacante = 1 if aleatorio() < prob_clube1 else 2
+            defensor = 3 - atacante
+            prob_finalizacao, prob_gol = chances[atacante]
+
+            if aleatorio() < prob_finalizacao:
+                if aleatorio() < PROB_FINALIZACAO_NO_GOL:
+                    if aleatorio() < prob_gol:
+                        gols[atacante] += 1
+                        jogador = None
+                        if marcadores[atacante]:
+                            jogador = sortear(marcadores[atacante], cum_weights=pesos_marcadores[atacante])[0].nome
+                            marcadores_gols.append((jogador, minutos, nomes[atacante]))
+                        if emitir:
+                            emitir(Evento(GOL, minutos, atacante, jogador, gols[1], gols[2]))
+                    elif emitir:
+                        goleiro = goleiros[defensor]
+                        emitir(Evento(DEFESA, minutos, defensor, goleiro.nome if goleiro else None, gols[1], gols[2]))
+                elif emitir:
+                    emitir(Evento(FINALIZACAO_FORA, minutos, atacante, None, gols[1], gols[2]))
+
+            elif aleatorio() < PROB_OUTRO_EVENTO:
+                tipo = rng.choice(OUTROS_EVENTOS)
+                if tipo != CARTAO:
+                    lado = 1 if aleatorio() < prob_clube1 else 2
+                    if emitir:
+                        emitir(Evento(tipo, minutos, lado, None, gols[1], gols[2]))
+                elif aleatorio() < PROB_CARTAO:
+                    lado = 1 if aleatorio() < prob_clube1 else 2
+                    jogador = rng.choice(titulares[lado]).nome if titulares[lado] else None
+                    if emitir:
+                        emitir(Evento(CARTAO, minutos, lado, jogador, gols[1], gols[2]))
+
+            if emitir:
+                emitir(Evento(LANCE, minutos, atacante, None, gols[1], gols[2]))
+
+        # Intervalo e chance de motivação
+        if periodo == 0:
+            if emitir:
+                emitir(Evento(INTERVALO, 45, 0, None, gols[1], gols[2]))
+            if saldo_inicial + gols[1] < gols[2] and aleatorio() < PROB_MOTIVACAO_INTERVALO:
+                forca_efetiva_clube1 *= BONUS_MOTIVACAO
+                if emitir:
+                    emitir(Evento(MOTIVACAO, 45, 1, None, gols[1], gols[2]))
+            elif saldo_inicial + gols[1] > gols[2] and aleatorio() < PROB_MOTIVACAO_INTERVALO:
+                forca_efetiva_clube2 *= BONUS_MOTIVACAO
+                if emitir:
+                    emitir(Evento(MOTIVACAO, 45, 2, None, gols[1], gols[2]))
+
+    if sink is not None:
+        sink.registrar(Evento(FIM, 90, 0, None, gols[1], gols[2]))
+        sink.finalizar()
+
+    return gols[1], gols[2], marcadores_gols
+
+def simular_placares_vetorizado(forcas1, forcas2, n_simulacoes, rng=None, saldo_inicial=None):
+    """
+    Simula, de forma vetorizada, n_simulacoes repetições de vários jogos.
+
+    Usa o mesmo modelo de simular_partida_rapida() (inclusive o ajuste por
+    diferença de gols e a motivação no intervalo), mas processa todas as
+    repetições e todos os jogos de uma vez com NumPy. Os autores dos gols
+    não são sorteados.
+
+    Args:
+        forcas1 (array-like): Força geral dos mandantes, um valor por jogo
+            (ou um por repetição e jogo, formato (n_simulacoes, jogos)).
+        forcas2 (array-like): Força geral dos visitantes, no mesmo formato.
+        n_simulacoes (int): Número de repetições de cada jogo.
+        rng (numpy.random.Generator, opcional): Gerador de números aleatórios.
+        saldo_inicial (array-like, opcional): Saldo que o mandante traz de um
+            jogo de ida, como em simular_partida_confronto().
+
+    Returns:
+        tuple: (gols1, gols2), arrays de inteiros com formato (n_simulacoes, jogos).
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    forcas1 = np.asarray(forcas1, dtype=float)
+    forcas2 = np.asarray(forcas2, dtype=float)
+    formato = np.broadcast_shapes((n_simulacoes, forcas1.shape[-1]), forcas1.shape, forcas2.shape)
+    if saldo_inicial is not None:
+        saldo_inicial = np.broadcast_to(np.asarray(saldo_inicial, dtype=np.int16), formato)
+        saldo_plano = saldo_inicial.reshape(-1)
+
+    forca_efetiva1 = forcas1 * rng.uniform(*FATOR_CASA, formato) * rng.uniform(*FATOR_DIA, formato)
+    forca_efetiva2 = forcas2 * rng.uniform(*FATOR_DIA, formato)
+
+    gols1 = np.zeros(formato, dtype=np.int16)
+    gols2 = np.zeros(formato, dtype=np.int16)
+    gols1_plano = gols1.reshape(-1)
+    gols2_plano = gols2.reshape(-1)
+    prob_gol_por_evento = PROB_FINALIZACAO * PROB_FINALIZACAO_NO_GOL * PROB_GOL
+    min_eventos, max_eventos = EVENTOS_POR_TEMPO
+
+    for periodo in range(2):
+        prob_base = (forca_efetiva1 / (forca_efetiva1 + forca_efetiva2)).reshape(-1)
+        num_eventos = rng.integers(min_eventos, max_eventos + 1, formato).reshape(-1)
+
+        for evento in range(max_eventos):
+            # Um único sorteio decide se houve gol e de quem foi. Gols são
+            # raros, então o ajuste por diferença de gols só é calculado
+            # nas posições em que houve gol.
+            sorteio = rng.random(gols1_plano.shape[0])
+            gol = sorteio < prob_gol_por_evento
+            if evento >= min_eventos:
+                gol &= evento < num_eventos
+            indices = np.flatnonzero(gol)
+            if not indices.size:
+                continue
+
+            diferenca = gols1_plano[indices] - gols2_plano[indices]
+            if saldo_inicial is not None:
+                diferenca += saldo_plano[indices]
+            prob_clube1 = prob_base[indices]
+            prob_clube1 = np.where(diferenca >= 2, prob_clube1 * 0.8,
+                                   np.where(diferenca <= -2, prob_clube1 * 1.2, prob_clube1))
+            prob_clube1 = np.clip(prob_clube1, 0.3, 0.7)
+            gol_clube1 = sorteio[indices] < prob_gol_por_evento * prob_clube1
+
+            gols1_plano[indices] += gol_clube1
+            gols2_plano[indices] += ~gol_clube1
+
+        # Motivação no intervalo (só um dos lados pode estar perdendo)
+        if periodo == 0:
+            motivado = rng.random(formato) < PROB_MOTIVACAO_INTERVALO
+            saldo = gols1 - gols2 if saldo_inicial is None else saldo_inicial + gols1 - gols2
+            forca_efetiva1 = np.where(motivado & (saldo < 0), forca_efetiva1 * BONUS_MOTIVACAO, forca_efetiva1)
+            forca_efetiva2 = np.where(motivado & (saldo > 0), forca_efetiva2 * BONUS_MOTIVACAO, forca_efetiva2)
+
+    return gols1, gols2
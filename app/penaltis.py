@@ -0,0 +1,142 @@
+# Arquivo: app/penaltis.py
+"""
+Disputa de pênaltis com cobradores e goleiros do elenco.
+
+A chance de conversão de cada cobrança depende da habilidade do cobrador
+contra a do goleiro adversário. A disputa segue as regras oficiais: série de
+cinco cobranças alternadas com encerramento antecipado quando um time não
+pode mais alcançar o outro, e depois morte súbita sem limite de rodadas.
+
+Além da simulação, prob_vitoria_penaltis() calcula a probabilidade exata de
+vitória (programação dinâmica na série inicial e série geométrica sobre o
+ciclo de cobradores na morte súbita), para análises sem sorteios.
+"""
+import math
+import random
+from functools import lru_cache
+
+from app.modelo import eh_goleiro
+
+PROB_CONVERSAO_BASE = 0.75
+PESO_HABILIDADE = 0.01  # Variação na chance de conversão por ponto de habilidade
+PROB_CONVERSAO_MIN = 0.55
+PROB_CONVERSAO_MAX = 0.92
+COBRANCAS_SERIE = 5
+
+def prob_conversao(habilidade_cobrador, habilidade_goleiro):
+    """Chance de o cobrador converter contra o goleiro"""
+    prob = PROB_CONVERSAO_BASE + PESO_HABILIDADE * (habilidade_cobrador - habilidade_goleiro)
+    return max(PROB_CONVERSAO_MIN, min(PROB_CONVERSAO_MAX, prob))
+
+def goleiro_do_clube(clube):
+    """Goleiro do elenco (o de maior habilidade) ou None se não houver"""
+    goleiros = [j for j in clube.get('jogadores', []) if eh_goleiro(j.get('posicao', ''))]
+    return max(goleiros, key=lambda j: j['habilidade']) if goleiros else None
+
+def habilidade_goleiro(clube):
+    """Habilidade do goleiro; sem goleiro no elenco, usa a força geral do clube"""
+    goleiro = goleiro_do_clube(clube)
+    return float(goleiro['habilidade']) if goleiro else float(clube['forca_geral'])
+
+def escolher_cobradores(clube):
+    """
+    Ordem de cobrança: jogadores de linha do mais para o menos habilidoso.
+
+    Na morte súbita a ordem recomeça do primeiro após todos cobrarem. Sem
+    jogadores cadastrados, o próprio clube "cobra" com a sua força geral.
+    """
+    cobradores = [j for j in clube.get('jogadores', []) if not eh_goleiro(j.get('posicao', ''))]
+    if not cobradores:
+        return [{'nome': clube['nome'], 'habilidade': float(clube['forca_geral'])}]
+    return sorted(cobradores, key=lambda j: j['habilidade'], reverse=True)
+
+def probabilidades_cobradores(clube, adversario):
+    """Chance de conversão de cada cobrador do clube, na ordem de cobrança"""
+    goleiro = habilidade_goleiro(adversario)
+    return tuple(prob_conversao(float(j['habilidade']), goleiro) for j in escolher_cobradores(clube))
+
+def simular_disputa_penaltis(clube1, clube2, rng=None):
+    """
+    Simula uma disputa de pênaltis (clube1 cobra primeiro).
+
+    Returns:
+        tuple: (penaltis1, penaltis2, cobrancas), com cobrancas como lista de
+        tuplas (nome do clube, nome do cobrador, convertido).
+    """
+    if rng is None:
+        rng = random
+
+    cobradores = (escolher_cobradores(clube1), escolher_cobradores(clube2))
+    probs = (probabilidades_cobradores(clube1, clube2), probabilidades_cobradores(clube2, clube1))
+    nomes = (clube1['nome'], clube2['nome'])
+    gols = [0, 0]
+    cobrancas = []
+
+    def cobrar(lado, numero):
+        indice = numero % len(cobradores[lado])
+        convertido = rng.random() < probs[lado][indice]
+        gols[lado] += convertido
+        cobrancas.append((nomes[lado], cobradores[lado][indice]['nome'], convertido))
+
+    # Série inicial com encerramento antecipado
+    for numero in range(COBRANCAS_SERIE):
+        for lado in (0, 1):
+            cobrar(lado, numero)
+            restantes = [COBRANCAS_SERIE - numero - 1, COBRANCAS_SERIE - numero - (lado == 1)]
+            if gols[0] + restantes[0] < gols[1] or gols[1] + restantes[1] < gols[0]:
+                return gols[0], gols[1], cobrancas
+
+    # Morte súbita: uma cobrança de cada lado até alguém ficar à frente
+    numero = COBRANCAS_SERIE
+    while gols[0] == gols[1]:
+        cobrar(0, numero)
+        cobrar(1, numero)
+        numero += 1
+
+    return gols[0], gols[1], cobrancas
+
+@lru_cache(maxsize=8192)
+def prob_vitoria_por_probabilidades(probs1, probs2):
+    """
+    Probabilidade exata de o lado 1 (que cobra primeiro) vencer a disputa.
+
+    Args:
+        probs1 (tuple): Chance de conversão de cada cobrador do lado 1, em ordem.
+        probs2 (tuple): Idem para o lado 2.
+    """
+    # Série inicial: o encerramento antecipado não muda o vencedor, então
+    # basta a distribuição do placar após as cinco cobranças de cada lado
+    def distribuicao_gols(probs):
+        distribuicao = [1.0]
+        for numero in range(COBRANCAS_SERIE):
+            p = probs[numero % len(probs)]
+            nova = [0.0] * (len(distribuicao) + 1)
+            for gols, prob in enumerate(distribuicao):
+                nova[gols] += prob * (1 - p)
+                nova[gols + 1] += prob * p
+            distribuicao = nova
+        return distribuicao
+
+    gols1 = distribuicao_gols(probs1)
+    gols2 = distribuicao_gols(probs2)
+    vitoria = sum(p1 * p2 for g1, p1 in enumerate(gols1) for g2, p2 in enumerate(gols2) if g1 > g2)
+    empate = sum(p1 * p2 for p1, p2 in zip(gols1, gols2))
+
+    # Morte súbita: os cobradores se repetem em ciclos de mmc(n1, n2) rodadas,
+    # então a chance de vitória é uma série geométrica sobre um ciclo
+    ciclo = len(probs1) * len(probs2) // math.gcd(len(probs1), len(probs2))
+    vitoria_ciclo = 0.0
+    continua = 1.0
+    for rodada in range(ciclo):
+        p1 = probs1[(COBRANCAS_SERIE + rodada) % len(probs1)]
+        p2 = probs2[(COBRANCAS_SERIE + rodada) % len(probs2)]
+        vitoria_ciclo += continua * p1 * (1 - p2)
+        continua *= p1 * p2 + (1 - p1) * (1 - p2)
+
+    return vitoria + empate * vitoria_ciclo / (1 - continua)
+
+def prob_vitoria_penaltis(clube1, clube2):
+    """Probabilidade exata de clube1 (cobrando primeiro) vencer a disputa de pênaltis"""
+    return prob_vitoria_por_probabilidades(
+        probabilidades_cobradores(clube1, clube2), probabilidades_cobradores(clube2, clube1)
+    )
@@ -0,0 +1,224 @@
+# Arquivo: app/probabilidades.py
+"""
+Probabilidades exatas de placar do modelo de partida, sem sorteios.
+
+O modelo de simular_partida() é uma cadeia de eventos independentes: em cada
+tempo há de 8 a 12 eventos (uniforme) e cada evento vira gol com probabilidade
+20% × 60% × 40%, do mandante com probabilidade prob_clube1 (ajustada pela
+diferença de gols). A distribuição P(gols1, gols2) é calculada por programação
+dinâmica sobre a grade de placares, incluindo a motivação no intervalo. Os
+fatores casa/dia (uniformes) são integrados por quadratura.
+
+Como um jogo tem no máximo 24 eventos, a grade 25 × 25 é exata (sem truncamento).
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from app.motor import (
+    EVENTOS_POR_TEMPO, FATOR_CASA, FATOR_DIA, PROB_FINALIZACAO, PROB_FINALIZACAO_NO_GOL,
+    PROB_GOL, PROB_MOTIVACAO_INTERVALO, BONUS_MOTIVACAO
+)
+
+MAX_GOLS = 2 * EVENTOS_POR_TEMPO[1]
+TAMANHO_GRADE = MAX_GOLS + 1
+NOS_QUADRATURA = 16
+PONTOS_DISCRETIZACAO = 100
+JOGOS_POR_BLOCO = 4  # Blocos pequenos cabem no cache (cada jogo gera 3 × NOS_QUADRATURA grades)
+
+PROB_GOL_POR_EVENTO = PROB_FINALIZACAO * PROB_FINALIZACAO_NO_GOL * PROB_GOL
+
+# Diferença de gols (gols1 - gols2) em cada célula da grade
+DIFERENCA_GRADE = np.subtract.outer(np.arange(TAMANHO_GRADE), np.arange(TAMANHO_GRADE))
+
+@lru_cache(maxsize=None)
+def _nos_razao_forcas(n=NOS_QUADRATURA, pontos=PONTOS_DISCRETIZACAO):
+    """
+    Nós e pesos da quadratura para o fator multiplicativo da razão de forças.
+
+    prob_clube1 só depende de (forca1 · fator_casa · fator_dia1) / (forca2 · fator_dia2),
+    então basta integrar o fator fator_casa · fator_dia1 / fator_dia2. A
+    distribuição do seu logaritmo é discretizada em uma grade fina dos três
+    sorteios uniformes e dividida em n faixas de mesma probabilidade; cada
+    faixa é representada pela sua média. Isso reduz a integral tripla a n
+    cenários (o limite de prob_clube1 em [0.3, 0.7] cria "quinas" em que uma
+    quadratura de Gauss em produto tensorial converge mal).
+
+    Calculado na primeira distribuição pedida, não na importação do módulo.
+    """
+    u = (np.arange(pontos) + 0.5) / pontos
+    log_casa = np.log(FATOR_CASA[0] + (FATOR_CASA[1] - FATOR_CASA[0]) * u)
+    log_dia = np.log(FATOR_DIA[0] + (FATOR_DIA[1] - FATOR_DIA[0]) * u)
+    log_fator = np.sort((log_casa[:, None, None] + log_dia[None, :, None] - log_dia[None, None, :]).reshape(-1))
+
+    faixas = np.array_split(log_fator, n)
+    fator = np.exp([faixa.mean() for faixa in faixas])
+    pesos = np.array([faixa.size for faixa in faixas]) / log_fator.size
+    return fator, pesos
+
+def _matriz_prob_ataque(prob_base, tamanho=TAMANHO_GRADE):
+    """
+    prob_clube1 ajustada pela diferença de gols em cada célula da grade.
+
+    Args:
+        prob_base (ndarray): Formato (k,), uma probabilidade base por cenário.
+
+    Returns:
+        ndarray: Formato (k, tamanho, tamanho).
+    """
+    diferenca = DIFERENCA_GRADE[:tamanho, :tamanho]
+    prob = prob_base[:, None, None]
+    prob = np.where(diferenca >= 2, prob * 0.8, np.where(diferenca <= -2, prob * 1.2, prob))
+    return np.clip(prob, 0.3, 0.7)
+
+def _simular_tempo(grade, prob_base, gols_iniciais=0):
+    """
+    Avança a distribuição de placares por um tempo (8 a 12 eventos, uniforme).
+
+    Args:
+        grade (ndarray): Distribuições iniciais, formato (k, tamanho, tamanho),
+            com tamanho > gols_iniciais + 12.
+        prob_base (ndarray): Probabilidade base de ataque do mandante por cenário.
+        gols_iniciais (int): Maior número de gols de um time já possível na grade.
+
+    Returns:
+        ndarray: Distribuições ao fim do tempo, mesmo formato.
+    """
+    tamanho = grade.shape[1]
+    prob_ataque = _matriz_prob_ataque(prob_base, tamanho)
+    transicao_gol1 = PROB_GOL_POR_EVENTO * prob_ataque
+    transicao_gol2 = PROB_GOL_POR_EVENTO - transicao_gol1
+    sem_gol = 1 - PROB_GOL_POR_EVENTO
+
+    min_eventos, max_eventos = EVENTOS_POR_TEMPO
+    atual = grade.copy()
+    proxima = np.zeros_like(grade)
+    resultado = np.zeros_like(grade)
+
+    for evento in range(1, max_eventos + 1):
+        # Só a região alcançável da grade é atualizada (ela cresce um gol por evento)
+        anterior = gols_iniciais + evento
+        regiao = anterior + 1
+        origem = atual[:, :anterior, :anterior]
+        destino = proxima[:, :regiao, :regiao]
+        destino[:, anterior, :] = 0
+        destino[:, :, anterior] = 0
+
+        np.multiply(origem, sem_gol, out=destino[:, :anterior, :anterior])
+        destino[:, 1:, :anterior] += origem * transicao_gol1[:, :anterior, :anterior]
+        destino[:, :anterior, 1:] += origem * transicao_gol2[:, :anterior, :anterior]
+
+        atual, proxima = proxima, atual
+        if evento >= min_eventos:
+            resultado[:, :regiao, :regiao] += atual[:, :regiao, :regiao]
+
+    return resultado / (max_eventos - min_eventos + 1)
+
+def _distribuicoes_por_razao(razoes):
+    """Distribuições de placar de um bloco de jogos, dado forca1 / forca2 de cada um"""
+    fator_razao, pesos_razao = _nos_razao_forcas()
+    num_jogos, num_nos = razoes.shape[0], fator_razao.shape[0]
+
+    # Cada jogo × nó da quadratura é um cenário com fatores casa/dia fixos
+    razao = (razoes[:, None] * fator_razao[None, :]).reshape(-1)
+    k = razao.shape[0]
+
+    # Primeiro tempo em uma grade menor (no máximo 12 gols por time)
+    gols_intervalo = EVENTOS_POR_TEMPO[1]
+    grade = np.zeros((k, gols_intervalo + 1, gols_intervalo + 1))
+    grade[:, 0, 0] = 1.0
+    intervalo = np.zeros((k, TAMANHO_GRADE, TAMANHO_GRADE))
+    intervalo[:, :gols_intervalo + 1, :gols_intervalo + 1] = _simular_tempo(grade, razao / (1 + razao))
+
+    # Motivação no intervalo: três regimes para o segundo tempo
+    perdendo1 = DIFERENCA_GRADE < 0
+    perdendo2 = DIFERENCA_GRADE > 0
+    motivado1 = intervalo * (perdendo1 * PROB_MOTIVACAO_INTERVALO)
+    motivado2 = intervalo * (perdendo2 * PROB_MOTIVACAO_INTERVALO)
+    sem_motivacao = intervalo - motivado1 - motivado2
+
+    razao_motivado1 = razao * BONUS_MOTIVACAO
+    razao_motivado2 = razao / BONUS_MOTIVACAO
+    final = _simular_tempo(
+        np.concatenate([sem_motivacao, motivado1, motivado2]),
+        np.concatenate([razao / (1 + razao), razao_motivado1 / (1 + razao_motivado1), razao_motivado2 / (1 + razao_motivado2)]),
+        gols_intervalo
+    )
+    final = final[:k] + final[k:2 * k] + final[2 * k:]
+
+    final = final.reshape(num_jogos, num_nos, TAMANHO_GRADE, TAMANHO_GRADE)
+    return np.einsum('jnab,n->jab', final, pesos_razao)
+
+def distribuicoes_placar(forcas1, forcas2):
+    """
+    Distribuições exatas de placar para vários jogos de uma vez.
+
+    Args:
+        forcas1 (array-like): Força geral dos mandantes, um valor por jogo.
+        forcas2 (array-like): Força geral dos visitantes, um valor por jogo.
+
+    Returns:
+        ndarray: Formato (jogos, 25, 25), com P(gols1, gols2) de cada jogo.
+    """
+    razoes = np.atleast_1d(np.asarray(forcas1, dtype=float) / np.asarray(forcas2, dtype=float))
+    if not razoes.shape[0]:
+        return np.zeros((0, TAMANHO_GRADE, TAMANHO_GRADE))
+
+    # Jogos com a mesma razão de forças têm a mesma distribuição
+    unicas, inverso = np.unique(razoes, return_inverse=True)
+    distribuicoes = np.concatenate([
+        _distribuicoes_por_razao(unicas[inicio:inicio + JOGOS_POR_BLOCO])
+        for inicio in range(0, unicas.shape[0], JOGOS_POR_BLOCO)
+    ])
+    return distribuicoes[inverso.reshape(-1)]
+
+@lru_cache(maxsize=4096)
+def _distribuicao_por_razao(razao):
+    distribuicao = distribuicoes_placar([razao], [1.0])[0]
+    distribuicao.setflags(write=False)
+    return distribuicao
+
+def distribuicao_placar(forca1, forca2):
+    """
+    Distribuição exata P(gols1, gols2) de um jogo (mandante com forca1).
+
+    O resultado só depende da razão entre as forças e fica em cache, então
+    consultas repetidas custam microssegundos. O array retornado é somente leitura.
+    """
+    return _distribuicao_por_razao(round(float(forca1) / float(forca2), 12))
+
+def resumir_distribuicao(distribuicao):
+    """
+    Resume uma distribuição de placar.
+
+    Returns:
+        dict: Probabilidades de vitória do mandante, empate e vitória do
+        visitante, e gols esperados de cada lado.
+    """
+    gols = np.arange(distribuicao.shape[-1])
+    return {
+        'vitoria_casa': float(np.tril(distribuicao, -1).sum()),
+        'empate': float(np.trace(distribuicao)),
+        'vitoria_visitante': float(np.triu(distribuicao, 1).sum()),
+        'gols_casa': float(distribuicao.sum(axis=1) @ gols),
+        'gols_visitante': float(distribuicao.sum(axis=0) @ gols),
+    }
+
+@lru_cache(maxsize=4096)
+def _resumo_por_razao(razao):
+    return resumir_distribuicao(_distribuicao_por_razao(razao))
+
+def probabilidades_resultado(forca1, forca2):
+    """Probabilidades (vitória do mandante, empate, vitória do visitante)"""
+    resumo = _resumo_por_razao(round(float(forca1) / float(forca2), 12))
+    return resumo['vitoria_casa'], resumo['empate'], resumo['vitoria_visitante']
+
+def probabilidades_partida(clube1, clube2):
+    """Resumo exato do confronto entre dois clubes (clube1 como mandante)"""
+    return dict(_resumo_por_razao(round(float(clube1['forca_geral']) / float(clube2['forca_geral']), 12)))
+
+def placares_mais_provaveis(forca1, forca2, quantidade=5):
+    """Lista de ((gols1, gols2), probabilidade) com os placares mais prováveis"""
+    distribuicao = distribuicao_placar(forca1, forca2)
+    indices = np.argsort(distribuicao, axis=None)[::-1][:quantidade]
+    return [((int(i // TAMANHO_GRADE), int(i % TAMANHO_GRADE)), float(distribuicao.flat[i])) for i in indices]
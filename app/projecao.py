@@ -0,0 +1,266 @@
+# Arquivo: app/projecao.py
+"""
+Projeção de temporada: Monte Carlo dos jogos restantes sobre a classificação atual.
+
+Parte da tabela de gerar_tabela_classificacao() e de uma lista de jogos ainda
+não disputados, simula o restante da temporada milhares de vezes (vetorizado
+com NumPy, opcionalmente em vários processos) e estima as probabilidades de
+título, G-4 e rebaixamento e a distribuição de pontos de cada clube.
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+import pandas as pd
+
+from app.motor import simular_placares_vetorizado
+
+COLUNAS_TABELA = ['pontos', 'saldo_gols', 'gols_pro', 'vitorias']
+
+def preparar_dados_projecao(tabela, jogos_restantes):
+    """
+    Converte a tabela atual e os jogos restantes em arrays para a simulação.
+
+    Args:
+        tabela (DataFrame or None): Classificação atual (gerar_tabela_classificacao).
+        jogos_restantes (list): Tuplas (mandante, visitante) com dicts de clubes.
+
+    Returns:
+        dict: Dados serializáveis (nomes, estado atual, índices e forças dos jogos).
+    """
+    times = list(tabela['time']) if tabela is not None else []
+    for casa, fora in jogos_restantes:
+        for clube in (casa, fora):
+            if clube['nome'] not in times:
+                times.append(clube['nome'])
+
+    indice = {nome: i for i, nome in enumerate(times)}
+    estado = np.zeros((len(times), len(COLUNAS_TABELA)), dtype=np.int64)
+    if tabela is not None:
+        for _, linha in tabela.iterrows():
+            estado[indice[linha['time']]] = [int(linha[coluna]) for coluna in COLUNAS_TABELA]
+
+    return {
+        'times': times,
+        'estado': estado,
+        'casa': np.array([indice[casa['nome']] for casa, _ in jogos_restantes], dtype=np.int64),
+        'fora': np.array([indice[fora['nome']] for _, fora in jogos_restantes], dtype=np.int64),
+        'forca_casa': np.array([casa['forca_geral'] for casa, _ in jogos_restantes], dtype=float),
+        'forca_fora': np.array([fora['forca_geral'] for _, fora in jogos_restantes], dtype=float),
+    }
+
+def simular_lote_projecao(dados, n_simulacoes, seed=None):
+    """
+    Simula um lote de temporadas e devolve os acumuladores do lote.
+
+    Função de módulo para poder ser executada em outro processo.
+
+    Returns:
+        dict: Contagens de posições (clubes × posições), soma de pontos,
+        soma dos quadrados e histograma de pontos finais por clube.
+    """
+    rng = np.random.default_rng(seed)
+    num_times = len(dados['times'])
+    pontos, saldo, gols_pro, vitorias = (dados['estado'][:, i] for i in range(len(COLUNAS_TABELA)))
+
+    pontos = np.tile(pontos, (n_simulacoes, 1))
+    saldo = np.tile(saldo, (n_simulacoes, 1))
+    gols_pro = np.tile(gols_pro, (n_simulacoes, 1))
+    vitorias = np.tile(vitorias, (n_simulacoes, 1))
+
+    if len(dados['casa']):
+        gols_casa, gols_fora = simular_placares_vetorizado(
+            dados['forca_casa'], dados['forca_fora'], n_simulacoes, rng
+        )
+        # Produto matricial em ponto flutuante (BLAS); os valores são inteiros exatos
+        gols_casa = gols_casa.astype(float)
+        gols_fora = gols_fora.astype(float)
+        vitoria_casa = (gols_casa > gols_fora).astype(float)
+        vitoria_fora = (gols_fora > gols_casa).astype(float)
+        empate = 1.0 - vitoria_casa - vitoria_fora
+
+        # Matrizes de incidência jogo -> clube para acumular tudo com produto matricial
+        incidencia_casa = np.zeros((len(dados['casa']), num_times))
+        incidencia_fora = np.zeros((len(dados['fora']), num_times))
+        incidencia_casa[np.arange(len(dados['casa'])), dados['casa']] = 1
+        incidencia_fora[np.arange(len(dados['fora'])), dados['fora']] = 1
+
+        def acumular(valores_casa, valores_fora):
+            return np.rint(valores_casa @ incidencia_casa + valores_fora @ incidencia_fora).astype(np.int64)
+
+        pontos = pontos + acumular(3 * vitoria_casa + empate, 3 * vitoria_fora + empate)
+        saldo = saldo + acumular(gols_casa - gols_fora, gols_fora - gols_casa)
+        gols_pro = gols_pro + acumular(gols_casa, gols_fora)
+        vitorias = vitorias + acumular(vitoria_casa, vitoria_fora)
+
+    # Critérios de desempate combinados em uma única chave inteira;
+    # o sorteio final desfaz empates completos
+    chave = pontos * 20000 + (saldo + 10000)
+    chave = chave * 10000 + gols_pro
+    chave = chave * 1000 + vitorias
+    chave = chave * 1000 + rng.integers(0, 1000, chave.shape)
+
+    ordem = np.argsort(-chave, axis=1)
+    posicoes = np.empty_like(ordem)
+    np.put_along_axis(posicoes, ordem, np.arange(num_times)[None, :], axis=1)
+
+    contagem_posicoes = np.zeros((num_times, num_times), dtype=np.int64)
+    for clube in range(num_times):
+        contagem_posicoes[clube] = np.bincount(posicoes[:, clube], minlength=num_times)
+
+    max_pontos = int(pontos.max())
+    histograma_pontos = np.zeros((num_times, max_pontos + 1), dtype=np.int64)
+    for clube in range(num_times):
+        histograma_pontos[clube] = np.bincount(pontos[:, clube], minlength=max_pontos + 1)
+
+    return {
+        'n_simulacoes': n_simulacoes,
+        'contagem_posicoes': contagem_posicoes,
+        'soma_pontos': pontos.sum(axis=0).astype(float),
+        'soma_pontos_quadrado': (pontos.astype(float) ** 2).sum(axis=0),
+        'histograma_pontos': histograma_pontos,
+    }
+
+class ProjecaoTemporada:
+    """Estimativas acumuladas de uma projeção (refinadas a cada lote)"""
+
+    def __init__(self, times, vagas_topo=4, vagas_rebaixamento=4):
+        self.times = times
+        self.vagas_topo = vagas_topo
+        self.vagas_rebaixamento = vagas_rebaixamento
+        self.n_simulacoes = 0
+        self.tempo_decorrido = 0.0
+        self.contagem_posicoes = np.zeros((len(times), len(times)), dtype=np.int64)
+        self.soma_pontos = np.zeros(len(times))
+        self.soma_pontos_quadrado = np.zeros(len(times))
+        self.histograma_pontos = np.zeros((len(times), 1), dtype=np.int64)
+
+    def acumular(self, lote):
+        """Incorpora o resultado de simular_lote_projecao()"""
+        self.n_simulacoes += lote['n_simulacoes']
+        self.contagem_posicoes += lote['contagem_posicoes']
+        self.soma_pontos += lote['soma_pontos']
+        self.soma_pontos_quadrado += lote['soma_pontos_quadrado']
+
+        histograma = lote['histograma_pontos']
+        largura = max(histograma.shape[1], self.histograma_pontos.shape[1])
+        acumulado = np.zeros((len(self.times), largura), dtype=np.int64)
+        acumulado[:, :self.histograma_pontos.shape[1]] += self.histograma_pontos
+        acumulado[:, :histograma.shape[1]] += histograma
+        self.histograma_pontos = acumulado
+
+    @property
+    def distribuicao_posicoes(self):
+        """Matriz clubes × posições com a probabilidade de cada colocação final"""
+        return self.contagem_posicoes / max(self.n_simulacoes, 1)
+
+    @property
+    def distribuicao_pontos(self):
+        """Matriz clubes × pontos com a probabilidade de cada pontuação final"""
+        return self.histograma_pontos / max(self.n_simulacoes, 1)
+
+    @property
+    def prob_titulo(self):
+        return self.distribuicao_posicoes[:, 0]
+
+    @property
+    def prob_topo(self):
+        return self.distribuicao_posicoes[:, :self.vagas_topo].sum(axis=1)
+
+    @property
+    def prob_rebaixamento(self):
+        if self.vagas_rebaixamento <= 0:
+            return np.zeros(len(self.times))
+        return self.distribuicao_posicoes[:, -self.vagas_rebaixamento:].sum(axis=1)
+
+    @property
+    def pontos_esperados(self):
+        return self.soma_pontos / max(self.n_simulacoes, 1)
+
+    @property
+    def desvio_pontos(self):
+        media = self.pontos_esperados
+        variancia = self.soma_pontos_quadrado / max(self.n_simulacoes, 1) - media ** 2
+        return np.sqrt(np.maximum(variancia, 0))
+
+    def tabela(self):
+        """DataFrame com as probabilidades por clube, ordenado por pontos esperados"""
+        df = pd.DataFrame({
+            'time': self.times,
+            'pontos_esperados': np.round(self.pontos_esperados, 1),
+            'desvio_pontos': np.round(self.desvio_pontos, 1),
+            'posicao_media': np.round(self.distribuicao_posicoes @ np.arange(1, len(self.times) + 1), 1),
+            'prob_titulo': np.round(self.prob_titulo * 100, 1),
+            'prob_topo': np.round(self.prob_topo * 100, 1),
+            'prob_rebaixamento': np.round(self.prob_rebaixamento * 100, 1),
+        })
+        df = df.sort_values(by=['pontos_esperados', 'prob_titulo'], ascending=[False, False])
+        df = df.reset_index(drop=True)
+        df.index = df.index + 1
+        df.index.name = "Pos"
+        return df
+
+def projetar_temporada_progressiva(tabela, jogos_restantes, n_simulacoes=10000, tempo_limite=None,
+                                   tamanho_lote=2000, workers=None, seed=None,
+                                   vagas_topo=4, vagas_rebaixamento=4):
+    """
+    Projeta a temporada em lotes, devolvendo estimativas cada vez mais refinadas.
+
+    Args:
+        tabela (DataFrame or None): Classificação atual (gerar_tabela_classificacao).
+        jogos_restantes (list): Tuplas (mandante, visitante) com dicts de clubes.
+        n_simulacoes (int): Número máximo de temporadas simuladas.
+        tempo_limite (float, opcional): Orçamento de tempo em segundos. Ao estourar,
+            nenhum lote novo é iniciado.
+        tamanho_lote (int): Temporadas por lote (cada lote é vetorizado).
+        workers (int, opcional): Processos em paralelo; None ou 1 roda no processo atual.
+        seed (int, opcional): Semente para reprodutibilidade.
+
+    Yields:
+        ProjecaoTemporada: A mesma projeção, atualizada após cada lote concluído.
+    """
+    inicio = time.perf_counter()
+    dados = preparar_dados_projecao(tabela, jogos_restantes)
+    projecao = ProjecaoTemporada(dados['times'], vagas_topo, vagas_rebaixamento)
+
+    lotes = [tamanho_lote] * (n_simulacoes // tamanho_lote)
+    if n_simulacoes % tamanho_lote:
+        lotes.append(n_simulacoes % tamanho_lote)
+    sementes = np.random.SeedSequence(seed).spawn(len(lotes))
+
+    def tempo_esgotado():
+        return tempo_limite is not None and time.perf_counter() - inicio >= tempo_limite
+
+    if not workers or workers <= 1:
+        for tamanho, semente in zip(lotes, sementes):
+            if tempo_esgotado():
+                break
+            projecao.acumular(simular_lote_projecao(dados, tamanho, semente))
+            projecao.tempo_decorrido = time.perf_counter() - inicio
+            yield projecao
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pendentes = list(zip(lotes, sementes))
+        em_execucao = set()
+
+        while pendentes or em_execucao:
+            while pendentes and len(em_execucao) < workers and not tempo_esgotado():
+                tamanho, semente = pendentes.pop(0)
+                em_execucao.add(executor.submit(simular_lote_projecao, dados, tamanho, semente))
+
+            if not em_execucao:
+                break
+
+            concluidos, em_execucao = wait(em_execucao, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                projecao.acumular(futuro.result())
+            projecao.tempo_decorrido = time.perf_counter() - inicio
+            yield projecao
+
+def projetar_temporada(tabela, jogos_restantes, **kwargs):
+    """Executa a projeção completa e retorna a estimativa final"""
+    projecao = None
+    for projecao in projetar_temporada_progressiva(tabela, jogos_restantes, **kwargs):
+        pass
+    return projecao
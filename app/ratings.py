@@ -0,0 +1,311 @@
+# Arquivo: app/ratings.py
+"""
+Ratings Elo dinâmicos calculados a partir do histórico de partidas.
+
+O histórico é processado em uma única passada, em blocos, guardando o deslocamento
+(em bytes) já lido do CSV. Como o histórico só recebe novas linhas no final,
+a atualização após cada partida salva apenas lê as linhas novas a partir desse
+ponto, e a reconstrução completa é a mesma rotina começando do byte zero.
+
+O rating pode ser convertido em força equivalente à forca_geral: um clube sem
+partidas tem rating_inicial(forca_geral) e forca_por_rating() devolve a mesma
+forca_geral, e a razão entre forças reproduz a expectativa do Elo no motor.
+"""
+import csv
+import io
+import json
+import math
+import os
+
+from app.armazenamento import gravar_json_atomico, tamanho_estavel, trava_arquivo
+from app.modelo import como_clube
+
+DATA_DIR = "data"
+HISTORICO_ARQUIVO = os.path.join(DATA_DIR, "historico_partidas.csv")
+CLUBES_ARQUIVO = os.path.join(DATA_DIR, "clubes_utf8.csv")
+RATINGS_DIR = os.path.join(DATA_DIR, "ratings")
+RATINGS_ARQUIVO = os.path.join(RATINGS_DIR, "ratings.json")
+HISTORICO_RATINGS_ARQUIVO = os.path.join(RATINGS_DIR, "historico_ratings.csv")
+
+RATING_BASE = 1500.0
+FORCA_REFERENCIA = 75.0
+FATOR_K = 20.0
+# Vantagem de mando equivalente ao fator casa médio do motor (1.10)
+VANTAGEM_CASA = 400 * math.log10(1.10)
+TAMANHO_BLOCO = 8 * 1024 * 1024
+TAMANHO_ASSINATURA = 256
+
+def rating_inicial(forca_geral):
+    """Rating Elo equivalente a uma forca_geral do cadastro"""
+    return RATING_BASE + 400 * math.log10(max(float(forca_geral), 1.0) / FORCA_REFERENCIA)
+
+def forca_por_rating(rating):
+    """Força equivalente a um rating Elo (inversa de rating_inicial)"""
+    return FORCA_REFERENCIA * 10 ** ((rating - RATING_BASE) / 400)
+
+def multiplicador_saldo(saldo):
+    """Peso da vitória pelo saldo de gols (como no World Football Elo)"""
+    saldo = abs(saldo)
+    if saldo <= 1:
+        return 1.0
+    if saldo == 2:
+        return 1.5
+    return (11 + saldo) / 8
+
+def variacao_elo(rating_casa, rating_visitante, gols_casa, gols_visitante):
+    """Pontos de rating ganhos pelo mandante (e perdidos pelo visitante) em uma partida"""
+    esperado_casa = 1 / (1 + 10 ** ((rating_visitante - rating_casa - VANTAGEM_CASA) / 400))
+    if gols_casa > gols_visitante:
+        resultado_casa = 1.0
+    elif gols_casa < gols_visitante:
+        resultado_casa = 0.0
+    else:
+        resultado_casa = 0.5
+    return FATOR_K * multiplicador_saldo(gols_casa - gols_visitante) * (resultado_casa - esperado_casa)
+
+def ler_assinatura(arquivo, posicao):
+    """Últimos bytes antes de uma posição do arquivo, para detectar se ele foi reescrito"""
+    if not posicao or not os.path.isfile(arquivo) or os.path.getsize(arquivo) < posicao:
+        return ''
+    inicio = max(0, posicao - TAMANHO_ASSINATURA)
+    with open(arquivo, 'rb') as f:
+        f.seek(inicio)
+        return f.read(posicao - inicio).decode('latin-1')
+
+def carregar_forcas_cadastro(arquivo=CLUBES_ARQUIVO):
+    """Lê nome -> forca_geral do cadastro de clubes (sem pandas)"""
+    forcas = {}
+    if not os.path.isfile(arquivo):
+        return forcas
+    with open(arquivo, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        for linha in csv.DictReader(f):
+            try:
+                forcas[linha['nome']] = float(linha['forca_geral'])
+            except (KeyError, TypeError, ValueError):
+                continue
+    return forcas
+
+class RatingsElo:
+    def __init__(self, forcas_iniciais=None):
+        self.forcas_iniciais = forcas_iniciais or {}
+        self.ratings = {}
+        self.partidas_processadas = 0
+        self.bytes_processados = 0
+        self.colunas = None
+        self.assinatura = ''
+        self.historico = {}  # nome -> lista de (data, rating), preenchido sob demanda
+
+    def rating(self, nome):
+        """Rating atual do clube (inicial pelo cadastro se ainda não jogou)"""
+        valor = self.ratings.get(nome)
+        if valor is None:
+            forca = self.forcas_iniciais.get(nome)
+            valor = rating_inicial(forca) if forca is not None else RATING_BASE
+        return valor
+
+    def atualizar_partida(self, time_casa, time_visitante, gols_casa, gols_visitante):
+        """
+        Aplica o resultado de uma partida aos ratings.
+
+        Returns:
+            tuple: (rating_casa, rating_visitante) após a partida.
+        """
+        rating_casa = self.rating(time_casa)
+        rating_visitante = self.rating(time_visitante)
+
+        variacao = variacao_elo(rating_casa, rating_visitante, gols_casa, gols_visitante)
+        rating_casa += variacao
+        rating_visitante -= variacao
+
+        self.ratings[time_casa] = rating_casa
+        self.ratings[time_visitante] = rating_visitante
+        self.partidas_processadas += 1
+        return rating_casa, rating_visitante
+
+    def processar_historico(self, arquivo=HISTORICO_ARQUIVO, arquivo_log=None, limite=None):
+        """
+        Processa, em uma única passada por blocos, as linhas do histórico ainda não lidas.
+
+        Args:
+            arquivo (str): CSV do histórico de partidas.
+            arquivo_log (str, opcional): CSV onde cada novo rating é acrescentado
+                (data, time, rating), formando o histórico de ratings por clube.
+            limite (int, opcional): Lê só até esse byte (ver tamanho_estavel());
+                None lê até o fim do arquivo.
+
+        Returns:
+            int: Número de partidas novas processadas.
+        """
+        if not os.path.isfile(arquivo):
+            return 0
+
+        processadas_antes = self.partidas_processadas
+        log = open(arquivo_log, 'a', encoding='utf-8', newline='') if arquivo_log else None
+        # Nomes de clubes com vírgula ou aspas saem entre aspas, como no histórico
+        escritor_log = csv.writer(log, lineterminator='\n') if log else None
+
+        try:
+            with open(arquivo, 'rb') as f:
+                f.seek(self.bytes_processados)
+                resto = b''
+
+                while True:
+                    bloco = f.read(TAMANHO_BLOCO if limite is None else max(0, min(TAMANHO_BLOCO, limite - f.tell())))
+                    if not bloco:
+                        break
+
+                    # Só processa linhas completas; o resto fica para o próximo bloco
+                    bloco = resto + bloco
+                    fim = bloco.rfind(b'\n') + 1
+                    bloco, resto = bloco[:fim], bloco[fim:]
+                    if not bloco:
+                        continue
+
+                    linhas = csv.reader(io.StringIO(bloco.decode('utf-8', errors='replace')))
+                    if self.colunas is None:
+                        cabecalho = next(linhas)
+                        self.colunas = [cabecalho.index(coluna) for coluna in
+                                        ('data', 'time_casa', 'time_visitante', 'gols_casa', 'gols_visitante')]
+
+                    i_data, i_casa, i_fora, i_gols_casa, i_gols_fora = self.colunas
+                    registros = []
+                    # Atalhos locais (laço executado uma vez por partida do histórico)
+                    ratings = self.ratings
+                    rating = self.rating
+                    for linha in linhas:
+                        try:
+                            time_casa, time_fora = linha[i_casa], linha[i_fora]
+                            gols_casa = int(linha[i_gols_casa])
+                            gols_fora = int(linha[i_gols_fora])
+                        except IndexError:
+                            continue
+                        except ValueError:
+                            try:
+                                gols_casa = int(float(linha[i_gols_casa]))
+                                gols_fora = int(float(linha[i_gols_fora]))
+                            except ValueError:
+                                continue
+
+                        rating_casa = ratings.get(time_casa) or rating(time_casa)
+                        rating_fora = ratings.get(time_fora) or rating(time_fora)
+                        variacao = variacao_elo(rating_casa, rating_fora, gols_casa, gols_fora)
+                        rating_casa += variacao
+                        rating_fora -= variacao
+                        ratings[time_casa] = rating_casa
+                        ratings[time_fora] = rating_fora
+
+                        if log:
+                            data = linha[i_data]
+                            registros.append((data, time_casa, f"{rating_casa:.1f}"))
+                            registros.append((data, time_fora, f"{rating_fora:.1f}"))
+                        self.partidas_processadas += 1
+
+                    if log and registros:
+                        escritor_log.writerows(registros)
+                    self.bytes_processados += len(bloco)
+        finally:
+            if log:
+                log.close()
+
+        self.assinatura = ler_assinatura(arquivo, self.bytes_processados)
+        self.historico = {}
+        return self.partidas_processadas - processadas_antes
+
+    def para_dict(self):
+        return {
+            'partidas_processadas': self.partidas_processadas,
+            'bytes_processados': self.bytes_processados,
+            'colunas': self.colunas,
+            'assinatura': self.assinatura,
+            'ratings': self.ratings
+        }
+
+    @classmethod
+    def de_dict(cls, dados, forcas_iniciais=None):
+        ratings = cls(forcas_iniciais)
+        ratings.partidas_processadas = dados.get('partidas_processadas', 0)
+        ratings.bytes_processados = dados.get('bytes_processados', 0)
+        ratings.colunas = dados.get('colunas')
+        ratings.assinatura = dados.get('assinatura', '')
+        ratings.ratings = dados.get('ratings', {})
+        return ratings
+
+    def historico_rating(self, nome, arquivo_log=HISTORICO_RATINGS_ARQUIVO):
+        """
+        Evolução do rating de um clube como lista de (data, rating).
+
+        Lê o log gravado durante o processamento (sem recalcular nada) e guarda
+        o resultado agrupado por clube para as próximas consultas.
+        """
+        if not self.historico and os.path.isfile(arquivo_log):
+            with open(arquivo_log, 'r', encoding='utf-8', newline='') as f:
+                for data, time, rating in csv.reader(f):
+                    self.historico.setdefault(time, []).append((data, float(rating)))
+        return self.historico.get(nome, [])
+
+    def tabela(self):
+        """Lista de (time, rating, forca_equivalente) ordenada pelo rating"""
+        nomes = set(self.ratings) | set(self.forcas_iniciais)
+        linhas = [(nome, self.rating(nome), forca_por_rating(self.rating(nome))) for nome in nomes]
+        return sorted(linhas, key=lambda x: x[1], reverse=True)
+
+def salvar_ratings(ratings, arquivo=RATINGS_ARQUIVO):
+    """Grava o estado dos ratings (pequeno: um valor por clube)"""
+    gravar_json_atomico(arquivo, ratings.para_dict())
+
+def sincronizar_ratings(arquivo_historico=HISTORICO_ARQUIVO, arquivo_ratings=RATINGS_ARQUIVO,
+                        arquivo_log=HISTORICO_RATINGS_ARQUIVO):
+    """
+    Carrega os ratings salvos e processa apenas as partidas novas do histórico.
+
+    Se o histórico foi recriado ou editado (encolheu, ou os bytes antes do ponto
+    já processado mudaram), os ratings são recalculados do zero. Usada tanto na inicialização quanto após
+    salvar_resultado(), que só acrescenta linhas ao histórico.
+
+    Returns:
+        RatingsElo: Ratings atualizados e já gravados em disco.
+    """
+    # Uma sessão por vez processa (e grava) as mesmas partidas: a trava é a do
+    # arquivo de ratings. A do histórico fica só com quem grava partidas; daqui
+    # ela é pega só para ler até onde há lotes completos
+    with trava_arquivo(arquivo_ratings):
+        forcas_iniciais = carregar_forcas_cadastro()
+        ratings = None
+
+        if os.path.isfile(arquivo_ratings):
+            try:
+                with open(arquivo_ratings, 'r', encoding='utf-8') as f:
+                    ratings = RatingsElo.de_dict(json.load(f), forcas_iniciais)
+            except (json.JSONDecodeError, OSError):
+                ratings = None
+
+        tamanho_historico = tamanho_estavel(arquivo_historico)
+        assinatura_historico = ler_assinatura(arquivo_historico, tamanho_historico)
+        if (ratings is None or ratings.bytes_processados > tamanho_historico
+                or ratings.assinatura != ler_assinatura(arquivo_historico, ratings.bytes_processados)):
+            ratings = RatingsElo(forcas_iniciais)
+            if os.path.isfile(arquivo_log):
+                os.remove(arquivo_log)
+
+        if ratings.bytes_processados < tamanho_historico:
+            os.makedirs(os.path.dirname(arquivo_log), exist_ok=True)
+            ratings.processar_historico(arquivo_historico, arquivo_log, tamanho_historico)
+            # Histórico reescrito durante a leitura (migração, recriação): não
+            # grava; a próxima sincronização vê a diferença e recalcula
+            if ler_assinatura(arquivo_historico, tamanho_historico) == assinatura_historico:
+                salvar_ratings(ratings, arquivo_ratings)
+
+        return ratings
+
+def clubes_com_forca_rating(clubes, ratings):
+    """
+    Retorna cópias dos clubes com a forca_geral trocada pela força equivalente ao rating.
+
+    A força do cadastro fica em forca_cadastro. Como todos os motores leem
+    forca_geral, qualquer simulação passa a usar o rating sem outras mudanças.
+    As cópias compartilham elenco e logo com os originais.
+    """
+    return {
+        clube_id: como_clube(clube).com_forca(round(forca_por_rating(ratings.rating(clube['nome'])), 1))
+        for clube_id, clube in clubes.items()
+    }
@@ -3,12 +3,20 @@ import streamlit as st
 import pandas as pd
 import random
 import time
+import datetime
 from utils.io import salvar_resultado
+from app.competicoes import COMPETICAO_PADRAO
 import base64
 from io import BytesIO
-from PIL import Image
 from collections import Counter
 
+from app.motor import simular_partida_escalacao, simular_partida_eventos
+from app.log_eventos import LogEventos, SinkLogBinario
+from app.eventos import (
+    SinkEventos, SinkContadores, SinkMultiplo, formatar_evento, eventos_de_resultado, ESTILOS_EVENTO,
+    TIPOS_NARRADOS, TIPOS_DESTAQUE, INICIO, INSPIRADO, LANCE, GOL, INTERVALO, FIM
+)
+
 def configurar_streamlit():
     """Configurações iniciais do Streamlit"""
     if 'animacao_ativa' not in st.session_state:
@@ -19,6 +27,7 @@ def configurar_streamlit():
 def base64_to_image(base64_string):
     """Converte base64 para objeto de imagem"""
     try:
+        from PIL import Image  # Importado só quando um logo é desenhado (o PIL é lento para importar)
         img_data = base64.b64decode(base64_string)
         return Image.open(BytesIO(img_data))
     except:
@@ -111,7 +120,7 @@ def exibir_placar_metrica(container, clube1, clube2, gols1, gols2, minutos, dest
                     st.image(img, width=60)
             st.metric(label=clube2['nome'], value=gols2, delta=None)
 
-def animar_gol(container, clube1, clube2, gols1, gols2, minutos):
+def animar_gol(container, clube1, clube2, gols1, gols2, minutos, pausa=0.4):
     """Animação de gol usando componentes nativos"""
     for i in range(3):
         container.empty()
@@ -119,19 +128,19 @@ def animar_gol(container, clube1, clube2, gols1, gols2, minutos):
             exibir_placar_nativo(container, clube1, clube2, gols1, gols2, minutos, "⚽ GOOOOOL! 🎯")
         else:
             exibir_placar_nativo(container, clube1, clube2, gols1, gols2, minutos)
-        time.sleep(0.4)
+        time.sleep(pausa)
 
-def animar_intervalo(container, clube1, clube2, gols1, gols2, minutos):
+def animar_intervalo(container, clube1, clube2, gols1, gols2, minutos, pausa=1.5):
     """Animação para o intervalo"""
     container.empty()
     exibir_placar_nativo(container, clube1, clube2, gols1, gols2, minutos, "🔄 INTERVALO")
-    time.sleep(1.5)
+    time.sleep(pausa)
 
-def animar_fim_jogo(container, clube1, clube2, gols1, gols2, minutos):
+def animar_fim_jogo(container, clube1, clube2, gols1, gols2, minutos, pausa=1.5):
     """Animação para o fim do jogo"""
     container.empty()
     exibir_placar_nativo(container, clube1, clube2, gols1, gols2, minutos, "🏁 FIM DE JOGO!")
-    time.sleep(1.5)
+    time.sleep(pausa)
 
 def validar_dados_clube(clube):
     """Valida os dados do clube"""
@@ -148,28 +157,128 @@ def validar_dados_clube(clube):
             raise ValueError(f"Jogador sem dados completos em {clube['nome']}")
 
 def calcular_media_habilidade(jogadores):
-    """Calcula a média de habilidade dos jogadores"""
-    if not jogadores:
+    """
+    Calcula a média de habilidade dos jogadores: uma lista de jogadores ou as
+    habilidades de um clube nos elencos em colunas (ElencosColunares.habilidades()).
+    Para todos os clubes de uma vez, ver ElencosColunares.media_habilidade().
+    """
+    if jogadores is None or len(jogadores) == 0:
         return 50
+    if hasattr(jogadores, 'mean'):
+        return float(jogadores.mean())
     return sum(j.get('habilidade', 50) for j in jogadores) / len(jogadores)
 
-def simular_partida(clube1, clube2):
+def exibir_alerta(estilo, texto):
+    """Exibe um texto com o componente de alerta do Streamlit indicado pelo estilo"""
+    getattr(st, estilo, st.write)(texto)
+
+class SinkStreamlit(SinkEventos):
     """
-    Simula uma partida usando apenas componentes nativos do Streamlit
+    Sink que mostra a partida: placar animado, progresso e os últimos eventos
+    narrados. Os eventos são classificados pelo tipo, sem inspecionar textos.
+
+    É o mesmo caminho de exibição para a partida ao vivo e para o replay.
+    velocidade multiplica o ritmo das animações (2.0 = duas vezes mais rápido);
+    com velocidade 0 a partida é exibida instantaneamente, só no estado final.
+    """
+
+    def __init__(self, clube1, clube2, placar_container, info_container, eventos_placeholder,
+                 progresso, tempo_texto, velocidade=1.0):
+        self.clube1 = clube1
+        self.clube2 = clube2
+        self.placar_container = placar_container
+        self.info_container = info_container
+        self.eventos_placeholder = eventos_placeholder
+        self.progresso = progresso
+        self.tempo_texto = tempo_texto
+        self.instantaneo = not velocidade
+        self.velocidade = velocidade or 1.0
+        self.narrados = []  # Tuplas (evento, texto)
+
+    def pausa(self, segundos):
+        return segundos / self.velocidade
+
+    def exibir_ultimos_eventos(self, quantidade=5):
+        with self.eventos_placeholder.container():
+            for evento_narrado, texto in self.narrados[-quantidade:]:
+                exibir_alerta(ESTILOS_EVENTO[evento_narrado.tipo], texto)
+
+    def registrar(self, evento):
+        tipo = evento.tipo
+
+        if tipo in (INSPIRADO, INICIO):
+            with self.info_container:
+                exibir_alerta(ESTILOS_EVENTO[tipo], formatar_evento(evento, self.clube1, self.clube2))
+            return
+
+        if tipo in TIPOS_NARRADOS:
+            self.narrados.append((evento, formatar_evento(evento, self.clube1, self.clube2)))
+
+        if tipo == FIM:
+            self.progresso.progress(100)
+            self.tempo_texto.markdown(f"**Tempo: {evento.minuto} minutos**")
+            if self.instantaneo:
+                exibir_placar_nativo(self.placar_container, self.clube1, self.clube2, evento.gols1, evento.gols2,
+                                     evento.minuto, "🏁 FIM DE JOGO!")
+                self.exibir_ultimos_eventos()
+            else:
+                animar_fim_jogo(self.placar_container, self.clube1, self.clube2, evento.gols1, evento.gols2, 90,
+                                self.pausa(1.5))
+
+        elif self.instantaneo:
+            return
+
+        elif tipo == GOL:
+            animar_gol(self.placar_container, self.clube1, self.clube2, evento.gols1, evento.gols2, evento.minuto,
+                       self.pausa(0.4))
+
+        elif tipo == LANCE:
+            self.progresso.progress(int((evento.minuto / 90) * 100))
+            self.tempo_texto.markdown(f"**Tempo: {evento.minuto} minutos**")
+            exibir_placar_nativo(self.placar_container, self.clube1, self.clube2, evento.gols1, evento.gols2, evento.minuto)
+
+            # Atualiza lista de eventos (mostra últimos 5)
+            self.exibir_ultimos_eventos()
+
+            time.sleep(self.pausa(0.3))
+
+        elif tipo == INTERVALO:
+            animar_intervalo(self.placar_container, self.clube1, self.clube2, evento.gols1, evento.gols2, 45,
+                             self.pausa(1.5))
+            with self.eventos_placeholder.container():
+                st.warning(self.narrados[-1][1])
+
+def ajustar_estatisticas_exibicao(estatisticas, gols1, gols2):
+    """
+    Ajuste final de estatísticas para garantir realismo na exibição:
+    cada time tem pelo menos algumas finalizações e as finalizações no gol
+    cobrem os gols sem exceder o total de finalizações.
+    """
+    finalizacoes = list(estatisticas['finalizacoes'])
+    finalizacoes_gol = list(estatisticas['finalizacoes_gol'])
+
+    for lado, gols in enumerate((gols1, gols2)):
+        if finalizacoes[lado] < 3:
+            finalizacoes[lado] += random.randint(2, 4)
+        if finalizacoes_gol[lado] < gols:
+            finalizacoes_gol[lado] = gols + random.randint(1, 3)
+        finalizacoes_gol[lado] = min(finalizacoes_gol[lado], finalizacoes[lado])
+
+    estatisticas = dict(estatisticas)
+    estatisticas['finalizacoes'] = tuple(finalizacoes)
+    estatisticas['finalizacoes_gol'] = tuple(finalizacoes_gol)
+    return estatisticas
+
+def preparar_tela_partida(clube1, clube2, titulo="⚽ Simulação de Partida", velocidade=1.0):
+    """
+    Monta a tela da partida (placar, eventos e progresso) e retorna o
+    SinkStreamlit que a atualiza a cada evento.
     """
-    try:
-        # Validação
-        validar_dados_clube(clube1)
-        validar_dados_clube(clube2)
-    except ValueError as e:
-        st.error(f"❌ Erro nos dados: {e}")
-        return 0, 0
-    
     # Configuração inicial
     configurar_streamlit()
     
     # Título da partida
-    st.title("⚽ Simulação de Partida")
+    st.title(titulo)
     st.markdown(f"### {clube1['nome']} vs {clube2['nome']}")
     
     # Separador
@@ -194,244 +303,71 @@ def simular_partida(clube1, clube2):
         progresso = stats_container.progress(0)
         tempo_texto = stats_container.empty()
     
-    # Inicialização
-    gols1 = gols2 = 0
-    minutos = 0
-    eventos = []
-    marcadores_gols = []
-    
-    # Estatísticas detalhadas
-    finalizacoes1 = finalizacoes2 = 0
-    finalizacoes_gol1 = finalizacoes_gol2 = 0
-    defesas1 = defesas2 = 0
-    posse_bola1 = posse_bola2 = 0
-    faltas1 = faltas2 = 0
-    escanteios1 = escanteios2 = 0
-    cartoes_amarelos1 = cartoes_amarelos2 = 0
-    
     # Exibir placar inicial
     exibir_placar_nativo(placar_container, clube1, clube2, 0, 0, 0)
     
-    # Fatores do jogo
-    fator_casa = random.uniform(1.05, 1.15)
-    fator_dia_clube1 = random.uniform(0.85, 1.15)
-    fator_dia_clube2 = random.uniform(0.85, 1.15)
-    
-    forca_efetiva_clube1 = clube1['forca_geral'] * fator_casa * fator_dia_clube1
-    forca_efetiva_clube2 = clube2['forca_geral'] * fator_dia_clube2
-    
-    # Informações pré-jogo
-    with eventos_container:
-        info_container = st.container()
-        with info_container:
-            if fator_dia_clube1 > 1.1:
-                st.success(f"🔥 {clube1['nome']} está em um dia inspirado!")
-            if fator_dia_clube2 > 1.1:
-                st.success(f"🔥 {clube2['nome']} está em um dia inspirado!")
-            st.info("📢 Começa a partida!")
-    
-    # Placeholder para eventos
+    # Informações pré-jogo e eventos ao vivo
+    info_container = eventos_container.container()
     eventos_placeholder = eventos_container.empty()
     
-    # Simulação
-    for periodo in range(2):
-        tempo_inicial = 0 if periodo == 0 else 45
-        tempo_final = 45 if periodo == 0 else 90
-        
-        num_eventos = random.randint(8, 12)
-        
-        for _ in range(num_eventos):
-            # Avança o tempo
-            if minutos < tempo_final:
-                minutos = min(minutos + random.randint(3, 8), tempo_final)
-            
-            # Atualiza progresso
-            progresso_percentual = int((minutos / 90) * 100)
-            progresso.progress(progresso_percentual)
-            tempo_texto.markdown(f"**Tempo: {minutos} minutos**")
-            
-            # Atualiza placar
-            exibir_placar_nativo(placar_container, clube1, clube2, gols1, gols2, minutos)
-            
-            # Determina time atacante baseado na força
-            soma_forcas = forca_efetiva_clube1 + forca_efetiva_clube2
-            prob_clube1 = forca_efetiva_clube1 / soma_forcas
-            
-            # Ajuste por diferença de gols (time perdendo ataca mais)
-            diferenca_gols = gols1 - gols2
-            if diferenca_gols >= 2:
-                prob_clube1 *= 0.8
-            elif diferenca_gols <= -2:
-                prob_clube1 *= 1.2
-            prob_clube1 = max(0.3, min(0.7, prob_clube1))
-            
-            time_atacante = 1 if random.random() < prob_clube1 else 2
-            
-            # Chance de finalização (20%)
-            if random.random() < 0.20:
-                if time_atacante == 1:
-                    finalizacoes1 += 1
-                    
-                    # Chance da finalização ir no gol (60%)
-                    if random.random() < 0.60:
-                        finalizacoes_gol1 += 1
-                        
-                        # Chance de gol (40% das finalizações no gol)
-                        if random.random() < 0.40:
-                            gols1 += 1
-                            jogadores = [j for j in clube1['jogadores'] if j.get('posicao') != 'Goleiro']
-                            if jogadores:
-                                marcador = random.choice(jogadores)
-                                evento = f"⚽ {minutos}' - GOL! {marcador['nome']} marca para o {clube1['nome']}!"
-                                marcadores_gols.append((marcador['nome'], minutos, clube1['nome']))
-                            else:
-                                evento = f"⚽ {minutos}' - GOL do {clube1['nome']}!"
-                            eventos.append(evento)
-                            animar_gol(placar_container, clube1, clube2, gols1, gols2, minutos)
-                        else:
-                            # Defesa do goleiro
-                            defesas2 += 1
-                            goleiro = next((j for j in clube2['jogadores'] if j.get('posicao') == 'Goleiro'), None)
-                            if goleiro:
-                                evento = f"🧤 {minutos}' - Grande defesa de {goleiro['nome']} ({clube2['nome']})!"
-                            else:
-                                evento = f"🧤 {minutos}' - Defesa do goleiro do {clube2['nome']}!"
-                            eventos.append(evento)
-                    else:
-                        # Finalização para fora
-                        evento = f"😮 {minutos}' - {clube1['nome']} finaliza para fora!"
-                        eventos.append(evento)
-                else:
-                    finalizacoes2 += 1
-                    
-                    # Chance da finalização ir no gol (60%)
-                    if random.random() < 0.60:
-                        finalizacoes_gol2 += 1
-                        
-                        # Chance de gol (40% das finalizações no gol)
-                        if random.random() < 0.40:
-                            gols2 += 1
-                            jogadores = [j for j in clube2['jogadores'] if j.get('posicao') != 'Goleiro']
-                            if jogadores:
-                                marcador = random.choice(jogadores)
-                                evento = f"⚽ {minutos}' - GOL! {marcador['nome']} marca para o {clube2['nome']}!"
-                                marcadores_gols.append((marcador['nome'], minutos, clube2['nome']))
-                            else:
-                                evento = f"⚽ {minutos}' - GOL do {clube2['nome']}!"
-                            eventos.append(evento)
-                            animar_gol(placar_container, clube1, clube2, gols1, gols2, minutos)
-                        else:
-                            # Defesa do goleiro
-                            defesas1 += 1
-                            goleiro = next((j for j in clube1['jogadores'] if j.get('posicao') == 'Goleiro'), None)
-                            if goleiro:
-                                evento = f"🧤 {minutos}' - Grande defesa de {goleiro['nome']} ({clube1['nome']})!"
-                            else:
-                                evento = f"🧤 {minutos}' - Defesa do goleiro do {clube1['nome']}!"
-                            eventos.append(evento)
-                    else:
-                        # Finalização para fora
-                        evento = f"😮 {minutos}' - {clube2['nome']} finaliza para fora!"
-                        eventos.append(evento)
-                        
-            # Outros eventos (10% de chance)
-            elif random.random() < 0.10:
-                tipo_evento = random.choice(['falta', 'escanteio', 'cartao'])
-                
-                if tipo_evento == 'falta':
-                    if random.random() < prob_clube1:
-                        faltas1 += 1
-                        evento = f"⚠️ {minutos}' - Falta cometida por {clube1['nome']}"
-                    else:
-                        faltas2 += 1
-                        evento = f"⚠️ {minutos}' - Falta cometida por {clube2['nome']}"
-                    eventos.append(evento)
-                    
-                elif tipo_evento == 'escanteio':
-                    if random.random() < prob_clube1:
-                        escanteios1 += 1
-                        evento = f"🚩 {minutos}' - Escanteio para {clube1['nome']}"
-                    else:
-                        escanteios2 += 1
-                        evento = f"🚩 {minutos}' - Escanteio para {clube2['nome']}"
-                    eventos.append(evento)
-                    
-                elif tipo_evento == 'cartao' and random.random() < 0.3:  # Cartões são mais raros
-                    if random.random() < prob_clube1:
-                        cartoes_amarelos1 += 1
-                        jogador = random.choice(clube1['jogadores'])
-                        evento = f"🟨 {minutos}' - Cartão amarelo para {jogador['nome']} ({clube1['nome']})"
-                    else:
-                        cartoes_amarelos2 += 1
-                        jogador = random.choice(clube2['jogadores'])
-                        evento = f"🟨 {minutos}' - Cartão amarelo para {jogador['nome']} ({clube2['nome']})"
-                    eventos.append(evento)
-            
-            # Atualiza lista de eventos (mostra últimos 5)
-            with eventos_placeholder.container():
-                for evento in eventos[-5:]:
-                    if "GOL" in evento:
-                        st.success(evento)
-                    elif "defesa" in evento.lower():
-                        st.info(evento)
-                    elif "Cartão" in evento:
-                        st.warning(evento)
-                    elif "Falta" in evento:
-                        st.warning(evento)
-                    elif "Escanteio" in evento:
-                        st.info(evento)
-                    elif "finaliza" in evento:
-                        st.warning(evento)
-                    else:
-                        st.info(evento)
-            
-            # Contabiliza posse de bola
-            if time_atacante == 1:
-                posse_bola1 += 1
-            else:
-                posse_bola2 += 1
-            
-            # Pausa entre eventos
-            time.sleep(0.3)
-        
-        # Intervalo
-        if periodo == 0:
-            evento_intervalo = f"⏱️ 45' - Fim do 1º tempo: {clube1['nome']} {gols1} x {gols2} {clube2['nome']}"
-            eventos.append(evento_intervalo)
-            
-            animar_intervalo(placar_container, clube1, clube2, gols1, gols2, 45)
-            
-            with eventos_placeholder.container():
-                st.warning(evento_intervalo)
-            
-            # Chance de motivação no intervalo
-            if gols1 < gols2 and random.random() < 0.3:
-                forca_efetiva_clube1 *= 1.1
-                eventos.append(f"🗣️ {clube1['nome']} volta motivado do intervalo!")
-            elif gols2 < gols1 and random.random() < 0.3:
-                forca_efetiva_clube2 *= 1.1
-                eventos.append(f"🗣️ {clube2['nome']} volta motivado do intervalo!")
-    
-    # Fim do jogo
-    animar_fim_jogo(placar_container, clube1, clube2, gols1, gols2, 90)
-    
-    # Ajuste final de estatísticas para garantir realismo
-    # Garante que cada time tenha pelo menos algumas finalizações
-    if finalizacoes1 < 3:
-        finalizacoes1 += random.randint(2, 4)
-    if finalizacoes2 < 3:
-        finalizacoes2 += random.randint(2, 4)
-    
-    # Ajusta finalizações no gol baseado no total
-    if finalizacoes_gol1 < gols1:
-        finalizacoes_gol1 = gols1 + random.randint(1, 3)
-    if finalizacoes_gol2 < gols2:
-        finalizacoes_gol2 = gols2 + random.randint(1, 3)
-    
-    # Garante que finalizações no gol não excedam total de finalizações
-    finalizacoes_gol1 = min(finalizacoes_gol1, finalizacoes1)
-    finalizacoes_gol2 = min(finalizacoes_gol2, finalizacoes2)
+    return SinkStreamlit(clube1, clube2, placar_container, info_container, eventos_placeholder,
+                         progresso, tempo_texto, velocidade)
+
+def simular_partida(clube1, clube2, saldo_inicial=0, competicao=COMPETICAO_PADRAO, torneio_id=None, motor="forca"):
+    """
+    Simula uma partida usando apenas componentes nativos do Streamlit
+
+    saldo_inicial é o saldo do mandante no confronto antes do jogo (jogo de
+    volta de um mata-mata); o time que está sendo eliminado pressiona.
+    competicao e torneio_id identificam a partida no histórico.
+    Com motor="escalacao" as forças vêm dos titulares (app/escalacao.py).
+    """
+    try:
+        # Validação
+        validar_dados_clube(clube1)
+        validar_dados_clube(clube2)
+    except ValueError as e:
+        st.error(f"❌ Erro nos dados: {e}")
+        return 0, 0
+    
+    tela = preparar_tela_partida(clube1, clube2)
+    
+    # Simulação: o motor emite os eventos para a tela, para os contadores e para o log
+    contadores = SinkContadores()
+    log_eventos = LogEventos()
+    registro = SinkLogBinario(log_eventos, clube1, clube2, gravar=False)
+    simular = simular_partida_escalacao if motor == "escalacao" else simular_partida_eventos
+    gols1, gols2, marcadores_gols = simular(clube1, clube2, SinkMultiplo(tela, contadores, registro),
+                                            saldo_inicial=saldo_inicial)
+    
+    estatisticas = ajustar_estatisticas_exibicao(contadores.estatisticas(), gols1, gols2)
+    exibir_relatorio_partida(clube1, clube2, gols1, gols2, marcadores_gols, estatisticas, tela.narrados)
+    
+    # Salvar resultado
+    try:
+        salvar_resultado(clube1, clube2, gols1, gols2, marcadores_gols, competicao, torneio_id=torneio_id)
+        st.info("💾 Resultado salvo no histórico!")
+    except Exception as e:
+        st.warning(f"⚠️ Não foi possível salvar o resultado: {e}")
     
+    # Linha do tempo completa no log binário de eventos (para replay e estatísticas)
+    try:
+        log_eventos.gravar()
+    except Exception as e:
+        st.warning(f"⚠️ Não foi possível gravar os eventos da partida (replay): {e}")
+    
+    return gols1, gols2
+
+def exibir_relatorio_partida(clube1, clube2, gols1, gols2, marcadores_gols, estatisticas, eventos):
+    """
+    Resultado final e estatísticas detalhadas de uma partida já exibida.
+    
+    Args:
+        marcadores_gols (list): Tuplas (jogador, minuto, time).
+        estatisticas (dict): Pares (mandante, visitante) por estatística, como
+            em SinkContadores.estatisticas().
+        eventos (list): Tuplas (evento, texto) narradas na partida.
+    """
     # Resultado final
     st.markdown("---")
     st.success(f"🏁 **RESULTADO FINAL: {clube1['nome']} {gols1} x {gols2} {clube2['nome']}**")
@@ -457,11 +393,11 @@ def simular_partida(clube1, clube2):
         with col1:
             st.metric("Total de Gols", gols1 + gols2)
         with col2:
-            st.metric("Total de Finalizações", finalizacoes1 + finalizacoes2)
+            st.metric("Total de Finalizações", sum(estatisticas['finalizacoes']))
         with col3:
-            st.metric("Total de Defesas", defesas1 + defesas2)
+            st.metric("Total de Defesas", sum(estatisticas['defesas']))
         with col4:
-            st.metric("Total de Faltas", faltas1 + faltas2)
+            st.metric("Total de Faltas", sum(estatisticas['faltas']))
         
         st.markdown("---")
         
@@ -512,48 +448,22 @@ def simular_partida(clube1, clube2):
         # Estatísticas gerais
         st.subheader("📈 Estatísticas Gerais")
         
-        # Posse de bola baseada em dados reais da partida
-        total_posse = posse_bola1 + posse_bola2
-        if total_posse > 0:
-            posse_time1 = round((posse_bola1 / total_posse) * 100)
-            posse_time2 = round((posse_bola2 / total_posse) * 100)
-        else:
-            # Fallback para cálculo baseado em força
-            posse_time1 = round((forca_efetiva_clube1 / (forca_efetiva_clube1 + forca_efetiva_clube2)) * 100)
-            posse_time2 = 100 - posse_time1
+        linhas_estatisticas = [
+            ('Posse de Bola (%)', 'posse'),
+            ('Gols', 'gols'),
+            ('Finalizações', 'finalizacoes'),
+            ('Finalizações no Gol', 'finalizacoes_gol'),
+            ('Defesas do Goleiro', 'defesas'),
+            ('Faltas', 'faltas'),
+            ('Escanteios', 'escanteios'),
+            ('Cartões Amarelos', 'cartoes_amarelos')
+        ]
         
         # Criar DataFrame com todas as estatísticas
         stats_df = pd.DataFrame({
-            'Estatística': [
-                'Posse de Bola (%)', 
-                'Gols', 
-                'Finalizações',
-                'Finalizações no Gol',
-                'Defesas do Goleiro',
-                'Faltas',
-                'Escanteios',
-                'Cartões Amarelos'
-            ],
-            clube1['nome']: [
-                posse_time1, 
-                gols1, 
-                finalizacoes1,
-                finalizacoes_gol1,
-                defesas1,
-                faltas1,
-                escanteios1,
-                cartoes_amarelos1
-            ],
-            clube2['nome']: [
-                posse_time2, 
-                gols2, 
-                finalizacoes2,
-                finalizacoes_gol2,
-                defesas2,
-                faltas2,
-                escanteios2,
-                cartoes_amarelos2
-            ]
+            'Estatística': [rotulo for rotulo, _ in linhas_estatisticas],
+            clube1['nome']: [estatisticas[chave][0] for _, chave in linhas_estatisticas],
+            clube2['nome']: [estatisticas[chave][1] for _, chave in linhas_estatisticas]
         })
         
         st.dataframe(stats_df, hide_index=True, use_container_width=True)
@@ -563,92 +473,154 @@ def simular_partida(clube1, clube2):
         
         col1, col2 = st.columns(2)
         
-        with col1:
-            st.markdown(f"**{clube1['nome']}**")
-            # Eficiência de finalização
-            if finalizacoes1 > 0:
-                eficiencia1 = round((gols1 / finalizacoes1) * 100, 1)
-                st.metric("Eficiência de Finalização", f"{eficiencia1}%")
-            else:
-                st.metric("Eficiência de Finalização", "0%")
-            
-            # Precisão de finalização
-            if finalizacoes1 > 0:
-                precisao1 = round((finalizacoes_gol1 / finalizacoes1) * 100, 1)
-                st.metric("Precisão de Finalização", f"{precisao1}%")
-            else:
-                st.metric("Precisão de Finalização", "0%")
-        
-        with col2:
-            st.markdown(f"**{clube2['nome']}**")
-            # Eficiência de finalização
-            if finalizacoes2 > 0:
-                eficiencia2 = round((gols2 / finalizacoes2) * 100, 1)
-                st.metric("Eficiência de Finalização", f"{eficiencia2}%")
-            else:
-                st.metric("Eficiência de Finalização", "0%")
-            
-            # Precisão de finalização
-            if finalizacoes2 > 0:
-                precisao2 = round((finalizacoes_gol2 / finalizacoes2) * 100, 1)
-                st.metric("Precisão de Finalização", f"{precisao2}%")
-            else:
-                st.metric("Precisão de Finalização", "0%")
+        for lado, (coluna, clube, gols) in enumerate(((col1, clube1, gols1), (col2, clube2, gols2))):
+            with coluna:
+                st.markdown(f"**{clube['nome']}**")
+                finalizacoes = estatisticas['finalizacoes'][lado]
+                # Eficiência de finalização
+                if finalizacoes > 0:
+                    st.metric("Eficiência de Finalização", f"{round((gols / finalizacoes) * 100, 1)}%")
+                else:
+                    st.metric("Eficiência de Finalização", "0%")
+                
+                # Precisão de finalização
+                if finalizacoes > 0:
+                    precisao = round((estatisticas['finalizacoes_gol'][lado] / finalizacoes) * 100, 1)
+                    st.metric("Precisão de Finalização", f"{precisao}%")
+                else:
+                    st.metric("Precisão de Finalização", "0%")
         
         # Visualização gráfica das estatísticas
         st.subheader("📊 Comparativo Visual")
         
         # Gráfico de barras comparativo
+        chaves_grafico = ['finalizacoes', 'finalizacoes_gol', 'defesas', 'faltas', 'escanteios']
         chart_data = pd.DataFrame({
-            clube1['nome']: [finalizacoes1, finalizacoes_gol1, defesas1, faltas1, escanteios1],
-            clube2['nome']: [finalizacoes2, finalizacoes_gol2, defesas2, faltas2, escanteios2]
+            clube1['nome']: [estatisticas[chave][0] for chave in chaves_grafico],
+            clube2['nome']: [estatisticas[chave][1] for chave in chaves_grafico]
         }, index=['Finalizações', 'No Gol', 'Defesas', 'Faltas', 'Escanteios'])
         
         st.bar_chart(chart_data)
         
         # Todos os eventos
         st.subheader("📝 Todos os Eventos da Partida")
-        for i, evento in enumerate(eventos):
-            if "GOL" in evento:
-                st.success(f"{i+1}. {evento}")
-            elif "defesa" in evento.lower():
-                st.info(f"{i+1}. {evento}")
-            elif "Cartão" in evento:
-                st.warning(f"{i+1}. {evento}")
-            elif "Falta" in evento:
-                st.warning(f"{i+1}. {evento}")
-            elif "Escanteio" in evento:
-                st.info(f"{i+1}. {evento}")
-            elif "finaliza" in evento:
-                st.warning(f"{i+1}. {evento}")
-            elif "Fim do" in evento or "volta motivado" in evento:
-                st.info(f"{i+1}. {evento}")
-            else:
-                st.write(f"{i+1}. {evento}")
+        for i, (evento, texto) in enumerate(eventos):
+            exibir_alerta(ESTILOS_EVENTO[evento.tipo], f"{i+1}. {texto}")
     
         # Melhores momentos
         st.subheader("🌟 Melhores Momentos")
         
         # Filtrar apenas eventos importantes
-        eventos_importantes = [e for e in eventos if any(palavra in e for palavra in ["GOL", "defesa", "Cartão"])]
+        eventos_importantes = [(evento, texto) for evento, texto in eventos if evento.tipo in TIPOS_DESTAQUE]
         
         if eventos_importantes:
             # Mostrar últimos 10 momentos importantes
-            for evento in eventos_importantes[-10:]:
-                if "GOL" in evento:
-                    st.success(f"⭐ {evento}")
-                elif "defesa" in evento.lower():
-                    st.info(f"⭐ {evento}")
-                elif "Cartão" in evento:
-                    st.warning(f"⭐ {evento}")
+            for evento, texto in eventos_importantes[-10:]:
+                exibir_alerta(ESTILOS_EVENTO[evento.tipo], f"⭐ {texto}")
         else:
             st.info("Partida sem grandes emoções")
+
+VELOCIDADES_REPLAY = {"Instantâneo": 0, "1x": 1.0, "2x": 2.0, "4x": 4.0}
+
+def reproduzir_partida(clube1, clube2, eventos, velocidade=1.0, titulo="🔁 Replay da Partida"):
+    """
+    Exibe uma partida já jogada a partir dos seus eventos, sem re-simular.
     
-    # Salvar resultado
-    try:
-        salvar_resultado(clube1, clube2, gols1, gols2, marcadores_gols)
-        st.info("💾 Resultado salvo no histórico!")
-    except Exception as e:
-        st.warning(f"⚠️ Não foi possível salvar o resultado: {e}")
+    Usa a mesma tela e o mesmo relatório da partida ao vivo; apenas a origem
+    dos eventos muda (log de eventos ou linha do tempo montada do histórico).
+    
+    Args:
+        eventos (list): Eventos da partida em ordem (app.eventos.Evento).
+        velocidade (float): Ritmo das animações; 0 exibe o resultado instantaneamente.
+    
+    Returns:
+        tuple: (gols1, gols2)
+    """
+    tela = preparar_tela_partida(clube1, clube2, titulo, velocidade)
+    contadores = SinkContadores()
+    destino = SinkMultiplo(tela, contadores)
+    for evento in eventos:
+        destino.registrar(evento)
+    destino.finalizar()
+    
+    gols1, gols2 = eventos[-1].gols1, eventos[-1].gols2
+    clubes = (None, clube1, clube2)
+    marcadores_gols = [(evento.jogador, evento.minuto, clubes[evento.lado]['nome'])
+                       for evento in eventos if evento.tipo == GOL and evento.jogador]
+    
+    exibir_relatorio_partida(clube1, clube2, gols1, gols2, marcadores_gols, contadores.estatisticas(), tela.narrados)
+    return gols1, gols2
+
+def ler_marcadores_historico(texto):
+    """Converte a coluna marcadores_gols do histórico em tuplas (jogador, minuto, time)"""
+    marcadores = []
+    if isinstance(texto, str):
+        for marcador_info in texto.split(';'):
+            partes = marcador_info.split(':')
+            if len(partes) >= 3 and partes[1].strip().isdigit():
+                marcadores.append((partes[0], int(partes[1]), partes[2]))
+    return marcadores
+
+def exibir_replays(clubes, historico=None, log_eventos=None):
+    """
+    Seleção de uma partida passada e exibição do seu replay.
+    
+    Partidas do log de eventos têm a linha do tempo completa; as demais
+    partidas do histórico são reconstruídas a partir do placar e dos marcadores.
+    """
+    log_eventos = log_eventos or LogEventos()
+    partidas = log_eventos.partidas()
+    
+    fonte_log = "🎞️ Linha do tempo completa"
+    fonte_historico = "📋 Histórico (placar e gols)"
+    fontes = []
+    if partidas.shape[0]:
+        fontes.append(fonte_log)
+    if historico is not None and not historico.empty:
+        fontes.append(fonte_historico)
+    
+    if not fontes:
+        st.info("Nenhuma partida disponível para replay.")
+        return
+    
+    fonte = st.radio("Origem da partida:", fontes, horizontal=True, key="replay_fonte")
+    
+    if fonte == fonte_log:
+        nomes = {clube.get('id'): clube['nome'] for clube in clubes.values()}
+        opcoes = list(range(partidas.shape[0] - 1, max(-1, partidas.shape[0] - 201), -1))
+        
+        def rotulo(indice):
+            partida = partidas[indice]
+            data = datetime.datetime.fromtimestamp(int(partida['data'])).strftime("%Y-%m-%d %H:%M")
+            return (f"#{int(partida['partida'])} · {data} · {nomes.get(int(partida['clube1']), '?')} "
+                    f"{int(partida['gols1'])} x {int(partida['gols2'])} {nomes.get(int(partida['clube2']), '?')}")
+    else:
+        opcoes = list(historico.index[::-1][:200])
+        
+        def rotulo(indice):
+            partida = historico.loc[indice]
+            return (f"{partida['data']} · {partida['time_casa']} {partida['gols_casa']} x "
+                    f"{partida['gols_visitante']} {partida['time_visitante']}")
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        escolha = st.selectbox("Partida:", opcoes, format_func=rotulo, key="replay_partida")
+    with col2:
+        velocidade = st.select_slider("Velocidade:", options=list(VELOCIDADES_REPLAY), value="2x", key="replay_velocidade")
+    
+    if not st.button("▶️ Assistir Replay", use_container_width=True):
+        return
+    
+    if fonte == fonte_log:
+        clube1, clube2, eventos = log_eventos.reconstruir_partida(escolha, clubes)
+    else:
+        partida = historico.loc[escolha]
+        por_nome = {clube['nome']: clube for clube in clubes.values()}
+        clube1 = por_nome.get(partida['time_casa'], {'nome': partida['time_casa'], 'jogadores': []})
+        clube2 = por_nome.get(partida['time_visitante'], {'nome': partida['time_visitante'], 'jogadores': []})
+        eventos = eventos_de_resultado(int(partida['gols_casa']), int(partida['gols_visitante']),
+                                       ler_marcadores_historico(partida.get('marcadores_gols')),
+                                       clube1['nome'], clube2['nome'])
+        st.caption("Replay reconstruído a partir do placar e dos marcadores registrados no histórico.")
     
-    return gols1, gols2
\ No newline at end of file
+    reproduzir_partida(clube1, clube2, eventos, VELOCIDADES_REPLAY[velocidade])
@@ -9,169 +9,22 @@ from datetime import datetime
 
 # Importar a função de simulação do módulo existente
 from app.simulacao import simular_partida
-
-class TorneioMataMata:
-    def __init__(self, nome, times, formato="ida_volta"):
-        self.nome = nome
-        self.times = times
-        self.formato = formato  # "ida_volta" ou "jogo_unico"
-        self.fase_atual = None
-        self.chaves = {}
-        self.resultados = {}
-        self.campeao = None
-        self.vice = None
-        self.historico = []
-        
-    def validar_numero_times(self):
-        """Valida se o número de times é válido para mata-mata"""
-        num_times = len(self.times)
-        potencias_validas = [2, 4, 8, 16, 32, 64]
-        
-        if num_times not in potencias_validas:
-            return False, f"Número inválido de times ({num_times}). Use: {potencias_validas}"
-        
-        return True, "OK"
-    
-    def gerar_fases(self):
-        """Gera as fases do torneio baseado no número de times - VERSÃO CORRIGIDA"""
-        num_times = len(self.times)
-        fases = []
-        
-        # Lógica mais clara para gerar fases
-        if num_times == 2:
-            fases = ["Final"]
-        elif num_times == 4:
-            fases = ["Semifinais", "Final"]
-        elif num_times == 8:
-            fases = ["Quartas de Final", "Semifinais", "Final"]
-        elif num_times == 16:
-            fases = ["Oitavas de Final", "Quartas de Final", "Semifinais", "Final"]
-        elif num_times == 32:
-            fases = ["Oitavas de Final", "Quartas de Final", "Semifinais", "Final"]
-        else:
-            # Fallback para outros números
-            times_restantes = num_times
-            while times_restantes > 2:
-                if times_restantes >= 32:
-                    fases.append("Oitavas de Final")
-                elif times_restantes >= 16:
-                    fases.append("Quartas de Final")
-                elif times_restantes >= 8:
-                    fases.append("Semifinais")
-                elif times_restantes >= 4:
-                    fases.append("Semifinais")
-                times_restantes = times_restantes // 2
-            fases.append("Final")
-        
-        return fases
-    
-    def sortear_chaves(self, times_participantes):
-        """Sorteia as chaves de uma fase"""
-        times_embaralhados = times_participantes.copy()
-        random.shuffle(times_embaralhados)
-        
-        chaves = []
-        for i in range(0, len(times_embaralhados), 2):
-            chave = {
-                'time1': times_embaralhados[i],
-                'time2': times_embaralhados[i+1],
-                'resultado_ida': None,
-                'resultado_volta': None,
-                'vencedor': None,
-                'detalhes': {}
-            }
-            chaves.append(chave)
-        
-        return chaves
-    
-    def simular_penaltis(self, time1, time2):
-        """Simula disputa de pênaltis"""
-        penaltis1 = 0
-        penaltis2 = 0
-        rodadas = 0
-        max_rodadas = 10
-        
-        # Simular até 5 cobranças para cada time
-        for rodada in range(5):
-            if random.random() < 0.75:  # 75% de chance de converter
-                penaltis1 += 1
-            if random.random() < 0.75:
-                penaltis2 += 1
-            rodadas += 1
-        
-        # Se empatado, morte súbita
-        while penaltis1 == penaltis2 and rodadas < max_rodadas:
-            gol1 = random.random() < 0.75
-            gol2 = random.random() < 0.75
-            
-            if gol1:
-                penaltis1 += 1
-            if gol2:
-                penaltis2 += 1
-            
-            rodadas += 1
-            
-            if gol1 and not gol2:
-                break
-            if gol2 and not gol1:
-                break
-        
-        # Se ainda empatado, sorteio
-        if penaltis1 == penaltis2:
-            vencedor = random.choice([time1['nome'], time2['nome']])
-            if vencedor == time1['nome']:
-                penaltis1 += 1
-            else:
-                penaltis2 += 1
-        
-        return penaltis1, penaltis2
-    
-    def determinar_vencedor_chave(self, chave):
-        """Determina o vencedor de uma chave baseado no formato"""
-        time1 = chave['time1']
-        time2 = chave['time2']
-        
-        if self.formato == "jogo_unico":
-            gols1, gols2 = chave['resultado_ida']
-            
-            if gols1 > gols2:
-                return time1, f"{gols1}-{gols2}"
-            elif gols2 > gols1:
-                return time2, f"{gols1}-{gols2}"
-            else:
-                pen1, pen2 = self.simular_penaltis(time1, time2)
-                if pen1 > pen2:
-                    return time1, f"{gols1}-{gols2} ({pen1}-{pen2} pên.)"
-                else:
-                    return time2, f"{gols1}-{gols2} ({pen1}-{pen2} pên.)"
-        
-        else:  # ida_volta
-            gols1_ida, gols2_ida = chave['resultado_ida']
-            gols1_volta, gols2_volta = chave['resultado_volta']
-            
-            total_time1 = gols1_ida + gols1_volta
-            total_time2 = gols2_ida + gols2_volta
-            
-            if total_time1 > total_time2:
-                return time1, f"Agregado: {total_time1}-{total_time2}"
-            elif total_time2 > total_time1:
-                return time2, f"Agregado: {total_time1}-{total_time2}"
-            else:
-                # Verificar gols fora
-                gols_fora_time1 = gols1_volta
-                gols_fora_time2 = gols2_ida
-                
-                if gols_fora_time1 > gols_fora_time2:
-                    return time1, f"Agregado: {total_time1}-{total_time2} (gols fora)"
-                elif gols_fora_time2 > gols_fora_time1:
-                    return time2, f"Agregado: {total_time1}-{total_time2} (gols fora)"
-                else:
-                    # Pênaltis
-                    pen1, pen2 = self.simular_penaltis(time1, time2)
-                    if pen1 > pen2:
-                        return time1, f"Agregado: {total_time1}-{total_time2} ({pen1}-{pen2} pên.)"
-                    else:
-                        return time2, f"Agregado: {total_time1}-{total_time2} ({pen1}-{pen2} pên.)"
+from app.mata_mata import TorneioMataMata
+from app.campeonato import CampeonatoPontosCorridos
+from app.copa import CompeticaoGruposMataMata
+from app.modelo import como_clube
+from app.projecao import projetar_temporada_progressiva
+from app.matriz_confrontos import carregar_matriz_confrontos, probabilidades_titulo_mata_mata
+from app.classificacao import exibir_classificacao_com_logos
+from app.historico_torneios import (
+    ARQUIVO_HISTORICO_TORNEIOS, dados_do_torneio, recriar_historico_torneios, registrar_torneio
+)
+from app.cache_compartilhado import historico_torneios_compartilhado, resumo_torneios_compartilhado
+from app.jobs import (
+    submeter_job, obter_job, listar_jobs, cancelar_job, carregar_resultado, remover_job,
+    STATUS_ATIVOS, CONCLUIDO, ERRO, CANCELADO, INTERROMPIDO
+)
+from utils.io import salvar_resultados_em_lote
 
 def exibir_chave_torneio(chaves, fase_nome, formato="ida_volta"):
     """Exibe as chaves de uma fase do torneio"""
@@ -239,8 +92,8 @@ def exibir_chave_torneio(chaves, fase_nome, formato="ida_volta"):
         
         st.markdown("---")
 
-def simular_fase_completa(chaves, fase_nome, formato="ida_volta"):
-    """Simula uma fase completa do torneio"""
+def simular_fase_completa(chaves, fase_nome, formato="ida_volta", torneio_id=None):
+    """Simula uma fase completa do torneio (partidas salvas na competição 'copa')"""
     st.subheader(f"⚽ Simulando {fase_nome}")
     
     vencedores = []
@@ -251,7 +104,7 @@ def simular_fase_completa(chaves, fase_nome, formato="ida_volta"):
         st.info("📺 Simulando Jogo de Ida...")
         
         # Simular jogo de ida
-        gols1_ida, gols2_ida = simular_partida(chave['time1'], chave['time2'])
+        gols1_ida, gols2_ida = simular_partida(chave['time1'], chave['time2'], competicao='copa', torneio_id=torneio_id)
         chave['resultado_ida'] = (gols1_ida, gols2_ida)
         
         st.success(f"🏟️ Resultado da Ida: {chave['time1']['nome']} {gols1_ida} x {gols2_ida} {chave['time2']['nome']}")
@@ -259,8 +112,9 @@ def simular_fase_completa(chaves, fase_nome, formato="ida_volta"):
         if formato == "ida_volta":
             st.info("📺 Simulando Jogo de Volta...")
             
-            # Simular jogo de volta
-            gols2_volta, gols1_volta = simular_partida(chave['time2'], chave['time1'])
+            # Simular jogo de volta (o mandante da volta conhece o placar da ida)
+            gols2_volta, gols1_volta = simular_partida(chave['time2'], chave['time1'], saldo_inicial=gols2_ida - gols1_ida,
+                                                       competicao='copa', torneio_id=torneio_id)
             chave['resultado_volta'] = (gols1_volta, gols2_volta)
             
             st.success(f"🏟️ Resultado da Volta: {chave['time2']['nome']} {gols2_volta} x {gols1_volta} {chave['time1']['nome']}")
@@ -281,135 +135,340 @@ def simular_fase_completa(chaves, fase_nome, formato="ida_volta"):
     
     return vencedores
 
+def formatar_nome_formato(formato):
+    """Retorna o nome amigável de um formato de torneio"""
+    if formato == "ida_volta":
+        return "Ida e Volta"
+    if formato == "jogo_unico":
+        return "Jogo Único"
+    return formato
+
+def maior_campeao(campeoes):
+    """Retorna (time, títulos) do maior campeão de um contador ou None"""
+    if not campeoes:
+        return None
+    return max(campeoes.items(), key=lambda x: x[1])
+
 def salvar_historico_torneio(torneio):
-    """Salva o histórico do torneio"""
+    """Salva o torneio no histórico e atualiza o resumo agregado (ver app/historico_torneios.py)"""
     try:
-        # Criar diretório data se não existir
-        if not os.path.exists("data"):
-            os.makedirs("data")
-            st.info("📁 Pasta 'data' criada")
-        
-        # Criar diretório de torneios
-        historico_dir = "data/torneios"
-        if not os.path.exists(historico_dir):
-            os.makedirs(historico_dir)
-            st.info("📁 Pasta 'data/torneios' criada")
-        
-        arquivo_historico = os.path.join(historico_dir, "historico_torneios.json")
-        
-        dados_torneio = {
-            'nome': torneio.nome,
-            'data': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'formato': torneio.formato,
-            'campeao': torneio.campeao['nome'] if torneio.campeao else None,
-            'vice': torneio.vice['nome'] if torneio.vice else None,
-            'num_times': len(torneio.times),
-            'times_participantes': [time['nome'] for time in torneio.times]
-        }
-        
-        # Carregar histórico existente
-        historico = []
-        if os.path.exists(arquivo_historico):
-            try:
-                with open(arquivo_historico, 'r', encoding='utf-8') as f:
-                    historico = json.load(f)
-            except json.JSONDecodeError:
-                st.warning("⚠️ Arquivo de histórico corrompido, criando novo")
-                historico = []
-            except Exception as e:
-                st.warning(f"⚠️ Erro ao ler histórico existente: {e}")
-                historico = []
-        
-        # Adicionar novo torneio
-        historico.append(dados_torneio)
-        
-        # Salvar arquivo
-        with open(arquivo_historico, 'w', encoding='utf-8') as f:
-            json.dump(historico, f, ensure_ascii=False, indent=2)
-        
-        st.success(f"💾 Histórico salvo com sucesso! Total: {len(historico)} torneios")
+        total = registrar_torneio(dados_do_torneio(torneio))
+        st.success(f"💾 Histórico salvo com sucesso! Total: {total} torneios")
         return True
         
     except Exception as e:
         st.error(f"❌ Erro ao salvar histórico: {e}")
         return False
 
+def exibir_torneio_historico(torneio):
+    """Exibe um registro de torneio do histórico"""
+    st.markdown(f"### 🏆 {torneio.get('nome', 'Torneio')} ({torneio.get('data', 'N/A')[:10]})")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.write(f"**🏆 Campeão:** {torneio.get('campeao', 'N/A')}")
+        st.write(f"**🥈 Vice:** {torneio.get('vice', 'N/A')}")
+        formato_texto = formatar_nome_formato(torneio.get('formato', 'N/A'))
+        st.write(f"**⚽ Formato:** {formato_texto}")
+    
+    with col2:
+        st.write(f"**👥 Times:** {torneio.get('num_times', 'N/A')}")
+        st.write(f"**📅 Data:** {torneio.get('data', 'N/A')}")
+    
+    st.write("**🏟️ Times Participantes:**")
+    participantes = torneio.get('times_participantes', [])
+    if participantes:
+        times_texto = ", ".join(participantes)
+        st.write(times_texto)
+    else:
+        st.write("N/A")
+    
+    st.markdown("---")
+
 def exibir_historico_torneios():
     """Exibe o histórico de torneios realizados"""
     st.subheader("📊 Histórico de Torneios")
     
-    arquivo_historico = "data/torneios/historico_torneios.json"
-    
-    if not os.path.exists(arquivo_historico):
-        st.info("📝 Nenhum torneio realizado ainda.")
-        return
-    
     try:
-        with open(arquivo_historico, 'r', encoding='utf-8') as f:
-            historico = json.load(f)
+        resumo = resumo_torneios_compartilhado()
         
-        if not historico:
-            st.info("📝 Nenhum torneio registrado no histórico.")
+        if not resumo or resumo['total_torneios'] == 0:
+            st.info("📝 Nenhum torneio realizado ainda.")
             return
         
-        # Ordenar por data (mais recente primeiro)
-        historico_ordenado = sorted(historico, key=lambda x: x.get('data', ''), reverse=True)
-        
         # Estatísticas gerais
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("🏆 Torneios Realizados", len(historico))
+            st.metric("🏆 Torneios Realizados", resumo['total_torneios'])
         
         with col2:
-            campeoes = [t.get('campeao') for t in historico if t.get('campeao')]
-            if campeoes:
-                campeao_mais_vitorioso = max(set(campeoes), key=campeoes.count)
-                vitorias = campeoes.count(campeao_mais_vitorioso)
-                st.metric("👑 Maior Campeão", f"{campeao_mais_vitorioso} ({vitorias}x)")
+            maior = maior_campeao(resumo['campeoes'])
+            if maior:
+                st.metric("👑 Maior Campeão", f"{maior[0]} ({maior[1]}x)")
             else:
                 st.metric("👑 Maior Campeão", "N/A")
         
         with col3:
-            formatos = [t.get('formato', 'N/A') for t in historico]
-            if formatos:
-                formato_popular = max(set(formatos), key=formatos.count)
-                formato_texto = "Ida e Volta" if formato_popular == "ida_volta" else "Jogo Único" if formato_popular == "jogo_unico" else formato_popular
-                st.metric("⚽ Formato Popular", formato_texto)
+            if resumo['formatos']:
+                formato_popular = max(resumo['formatos'].items(), key=lambda x: x[1]['count'])[0]
+                st.metric("⚽ Formato Popular", formatar_nome_formato(formato_popular))
             else:
                 st.metric("⚽ Formato Popular", "N/A")
         
         st.markdown("---")
         
-        # Lista de torneios
-        for i, torneio in enumerate(historico_ordenado):
-            st.markdown(f"### 🏆 {torneio.get('nome', 'Torneio')} ({torneio.get('data', 'N/A')[:10]})")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.write(f"**🏆 Campeão:** {torneio.get('campeao', 'N/A')}")
-                st.write(f"**🥈 Vice:** {torneio.get('vice', 'N/A')}")
-                formato_texto = "Ida e Volta" if torneio.get('formato') == "ida_volta" else "Jogo Único" if torneio.get('formato') == "jogo_unico" else "N/A"
-                st.write(f"**⚽ Formato:** {formato_texto}")
-            
-            with col2:
-                st.write(f"**👥 Times:** {torneio.get('num_times', 'N/A')}")
-                st.write(f"**📅 Data:** {torneio.get('data', 'N/A')}")
-            
-            st.write("**🏟️ Times Participantes:**")
-            participantes = torneio.get('times_participantes', [])
-            if participantes:
-                times_texto = ", ".join(participantes)
-                st.write(times_texto)
-            else:
-                st.write("N/A")
-            
-            st.markdown("---")
+        # Lista de torneios: os mais recentes vêm do resumo, o restante sob demanda
+        if resumo['total_torneios'] > len(resumo['ultimos']) and st.checkbox("📋 Ver todos os torneios"):
+            historico = historico_torneios_compartilhado()
+            torneios_exibidos = sorted(historico, key=lambda x: x.get('data', ''), reverse=True)
+        else:
+            torneios_exibidos = resumo['ultimos']
+        
+        for torneio in torneios_exibidos:
+            exibir_torneio_historico(torneio)
     
     except Exception as e:
         st.error(f"❌ Erro ao carregar histórico: {e}")
 
+def pagina_grupos_mata_mata(clubes):
+    """Página da competição com fase de grupos seguida de mata-mata"""
+    st.subheader("🌍 Fase de Grupos + Mata-Mata")
+    
+    nome_competicao = st.text_input("📝 Nome da Competição", value="Copa do Mundo", key="nome_competicao_grupos")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        opcoes_grupos = [g for g in [1, 2, 4, 8] if g * 3 <= len(clubes)]
+        if not opcoes_grupos:
+            st.error("❌ São necessários pelo menos 3 clubes para uma fase de grupos.")
+            return
+        num_grupos = st.selectbox("🗂️ Número de Grupos", opcoes_grupos, index=len(opcoes_grupos) - 1,
+                                  key="num_grupos_competicao")
+    
+    with col2:
+        max_por_grupo = min(6, len(clubes) // num_grupos)
+        times_por_grupo = st.number_input("👥 Times por Grupo", min_value=3, max_value=max_por_grupo,
+                                          value=min(4, max_por_grupo), step=1, key="times_por_grupo_competicao")
+    
+    with col3:
+        formato = st.selectbox("⚽ Formato do Mata-Mata", ["ida_volta", "jogo_unico"],
+                               format_func=formatar_nome_formato, key="formato_competicao_grupos")
+    
+    grupos_ida_e_volta = st.checkbox("🔁 Grupos em turno e returno", value=False, key="grupos_ida_volta")
+    
+    num_times = num_grupos * times_por_grupo
+    st.caption(f"{num_times} times, os {num_times} mais fortes por força geral, sorteados em potes.")
+    
+    if st.button("🚀 Criar e Simular Competição", type="primary", key="criar_competicao_grupos"):
+        times = sorted(clubes.values(), key=lambda x: x['forca_geral'], reverse=True)[:num_times]
+        competicao = CompeticaoGruposMataMata(nome_competicao, times, num_grupos, formato, grupos_ida_e_volta)
+        valido, erro = competicao.validar()
+        
+        if not valido:
+            st.error(f"❌ {erro}")
+        else:
+            with st.spinner("⚽ Simulando grupos em paralelo e mata-mata..."):
+                competicao.simular(workers=min(num_grupos, os.cpu_count() or 1))
+            st.session_state.competicao_grupos = competicao
+            st.session_state.competicao_grupos_salva = False
+    
+    if 'competicao_grupos' not in st.session_state:
+        return
+    
+    competicao = st.session_state.competicao_grupos
+    
+    st.markdown("---")
+    st.subheader(f"🏆 {competicao.nome}")
+    st.success(f"🏆 **CAMPEÃO: {competicao.campeao['nome']}** 🏆")
+    st.info(f"🥈 **Vice-campeão:** {competicao.vice['nome']}")
+    
+    if not st.session_state.get('competicao_grupos_salva'):
+        if st.button("💾 Salvar no Histórico", key="salvar_competicao_grupos"):
+            if (salvar_resultados_em_lote(competicao.partidas, 'copa', torneio_id=competicao.id)
+                    and salvar_historico_torneio(competicao)):
+                st.session_state.competicao_grupos_salva = True
+    else:
+        st.info("💾 Competição já salva no histórico.")
+    
+    st.subheader("🗂️ Fase de Grupos")
+    letras = list(competicao.tabelas)
+    for inicio in range(0, len(letras), 2):
+        colunas = st.columns(2)
+        for coluna, letra in zip(colunas, letras[inicio:inicio + 2]):
+            with coluna:
+                st.markdown(f"**Grupo {letra}**")
+                st.dataframe(
+                    competicao.tabelas[letra][['time', 'pontos', 'jogos', 'vitorias', 'empates', 'derrotas', 'saldo_gols']],
+                    column_config={"time": "Time", "pontos": "PTS", "jogos": "J", "vitorias": "V",
+                                   "empates": "E", "derrotas": "D", "saldo_gols": "SG"},
+                    use_container_width=True
+                )
+    
+    st.subheader("⚔️ Mata-Mata")
+    for fase, chaves in competicao.mata_mata.chaves.items():
+        with st.expander(f"🏆 {fase}", expanded=(fase == "Final")):
+            exibir_chave_torneio(chaves, fase, competicao.formato)
+
+def colunas_tabela_projecao(vagas_topo):
+    """Rótulos das colunas da tabela de projeção"""
+    return {
+        "time": "Time",
+        "pontos_esperados": "Pontos (média)",
+        "desvio_pontos": "Desvio",
+        "posicao_media": "Posição média",
+        "prob_titulo": "Título (%)",
+        "prob_topo": f"Top {vagas_topo} (%)",
+        "prob_rebaixamento": "Rebaixamento (%)",
+    }
+
+def exibir_projecao_temporada(campeonato):
+    """Projeta o restante da temporada com Monte Carlo e exibe as probabilidades"""
+    with st.expander("🔮 Projeção do Restante da Temporada"):
+        col1, col2 = st.columns(2)
+        with col1:
+            n_simulacoes = st.select_slider("Temporadas simuladas", [1000, 5000, 10000, 20000, 50000],
+                                            value=10000, key="n_simulacoes_projecao")
+        with col2:
+            tempo_limite = st.slider("Tempo máximo (s)", 1, 30, 10, key="tempo_limite_projecao")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            projetar_agora = st.button("🔮 Projetar Temporada", key="projetar_temporada", use_container_width=True)
+        with col2:
+            if st.button("🖥️ Projetar em Segundo Plano", key="projetar_temporada_segundo_plano", use_container_width=True):
+                # Sem limite de tempo: a tarefa não ocupa a sessão
+                submeter_job("projecao_temporada", {
+                    'tabela': campeonato.gerar_tabela(),
+                    'jogos_restantes': [(como_clube(casa), como_clube(fora))
+                                        for casa, fora in campeonato.jogos_restantes()],
+                    'n_simulacoes': n_simulacoes,
+                }, f"Projeção - {campeonato.nome} ({n_simulacoes} temporadas)")
+                st.success("✅ Projeção enviada! Acompanhe em Torneios → ⚙️ Tarefas.")
+        
+        if projetar_agora:
+            progresso = st.progress(0)
+            status = st.empty()
+            tabela_placeholder = st.empty()
+            
+            for projecao in projetar_temporada_progressiva(
+                campeonato.gerar_tabela(), campeonato.jogos_restantes(),
+                n_simulacoes=n_simulacoes, tempo_limite=tempo_limite
+            ):
+                progresso.progress(min(projecao.n_simulacoes / n_simulacoes, 1.0))
+                status.caption(f"⏱️ {projecao.n_simulacoes} temporadas em {projecao.tempo_decorrido:.1f}s")
+                tabela_placeholder.dataframe(
+                    projecao.tabela(),
+                    column_config=colunas_tabela_projecao(projecao.vagas_topo),
+                    use_container_width=True
+                )
+
+def exibir_favoritos_mata_mata(clubes, times, formato):
+    """Exibe as chances de final e de título de cada time, consultando a matriz de confrontos"""
+    with st.expander("📊 Favoritos ao Título"):
+        matriz = carregar_matriz_confrontos(clubes)
+        favoritos = probabilidades_titulo_mata_mata(times, matriz, formato)
+        df_favoritos = pd.DataFrame(favoritos, columns=['Time', 'Final (%)', 'Título (%)'])
+        df_favoritos[['Final (%)', 'Título (%)']] = (df_favoritos[['Final (%)', 'Título (%)']] * 100).round(1)
+        st.dataframe(df_favoritos, hide_index=True, use_container_width=True)
+        st.caption("Probabilidades exatas de cada confronto, com as chaves sorteadas a cada fase")
+
+def pagina_pontos_corridos(clubes):
+    """Página do campeonato por pontos corridos (todos contra todos)"""
+    st.subheader("📅 Campeonato por Pontos Corridos")
+    
+    if len(clubes) < 2:
+        st.error("❌ São necessários pelo menos 2 clubes para um campeonato.")
+        return
+    
+    nome_campeonato = st.text_input("📝 Nome do Campeonato", value="Brasileirão 2024", key="nome_campeonato")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        num_times = st.number_input("👥 Número de Times", min_value=2, max_value=len(clubes),
+                                    value=min(20, len(clubes)), step=1, key="num_times_campeonato")
+    
+    with col2:
+        ida_e_volta = st.checkbox("🔁 Turno e returno", value=True, key="ida_volta_campeonato")
+    
+    with col3:
+        metodo_selecao = st.radio("Seleção dos times", ["Automático (Melhores)", "Sorteio"],
+                                  key="selecao_campeonato")
+    
+    if st.button("🚀 Criar Campeonato", type="primary", key="criar_campeonato"):
+        if metodo_selecao == "Automático (Melhores)":
+            times = sorted(clubes.values(), key=lambda x: x['forca_geral'], reverse=True)[:num_times]
+        else:
+            times = random.sample(list(clubes.values()), num_times)
+        
+        st.session_state.campeonato_atual = CampeonatoPontosCorridos(nome_campeonato, times, ida_e_volta)
+        st.session_state.campeonato_salvo = False
+    
+    if 'campeonato_atual' not in st.session_state:
+        return
+    
+    campeonato = st.session_state.campeonato_atual
+    
+    st.markdown("---")
+    st.subheader(f"🏆 {campeonato.nome}")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("👥 Times", len(campeonato.times))
+    with col2:
+        st.metric("📅 Rodada", f"{campeonato.rodada_atual}/{campeonato.total_rodadas}")
+    with col3:
+        st.metric("🏟️ Total de Jogos", campeonato.total_jogos)
+    
+    # Controles de simulação
+    if not campeonato.concluido:
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("⚽ Simular Próxima Rodada", use_container_width=True, key="rodada_campeonato"):
+                campeonato.simular_rodada()
+                st.rerun()
+        with col2:
+            if st.button("⏩ Simular Temporada Completa", use_container_width=True, type="primary", key="temporada_campeonato"):
+                inicio = time.perf_counter()
+                campeonato.simular_temporada()
+                st.session_state.tempo_simulacao_campeonato = time.perf_counter() - inicio
+                st.rerun()
+    else:
+        st.success(f"🏆 **CAMPEÃO: {campeonato.campeao}** 🏆")
+        if 'tempo_simulacao_campeonato' in st.session_state:
+            st.caption(f"⏱️ Temporada simulada em {st.session_state.tempo_simulacao_campeonato:.2f}s")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            if not st.session_state.get('campeonato_salvo'):
+                if st.button("💾 Salvar Temporada no Histórico", use_container_width=True, key="salvar_campeonato"):
+                    if campeonato.salvar():
+                        st.session_state.campeonato_salvo = True
+                        st.success(f"💾 {len(campeonato.partidas)} partidas salvas no histórico!")
+            else:
+                st.info("💾 Temporada já salva no histórico.")
+        with col2:
+            if st.button("🎉 Novo Campeonato", use_container_width=True, key="novo_campeonato"):
+                for key in ['campeonato_atual', 'campeonato_salvo', 'tempo_simulacao_campeonato']:
+                    if key in st.session_state:
+                        del st.session_state[key]
+                st.rerun()
+    
+    if campeonato.rodada_atual > 0:
+        exibir_classificacao_com_logos(campeonato.gerar_tabela(), clubes)
+        
+        if not campeonato.concluido:
+            exibir_projecao_temporada(campeonato)
+        
+        with st.expander("📋 Resultados por Rodada"):
+            for numero, resultados in reversed(list(enumerate(campeonato.resultados_rodadas, start=1))):
+                st.markdown(f"**Rodada {numero}**")
+                for casa, fora, gols_casa, gols_fora, _ in resultados:
+                    st.write(f"{casa['nome']} {gols_casa} x {gols_fora} {fora['nome']}")
+
 def pagina_torneios(clubes):
     """Página principal dos torneios"""
     st.header("🏆 Torneios Mata-Mata")
@@ -419,7 +478,9 @@ def pagina_torneios(clubes):
         return
     
     # Sub-abas para organizar melhor
-    subtab1, subtab2, subtab3 = st.tabs(["🚀 Novo Torneio", "📊 Histórico", "ℹ️ Sobre"])
+    subtab1, subtab_grupos, subtab_liga, subtab2, subtab_tarefas, subtab3 = st.tabs([
+        "🚀 Novo Torneio", "🌍 Grupos + Mata-Mata", "📅 Pontos Corridos", "📊 Histórico", "⚙️ Tarefas", "ℹ️ Sobre"
+    ])
     
     with subtab1:
         st.subheader("🎯 Configurar Novo Torneio")
@@ -492,6 +553,8 @@ def pagina_torneios(clubes):
         
         # Criar torneio se tudo estiver pronto
         if len(times_selecionados) == num_times:
+            exibir_favoritos_mata_mata(clubes, times_selecionados, formato)
+            
             col1, col2, col3 = st.columns([1, 1, 1])
             with col2:
                 if st.button("🚀 Criar e Simular Torneio", use_container_width=True, type="primary"):
@@ -516,9 +579,18 @@ def pagina_torneios(clubes):
             st.markdown("---")
             simular_torneio_completo(st.session_state.torneio_atual)
     
+    with subtab_grupos:
+        pagina_grupos_mata_mata(clubes)
+    
+    with subtab_liga:
+        pagina_pontos_corridos(clubes)
+    
     with subtab2:
         exibir_historico_torneios()
     
+    with subtab_tarefas:
+        exibir_tarefas_segundo_plano()
+    
     with subtab3:
         st.subheader("ℹ️ Como Funciona o Sistema de Torneios")
         
@@ -527,19 +599,21 @@ def pagina_torneios(clubes):
         with col1:
             st.markdown("""
             **🏆 Tipos de Torneio Suportados:**
-            - Champions League (16/32 times)
-            - Copa do Mundo (32 times)
-            - Copa do Brasil (variável)
+            - Mata-mata puro, estilo Copa do Brasil (4 a 32 times)
+            - Fase de grupos + mata-mata, estilo Champions League / Copa do Mundo (ex.: 8 grupos de 4)
+            - Pontos corridos, estilo Brasileirão (turno e returno)
             - Torneios personalizados
             
             **⚙️ Configurações:**
             - Formato: Ida e Volta ou Jogo Único
             - Times: 4, 8, 16 ou 32 participantes
             - Seleção: Automática, Manual ou Sorteio
+            - Grupos: sorteio por potes de força, 1º e 2º avançam
             
             **🎯 Critérios de Desempate:**
             - Ida e Volta: Saldo → Gols fora → Pênaltis
             - Jogo Único: Pênaltis direto
+            - Grupos: Pontos → Saldo → Gols pró → Vitórias
             """)
         
         with col2:
@@ -562,6 +636,163 @@ def pagina_torneios(clubes):
         st.markdown("---")
         st.info("💡 **Dica:** Use a seleção automática para pegar os times mais fortes, ou faça um sorteio para mais surpresas!")
 
+def concluir_fase_torneio(torneio, fases, fase_atual, chaves, vencedores):
+    """Registra o resultado de uma fase e avança o torneio (simulação ao vivo ou em segundo plano)"""
+    # Salvar informações da fase
+    torneio.chaves[fase_atual] = chaves
+    torneio.resultados[fase_atual] = vencedores
+    
+    # Salvar na lista de fases completadas
+    fase_info = {
+        'nome': fase_atual,
+        'chaves': chaves,
+        'vencedores': vencedores
+    }
+    st.session_state.fases_completadas.append(fase_info)
+    
+    st.success(f"✅ {fase_atual} concluída!")
+    st.info(f"🏆 Classificados para próxima fase: {[v['nome'] for v in vencedores]}")
+    
+    # Verificar se é a final
+    if fase_atual == "Final":
+        if len(vencedores) == 1:
+            # Definir campeão
+            torneio.campeao = vencedores[0]
+    
+            # Encontrar vice-campeão
+            for chave in chaves:
+                if chave['vencedor'] == torneio.campeao:
+                    torneio.vice = chave['time1'] if chave['time2'] == torneio.campeao else chave['time2']
+                    break
+    
+            # Salvar histórico
+            salvar_historico_torneio(torneio)
+    
+            # Marcar torneio como concluído
+            st.session_state.fase_atual_idx = len(fases)  # Marca como concluído
+    
+            st.rerun()
+        else:
+            st.error("❌ Erro: Final deveria ter apenas 1 vencedor!")
+    else:
+        # Avançar para próxima fase
+        st.session_state.times_atuais = vencedores
+        st.session_state.fase_atual_idx += 1
+        st.rerun()
+
+def enviar_fase_segundo_plano(torneio, chaves, fase_atual):
+    """Envia a simulação de uma fase para o pool de tarefas e guarda o id na sessão"""
+    chaves_job = [
+        {**chave, 'time1': como_clube(chave['time1']), 'time2': como_clube(chave['time2'])}
+        for chave in chaves
+    ]
+    job_id = submeter_job("fase_mata_mata", {
+        'chaves': chaves_job,
+        'formato': torneio.formato,
+        'seed': random.getrandbits(32),
+    }, f"{torneio.nome} - {fase_atual}")
+    st.session_state.job_fase = {'job_id': job_id, 'fase_idx': st.session_state.fase_atual_idx}
+
+def acompanhar_fase_segundo_plano(torneio, fases, fase_atual, job_id):
+    """Mostra o progresso da fase em segundo plano e aplica o resultado quando a tarefa termina"""
+    job = obter_job(job_id)
+    
+    if job is None or job['status'] in (ERRO, CANCELADO, INTERROMPIDO):
+        del st.session_state.job_fase
+        motivo = job['erro'] if job and job['erro'] else (job['status'] if job else "tarefa não encontrada")
+        st.error(f"❌ A simulação em segundo plano não terminou: {motivo}")
+        st.button("↩️ Voltar à fase", key="voltar_fase_segundo_plano")
+        return
+    
+    if job['status'] in STATUS_ATIVOS:
+        st.info(f"🖥️ {fase_atual} sendo simulada em segundo plano...")
+        st.progress(job['progresso'])
+        if job['mensagem']:
+            st.caption(job['mensagem'])
+        if st.button("⏹️ Cancelar", key="cancelar_fase_segundo_plano"):
+            cancelar_job(job_id)
+        time.sleep(1)
+        st.rerun()
+    
+    # Concluída: troca as cópias enxutas pelos clubes do torneio
+    resultado = carregar_resultado(job_id)
+    del st.session_state.job_fase
+    por_nome = {time_clube['nome']: time_clube for time_clube in torneio.times}
+    chaves = []
+    for chave in resultado['chaves']:
+        chave.update({campo: por_nome[chave[campo]['nome']] for campo in ('time1', 'time2', 'vencedor')})
+        chaves.append(chave)
+    vencedores = [chave['vencedor'] for chave in chaves]
+    
+    salvar_resultados_em_lote([
+        (por_nome[clube1['nome']], por_nome[clube2['nome']], gols1, gols2, marcadores)
+        for clube1, clube2, gols1, gols2, marcadores in resultado['partidas']
+    ], 'copa', torneio_id=torneio.id)
+    
+    exibir_chave_torneio(chaves, f"Resultados - {fase_atual}", torneio.formato)
+    concluir_fase_torneio(torneio, fases, fase_atual, chaves, vencedores)
+
+ROTULOS_STATUS_JOB = {
+    "pendente": "⏳ Na fila",
+    "executando": "⚙️ Executando",
+    "concluido": "✅ Concluída",
+    "erro": "❌ Erro",
+    "cancelado": "⏹️ Cancelada",
+    "interrompido": "⚠️ Interrompida",
+}
+
+def exibir_tarefas_segundo_plano():
+    """Lista as tarefas em segundo plano com progresso e resultados"""
+    st.subheader("⚙️ Tarefas em Segundo Plano")
+    st.caption("Simulações longas rodam em processos separados e continuam mesmo se a página for recarregada.")
+    
+    tarefas = listar_jobs(limite=20)
+    if not tarefas:
+        st.info("📝 Nenhuma tarefa enviada ainda.")
+        return
+    
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.button("🔄 Atualizar", key="atualizar_tarefas")
+    with col2:
+        acompanhar = st.checkbox("Atualizar automaticamente", key="acompanhar_tarefas")
+    
+    for tarefa in tarefas:
+        col1, col2, col3 = st.columns([3, 2, 1])
+        with col1:
+            st.markdown(f"**{tarefa['descricao'] or tarefa['tipo']}**")
+            st.caption(datetime.fromtimestamp(tarefa['criado_em']).strftime("%d/%m/%Y %H:%M:%S"))
+        with col2:
+            st.write(ROTULOS_STATUS_JOB.get(tarefa['status'], tarefa['status']))
+            if tarefa['status'] in STATUS_ATIVOS:
+                st.progress(tarefa['progresso'])
+            if tarefa['mensagem']:
+                st.caption(tarefa['mensagem'])
+        with col3:
+            if tarefa['status'] in STATUS_ATIVOS:
+                if st.button("⏹️", key=f"cancelar_{tarefa['id']}", help="Cancelar"):
+                    cancelar_job(tarefa['id'])
+                    st.rerun()
+            elif st.button("🗑️", key=f"remover_{tarefa['id']}", help="Remover"):
+                remover_job(tarefa['id'])
+                st.rerun()
+        
+        if tarefa['status'] == ERRO and tarefa['erro']:
+            st.error(tarefa['erro'])
+        
+        if tarefa['status'] == CONCLUIDO and tarefa['tipo'] == "projecao_temporada":
+            with st.expander("📊 Ver projeção"):
+                resultado = carregar_resultado(tarefa['id'])
+                st.caption(f"⏱️ {resultado['n_simulacoes']} temporadas em {resultado['tempo_decorrido']:.1f}s")
+                st.dataframe(resultado['tabela'], column_config=colunas_tabela_projecao(resultado['vagas_topo']),
+                             use_container_width=True)
+        
+        st.markdown("---")
+    
+    if acompanhar and any(tarefa['status'] in STATUS_ATIVOS for tarefa in tarefas):
+        time.sleep(2)
+        st.rerun()
+
 def simular_torneio_completo(torneio):
     """Simula um torneio completo do início ao fim - VERSÃO COM FASES CORRIGIDAS"""
     st.subheader(f"🏆 {torneio.nome}")
@@ -639,6 +870,12 @@ def simular_torneio_completo(torneio):
             st.error("❌ Erro: Não há times suficientes para continuar o torneio!")
             return torneio
         
+        # Fase em simulação no pool de tarefas
+        job_fase = st.session_state.get('job_fase')
+        if job_fase and job_fase['fase_idx'] == st.session_state.fase_atual_idx:
+            acompanhar_fase_segundo_plano(torneio, fases, fase_atual, job_fase['job_id'])
+            return torneio
+        
         # Sortear chaves para a fase atual
         chaves = torneio.sortear_chaves(st.session_state.times_atuais)
         
@@ -646,54 +883,19 @@ def simular_torneio_completo(torneio):
         st.subheader(f"🎲 Sorteio - {fase_atual}")
         exibir_chave_torneio(chaves, f"Chaves - {fase_atual}", torneio.formato)
         
-        # Botão para simular a fase
+        # Botões para simular a fase (ao vivo ou em segundo plano)
         col1, col2, col3 = st.columns([1, 1, 1])
+        with col3:
+            if st.button("🖥️ Simular em Segundo Plano", key=f"simular_segundo_plano_{st.session_state.fase_atual_idx}",
+                         use_container_width=True):
+                enviar_fase_segundo_plano(torneio, chaves, fase_atual)
+                st.rerun()
         with col2:
             if st.button(f"⚽ Simular {fase_atual}", key=f"simular_{fase_atual}_{st.session_state.fase_atual_idx}", use_container_width=True, type="primary"):
                 # Simular a fase
-                vencedores = simular_fase_completa(chaves, fase_atual, torneio.formato)
-                
-                # Salvar informações da fase
-                torneio.chaves[fase_atual] = chaves
-                torneio.resultados[fase_atual] = vencedores
+                vencedores = simular_fase_completa(chaves, fase_atual, torneio.formato, torneio.id)
                 
-                # Salvar na lista de fases completadas
-                fase_info = {
-                    'nome': fase_atual,
-                    'chaves': chaves,
-                    'vencedores': vencedores
-                }
-                st.session_state.fases_completadas.append(fase_info)
-                
-                st.success(f"✅ {fase_atual} concluída!")
-                st.info(f"🏆 Classificados para próxima fase: {[v['nome'] for v in vencedores]}")
-                
-                # Verificar se é a final
-                if fase_atual == "Final":
-                    if len(vencedores) == 1:
-                        # Definir campeão
-                        torneio.campeao = vencedores[0]
-                        
-                        # Encontrar vice-campeão
-                        for chave in chaves:
-                            if chave['vencedor'] == torneio.campeao:
-                                torneio.vice = chave['time1'] if chave['time2'] == torneio.campeao else chave['time2']
-                                break
-                        
-                        # Salvar histórico
-                        sucesso_save = salvar_historico_torneio(torneio)
-                        
-                        # Marcar torneio como concluído
-                        st.session_state.fase_atual_idx = len(fases)  # Marca como concluído
-                        
-                        st.rerun()
-                    else:
-                        st.error("❌ Erro: Final deveria ter apenas 1 vencedor!")
-                else:
-                    # Avançar para próxima fase
-                    st.session_state.times_atuais = vencedores
-                    st.session_state.fase_atual_idx += 1
-                    st.rerun()
+                concluir_fase_torneio(torneio, fases, fase_atual, chaves, vencedores)
     
     # Mostrar fases futuras
     for i, fase in enumerate(fases):
@@ -709,11 +911,11 @@ def simular_torneio_completo(torneio):
 def exibir_classificacao_geral_torneios(clubes):
     """
     Exibe a classificação geral dos times nos torneios - Hall da Fama
-    VERSÃO CORRIGIDA com tratamento de arquivos vazios/corrompidos
+    Lê apenas o resumo agregado mantido por salvar_historico_torneio()
     """
     st.header("👑 Hall da Fama dos Torneios")
     
-    arquivo_historico = "data/torneios/historico_torneios.json"
+    arquivo_historico = ARQUIVO_HISTORICO_TORNEIOS
     
     # Verificar se arquivo existe
     if not os.path.exists(arquivo_historico):
@@ -731,50 +933,25 @@ def exibir_classificacao_geral_torneios(clubes):
         """)
         return
     
-    # Verificar se arquivo não está vazio
-    try:
-        tamanho_arquivo = os.path.getsize(arquivo_historico)
-        st.info(f"🔍 Debug: Arquivo encontrado com {tamanho_arquivo} bytes")
-        
-        if tamanho_arquivo == 0:
-            st.warning("⚠️ Arquivo de histórico está vazio. Realize alguns torneios primeiro!")
-            return
-            
-    except Exception as e:
-        st.error(f"❌ Erro ao verificar arquivo: {e}")
-        return
-    
     try:
-        # Tentar ler o arquivo
-        with open(arquivo_historico, 'r', encoding='utf-8') as f:
-            conteudo = f.read().strip()
-            
-        # Verificar se conteúdo não está vazio
-        if not conteudo:
-            st.warning("⚠️ Arquivo de histórico está vazio. Realize alguns torneios primeiro!")
-            return
-        
-        # Debug: mostrar primeiros caracteres
-        st.info(f"🔍 Debug: Primeiros 50 caracteres do arquivo: {conteudo[:50]}...")
-        
-        # Tentar fazer parse do JSON
+        # Tentar carregar o resumo (reconstruído do histórico se necessário)
         try:
-            historico_torneios = json.loads(conteudo)
+            resumo = resumo_torneios_compartilhado()
         except json.JSONDecodeError as e:
             st.error(f"❌ Erro no formato JSON: {e}")
-            st.error(f"Conteúdo problemático: {conteudo[:100]}...")
             
             # Opção para recriar arquivo
             if st.button("🔧 Recriar Arquivo de Histórico"):
                 try:
                     # Criar backup
+                    with open(arquivo_historico, 'r', encoding='utf-8') as f:
+                        conteudo = f.read()
                     backup_file = arquivo_historico + '.backup'
-                    with open(backup_file, 'w') as f:
+                    with open(backup_file, 'w', encoding='utf-8') as f:
                         f.write(conteudo)
                     
                     # Criar arquivo novo e vazio
-                    with open(arquivo_historico, 'w', encoding='utf-8') as f:
-                        json.dump([], f, ensure_ascii=False, indent=2)
+                    recriar_historico_torneios()
                     
                     st.success("✅ Arquivo recriado! Backup salvo como .backup")
                     st.info("Realize novos torneios para popular o histórico.")
@@ -783,46 +960,19 @@ def exibir_classificacao_geral_torneios(clubes):
                     st.error(f"❌ Erro ao recriar arquivo: {e2}")
             return
         
-        if not historico_torneios:
+        if not resumo or resumo['total_torneios'] == 0:
             st.info("📝 Nenhum torneio registrado ainda no histórico. Realize alguns torneios primeiro!")
             return
         
-        st.success(f"✅ Carregados {len(historico_torneios)} torneios do histórico")
+        campeoes_count = resumo['campeoes']
+        vice_campeoes_count = resumo['vices']
+        participacoes_count = resumo['participacoes']
+        formatos_stats = resumo['formatos']
+        tamanhos_stats = resumo['tamanhos']
+        times_todos = set(participacoes_count) | set(campeoes_count) | set(vice_campeoes_count)
         
-        # Processar dados dos torneios
-        campeoes_count = {}
-        vice_campeoes_count = {}
-        participacoes_count = {}
-        times_todos = set()
-        
-        for i, torneio in enumerate(historico_torneios):
-            try:
-                campeao = torneio.get('campeao')
-                vice = torneio.get('vice')
-                participantes = torneio.get('times_participantes', [])
-                
-                # Debug: mostrar dados do torneio
-                if i < 3:  # Mostrar apenas os 3 primeiros para debug
-                    st.info(f"🔍 Debug Torneio {i+1}: Campeão: {campeao}, Vice: {vice}, Participantes: {len(participantes)}")
-                
-                # Contar campeões
-                if campeao:
-                    times_todos.add(campeao)
-                    campeoes_count[campeao] = campeoes_count.get(campeao, 0) + 1
-                
-                # Contar vice-campeões
-                if vice:
-                    times_todos.add(vice)
-                    vice_campeoes_count[vice] = vice_campeoes_count.get(vice, 0) + 1
-                
-                # Contar participações
-                for time in participantes:
-                    times_todos.add(time)
-                    participacoes_count[time] = participacoes_count.get(time, 0) + 1
-                    
-            except Exception as e:
-                st.warning(f"⚠️ Erro ao processar torneio {i+1}: {e}")
-                continue
+        # Índice de clubes por nome para buscar os logos
+        clubes_por_nome = {clube['nome']: clube for clube in clubes.values()}
         
         # Verificar se temos dados processados
         if not times_todos:
@@ -835,14 +985,14 @@ def exibir_classificacao_geral_torneios(clubes):
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("🏆 Total de Torneios", len(historico_torneios))
+            st.metric("🏆 Total de Torneios", resumo['total_torneios'])
         
         with col2:
             st.metric("🏟️ Times Participantes", len(times_todos))
         
         with col3:
-            if campeoes_count:
-                time_mais_vitorioso = max(campeoes_count.items(), key=lambda x: x[1])
+            time_mais_vitorioso = maior_campeao(campeoes_count)
+            if time_mais_vitorioso:
                 st.metric("👑 Time Mais Vitorioso", f"{time_mais_vitorioso[0]} ({time_mais_vitorioso[1]}x)")
             else:
                 st.metric("👑 Time Mais Vitorioso", "N/A")
@@ -873,11 +1023,7 @@ def exibir_classificacao_geral_torneios(clubes):
                 
                 for i, (time_nome, titulos) in enumerate(campeoes_ordenados):
                     # Encontrar dados do clube para pegar o logo
-                    clube_data = None
-                    for clube in clubes.values():
-                        if clube['nome'] == time_nome:
-                            clube_data = clube
-                            break
+                    clube_data = clubes_por_nome.get(time_nome)
                     
                     # Criar layout para cada campeão
                     col1, col2, col3 = st.columns([1, 4, 1])
@@ -934,11 +1080,7 @@ def exibir_classificacao_geral_torneios(clubes):
                 
                 for i, (time_nome, vices) in enumerate(vices_ordenados):
                     # Encontrar dados do clube
-                    clube_data = None
-                    for clube in clubes.values():
-                        if clube['nome'] == time_nome:
-                            clube_data = clube
-                            break
+                    clube_data = clubes_por_nome.get(time_nome)
                     
                     col1, col2, col3 = st.columns([1, 4, 1])
                     
@@ -1019,11 +1161,7 @@ def exibir_classificacao_geral_torneios(clubes):
                 
                 with col2:
                     # Nome do time com logo
-                    clube_data = None
-                    for clube in clubes.values():
-                        if clube['nome'] == dados['Time']:
-                            clube_data = clube
-                            break
+                    clube_data = clubes_por_nome.get(dados['Time'])
                     
                     if clube_data and clube_data.get('logo_base64'):
                         st.markdown(
@@ -1058,50 +1196,29 @@ def exibir_classificacao_geral_torneios(clubes):
             st.subheader("📈 Estatísticas Detalhadas")
             
             # Estatísticas por formato de torneio
-            formatos_stats = {}
-            for torneio in historico_torneios:
-                formato = torneio.get('formato', 'N/A')
-                if formato not in formatos_stats:
-                    formatos_stats[formato] = {'count': 0, 'campeoes': []}
-                formatos_stats[formato]['count'] += 1
-                if torneio.get('campeao'):
-                    formatos_stats[formato]['campeoes'].append(torneio['campeao'])
-            
             st.subheader("⚽ Estatísticas por Formato")
             for formato, stats in formatos_stats.items():
-                formato_nome = "Ida e Volta" if formato == "ida_volta" else "Jogo Único" if formato == "jogo_unico" else formato
-                st.write(f"**{formato_nome}:** {stats['count']} torneios")
+                st.write(f"**{formatar_nome_formato(formato)}:** {stats['count']} torneios")
                 
-                if stats['campeoes']:
-                    campeao_formato = max(set(stats['campeoes']), key=stats['campeoes'].count)
-                    vitorias_formato = stats['campeoes'].count(campeao_formato)
-                    st.write(f"  👑 Maior campeão: {campeao_formato} ({vitorias_formato}x)")
+                campeao_formato = maior_campeao(stats['campeoes'])
+                if campeao_formato:
+                    st.write(f"  👑 Maior campeão: {campeao_formato[0]} ({campeao_formato[1]}x)")
             
             st.markdown("---")
             
             # Estatísticas por número de times
             st.subheader("👥 Estatísticas por Número de Times")
-            tamanhos_stats = {}
-            for torneio in historico_torneios:
-                num_times = torneio.get('num_times', 0)
-                if num_times not in tamanhos_stats:
-                    tamanhos_stats[num_times] = {'count': 0, 'campeoes': []}
-                tamanhos_stats[num_times]['count'] += 1
-                if torneio.get('campeao'):
-                    tamanhos_stats[num_times]['campeoes'].append(torneio['campeao'])
-            
-            for num_times, stats in sorted(tamanhos_stats.items()):
+            for num_times, stats in sorted(tamanhos_stats.items(), key=lambda x: int(x[0])):
                 st.write(f"**{num_times} times:** {stats['count']} torneios")
-                if stats['campeoes']:
-                    campeao_tamanho = max(set(stats['campeoes']), key=stats['campeoes'].count)
-                    vitorias_tamanho = stats['campeoes'].count(campeao_tamanho)
-                    st.write(f"  👑 Maior campeão: {campeao_tamanho} ({vitorias_tamanho}x)")
+                campeao_tamanho = maior_campeao(stats['campeoes'])
+                if campeao_tamanho:
+                    st.write(f"  👑 Maior campeão: {campeao_tamanho[0]} ({campeao_tamanho[1]}x)")
             
             st.markdown("---")
             
             # Últimos torneios
             st.subheader("🕒 Últimos Torneios Realizados")
-            ultimos_torneios = sorted(historico_torneios, key=lambda x: x.get('data', ''), reverse=True)[:5]
+            ultimos_torneios = resumo['ultimos'][:5]
             
             for torneio in ultimos_torneios:
                 col1, col2, col3 = st.columns([2, 1, 1])
@@ -1131,8 +1248,7 @@ def exibir_classificacao_geral_torneios(clubes):
         # Opção para limpar/recriar arquivo
         if st.button("🔧 Recriar Arquivo de Histórico Limpo"):
             try:
-                with open(arquivo_historico, 'w', encoding='utf-8') as f:
-                    json.dump([], f, ensure_ascii=False, indent=2)
+                recriar_historico_torneios()
                 st.success("✅ Arquivo de histórico recriado como lista vazia")
                 st.info("Agora você pode realizar novos torneios!")
                 st.rerun()
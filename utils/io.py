@@ -1,11 +1,22 @@
 # Arquivo: utils/io.py
 import pandas as pd
 import os
+import sys
 import datetime
-import streamlit as st
 import base64
+import io
+import threading
 from pathlib import Path
 
+from app.armazenamento import GrupoCommit, anexar_bytes, escrever_atomico, tamanho_estavel, trava_arquivo
+from app.cache_compartilhado import notificar_alteracao
+from app.ratings import ler_assinatura, sincronizar_ratings
+from app.agregados import sincronizar_agregados, sincronizar_agregados_competicao
+from app.modelo import Clube, registrar_logo
+from app.elencos import COLUNAS_ELENCO, ElencosColunares
+from app.competicoes import (COLUNAS_COMPETICAO, COMPETICAO_PADRAO, arquivo_historico_competicao,
+                             temporada_atual)
+
 # Caminho para os arquivos de dados
 DATA_DIR = "data"
 HISTORICO_ARQUIVO = os.path.join(DATA_DIR, "historico_partidas.csv")
@@ -13,10 +24,34 @@ CLUBES_ARQUIVO = os.path.join(DATA_DIR, "clubes_utf8.csv")
 JOGADORES_ARQUIVO = os.path.join(DATA_DIR, "jogadores_utf8.csv")
 LOGOS_DIR = os.path.join("static", "logos")
 
-def carregar_csv_multiplas_codificacoes(caminho_arquivo):
+COLUNAS_HISTORICO = [
+    'data', 'time_casa', 'time_visitante', 'gols_casa', 'gols_visitante', 'vencedor', 'marcadores_gols'
+] + COLUNAS_COMPETICAO
+
+def _interface():
+    """
+    Módulo do Streamlit quando a aplicação web já o carregou, ou None.
+    
+    Este módulo não importa o Streamlit: a linha de comando (app/cli.py) usa
+    as mesmas funções de carga sem pagar a importação da interface.
+    """
+    return sys.modules.get("streamlit")
+
+def _mensagem(nivel, texto):
+    """Exibe a mensagem na interface (st.error, st.success...) ou no terminal"""
+    st = _interface()
+    if st is not None:
+        getattr(st, nivel)(texto)
+    else:
+        print(texto)
+
+def carregar_csv_multiplas_codificacoes(caminho_arquivo, conteudo=None):
     """
     Tenta carregar um CSV com múltiplas codificações.
     SOLUÇÃO DEFINITIVA para o erro de codificação.
+    
+    Com conteudo (bytes já lidos do arquivo), o CSV é lido dele e o caminho
+    serve só para as mensagens.
     """
     print(f"🔄 Tentando carregar: {caminho_arquivo}")
     
@@ -34,7 +69,8 @@ def carregar_csv_multiplas_codificacoes(caminho_arquivo):
     for encoding in codificacoes:
         try:
             print(f"  🧪 Testando {encoding}...")
-            df = pd.read_csv(caminho_arquivo, encoding=encoding)
+            fonte = io.BytesIO(conteudo) if conteudo is not None else caminho_arquivo
+            df = pd.read_csv(fonte, encoding=encoding)
             print(f"  ✅ SUCESSO com {encoding}!")
             return df, encoding
         except (UnicodeDecodeError, UnicodeError):
@@ -47,7 +83,8 @@ def carregar_csv_multiplas_codificacoes(caminho_arquivo):
     # Último recurso: ignorar caracteres problemáticos
     try:
         print("  🔧 Último recurso: UTF-8 ignorando erros...")
-        df = pd.read_csv(caminho_arquivo, encoding='utf-8', errors='ignore')
+        fonte = io.BytesIO(conteudo) if conteudo is not None else caminho_arquivo
+        df = pd.read_csv(fonte, encoding='utf-8', errors='ignore')
         print("  ✅ Carregado ignorando caracteres problemáticos!")
         return df, 'utf-8-ignore'
     except Exception as e:
@@ -85,11 +122,17 @@ def get_logo_base64(time_nome, logo_arquivo):
         with open(logo_path, "rb") as img_file:
             return base64.b64encode(img_file.read()).decode()
     except Exception as e:
-        st.warning(f"Erro ao carregar logo para {time_nome}: {e}")
+        _mensagem('warning', f"Erro ao carregar logo para {time_nome}: {e}")
         return None
 
-def carregar_clubes(arquivo=None):
-    """Carrega os dados dos clubes com tratamento de codificação robusto."""
+def carregar_clubes(arquivo=None, carregar_logos=True):
+    """
+    Carrega os dados dos clubes com tratamento de codificação robusto.
+    
+    Com carregar_logos=False os logos não são lidos (logo_base64 fica None),
+    o que acelera simulações em lote sem interface. Os logos ficam no registro
+    de app/modelo.py, uma vez por clube.
+    """
     if arquivo is None:
         arquivo = CLUBES_ARQUIVO
     
@@ -101,42 +144,40 @@ def carregar_clubes(arquivo=None):
         df, encoding_used = carregar_csv_multiplas_codificacoes(arquivo)
         
         if df is None:
-            st.error(f"Erro: Não foi possível carregar o arquivo de clubes: {arquivo}")
+            _mensagem('error', f"Erro: Não foi possível carregar o arquivo de clubes: {arquivo}")
             return {}
         
-        st.success(f"✅ Clubes carregados com codificação: {encoding_used}")
+        _mensagem('success', f"✅ Clubes carregados com codificação: {encoding_used}")
         
         clubes = {}
-        tem_logos = 'logo_arquivo' in df.columns
+        tem_logos = carregar_logos and 'logo_arquivo' in df.columns
         
         for _, linha in df.iterrows():
             logo_arquivo = linha['logo_arquivo'] if tem_logos else None
-            logo_base64 = get_logo_base64(linha['nome'], logo_arquivo)
+            registrar_logo(int(linha['id']), get_logo_base64(linha['nome'], logo_arquivo))
             
-            clubes[linha['id']] = {
-                'nome': linha['nome'],
-                'forca_geral': linha['forca_geral'],
-                'jogadores': [],
-                'logo_base64': logo_base64
-            }
+            clubes[linha['id']] = Clube(int(linha['id']), linha['nome'], linha['forca_geral'])
         
         print(f"✅ {len(clubes)} clubes carregados com sucesso!")
         return clubes
         
     except Exception as e:
-        st.error(f"Erro ao carregar clubes: {e}")
+        _mensagem('error', f"Erro ao carregar clubes: {e}")
         return {}
 
 def carregar_jogadores(arquivo=None, clubes=None):
     """
     VERSÃO CORRIGIDA - Carrega jogadores com tratamento robusto de codificação.
     Esta versão resolve o erro: 'utf-8' codec can't decode byte 0xfa
+    
+    Os elencos são montados em colunas (app/elencos.py) e cada clube recebe
+    os seus objetos Jogador. Retorna os ElencosColunares (None em caso de erro).
     """
     if arquivo is None:
         arquivo = JOGADORES_ARQUIVO
     
     if not clubes:
-        st.warning("Nenhum clube fornecido para associar os jogadores.")
+        _mensagem('warning', "Nenhum clube fornecido para associar os jogadores.")
         return
     
     try:
@@ -146,121 +187,331 @@ def carregar_jogadores(arquivo=None, clubes=None):
         df, encoding_used = carregar_csv_multiplas_codificacoes(arquivo)
         
         if df is None:
-            st.error(f"❌ ERRO: Não foi possível carregar o arquivo de jogadores: {arquivo}")
-            st.error("Verifique se o arquivo existe e não está corrompido.")
+            _mensagem('error', f"❌ ERRO: Não foi possível carregar o arquivo de jogadores: {arquivo}")
+            _mensagem('error', "Verifique se o arquivo existe e não está corrompido.")
             return
         
         # Sucesso no carregamento!
-        st.success(f"✅ Jogadores carregados com codificação: {encoding_used}")
+        _mensagem('success', f"✅ Jogadores carregados com codificação: {encoding_used}")
         print(f"📊 {len(df)} linhas carregadas do arquivo de jogadores")
         
         # Verificar colunas necessárias
         colunas_necessarias = ['nome', 'posicao', 'habilidade', 'clube_id']
         if not all(col in df.columns for col in colunas_necessarias):
-            st.error(f"Erro: Colunas necessárias não encontradas: {colunas_necessarias}")
-            st.write(f"Colunas disponíveis: {list(df.columns)}")
+            _mensagem('error', f"Erro: Colunas necessárias não encontradas: {colunas_necessarias}")
+            _mensagem('write', f"Colunas disponíveis: {list(df.columns)}")
             return
         
-        # Processar jogadores
-        jogadores_carregados = 0
-        jogadores_erro = 0
+        # Processar jogadores: elencos em colunas, depois um objeto Jogador por linha
+        elencos = ElencosColunares.de_dataframe(df)
+        del df
+        sem_clube = elencos.montar_clubes(clubes)
+        for clube_id, quantidade in sem_clube.items():
+            print(f"⚠️ Clube ID {clube_id} não encontrado para {quantidade} jogador(es)")
         
-        for index, linha in df.iterrows():
-            try:
-                jogador = {
-                    'nome': str(linha['nome']).strip(),
-                    'posicao': str(linha['posicao']).strip(),
-                    'habilidade': float(linha['habilidade'])
-                }
-                clube_id = linha['clube_id']
-                
-                if clube_id in clubes:
-                    clubes[clube_id]['jogadores'].append(jogador)
-                    jogadores_carregados += 1
-                else:
-                    print(f"⚠️ Clube ID {clube_id} não encontrado para {jogador['nome']}")
-                    jogadores_erro += 1
-                    
-            except Exception as e:
-                print(f"❌ Erro linha {index}: {e}")
-                jogadores_erro += 1
-                continue
+        jogadores_erro = elencos.descartados + sum(sem_clube.values())
+        jogadores_carregados = len(elencos) - sum(sem_clube.values())
+        if elencos.descartados:
+            print(f"❌ {elencos.descartados} linha(s) sem clube ou habilidade numéricos")
         
         # Relatório final
-        st.success(f"🎉 {jogadores_carregados} jogadores carregados com sucesso!")
+        _mensagem('success', f"🎉 {jogadores_carregados} jogadores carregados com sucesso!")
         
         if jogadores_erro > 0:
-            st.warning(f"⚠️ {jogadores_erro} jogadores tiveram problemas no carregamento.")
+            _mensagem('warning', f"⚠️ {jogadores_erro} jogadores tiveram problemas no carregamento.")
         
-        # Mostrar distribuição por clube
-        with st.expander("📊 Distribuição de jogadores por clube"):
-            for clube_id, clube in clubes.items():
-                num_jogadores = len(clube['jogadores'])
-                if num_jogadores > 0:
-                    st.write(f"🏟️ **{clube['nome']}**: {num_jogadores} jogadores")
+        # Mostrar distribuição por clube (só na interface)
+        st = _interface()
+        if st is not None:
+            with st.expander("📊 Distribuição de jogadores por clube"):
+                for clube_id, clube in clubes.items():
+                    num_jogadores = len(clube.jogadores)
+                    if num_jogadores > 0:
+                        st.write(f"🏟️ **{clube.nome}**: {num_jogadores} jogadores")
         
         print("✅ Carregamento de jogadores finalizado com sucesso!")
+        return elencos
         
     except Exception as e:
-        st.error(f"❌ ERRO CRÍTICO ao carregar jogadores: {e}")
+        _mensagem('error', f"❌ ERRO CRÍTICO ao carregar jogadores: {e}")
         print(f"❌ ERRO CRÍTICO: {e}")
         
         # Dicas para o usuário
-        st.info("💡 **Dicas para resolver:**")
-        st.write("1. Verifique se o arquivo existe em:", arquivo)
-        st.write("2. Abra o arquivo no Excel e salve como 'CSV (UTF-8)'")
-        st.write("3. Verifique se o arquivo não está sendo usado por outro programa")
+        _mensagem('info', "💡 **Dicas para resolver:**")
+        _mensagem('write', f"1. Verifique se o arquivo existe em: {arquivo}")
+        _mensagem('write', "2. Abra o arquivo no Excel e salve como 'CSV (UTF-8)'")
+        _mensagem('write', "3. Verifique se o arquivo não está sendo usado por outro programa")
 
-def salvar_resultado(clube1, clube2, gols1, gols2, marcadores_gols):
+def carregar_elencos(arquivos=None):
+    """
+    Elencos de um ou mais cadastros de jogadores (ex.: um CSV por liga) em
+    colunas NumPy, sem criar um objeto por jogador. Cada arquivo é lido e
+    convertido antes do próximo, então só um DataFrame fica na memória por vez.
+    
+    Args:
+        arquivos (str or list): Caminho(s) dos CSVs; padrão: JOGADORES_ARQUIVO.
+            Os ids de clube não podem se repetir entre arquivos.
+    
+    Returns:
+        ElencosColunares: Jogadores de todos os arquivos (ver app/elencos.py).
+    """
+    if arquivos is None:
+        arquivos = [JOGADORES_ARQUIVO]
+    elif isinstance(arquivos, str):
+        arquivos = [arquivos]
+    
+    partes = []
+    for arquivo in arquivos:
+        df, _ = carregar_csv_multiplas_codificacoes(arquivo)
+        if df is None:
+            _mensagem('error', f"❌ Não foi possível carregar o arquivo de jogadores: {arquivo}")
+            continue
+        faltando = [col for col in COLUNAS_ELENCO if col != 'id' and col not in df.columns]
+        if faltando:
+            _mensagem('error', f"Erro: Colunas não encontradas em {arquivo}: {faltando}")
+            continue
+        partes.append(ElencosColunares.de_dataframe(df[[col for col in COLUNAS_ELENCO if col in df.columns]]))
+        del df
+    
+    elencos = ElencosColunares.juntar(partes)
+    print(f"✅ {len(elencos)} jogadores de {len(elencos.clubes)} clubes em colunas "
+          f"({elencos.nbytes / 1024:.0f} KB)")
+    return elencos
+
+def salvar_resultado(clube1, clube2, gols1, gols2, marcadores_gols, competicao=COMPETICAO_PADRAO,
+                     temporada=None, torneio_id=None):
     """Salva o resultado da partida em um arquivo CSV."""
-    os.makedirs(DATA_DIR, exist_ok=True)
-    data_atual = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return salvar_resultados_em_lote([(clube1, clube2, gols1, gols2, marcadores_gols)],
+                                     competicao, temporada, torneio_id)
+
+def migrar_colunas_historico(arquivo):
+    """
+    Acrescenta as colunas de competição a um histórico gravado antes delas
+    (valores vazios), reescrevendo o arquivo uma única vez.
+    """
+    with open(arquivo, 'r', encoding='utf-8', errors='replace') as f:
+        cabecalho = f.readline().strip().split(',')
+    if all(coluna in cabecalho for coluna in COLUNAS_COMPETICAO):
+        return False
     
-    marcadores_str = ';'.join([f"{jogador}:{minuto}:{time}" for jogador, minuto, time in marcadores_gols])
+    df = pd.read_csv(arquivo, dtype=str, keep_default_na=False, encoding_errors='replace')
+    for coluna in COLUNAS_HISTORICO:
+        if coluna not in df.columns:
+            df[coluna] = ''
+    escrever_atomico(arquivo, df[COLUNAS_HISTORICO].to_csv(index=False))
+    return True
+
+def anexar_historico(resultado, arquivo):
+    """
+    Acrescenta as linhas ao CSV em uma única escrita (com cabeçalho se o
+    arquivo ainda não existe). Deve ser chamada com a trava do arquivo.
+    """
+    existe = os.path.isfile(arquivo)
+    if existe:
+        migrar_colunas_historico(arquivo)
+    anexar_bytes(arquivo, resultado.to_csv(header=not existe, index=False).encode('utf-8'))
+
+def gravar_lotes_historico(lotes):
+    """
+    Grava de uma vez os lotes enviados por várias sessões (ver GrupoCommit):
+    uma escrita no histórico completo e uma por partição de competição. A
+    trava do histórico cobre só essas escritas; ratings e visões são
+    sincronizados depois, fora dela e fora do lote (sincronizar_visoes()).
     
-    resultado = pd.DataFrame({
-        'data': [data_atual],
-        'time_casa': [clube1['nome']],
-        'time_visitante': [clube2['nome']],
-        'gols_casa': [gols1],
-        'gols_visitante': [gols2],
-        'vencedor': [clube1['nome'] if gols1 > gols2 else (clube2['nome'] if gols2 > gols1 else 'Empate')],
-        'marcadores_gols': [marcadores_str]
-    })
+    Args:
+        lotes (list): Tuplas (competicao, linhas), uma por chamada de
+            salvar_resultados_em_lote().
+    """
+    with trava_arquivo(HISTORICO_ARQUIVO):
+        resultado = pd.DataFrame([linha for _, linhas in lotes for linha in linhas], columns=COLUNAS_HISTORICO)
+        anexar_historico(resultado, HISTORICO_ARQUIVO)
+        competicoes = list(dict.fromkeys(competicao for competicao, _ in lotes))
+        for competicao in competicoes:
+            arquivo_competicao = arquivo_historico_competicao(competicao)
+            with trava_arquivo(arquivo_competicao):
+                anexar_historico(resultado[resultado['competicao'] == competicao], arquivo_competicao)
     
-    try:
-        arquivo_existe = os.path.isfile(HISTORICO_ARQUIVO)
-        
-        if arquivo_existe:
-            resultado.to_csv(HISTORICO_ARQUIVO, mode='a', header=False, index=False, encoding='utf-8')
-        else:
-            resultado.to_csv(HISTORICO_ARQUIVO, index=False, encoding='utf-8')
+    # As outras sessões passam a ler só as partidas novas (ver app/cache_compartilhado.py)
+    notificar_alteracao('historico')
+    return [True] * len(lotes)
+
+_competicoes_pendentes = set()
+_sincronizacao = threading.Lock()
+_sincronizacao_guarda = threading.Lock()
+
+def sincronizar_visoes(competicoes):
+    """
+    Atualiza ratings e visões depois de uma gravação, sem a trava do histórico.
+    
+    As sincronizações do processo são agrupadas: se uma já está em curso, as
+    competições ficam pendentes e ela mesma faz mais uma passada ao terminar,
+    lendo de uma vez tudo o que foi gravado nesse meio tempo.
+    """
+    with _sincronizacao_guarda:
+        _competicoes_pendentes.update(competicoes)
+    
+    while _sincronizacao.acquire(blocking=False):
+        try:
+            while True:
+                with _sincronizacao_guarda:
+                    pendentes = sorted(_competicoes_pendentes)
+                    _competicoes_pendentes.clear()
+                if not pendentes:
+                    break
+                
+                # Atualização incremental dos ratings: só as linhas novas são lidas
+                try:
+                    sincronizar_ratings()
+                except Exception as e:
+                    print(f"⚠️ Erro ao atualizar ratings: {e}")
+                
+                # Visões materializadas (estatísticas por clube...) seguem o mesmo caminho,
+                # no histórico completo e nas partições das competições
+                try:
+                    sincronizar_agregados()
+                    for competicao in pendentes:
+                        sincronizar_agregados_competicao(competicao)
+                except Exception as e:
+                    print(f"⚠️ Erro ao atualizar estatísticas agregadas: {e}")
+        finally:
+            _sincronizacao.release()
         
+        # Pedidos que chegaram entre a última passada e a liberação da trava
+        with _sincronizacao_guarda:
+            if not _competicoes_pendentes:
+                return
+
+# Sessões que salvam ao mesmo tempo têm as partidas gravadas em um único lote
+grupo_historico = GrupoCommit(gravar_lotes_historico)
+
+def salvar_resultados_em_lote(partidas, competicao=COMPETICAO_PADRAO, temporada=None, torneio_id=None):
+    """
+    Salva várias partidas no histórico com uma única escrita no CSV.
+    
+    As partidas vão para o histórico completo e para a partição da competição
+    (data/historico/<competicao>.csv). Chamadas simultâneas (várias sessões)
+    são gravadas juntas, com trava entre processos (ver app/armazenamento.py).
+    
+    Args:
+        partidas (list): Lista de tuplas (clube1, clube2, gols1, gols2, marcadores_gols),
+            no mesmo formato dos argumentos de salvar_resultado().
+        competicao (str): 'amistoso', 'liga' ou 'copa' (ver app/competicoes.py).
+        temporada (str, opcional): Temporada das partidas (padrão: ano atual).
+        torneio_id (str ou list, opcional): Torneio/temporada de origem
+            (gerar_torneio_id()), ou uma lista com um id por partida.
+    
+    Returns:
+        bool: True se o lote foi salvo com sucesso.
+    """
+    if not partidas:
         return True
+    
+    try:
+        arquivo_competicao = arquivo_historico_competicao(competicao)
+    except ValueError as e:
+        _mensagem('error', f"Erro ao salvar resultado: {e}")
+        return False
+    
+    data_atual = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    temporada = temporada or temporada_atual()
+    torneio_ids = torneio_id if isinstance(torneio_id, list) else [torneio_id or ''] * len(partidas)
+    
+    linhas = []
+    for (clube1, clube2, gols1, gols2, marcadores_gols), id_torneio in zip(partidas, torneio_ids):
+        marcadores_str = ';'.join([f"{jogador}:{minuto}:{time}" for jogador, minuto, time in marcadores_gols])
+        linhas.append({
+            'data': data_atual,
+            'time_casa': clube1['nome'],
+            'time_visitante': clube2['nome'],
+            'gols_casa': gols1,
+            'gols_visitante': gols2,
+            'vencedor': clube1['nome'] if gols1 > gols2 else (clube2['nome'] if gols2 > gols1 else 'Empate'),
+            'marcadores_gols': marcadores_str,
+            'competicao': competicao,
+            'temporada': temporada,
+            'torneio_id': id_torneio,
+        })
+    
+    try:
+        salvo = grupo_historico.enviar((competicao, linhas))
     except Exception as e:
-        st.error(f"Erro ao salvar resultado: {e}")
+        _mensagem('error', f"Erro ao salvar resultado: {e}")
         return False
+    
+    # Depois do lote: enquanto as visões são atualizadas, o próximo lote já pode gravar
+    sincronizar_visoes([competicao])
+    return salvo
 
-def carregar_historico():
-    """Carrega o histórico de partidas com tratamento de codificação."""
-    if not os.path.isfile(HISTORICO_ARQUIVO):
+def carregar_historico(competicao=None):
+    """
+    Carrega o histórico de partidas com tratamento de codificação.
+    
+    Args:
+        competicao (str, opcional): Lê só a partição da competição
+            (data/historico/<competicao>.csv) em vez do histórico completo.
+    """
+    arquivo = arquivo_historico_competicao(competicao) if competicao else HISTORICO_ARQUIVO
+    if not os.path.isfile(arquivo):
         return None
     
     try:
-        df, encoding_used = carregar_csv_multiplas_codificacoes(HISTORICO_ARQUIVO)
+        # A trava só é pega para saber até onde há lotes completos; a leitura e
+        # a interpretação desses bytes acontecem sem ela (o arquivo só cresce)
+        tamanho = tamanho_estavel(arquivo)
+        with open(arquivo, 'rb') as f:
+            conteudo = f.read(tamanho)
+        df, encoding_used = carregar_csv_multiplas_codificacoes(arquivo, conteudo)
+        if df is not None:
+            # Até onde o arquivo foi lido, para atualizar_historico() continuar dali
+            df.attrs.update(bytes_lidos=tamanho, assinatura=ler_assinatura(arquivo, tamanho),
+                            codificacao=encoding_used)
         if df is not None and encoding_used:
             print(f"📊 Histórico carregado com codificação: {encoding_used}")
         return df
     except Exception as e:
         try:
-            backup_file = HISTORICO_ARQUIVO + '.bak'
-            os.rename(HISTORICO_ARQUIVO, backup_file)
-            st.warning(f"Arquivo de histórico problemático. Backup criado: {backup_file}")
-            st.warning("Um novo arquivo de histórico será criado.")
+            backup_file = arquivo + '.bak'
+            os.rename(arquivo, backup_file)
+            _mensagem('warning', f"Arquivo de histórico problemático. Backup criado: {backup_file}")
+            _mensagem('warning', "Um novo arquivo de histórico será criado.")
         except:
-            st.error("Não foi possível criar backup do arquivo problemático.")
+            _mensagem('error', "Não foi possível criar backup do arquivo problemático.")
         return None
 
+def atualizar_historico(historico, competicao=None):
+    """
+    Acrescenta a um histórico carregado por carregar_historico() as partidas
+    gravadas depois dele, lendo só os bytes novos do arquivo.
+    
+    Se o arquivo foi recriado ou editado (encolheu, ou os bytes já lidos
+    mudaram), o histórico é recarregado inteiro.
+    
+    Returns:
+        DataFrame: O próprio histórico se não há partidas novas, ou um novo
+        DataFrame (o recebido não é alterado).
+    """
+    arquivo = arquivo_historico_competicao(competicao) if competicao else HISTORICO_ARQUIVO
+    posicao = historico.attrs.get('bytes_lidos') if historico is not None else None
+    if posicao is None or historico.attrs.get('codificacao') == 'utf-8-ignore' or not os.path.isfile(arquivo):
+        return carregar_historico(competicao)
+    
+    with trava_arquivo(arquivo):
+        tamanho = os.path.getsize(arquivo)
+        if tamanho < posicao or ler_assinatura(arquivo, posicao) != historico.attrs['assinatura']:
+            return carregar_historico(competicao)
+        if tamanho == posicao:
+            return historico
+        with open(arquivo, 'rb') as f:
+            f.seek(posicao)
+            conteudo = f.read(tamanho - posicao)
+        assinatura = ler_assinatura(arquivo, tamanho)
+    
+    novas = pd.read_csv(io.BytesIO(conteudo), header=None, names=list(historico.columns),
+                        encoding=historico.attrs['codificacao'])
+    atualizado = pd.concat([historico, novas], ignore_index=True)
+    atualizado.attrs = dict(historico.attrs, bytes_lidos=tamanho, assinatura=assinatura)
+    return atualizado
+
 def filtrar_historico_por_time(historico, time_nome):
     """Filtra o histórico de partidas por um time específico."""
     if historico is None:
@@ -271,6 +522,8 @@ def filtrar_historico_por_time(historico, time_nome):
 
 def teste_rapido_codificacao():
     """Função para testar rapidamente se o problema foi resolvido."""
+    import streamlit as st
+    
     st.subheader("🧪 Teste Rápido de Codificação")
     
     if st.button("🔍 Testar Carregamento de Jogadores"):